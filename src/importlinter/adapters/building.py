@@ -1,16 +1,29 @@
-from typing import List, Optional
+import contextlib
+import os
+from typing import ContextManager, List, Optional
 
 import grimp
 from grimp import ImportGraph
 
+from importlinter.application import graph_snapshots
 from importlinter.application.ports import building as ports
 
+from .filesystem import locked, write_atomically
+
 
 class GraphBuilder(ports.GraphBuilder):
     """
     GraphBuilder that just uses Grimp's standard build_graph function.
+
+    So that several processes can share the same cache directory, the graph is built while
+    holding an exclusive lock on it. Grimp's cache is made up of several files that must agree
+    with each other, so this stops one process reading them while another is writing them.
+
+    Graphs are dumped in the binary format described in importlinter.application.graph_snapshots.
     """
 
+    LOCK_FILENAME = ".lock"
+
     def build(
         self,
         root_package_names: List[str],
@@ -18,9 +31,25 @@ class GraphBuilder(ports.GraphBuilder):
         include_external_packages: bool = False,
         exclude_type_checking_imports: bool = False,
     ) -> ImportGraph:
-        return grimp.build_graph(
-            *root_package_names,
-            include_external_packages=include_external_packages,
-            exclude_type_checking_imports=exclude_type_checking_imports,
-            cache_dir=cache_dir,
-        )
+        with self._lock_cache_dir(cache_dir):
+            return grimp.build_graph(
+                *root_package_names,
+                include_external_packages=include_external_packages,
+                exclude_type_checking_imports=exclude_type_checking_imports,
+                cache_dir=cache_dir,
+            )
+
+    def dump(self, graph: ImportGraph, filename: str) -> None:
+        snapshot = graph_snapshots.snapshot_graph(graph)
+        write_atomically(filename, graph_snapshots.serialize_snapshot(snapshot))
+
+    def load(self, filename: str) -> ImportGraph:
+        with open(filename, "rb") as file:
+            data = file.read()
+        return graph_snapshots.restore_graph(graph_snapshots.deserialize_snapshot(data))
+
+    def _lock_cache_dir(self, cache_dir: Optional[str]) -> ContextManager[None]:
+        if cache_dir is None:
+            # Caching is disabled, so there's nothing to share.
+            return contextlib.nullcontext()
+        return locked(os.path.join(cache_dir, self.LOCK_FILENAME), exclusive=True)
@@ -0,0 +1,80 @@
+import logging
+import os
+import pickle
+from typing import Any, Dict, List, Optional, Type
+
+from importlinter.application.ports import caching as ports
+
+from .filesystem import write_atomically
+
+logger = logging.getLogger(__name__)
+
+
+class PickleContractCheckCache(ports.ContractCheckCache):
+    """
+    Contract check cache that stores each result as a pickle file in the cache directory.
+
+    Caching is best-effort: if an entry can't be read or written, it is treated as missing.
+    Entries are written atomically, so the cache can be shared by concurrent processes.
+    """
+
+    SUBDIRECTORY = "contract_checks"
+    GRAPH_FINGERPRINT_FILENAME = "graph_fingerprint.pickle"
+    DURATIONS_FILENAME = "durations.pickle"
+
+    def read(self, cache_dir: str, contract_key: str) -> Optional[ports.CachedContractCheck]:
+        return self._read_pickle(
+            self._get_filename(cache_dir, f"{contract_key}.pickle"), ports.CachedContractCheck
+        )
+
+    def write(
+        self, cache_dir: str, contract_key: str, cached_check: ports.CachedContractCheck
+    ) -> None:
+        self._write_pickle(self._get_filename(cache_dir, f"{contract_key}.pickle"), cached_check)
+
+    def read_graph_fingerprint(self, cache_dir: str) -> Optional[ports.GraphFingerprint]:
+        return self._read_pickle(
+            self._get_filename(cache_dir, self.GRAPH_FINGERPRINT_FILENAME), ports.GraphFingerprint
+        )
+
+    def write_graph_fingerprint(self, cache_dir: str, fingerprint: ports.GraphFingerprint) -> None:
+        self._write_pickle(
+            self._get_filename(cache_dir, self.GRAPH_FINGERPRINT_FILENAME), fingerprint
+        )
+
+    def read_durations(self, cache_dir: str) -> Dict[str, List[float]]:
+        durations = self._read_pickle(self._get_filename(cache_dir, self.DURATIONS_FILENAME), dict)
+        return durations or {}
+
+    def write_durations(self, cache_dir: str, durations: Dict[str, List[float]]) -> None:
+        self._write_pickle(self._get_filename(cache_dir, self.DURATIONS_FILENAME), durations)
+
+    def _read_pickle(self, filename: str, expected_type: Type) -> Any:
+        try:
+            with open(filename, "rb") as file:
+                data = pickle.load(file)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            logger.info(f"Could not read contract check cache file {filename}.")
+            return None
+        if not isinstance(data, expected_type):
+            return None
+        return data
+
+    def _write_pickle(self, filename: str, data: Any) -> None:
+        try:
+            pickled = pickle.dumps(data)
+        except Exception:
+            # Custom contract types may put things in their metadata that can't be pickled.
+            logger.info(f"Could not pickle data for contract check cache file {filename}.")
+            return
+        try:
+            write_atomically(filename, pickled)
+        except OSError:
+            logger.info(f"Could not write contract check cache file {filename}.")
+            return
+        logger.info(f"Wrote contract check cache file {filename}.")
+
+    def _get_filename(self, cache_dir: str, name: str) -> str:
+        return os.path.join(cache_dir, self.SUBDIRECTORY, name)
@@ -1,5 +1,13 @@
+import contextlib
 import os
-from typing import Optional
+import tempfile
+from typing import Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:
+    # Not available on Windows.
+    fcntl = None  # type: ignore
 
 from importlinter.application.ports import filesystem as ports
 
@@ -16,8 +24,65 @@ class FileSystem(ports.FileSystem):
         with open(file_name, encoding=encoding) as file:
             return file.read()
 
+    def write(self, file_name: str, contents: str, encoding: Optional[str] = None) -> None:
+        with open(file_name, "w", encoding=encoding) as file:
+            file.write(contents)
+
     def exists(self, file_name: str) -> bool:
         return os.path.isfile(file_name)
 
     def getcwd(self) -> str:
         return os.getcwd()
+
+
+def write_atomically(file_name: str, contents: bytes) -> None:
+    """
+    Write the contents to the file, so that readers see either the old or the new contents,
+    never a partly written file.
+
+    The contents are written to a temporary file in the same directory, which is then renamed
+    over the original.
+    """
+    directory = os.path.dirname(file_name) or "."
+    os.makedirs(directory, exist_ok=True)
+    file_descriptor, temporary_file_name = tempfile.mkstemp(
+        dir=directory, prefix=".", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(file_descriptor, "wb") as file:
+            file.write(contents)
+        # mkstemp creates files that only the owner can read, but caches may be shared.
+        os.chmod(temporary_file_name, 0o644)
+        os.replace(temporary_file_name, file_name)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(temporary_file_name)
+        raise
+
+
+@contextlib.contextmanager
+def locked(lock_file_name: str, exclusive: bool) -> Iterator[None]:
+    """
+    Hold an advisory lock on the file for the duration of the block.
+
+    Any number of processes may hold a shared lock at once, but an exclusive lock is only
+    granted when no other lock is held.
+
+    Locking is best effort: on platforms without fcntl, or if the lock file can't be opened,
+    the block runs without a lock.
+    """
+    if fcntl is None:
+        yield
+        return
+    try:
+        os.makedirs(os.path.dirname(lock_file_name) or ".", exist_ok=True)
+        lock_file = open(lock_file_name, "a")
+    except OSError:
+        yield
+        return
+    with lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
@@ -0,0 +1,40 @@
+import cProfile
+import os
+import tracemalloc
+from typing import Callable, Tuple, TypeVar
+
+from importlinter.application.ports import profiling as ports
+
+T = TypeVar("T")
+
+
+class CProfileProfiler(ports.Profiler):
+    """
+    Profiler that uses cProfile to profile time, and tracemalloc to measure memory.
+
+    The profile is saved in the format read by the pstats module (and tools such as snakeviz).
+    Both profilers slow the function down, so the time it takes while profiled will be longer
+    than usual.
+    """
+
+    def profile(self, function: Callable[[], T], stats_filename: str) -> Tuple[T, int]:
+        directory = os.path.dirname(stats_filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        was_tracing_memory = tracemalloc.is_tracing()
+        if was_tracing_memory:
+            tracemalloc.reset_peak()
+        else:
+            tracemalloc.start()
+        memory_at_start, _ = tracemalloc.get_traced_memory()
+        profile = cProfile.Profile()
+        try:
+            result = profile.runcall(function)
+            _, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            if not was_tracing_memory:
+                tracemalloc.stop()
+
+        profile.dump_stats(stats_filename)
+        return result, peak_memory - memory_at_start
@@ -0,0 +1,138 @@
+import json
+import logging
+import os
+import socket
+from typing import Any, Callable, Dict
+
+from importlinter.application.ports import serving as ports
+
+logger = logging.getLogger(__name__)
+
+
+class UnixSocketDaemonTransport(ports.DaemonTransport):
+    """
+    Daemon transport that exchanges newline-delimited JSON messages over a Unix domain socket.
+
+    The address is the filename of the socket.
+    """
+
+    # How often, in seconds, to call handle_idle when there are no requests.
+    IDLE_INTERVAL = 0.5
+
+    def serve(
+        self,
+        address: str,
+        handle_request: Callable[[ports.CheckRequest], ports.CheckResponse],
+        handle_idle: Callable[[], None],
+    ) -> None:
+        self._check_platform_is_supported()
+        directory = os.path.dirname(address)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._remove_stale_socket(address)
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+            server.bind(address)
+            try:
+                server.listen()
+                server.settimeout(self.IDLE_INTERVAL)
+                while True:
+                    try:
+                        connection, _ = server.accept()
+                    except socket.timeout:
+                        handle_idle()
+                        continue
+                    with connection:
+                        self._handle_connection(connection, handle_request)
+            finally:
+                os.remove(address)
+
+    def send_request(self, address: str, request: ports.CheckRequest) -> ports.CheckResponse:
+        self._check_platform_is_supported()
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            try:
+                client.connect(address)
+            except (FileNotFoundError, ConnectionRefusedError) as e:
+                raise ports.DaemonNotRunning(f"No daemon is listening at {address}.") from e
+            self._send_message(
+                client,
+                {
+                    "limit_to_contracts": list(request.limit_to_contracts),
+                    "show_timings": request.show_timings,
+                    "verbose": request.verbose,
+                    "fail_fast": request.fail_fast,
+                    "summary_only": request.summary_only,
+                    "workers": request.workers,
+                    "config_fingerprint": request.config_fingerprint,
+                },
+            )
+            message = self._receive_message(client)
+        if message is None:
+            raise ports.DaemonNotRunning(f"The daemon at {address} closed the connection.")
+        return ports.CheckResponse(
+            passed=message["passed"],
+            output=tuple(
+                (text, bold, color, newline) for text, bold, color, newline in message["output"]
+            ),
+            rejection_reason=message.get("rejection_reason"),
+        )
+
+    def _handle_connection(
+        self,
+        connection: socket.socket,
+        handle_request: Callable[[ports.CheckRequest], ports.CheckResponse],
+    ) -> None:
+        connection.settimeout(None)
+        try:
+            message = self._receive_message(connection)
+            if message is None:
+                return
+            if not isinstance(message, dict):
+                raise ValueError(f"Expected a JSON object, got {message!r}.")
+            request = ports.CheckRequest(
+                limit_to_contracts=tuple(message.get("limit_to_contracts", ())),
+                show_timings=bool(message.get("show_timings", False)),
+                verbose=bool(message.get("verbose", False)),
+                fail_fast=bool(message.get("fail_fast", False)),
+                summary_only=bool(message.get("summary_only", False)),
+                workers=None if message.get("workers") is None else int(message["workers"]),
+                config_fingerprint=message.get("config_fingerprint"),
+            )
+            response = handle_request(request)
+            self._send_message(
+                connection,
+                {
+                    "passed": response.passed,
+                    "output": [list(line) for line in response.output],
+                    "rejection_reason": response.rejection_reason,
+                },
+            )
+        except (OSError, ValueError) as e:
+            # A misbehaving client shouldn't bring the daemon down.
+            logger.warning(f"Could not handle request: {e}")
+
+    def _send_message(self, connection: socket.socket, message: Dict[str, Any]) -> None:
+        connection.sendall(json.dumps(message).encode() + b"\n")
+
+    def _receive_message(self, connection: socket.socket) -> Any:
+        with connection.makefile("rb") as file:
+            line = file.readline()
+        if not line:
+            return None
+        return json.loads(line)
+
+    def _remove_stale_socket(self, address: str) -> None:
+        if not os.path.exists(address):
+            return
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            try:
+                client.connect(address)
+            except ConnectionRefusedError:
+                # Left behind by a daemon that didn't shut down cleanly.
+                os.remove(address)
+                return
+        raise RuntimeError(f"A daemon is already listening at {address}.")
+
+    def _check_platform_is_supported(self) -> None:
+        if not hasattr(socket, "AF_UNIX"):
+            raise RuntimeError("The daemon requires Unix domain sockets, which are unavailable.")
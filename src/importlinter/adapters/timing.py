@@ -5,4 +5,7 @@ from importlinter.application.ports.timing import Timer
 
 class SystemClockTimer(Timer):
     def get_current_time(self) -> float:
-        return time.time()
+        return time.perf_counter()
+
+    def get_current_time_ns(self) -> int:
+        return time.perf_counter_ns()
@@ -0,0 +1,201 @@
+import ctypes
+import ctypes.util
+import os
+import struct
+import sys
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from importlinter.application.ports import watching as ports
+
+
+class PollingFileWatcher(ports.FileWatcher):
+    """
+    File watcher that detects changes by comparing the modification times and sizes of the files,
+    each time it is asked for them.
+
+    This works on any platform, but the cost of each call grows with the number of files.
+    """
+
+    def __init__(self) -> None:
+        self._directories: List[str] = []
+        self._file_states: Dict[str, Tuple[int, int]] = {}
+
+    def watch(self, directories: Iterable[str]) -> None:
+        self._directories = list(directories)
+        self._file_states = self._get_file_states()
+
+    def get_changed_files(self) -> Set[str]:
+        file_states = self._get_file_states()
+        changed_files = {
+            filename
+            for filename in file_states.keys() | self._file_states.keys()
+            if file_states.get(filename) != self._file_states.get(filename)
+        }
+        self._file_states = file_states
+        return changed_files
+
+    def _get_file_states(self) -> Dict[str, Tuple[int, int]]:
+        file_states = {}
+        for filename in _find_python_files(self._directories):
+            try:
+                stat = os.stat(filename)
+            except OSError:
+                # The file was removed while we were looking.
+                continue
+            file_states[filename] = (stat.st_mtime_ns, stat.st_size)
+        return file_states
+
+
+class InotifyFileWatcher(ports.FileWatcher):
+    """
+    File watcher that uses the Linux inotify API, so the operating system tells us what changed.
+
+    Only available on Linux (see is_available).
+    """
+
+    # Flags from <sys/inotify.h>.
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ISDIR = 0x40000000
+    IN_NONBLOCK = os.O_NONBLOCK
+    IN_CLOEXEC = 0o2000000
+
+    WATCH_MASK = (
+        IN_MODIFY
+        | IN_ATTRIB
+        | IN_CLOSE_WRITE
+        | IN_MOVED_FROM
+        | IN_MOVED_TO
+        | IN_CREATE
+        | IN_DELETE
+        | IN_DELETE_SELF
+    )
+    # The fixed size part of struct inotify_event: wd, mask, cookie, len.
+    EVENT_HEADER = struct.Struct("iIII")
+    READ_SIZE = 64 * 1024
+
+    def __init__(self) -> None:
+        self._libc = _load_libc()
+        self._file_descriptor: Optional[int] = None
+        self._directories: List[str] = []
+        self._directories_by_watch_descriptor: Dict[int, str] = {}
+
+    @classmethod
+    def is_available(cls) -> bool:
+        if not sys.platform.startswith("linux"):
+            return False
+        libc = _load_libc()
+        return libc is not None and hasattr(libc, "inotify_init1")
+
+    def watch(self, directories: Iterable[str]) -> None:
+        if self._libc is None:
+            raise RuntimeError("inotify is not available on this platform.")
+        self.close()
+        file_descriptor = self._libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if file_descriptor < 0:
+            error_number = ctypes.get_errno()
+            raise OSError(error_number, os.strerror(error_number))
+        self._file_descriptor = file_descriptor
+        self._directories = list(directories)
+        for directory in self._directories:
+            self._add_watches(directory)
+
+    def get_changed_files(self) -> Set[str]:
+        changed_files: Set[str] = set()
+        if self._file_descriptor is None:
+            return changed_files
+        while True:
+            try:
+                data = os.read(self._file_descriptor, self.READ_SIZE)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+            changed_files |= self._handle_events(data)
+        return changed_files
+
+    def close(self) -> None:
+        """
+        Stop watching, releasing the inotify instance.
+        """
+        if self._file_descriptor is not None:
+            os.close(self._file_descriptor)
+        self._file_descriptor = None
+        self._directories_by_watch_descriptor = {}
+
+    def _handle_events(self, data: bytes) -> Set[str]:
+        changed_files: Set[str] = set()
+        offset = 0
+        while offset < len(data):
+            watch_descriptor, mask, _, name_length = self.EVENT_HEADER.unpack_from(data, offset)
+            offset += self.EVENT_HEADER.size
+            name = os.fsdecode(data[offset : offset + name_length].rstrip(b"\0"))
+            offset += name_length
+
+            if mask & self.IN_Q_OVERFLOW:
+                # Some events were lost, so we can't tell what changed.
+                changed_files.update(self._directories)
+                continue
+            directory = self._directories_by_watch_descriptor.get(watch_descriptor)
+            if directory is None:
+                continue
+            if mask & self.IN_IGNORED:
+                # The watched directory has gone.
+                del self._directories_by_watch_descriptor[watch_descriptor]
+                continue
+
+            path = os.path.join(directory, name) if name else directory
+            if mask & self.IN_ISDIR or not name:
+                if mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                    self._add_watches(path)
+                changed_files.add(path)
+            elif name.endswith(".py"):
+                changed_files.add(path)
+        return changed_files
+
+    def _add_watches(self, directory: str) -> None:
+        assert self._libc is not None  # For type checker.
+        for dirpath in _find_directories(directory):
+            watch_descriptor = self._libc.inotify_add_watch(
+                self._file_descriptor, os.fsencode(dirpath), self.WATCH_MASK
+            )
+            if watch_descriptor >= 0:
+                self._directories_by_watch_descriptor[watch_descriptor] = dirpath
+
+
+# Private functions
+# -----------------
+
+
+def _load_libc() -> Optional[ctypes.CDLL]:
+    library_name = ctypes.util.find_library("c")
+    if library_name is None:
+        return None
+    try:
+        return ctypes.CDLL(library_name, use_errno=True)
+    except OSError:
+        return None
+
+
+def _find_directories(directory: str) -> Iterator[str]:
+    for dirpath, dirnames, _ in os.walk(directory):
+        # Don't descend into hidden directories, in the same way Grimp doesn't.
+        dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+        yield dirpath
+
+
+def _find_python_files(directories: Iterable[str]) -> Iterator[str]:
+    for directory in directories:
+        for dirpath, dirnames, filenames in os.walk(directory):
+            dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+            for filename in filenames:
+                if filename.endswith(".py"):
+                    yield os.path.join(dirpath, filename)
@@ -4,7 +4,10 @@ Module for public-facing Python functions.
 
 from __future__ import annotations
 
+from grimp import ImportGraph
+
 from importlinter.application import use_cases
+from importlinter.application.app_config import settings
 
 from . import configuration
 
@@ -37,3 +40,17 @@ def read_configuration(config_filename: str | None = None) -> dict:
         "session_options": user_options.session_options,
         "contracts_options": user_options.contracts_options,
     }
+
+
+def load_graph(filename: str) -> ImportGraph:
+    """
+    Return the import graph saved to the supplied file by ``lint-imports --dump-graph``.
+
+    This allows other tools to analyse the same graph that was linted, without building
+    it again.
+
+    Raises:
+        FileNotFoundError if the file does not exist.
+        InvalidGraphSnapshot if the file is not a graph snapshot that can be read.
+    """
+    return settings.GRAPH_BUILDER.load(filename)
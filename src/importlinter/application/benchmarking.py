@@ -0,0 +1,306 @@
+"""
+Benchmarking of contract checks, to catch performance regressions between versions of
+Import Linter.
+
+Each contract is a scenario. Its check is timed over several rounds in a fresh worker process,
+so that the peak resident set size (RSS) of the process reflects that contract alone.
+Results can be saved as JSON, and compared with results saved earlier (the baseline).
+"""
+
+from __future__ import annotations
+
+import json
+import platform
+import statistics
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+
+from grimp import ImportGraph
+
+import importlinter
+
+from ..domain.contract import Contract
+from .app_config import settings
+from .graph_overlay import GraphOverlay
+from .graph_snapshots import GraphSnapshot, restore_graph, snapshot_graph
+from .parallel import ContractTask, get_multiprocessing_context
+from .ports.timing import Timer
+
+# Bump this if the format of serialized results changes.
+RESULTS_FORMAT_VERSION = 1
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    # Not available on Windows.
+    resource = None  # type: ignore[assignment]
+
+
+class InvalidBenchmarkResults(Exception):
+    """
+    Raised when benchmark results can't be read.
+    """
+
+
+@dataclass(frozen=True)
+class ScenarioResult:
+    """
+    The result of benchmarking a single scenario.
+
+    Attributes:
+        name:      the name of the contract checked in the scenario.
+        durations: the number of seconds each round took.
+        peak_rss:  the peak resident set size of the process that ran the scenario, in bytes,
+                   or None if it couldn't be measured.
+    """
+
+    name: str
+    durations: Tuple[float, ...]
+    peak_rss: Optional[int]
+
+    @property
+    def median_duration(self) -> float:
+        return statistics.median(self.durations)
+
+
+@dataclass(frozen=True)
+class BenchmarkResults:
+    """
+    The results of a benchmarking run, keyed by scenario id (the contract's id or, if it has
+    none, its name).
+    """
+
+    importlinter_version: str
+    python_version: str
+    scenarios: Dict[str, ScenarioResult]
+
+
+@dataclass(frozen=True)
+class ScenarioComparison:
+    """
+    A comparison of a scenario's results with its baseline.
+
+    Either result will be None if the scenario was only run on one side of the comparison.
+    """
+
+    scenario_id: str
+    baseline: Optional[ScenarioResult]
+    current: Optional[ScenarioResult]
+    is_regression: bool
+
+    @property
+    def name(self) -> str:
+        result = self.current or self.baseline
+        assert result is not None  # For type checker.
+        return result.name
+
+    @property
+    def change(self) -> Optional[float]:
+        """
+        The change in median duration, as a proportion of the baseline's, e.g. 0.1 for a 10%
+        slowdown. None if the scenario wasn't run on both sides.
+        """
+        if self.baseline is None or self.current is None or not self.baseline.median_duration:
+            return None
+        return self.current.median_duration / self.baseline.median_duration - 1
+
+
+def benchmark_contracts(
+    graph: ImportGraph,
+    tasks: Sequence[ContractTask],
+    session_options: Dict[str, Any],
+    rounds: int,
+) -> BenchmarkResults:
+    """
+    Time how long each contract takes to check, over the supplied number of rounds.
+
+    Each contract is checked in a fresh worker process, one after another, so the contracts
+    don't compete for the CPU, and the peak RSS of each process is down to one contract.
+    """
+    snapshot = snapshot_graph(graph)
+    scenarios: Dict[str, ScenarioResult] = {}
+    for contract_class, contract_options in tasks:
+        with ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=get_multiprocessing_context(),
+            initializer=_initialize_worker,
+            initargs=(snapshot, settings.TIMER),
+        ) as executor:
+            durations, peak_rss = executor.submit(
+                _benchmark_contract_in_worker,
+                contract_class,
+                contract_options,
+                session_options,
+                rounds,
+            ).result()
+        scenarios[get_scenario_id(contract_options)] = ScenarioResult(
+            name=contract_options["name"], durations=tuple(durations), peak_rss=peak_rss
+        )
+    return BenchmarkResults(
+        importlinter_version=importlinter.__version__,
+        python_version=platform.python_version(),
+        scenarios=scenarios,
+    )
+
+
+def get_scenario_id(contract_options: Dict[str, Any]) -> str:
+    """
+    Return the id of the scenario for checking the contract with the supplied options.
+    """
+    return contract_options.get("id") or contract_options["name"]
+
+
+def compare_results(
+    baseline: BenchmarkResults,
+    current: BenchmarkResults,
+    threshold: float,
+    min_difference: float = 0.0,
+) -> List[ScenarioComparison]:
+    """
+    Compare the current results with the baseline, scenario by scenario.
+
+    Args:
+        baseline:       the results to compare against.
+        current:        the results to compare.
+        threshold:      the proportion by which a scenario's median duration may exceed the
+                        baseline's before it counts as a regression, e.g. 0.1 for 10%.
+        min_difference: the number of seconds by which a scenario's median duration must
+                        exceed the baseline's to count as a regression. This stops noise in
+                        very quick scenarios being reported as a regression.
+
+    Returns:
+        A comparison for each scenario in either set of results, in the order of the current
+        results, followed by any scenarios only in the baseline.
+    """
+    comparisons = []
+    for scenario_id, current_result in current.scenarios.items():
+        baseline_result = baseline.scenarios.get(scenario_id)
+        is_regression = False
+        if baseline_result is not None:
+            baseline_duration = baseline_result.median_duration
+            current_duration = current_result.median_duration
+            is_regression = (
+                current_duration > baseline_duration * (1 + threshold)
+                and current_duration - baseline_duration > min_difference
+            )
+        comparisons.append(
+            ScenarioComparison(
+                scenario_id=scenario_id,
+                baseline=baseline_result,
+                current=current_result,
+                is_regression=is_regression,
+            )
+        )
+    for scenario_id, baseline_result in baseline.scenarios.items():
+        if scenario_id not in current.scenarios:
+            comparisons.append(
+                ScenarioComparison(
+                    scenario_id=scenario_id,
+                    baseline=baseline_result,
+                    current=None,
+                    is_regression=False,
+                )
+            )
+    return comparisons
+
+
+def serialize_results(results: BenchmarkResults) -> str:
+    """
+    Return the results as a JSON string.
+    """
+    return json.dumps(
+        {
+            "format_version": RESULTS_FORMAT_VERSION,
+            "importlinter_version": results.importlinter_version,
+            "python_version": results.python_version,
+            "scenarios": {
+                scenario_id: {
+                    "name": result.name,
+                    "median_duration": result.median_duration,
+                    "durations": list(result.durations),
+                    "peak_rss": result.peak_rss,
+                }
+                for scenario_id, result in results.scenarios.items()
+            },
+        },
+        indent=2,
+    )
+
+
+def deserialize_results(serialized: str) -> BenchmarkResults:
+    """
+    Return the results from a JSON string, as returned by serialize_results.
+
+    Raises:
+        InvalidBenchmarkResults: if the string isn't serialized results in the current format.
+    """
+    try:
+        data = json.loads(serialized)
+        if data["format_version"] != RESULTS_FORMAT_VERSION:
+            raise InvalidBenchmarkResults(
+                f"Unsupported format version {data['format_version']} "
+                f"(expected {RESULTS_FORMAT_VERSION})."
+            )
+        return BenchmarkResults(
+            importlinter_version=data["importlinter_version"],
+            python_version=data["python_version"],
+            scenarios={
+                scenario_id: ScenarioResult(
+                    name=scenario["name"],
+                    durations=tuple(float(duration) for duration in scenario["durations"]),
+                    peak_rss=scenario["peak_rss"],
+                )
+                for scenario_id, scenario in data["scenarios"].items()
+            },
+        )
+    except (ValueError, KeyError, TypeError, AttributeError) as e:
+        raise InvalidBenchmarkResults(f"Could not read benchmark results: {e!r}.") from e
+
+
+# Private functions
+# -----------------
+
+# The graph, restored once in each worker process by _initialize_worker.
+_worker_graph: Optional[ImportGraph] = None
+
+
+def _initialize_worker(snapshot: GraphSnapshot, timer: Timer) -> None:
+    global _worker_graph
+    settings.configure(TIMER=timer)
+    _worker_graph = restore_graph(snapshot)
+
+
+def _benchmark_contract_in_worker(
+    contract_class: Type[Contract],
+    contract_options: Dict[str, Any],
+    session_options: Dict[str, Any],
+    rounds: int,
+) -> Tuple[List[float], Optional[int]]:
+    assert _worker_graph is not None  # For type checker.
+    durations = []
+    for _ in range(rounds):
+        # A new contract each round, in case the contract caches anything.
+        contract = contract_class(
+            name=contract_options["name"],
+            session_options=session_options,
+            contract_options=contract_options,
+        )
+        with settings.TIMER as timer:
+            with GraphOverlay(_worker_graph) as overlay:
+                check = contract.check(overlay, verbose=False)
+                # Contracts may only build their metadata (e.g. the chains that broke them)
+                # when it is first needed. Time building it too, as it would be when running
+                # lint-imports.
+                check.metadata
+        durations.append(timer.duration_in_s)
+    return durations, _get_peak_rss()
+
+
+def _get_peak_rss() -> Optional[int]:
+    if resource is None:  # pragma: no cover
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS, but kilobytes elsewhere.
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
@@ -0,0 +1,163 @@
+"""
+Fingerprinting of graphs and contracts, for caching the results of contract checks.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import inspect
+import json
+import sys
+from typing import Callable, Dict, Iterable, Set
+
+from grimp import ImportGraph
+
+import importlinter
+from importlinter.domain.contract import Contract
+
+from . import contract_utils
+from .ports.caching import GraphFingerprint
+
+
+def fingerprint_graph(graph: ImportGraph) -> GraphFingerprint:
+    """
+    Return a GraphFingerprint of the graph's modules and the imports between them.
+
+    Only which modules import which are fingerprinted, not the details of each import (such as
+    line numbers), as fetching those for every import would make even a run where nothing has
+    changed cost as much as snapshotting the whole graph. Results that depend on the details
+    (i.e. those of broken contracts) therefore mustn't be reused on the strength of the
+    fingerprint alone.
+    """
+    hasher = hashlib.blake2b(digest_size=20)
+    module_fingerprints: Dict[str, str] = {}
+    for module in sorted(graph.modules):
+        module_fingerprint = _hash(
+            repr(
+                (
+                    graph.is_module_squashed(module),
+                    sorted(graph.find_modules_directly_imported_by(module)),
+                )
+            ),
+            digest_size=8,
+        )
+        module_fingerprints[module] = module_fingerprint
+        hasher.update(f"{module}:{module_fingerprint}\n".encode())
+    return GraphFingerprint(value=hasher.hexdigest(), module_fingerprints=module_fingerprints)
+
+
+def build_contract_key(contract: Contract) -> str:
+    """
+    Return a hash identifying the contract, for use as a cache key.
+
+    The hash covers everything (other than the graph) that might change the outcome of the
+    check: the contract and session options, the version of Import Linter, and the source
+    code of the module defining the contract class.
+    """
+    contract_class = contract.__class__
+    return _hash(
+        json.dumps(
+            {
+                "version": importlinter.__version__,
+                "contract_class": f"{contract_class.__module__}.{contract_class.__qualname__}",
+                "contract_class_source": _hash(_get_module_source(contract_class.__module__)),
+                "contract_options": contract.contract_options,
+                "session_options": contract.session_options,
+            },
+            sort_keys=True,
+            default=str,
+        )
+    )
+
+
+def find_changed_modules(previous: GraphFingerprint, current: GraphFingerprint) -> Set[str]:
+    """
+    Return the modules that were added, removed, or whose imports changed between two graphs.
+    """
+    previous_fingerprints = previous.module_fingerprints
+    current_fingerprints = current.module_fingerprints
+    return {
+        module
+        for module in previous_fingerprints.keys() | current_fingerprints.keys()
+        if previous_fingerprints.get(module) != current_fingerprints.get(module)
+    }
+
+
+def find_packages_affected_by_changes(graph: ImportGraph, changed_modules: Set[str]) -> Set[str]:
+    """
+    Return the names of all the packages that might be affected by the changed modules.
+
+    That is, every changed module, every module that imports or is imported by a changed module
+    (directly or indirectly), and all the ancestor packages of those modules.
+
+    Any import chain that was added or removed between two graphs must pass through a
+    changed module, and any contract that could see such a chain must be concerned with a
+    module upstream or downstream of it.
+    """
+    # Removed modules aren't in the graph, so can't be searched from.
+    present_changed_modules = changed_modules & graph.modules
+    # Search from all the changed modules at once, so that each module is visited at most once
+    # in each direction, however many modules changed.
+    affected_modules = set(changed_modules)
+    affected_modules |= _find_reachable_modules(
+        present_changed_modules, graph.find_modules_directly_imported_by
+    )
+    affected_modules |= _find_reachable_modules(
+        present_changed_modules, graph.find_modules_that_directly_import
+    )
+    return _with_ancestors(affected_modules)
+
+
+def contract_is_affected_by_changes(contract: Contract, affected_packages: Set[str]) -> bool:
+    """
+    Return whether checking the contract might give a different result, given the packages
+    affected by changes to the graph (see find_packages_affected_by_changes).
+    """
+    expressions = contract.get_referenced_module_expressions()
+    if expressions is None:
+        # We don't know which modules the contract is concerned with.
+        return True
+    for expression in expressions:
+        package_name = contract_utils.get_package_name(expression)
+        if package_name is None or package_name in affected_packages:
+            return True
+    return False
+
+
+# Private functions
+# -----------------
+
+
+def _hash(string: str, digest_size: int = 20) -> str:
+    return hashlib.blake2b(string.encode(), digest_size=digest_size).hexdigest()
+
+
+def _get_module_source(module_name: str) -> str:
+    try:
+        return inspect.getsource(sys.modules[module_name])
+    except (KeyError, OSError, TypeError):
+        return ""
+
+
+def _find_reachable_modules(
+    modules: Set[str], find_neighbours: Callable[[str], Set[str]]
+) -> Set[str]:
+    # The supplied modules, and those that can be reached from any of them by following
+    # find_neighbours.
+    reached = set(modules)
+    frontier = list(modules)
+    while frontier:
+        module = frontier.pop()
+        for neighbour in find_neighbours(module):
+            if neighbour not in reached:
+                reached.add(neighbour)
+                frontier.append(neighbour)
+    return reached
+
+
+def _with_ancestors(module_names: Iterable[str]) -> Set[str]:
+    names: Set[str] = set()
+    for module_name in module_names:
+        components = module_name.split(".")
+        names.update(".".join(components[:i]) for i in range(1, len(components) + 1))
+    return names
@@ -1,9 +1,15 @@
 import enum
-from typing import List, Optional, Sequence, Set
+import itertools
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
 
 
+from importlinter.application import tracing
+from importlinter.application.graph_overlay import GraphOverlay
+from importlinter.application.hierarchy_index import HierarchyIndex
+from importlinter.application.reachability import ReachabilityIndex
+from importlinter.domain.contract import Contract
 from importlinter.domain.helpers import MissingImport
-from importlinter.domain.imports import ImportExpression, DirectImport, Module
+from importlinter.domain.imports import ImportExpression, DirectImport, Module, ModuleExpression
 from grimp import ImportGraph
 
 
@@ -32,43 +38,128 @@ def remove_ignored_imports(
     Returns:
         A list of any warnings to be surfaced to the user.
     """
-    imports_to_remove = set()
-    unresolved_expressions = set()
-    for import_expression in ignore_imports or []:
-        matched_imports = graph.find_matching_direct_imports(
-            import_expression=str(import_expression)
+    with tracing.span("Remove ignored imports"):
+        imports_to_remove = set()
+        unresolved_expressions = set()
+        for import_expression in ignore_imports or []:
+            matched_imports = graph.find_matching_direct_imports(
+                import_expression=str(import_expression)
+            )
+            if matched_imports:
+                imports_to_remove.update(
+                    {
+                        DirectImport(
+                            importer=Module(matched_import["importer"]),
+                            imported=Module(matched_import["imported"]),
+                        )
+                        for matched_import in matched_imports
+                    }
+                )
+            else:
+                unresolved_expressions.add(import_expression)
+
+        warnings = _handle_unresolved_import_expressions(
+            unresolved_expressions,
+            unmatched_alerting,
         )
-        if matched_imports:
-            imports_to_remove.update(
-                {
-                    DirectImport(
-                        importer=Module(matched_import["importer"]),
-                        imported=Module(matched_import["imported"]),
-                    )
-                    for matched_import in matched_imports
-                }
+
+        for import_to_remove in imports_to_remove:
+            graph.remove_import(
+                importer=import_to_remove.importer.name,
+                imported=import_to_remove.imported.name,
             )
-        else:
-            unresolved_expressions.add(import_expression)
 
-    warnings = _handle_unresolved_import_expressions(
-        unresolved_expressions,
-        unmatched_alerting,
+        return warnings
+
+
+def get_package_name(expression: ModuleExpression) -> Optional[str]:
+    """
+    Return the name of the narrowest package containing every module the expression matches,
+    or None if there isn't one.
+    """
+    components = list(
+        itertools.takewhile(lambda c: "*" not in c, expression.expression.split("."))
     )
+    return ".".join(components) if components else None
+
 
-    for import_to_remove in imports_to_remove:
-        graph.remove_import(
-            importer=import_to_remove.importer.name,
-            imported=import_to_remove.imported.name,
+def find_referenced_root_packages(
+    contract: Contract, root_package_names: Iterable[str]
+) -> Optional[Set[str]]:
+    """
+    Return the root packages containing modules that the contract refers to
+    (see Contract.get_referenced_module_expressions).
+
+    Return None if this cannot be determined.
+    """
+    expressions = contract.get_referenced_module_expressions()
+    if expressions is None:
+        return None
+    root_package_names = set(root_package_names)
+    referenced_root_packages: Set[str] = set()
+    for expression in expressions:
+        package_name = get_package_name(expression)
+        if package_name is None:
+            # The expression could match modules in any root package.
+            return root_package_names
+        referenced_root_packages.update(
+            root_package_name
+            for root_package_name in root_package_names
+            # Either package may be inside the other (root packages can be portions of
+            # namespace packages).
+            if _is_same_or_descendant(package_name, root_package_name)
+            or _is_same_or_descendant(root_package_name, package_name)
         )
+    return referenced_root_packages
 
-    return warnings
+
+def get_reachability_index(graph: ImportGraph) -> Optional[ReachabilityIndex]:
+    """
+    Return an index of which modules in the graph import which, if one is available.
+
+    Contracts can use the index to rule out chains between modules without searching the
+    graph, but should still search for any chains the index doesn't rule out.
+
+    An index is only available if the reachability_index session option is set, and the
+    graph hasn't had any imports added to it (see GraphOverlay).
+    """
+    if isinstance(graph, GraphOverlay):
+        return graph.reachability_index
+    return None
+
+
+def get_hierarchy_index(graph: ImportGraph) -> Optional[HierarchyIndex]:
+    """
+    Return an index of where each module in the graph sits in the package hierarchy, if one is
+    available.
+
+    Contracts can use the index to check whether modules are in packages, or to find the
+    modules in a package, many times over. An index is only available while the modules in the
+    graph haven't changed (see GraphOverlay).
+    """
+    if isinstance(graph, GraphOverlay):
+        return graph.hierarchy_index
+    return None
+
+
+def is_summary_only(session_options: Dict[str, Any]) -> bool:
+    """
+    Return whether only a summary of each contract check has been requested.
+
+    In summary only mode, contracts should still work out whether they are kept, but may skip
+    building the details of what broke them (such as line numbers), returning counts instead.
+    """
+    return str(session_options.get("summary_only")).lower() == "true"
 
 
 # Private functions
 # -----------------
 
 
+def _is_same_or_descendant(module_name: str, package_name: str) -> bool:
+    return module_name == package_name or module_name.startswith(f"{package_name}.")
+
+
 def _handle_unresolved_import_expressions(
     expressions: Set[ImportExpression], alert_level: AlertLevel
 ) -> List[str]:
@@ -0,0 +1,282 @@
+"""
+Read-only snapshots of import graphs as NumPy arrays, for analyses that cover the whole graph.
+
+Working through a large graph one module at a time means many calls to the graph, each of which
+goes through Python. These snapshots hold the imports in compressed sparse row (CSR) form, so
+whole-graph analyses such as reachability can work on many modules at once.
+
+NumPy is an optional dependency: it is only needed to build a snapshot.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, Iterable, List, Set, Tuple
+
+from grimp import ImportGraph
+from grimp.exceptions import ModuleNotPresent
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    _is_numpy_installed = False
+else:
+    _is_numpy_installed = True
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+
+def is_available() -> bool:
+    """
+    Return whether graph arrays can be built (i.e. whether NumPy is installed).
+    """
+    return _is_numpy_installed
+
+
+class GraphArrays:
+    """
+    A read-only snapshot of the modules and imports in a graph, as NumPy arrays.
+
+    Each module is given an id from 0 to the number of modules, in the order of a preorder walk
+    of the package hierarchy. So the descendants of a package have the ids directly after it.
+
+    The modules each module imports are stored in CSR form: the ids of the modules imported by
+    module i are imported_ids[imported_pointers[i]:imported_pointers[i + 1]], in order. The
+    modules that import each module are stored in the same way, in importer_pointers and
+    importer_ids. Ids are int32 and pointers int64.
+
+    The snapshot describes the graph as it was when built; later changes to the graph aren't
+    reflected in it.
+    """
+
+    def __init__(
+        self,
+        modules: Tuple[str, ...],
+        imported_pointers: NDArray[np.int64],
+        imported_ids: NDArray[np.int32],
+    ) -> None:
+        """
+        Args:
+            modules:           the names of the modules, in preorder (each module's id is its
+                               position).
+            imported_pointers: where the ids of the modules imported by each module start and
+                               end in imported_ids.
+            imported_ids:      the ids of the modules imported by each module, in order.
+        """
+        module_count = len(modules)
+        self._modules = modules
+        self._module_ids = {module: module_id for module_id, module in enumerate(modules)}
+
+        self.imported_pointers = _make_read_only(imported_pointers)
+        self.imported_ids = _make_read_only(imported_ids)
+
+        # The same imports, keyed by the imported module.
+        importer_counts = np.bincount(imported_ids, minlength=module_count)
+        self.importer_pointers = _make_read_only(
+            np.concatenate(([0], np.cumsum(importer_counts))).astype(np.int64)
+        )
+        importers = np.repeat(np.arange(module_count, dtype=np.int32), np.diff(imported_pointers))
+        self.importer_ids = _make_read_only(
+            importers[np.argsort(imported_ids, kind="stable")].astype(np.int32)
+        )
+
+        # For each module, one more than the id of its last descendant.
+        self._descendant_ends = _find_descendant_ends(modules)
+
+    @property
+    def modules(self) -> Tuple[str, ...]:
+        """
+        The names of the modules, indexed by id.
+        """
+        return self._modules
+
+    @property
+    def module_count(self) -> int:
+        return len(self._modules)
+
+    @property
+    def import_count(self) -> int:
+        return len(self.imported_ids)
+
+    def get_module_id(self, module: str) -> int:
+        """
+        Return the id of the module.
+
+        Raises ModuleNotPresent if the module isn't in the snapshot.
+        """
+        try:
+            return self._module_ids[module]
+        except KeyError:
+            raise ModuleNotPresent(f'"{module}" not present in the graph.')
+
+    def get_package_ids(self, module: str) -> NDArray[np.int32]:
+        """
+        Return the ids of the module and its descendants.
+        """
+        module_id = self.get_module_id(module)
+        return np.arange(module_id, self._descendant_ends[module_id], dtype=np.int32)
+
+    def count_imported_modules(self) -> NDArray[np.int64]:
+        """
+        Return how many modules each module directly imports (its fan-out), indexed by id.
+        """
+        return np.diff(self.imported_pointers)
+
+    def count_importing_modules(self) -> NDArray[np.int64]:
+        """
+        Return how many modules directly import each module (its fan-in), indexed by id.
+        """
+        return np.diff(self.importer_pointers)
+
+    def find_reachable_ids(
+        self, module_ids: Iterable[int], *, follow_importers: bool = False
+    ) -> NDArray[np.bool_]:
+        """
+        Return which modules can be reached from the supplied ones by following one or more
+        imports, as a boolean array indexed by id.
+
+        Imports are followed from importer to imported, unless follow_importers is set. The
+        supplied modules are only included if they can be reached from one of them (e.g. via
+        a cycle).
+
+        Each step of the search follows the imports of every module reached in the previous
+        step at once, so the number of steps is the length of the longest chain, rather than
+        the number of modules.
+        """
+        if follow_importers:
+            pointers, ids = self.importer_pointers, self.importer_ids
+        else:
+            pointers, ids = self.imported_pointers, self.imported_ids
+        reached = np.zeros(self.module_count, dtype=np.bool_)
+        frontier = np.unique(np.fromiter(module_ids, dtype=np.int32))
+        while frontier.size:
+            neighbours = np.unique(_gather_rows(pointers, ids, frontier))
+            frontier = neighbours[~reached[neighbours]]
+            reached[frontier] = True
+        return reached
+
+    def find_upstream_modules(self, module: str, as_package: bool = False) -> Set[str]:
+        """
+        Return the modules that the module imports, directly or indirectly.
+
+        This gives the same results as ImportGraph.find_upstream_modules.
+        """
+        return self._find_reachable_modules(module, as_package, follow_importers=False)
+
+    def find_downstream_modules(self, module: str, as_package: bool = False) -> Set[str]:
+        """
+        Return the modules that import the module, directly or indirectly.
+
+        This gives the same results as ImportGraph.find_downstream_modules.
+        """
+        return self._find_reachable_modules(module, as_package, follow_importers=True)
+
+    def count_imports_between_packages(self, depth: int) -> Dict[Tuple[str, str], int]:
+        """
+        Return how many imports there are between each pair of packages at the supplied depth,
+        keyed with (importing package, imported package).
+
+        Each module is counted as part of the package made of its first `depth` segments (or
+        itself, if it has fewer). For example, at depth 2, an import from mypackage.blue.models
+        to mypackage.green counts towards ("mypackage.blue", "mypackage.green"). Imports within
+        a package aren't included.
+        """
+        if depth < 1:
+            raise ValueError("Depth must be at least 1.")
+        package_names: List[str] = []
+        package_ids_by_name: Dict[str, int] = {}
+        package_ids = np.empty(self.module_count, dtype=np.int64)
+        for module_id, module in enumerate(self._modules):
+            package_name = ".".join(module.split(".")[:depth])
+            package_id = package_ids_by_name.setdefault(package_name, len(package_names))
+            if package_id == len(package_names):
+                package_names.append(package_name)
+            package_ids[module_id] = package_id
+
+        importers = np.repeat(
+            np.arange(self.module_count, dtype=np.int32), self.count_imported_modules()
+        )
+        importer_packages = package_ids[importers]
+        imported_packages = package_ids[self.imported_ids]
+        is_between_packages = importer_packages != imported_packages
+        # Combine each pair of packages into a single number, so they can be counted at once.
+        pairs = (
+            importer_packages[is_between_packages] * len(package_names)
+            + imported_packages[is_between_packages]
+        )
+        unique_pairs, counts = np.unique(pairs, return_counts=True)
+        return {
+            (
+                package_names[pair // len(package_names)],
+                package_names[pair % len(package_names)],
+            ): count
+            for pair, count in zip(unique_pairs.tolist(), counts.tolist())
+        }
+
+    def _find_reachable_modules(
+        self, module: str, as_package: bool, follow_importers: bool
+    ) -> Set[str]:
+        if as_package:
+            source_ids = self.get_package_ids(module)
+        else:
+            source_ids = np.array([self.get_module_id(module)], dtype=np.int32)
+        reached = self.find_reachable_ids(source_ids.tolist(), follow_importers=follow_importers)
+        reached[source_ids] = False
+        return {self._modules[module_id] for module_id in np.flatnonzero(reached).tolist()}
+
+
+def build_graph_arrays(graph: ImportGraph) -> GraphArrays:
+    """
+    Build a GraphArrays snapshot of the supplied graph.
+
+    Raises ImportError if NumPy isn't installed.
+    """
+    if not _is_numpy_installed:
+        raise ImportError("NumPy must be installed to build graph arrays.")
+
+    # Sorting by segments puts each package directly before its descendants.
+    modules = tuple(sorted(graph.modules, key=lambda module: module.split(".")))
+    module_ids = {module: module_id for module_id, module in enumerate(modules)}
+    imported_counts = np.zeros(len(modules) + 1, dtype=np.int64)
+    imported_ids: List[int] = []
+    for module_id, module in enumerate(modules):
+        ids = sorted(
+            module_ids[imported] for imported in graph.find_modules_directly_imported_by(module)
+        )
+        imported_counts[module_id + 1] = len(ids)
+        imported_ids.extend(ids)
+    return GraphArrays(
+        modules,
+        imported_pointers=np.cumsum(imported_counts),
+        imported_ids=np.array(imported_ids, dtype=np.int32),
+    )
+
+
+def _gather_rows(
+    pointers: NDArray[np.int64], ids: NDArray[np.int32], rows: NDArray[np.int32]
+) -> NDArray[np.int32]:
+    # Concatenate ids[pointers[row]:pointers[row + 1]] for every row, without a Python loop.
+    starts = pointers[rows]
+    lengths = pointers[rows + 1] - starts
+    # The position in the output at which each row starts.
+    output_starts = np.cumsum(lengths) - lengths
+    positions = np.repeat(starts - output_starts, lengths) + np.arange(lengths.sum())
+    return ids[positions]
+
+
+def _find_descendant_ends(modules: Tuple[str, ...]) -> NDArray[np.int64]:
+    descendant_ends = np.empty(len(modules), dtype=np.int64)
+    # The ids of the modules containing the current module, outermost first. Each one is
+    # finished when a module is reached that it doesn't contain.
+    open_ids: List[int] = []
+    for module_id, module in enumerate(modules):
+        while open_ids and not module.startswith(f"{modules[open_ids[-1]]}."):
+            descendant_ends[open_ids.pop()] = module_id
+        open_ids.append(module_id)
+    descendant_ends[open_ids] = len(modules)
+    return descendant_ends
+
+
+def _make_read_only(array: NDArray) -> NDArray:
+    array.flags.writeable = False
+    return array
@@ -0,0 +1,348 @@
+"""
+A mutable view onto a shared import graph.
+"""
+
+from __future__ import annotations
+
+from copy import deepcopy
+from types import TracebackType
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+import grimp
+from grimp import DetailedImport, Import, ImportGraph, Layer, PackageDependency
+from grimp.exceptions import ModuleNotPresent
+
+from . import tracing
+from .hierarchy_index import HierarchyIndex
+from .module_name_index import ModuleNameIndex, parse_import_expression, parse_module_expression
+from .reachability import ReachabilityIndex
+
+
+class GraphOverlay(grimp.ImportGraph):
+    """
+    An ImportGraph that lets a contract mutate a shared graph, without a full copy of it.
+
+    Mutations are applied to the shared graph, but the state of each import and module they
+    touch is recorded first. Calling revert puts the shared graph back how it was, so the cost
+    of a check is proportional to the number of mutations, rather than the size of the graph.
+
+    Mutations that can't be undone cheaply (removing or squashing modules, or making visible a
+    module that was previously only implied by its descendants) cause the overlay to fall back
+    to a private copy of the graph, which is discarded on revert.
+
+    Because the shared graph is mutated in place, only one overlay may be in use on a given
+    graph at a time, and it must be reverted before the graph is used for anything else.
+
+    A ReachabilityIndex of the shared graph may be supplied, for contracts to rule out chains
+    with. It is only made available while the mutations can't have made any more modules
+    reachable (i.e. until an import is added or a module squashed).
+
+    A dictionary may also be supplied for caching the imports that match each import
+    expression. Overlays of the same shared graph can share the dictionary, so that an
+    expression used by many contracts is only matched once. It is only used until the overlay
+    is first mutated, so the same dictionary must not be shared between overlays of graphs
+    that differ.
+
+    A ModuleNameIndex of the shared graph may be supplied, for resolving wildcard expressions
+    without scanning the whole graph. It is used until a module is added.
+
+    Finally, a HierarchyIndex of the shared graph may be supplied, for finding descendants
+    without asking the graph. Like the ReachabilityIndex, it is also made available for
+    contracts to use, but only until a module is added.
+
+    Usage:
+
+        with GraphOverlay(graph) as overlay:
+            contract.check(overlay, verbose=False)
+    """
+
+    def __init__(
+        self,
+        graph: ImportGraph,
+        reachability_index: Optional[ReachabilityIndex] = None,
+        matching_imports_cache: Optional[Dict[str, List[Import]]] = None,
+        module_name_index: Optional[ModuleNameIndex] = None,
+        hierarchy_index: Optional[HierarchyIndex] = None,
+    ) -> None:
+        self._base = graph
+        self._reachability_index = reachability_index
+        self._matching_imports_cache = matching_imports_cache
+        self._module_name_index = module_name_index
+        self._hierarchy_index = hierarchy_index
+        # The graph that queries and mutations are delegated to. This will be the shared graph,
+        # unless the overlay has fallen back to a private copy.
+        self._graph = graph
+        self._is_private_copy = False
+        # The import details of each import before it was first mutated, keyed with
+        # (importer, imported). None indicates that the import did not exist.
+        self._original_imports: Dict[Tuple[str, str], Optional[List[DetailedImport]]] = {}
+        self._added_modules: List[str] = []
+
+    @property
+    def reachability_index(self) -> Optional[ReachabilityIndex]:
+        """
+        The ReachabilityIndex supplied for the shared graph, or None if there isn't one or it
+        is no longer safe to use.
+        """
+        return self._reachability_index
+
+    @property
+    def hierarchy_index(self) -> Optional[HierarchyIndex]:
+        """
+        The HierarchyIndex supplied for the shared graph, or None if there isn't one or the
+        modules have changed.
+        """
+        if self._are_modules_changed():
+            return None
+        return self._hierarchy_index
+
+    def revert(self) -> None:
+        """
+        Undo any mutations made via the overlay, restoring the shared graph.
+        """
+        if self._is_private_copy:
+            self._graph = self._base
+            self._is_private_copy = False
+        else:
+            self._undo_mutations()
+
+    def __enter__(self) -> GraphOverlay:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.revert()
+
+    # Mutations
+    # ---------
+
+    def add_module(self, module: str, is_squashed: bool = False) -> None:
+        if not self._is_private_copy:
+            if self._contains_module(module):
+                if self._graph.is_module_squashed(module) != is_squashed:
+                    self._switch_to_private_copy()
+            else:
+                self._record_added_module(module)
+        self._graph.add_module(module, is_squashed)
+
+    def remove_module(self, module: str) -> None:
+        self._switch_to_private_copy()
+        self._graph.remove_module(module)
+
+    def squash_module(self, module: str) -> None:
+        self._reachability_index = None
+        self._switch_to_private_copy()
+        self._graph.squash_module(module)
+
+    def add_import(
+        self,
+        *,
+        importer: str,
+        imported: str,
+        line_number: Optional[int] = None,
+        line_contents: Optional[str] = None,
+    ) -> None:
+        self._reachability_index = None
+        if not self._is_private_copy:
+            self._record_import(importer, imported)
+            for module in (importer, imported):
+                if not (self._is_private_copy or self._contains_module(module)):
+                    self._record_added_module(module)
+        self._graph.add_import(
+            importer=importer,
+            imported=imported,
+            line_number=line_number,
+            line_contents=line_contents,
+        )
+
+    def remove_import(self, *, importer: str, imported: str) -> None:
+        if not self._is_private_copy:
+            self._record_import(importer, imported)
+        self._graph.remove_import(importer=importer, imported=imported)
+
+    # Queries
+    # -------
+
+    @property
+    def modules(self) -> Set[str]:
+        return self._graph.modules
+
+    def find_matching_modules(self, expression: str) -> Set[str]:
+        module_name_index = self._get_module_name_index()
+        if module_name_index is not None:
+            module_expression = parse_module_expression(expression)
+            if module_expression is not None:
+                return module_name_index.find_matching_modules(module_expression)
+        # Leave the graph to match (or reject) any expressions the index can't.
+        return self._graph.find_matching_modules(expression)
+
+    def is_module_squashed(self, module: str) -> bool:
+        return self._graph.is_module_squashed(module)
+
+    def count_imports(self) -> int:
+        return self._graph.count_imports()
+
+    def find_children(self, module: str) -> Set[str]:
+        return self._graph.find_children(module)
+
+    def find_descendants(self, module: str) -> Set[str]:
+        hierarchy_index = self.hierarchy_index
+        # Leave the graph to reject squashed modules.
+        if hierarchy_index is not None and not self._graph.is_module_squashed(module):
+            return hierarchy_index.find_descendants(module)
+        return self._graph.find_descendants(module)
+
+    def direct_import_exists(
+        self, *, importer: str, imported: str, as_packages: bool = False
+    ) -> bool:
+        return self._graph.direct_import_exists(
+            importer=importer, imported=imported, as_packages=as_packages
+        )
+
+    def find_modules_directly_imported_by(self, module: str) -> Set[str]:
+        return self._graph.find_modules_directly_imported_by(module)
+
+    def find_modules_that_directly_import(self, module: str) -> Set[str]:
+        return self._graph.find_modules_that_directly_import(module)
+
+    def get_import_details(self, *, importer: str, imported: str) -> List[DetailedImport]:
+        return self._graph.get_import_details(importer=importer, imported=imported)
+
+    def find_matching_direct_imports(self, *, import_expression: str) -> List[Import]:
+        if self._matching_imports_cache is None or self._is_mutated():
+            return self._find_matching_direct_imports(import_expression)
+        try:
+            matching_imports = self._matching_imports_cache[import_expression]
+        except KeyError:
+            matching_imports = self._find_matching_direct_imports(import_expression)
+            self._matching_imports_cache[import_expression] = matching_imports
+        # A copy, so the caller can't change what's cached.
+        return list(matching_imports)
+
+    def find_downstream_modules(self, module: str, as_package: bool = False) -> Set[str]:
+        return self._graph.find_downstream_modules(module, as_package=as_package)
+
+    def find_upstream_modules(self, module: str, as_package: bool = False) -> Set[str]:
+        return self._graph.find_upstream_modules(module, as_package=as_package)
+
+    def find_shortest_chain(
+        self, importer: str, imported: str, as_packages: bool = False
+    ) -> Optional[Tuple[str, ...]]:
+        return self._graph.find_shortest_chain(importer, imported, as_packages=as_packages)
+
+    def find_shortest_chains(
+        self, importer: str, imported: str, as_packages: bool = True
+    ) -> Set[Tuple[str, ...]]:
+        return self._graph.find_shortest_chains(importer, imported, as_packages=as_packages)
+
+    def find_all_simple_chains(self, importer: str, imported: str) -> Iterator[Tuple[str, ...]]:
+        return self._graph.find_all_simple_chains(importer, imported)
+
+    def chain_exists(self, importer: str, imported: str, as_packages: bool = False) -> bool:
+        return self._graph.chain_exists(importer, imported, as_packages=as_packages)
+
+    def find_illegal_dependencies_for_layers(
+        self,
+        layers: Sequence[Layer | str | Set[str]],
+        containers: Optional[Set[str]] = None,
+    ) -> Set[PackageDependency]:
+        return self._graph.find_illegal_dependencies_for_layers(
+            layers=layers, containers=containers
+        )
+
+    def __deepcopy__(self, memodict: dict) -> ImportGraph:
+        return deepcopy(self._graph, memodict)
+
+    # Private methods
+    # ---------------
+
+    def _find_matching_direct_imports(self, import_expression: str) -> List[Import]:
+        module_name_index = self._get_module_name_index()
+        if module_name_index is not None:
+            parsed_expression = parse_import_expression(import_expression)
+            if parsed_expression is not None:
+                return module_name_index.find_matching_direct_imports(
+                    self._graph, parsed_expression
+                )
+        return self._graph.find_matching_direct_imports(import_expression=import_expression)
+
+    def _get_module_name_index(self) -> Optional[ModuleNameIndex]:
+        if self._are_modules_changed():
+            return None
+        return self._module_name_index
+
+    def _are_modules_changed(self) -> bool:
+        # Removing or squashing a module switches to a private copy, so this covers any change
+        # to the modules.
+        return bool(self._is_private_copy or self._added_modules)
+
+    def _is_mutated(self) -> bool:
+        return bool(self._is_private_copy or self._original_imports or self._added_modules)
+
+    def _contains_module(self, module: str) -> bool:
+        try:
+            self._graph.is_module_squashed(module)
+        except ModuleNotPresent:
+            return False
+        return True
+
+    def _record_import(self, importer: str, imported: str) -> None:
+        key = (importer, imported)
+        if key in self._original_imports:
+            return
+        if not (self._contains_module(importer) and self._contains_module(imported)):
+            self._original_imports[key] = None
+        elif self._graph.direct_import_exists(importer=importer, imported=imported):
+            self._original_imports[key] = self._graph.get_import_details(
+                importer=importer, imported=imported
+            )
+        else:
+            self._original_imports[key] = None
+
+    def _record_added_module(self, module: str) -> None:
+        # A module may be absent from the graph but implied by its descendants. Removing it
+        # again would remove the descendants too, so we can't undo adding it.
+        prefix = f"{module}."
+        if any(m.startswith(prefix) for m in self._graph.modules):
+            self._switch_to_private_copy()
+        else:
+            self._added_modules.append(module)
+
+    def _switch_to_private_copy(self) -> None:
+        if self._is_private_copy:
+            return
+        with tracing.span("Copy graph"):
+            private_copy = deepcopy(self._base)
+        self._undo_mutations()
+        self._graph = private_copy
+        self._is_private_copy = True
+
+    def _undo_mutations(self) -> None:
+        for (importer, imported), original_details in self._original_imports.items():
+            if (
+                self._contains_module(importer)
+                and self._contains_module(imported)
+                and self._base.direct_import_exists(importer=importer, imported=imported)
+            ):
+                self._base.remove_import(importer=importer, imported=imported)
+            if original_details is None:
+                continue
+            if not original_details:
+                # The import was present, but without any details.
+                self._base.add_import(importer=importer, imported=imported)
+            for details in original_details:
+                self._base.add_import(
+                    importer=importer,
+                    imported=imported,
+                    line_number=details["line_number"],
+                    line_contents=details["line_contents"],
+                )
+        for module in reversed(self._added_modules):
+            if self._contains_module(module):
+                self._base.remove_module(module)
+        self._original_imports = {}
+        self._added_modules = []
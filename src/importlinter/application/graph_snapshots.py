@@ -0,0 +1,235 @@
+"""
+Plain-data snapshots of import graphs.
+
+Grimp's ImportGraph is backed by a Rust data structure which cannot be pickled, so to send a
+graph to another process we first reduce it to plain Python values, then rebuild it on the
+other side.
+
+Snapshots can also be serialized to a compact binary format (see serialize_snapshot), so that
+a graph built once can be reused by later processes without scanning the code again.
+"""
+
+from __future__ import annotations
+
+import struct
+import sys
+import zlib
+from array import array
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from grimp import ImportGraph
+from grimp.adaptors.graph import ImportGraph as GrimpImportGraph
+
+# An import, in the form (importer, imported, line_number, line_contents).
+# The line number and contents will be None for imports added without any details.
+SnapshotImport = Tuple[str, str, Optional[int], Optional[str]]
+
+
+@dataclass(frozen=True)
+class GraphSnapshot:
+    """
+    Everything needed to rebuild an ImportGraph, as plain Python values.
+    """
+
+    modules: Tuple[str, ...]
+    squashed_modules: Tuple[str, ...]
+    imports: Tuple[SnapshotImport, ...]
+
+
+def snapshot_graph(graph: ImportGraph) -> GraphSnapshot:
+    """
+    Return a GraphSnapshot of the supplied graph.
+    """
+    modules = tuple(sorted(graph.modules))
+    squashed_modules = tuple(m for m in modules if graph.is_module_squashed(m))
+    imports: list[SnapshotImport] = []
+    for importer in modules:
+        for imported in sorted(graph.find_modules_directly_imported_by(importer)):
+            import_details = graph.get_import_details(importer=importer, imported=imported)
+            if import_details:
+                imports.extend(
+                    (importer, imported, details["line_number"], details["line_contents"])
+                    for details in import_details
+                )
+            else:
+                imports.append((importer, imported, None, None))
+    return GraphSnapshot(
+        modules=modules, squashed_modules=squashed_modules, imports=tuple(imports)
+    )
+
+
+def restore_graph(snapshot: GraphSnapshot) -> ImportGraph:
+    """
+    Build a new ImportGraph from the supplied GraphSnapshot.
+    """
+    graph = GrimpImportGraph()
+    squashed_modules = set(snapshot.squashed_modules)
+    for module in snapshot.modules:
+        graph.add_module(module, is_squashed=module in squashed_modules)
+    for importer, imported, line_number, line_contents in snapshot.imports:
+        graph.add_import(
+            importer=importer,
+            imported=imported,
+            line_number=line_number,
+            line_contents=line_contents,
+        )
+    return graph
+
+
+class InvalidGraphSnapshot(Exception):
+    """
+    Raised when serialized data is not a graph snapshot that can be read.
+    """
+
+
+# The serialized format
+# ---------------------
+#
+# A header, followed by a zlib-compressed body. The header is the magic bytes, a format version
+# and the number of modules, squashed modules, distinct line contents and imports. The body is:
+#
+# - The module names, in UTF-8 and separated by null bytes (which can't appear in Python source),
+#   preceded by their total length in bytes.
+# - The distinct line contents, in the same form.
+# - The indexes of the squashed modules, as unsigned 32-bit integers.
+# - Four arrays of 32-bit integers, with an item per import: the indexes of the importers, the
+#   indexes of the imported modules, the line numbers and the indexes of the line contents.
+#   Missing line numbers and line contents are stored as -1.
+#
+# All integers are little-endian.
+
+_MAGIC = b"ILGRAPH"
+_FORMAT_VERSION = 1
+_HEADER = struct.Struct("<7sBIIII")
+_MISSING = -1
+
+
+def serialize_snapshot(snapshot: GraphSnapshot) -> bytes:
+    """
+    Return the supplied GraphSnapshot in a compact binary form.
+
+    Each module name and line of code is stored once, however many imports refer to it.
+    """
+    module_indexes = {module: index for index, module in enumerate(snapshot.modules)}
+    line_contents_indexes: Dict[str, int] = {}
+    importers, importeds = array("I"), array("I")
+    line_numbers, line_contents_refs = array("i"), array("i")
+    for importer, imported, line_number, line_contents in snapshot.imports:
+        importers.append(module_indexes[importer])
+        importeds.append(module_indexes[imported])
+        line_numbers.append(_MISSING if line_number is None else line_number)
+        if line_contents is None:
+            line_contents_refs.append(_MISSING)
+        else:
+            line_contents_refs.append(
+                line_contents_indexes.setdefault(line_contents, len(line_contents_indexes))
+            )
+    squashed = array("I", (module_indexes[module] for module in snapshot.squashed_modules))
+
+    header = _HEADER.pack(
+        _MAGIC,
+        _FORMAT_VERSION,
+        len(snapshot.modules),
+        len(squashed),
+        len(line_contents_indexes),
+        len(snapshot.imports),
+    )
+    body = b"".join(
+        [
+            _encode_strings(snapshot.modules),
+            _encode_strings(list(line_contents_indexes)),
+            *(
+                _to_little_endian(integers)
+                for integers in (squashed, importers, importeds, line_numbers, line_contents_refs)
+            ),
+        ]
+    )
+    return header + zlib.compress(body)
+
+
+def deserialize_snapshot(data: bytes) -> GraphSnapshot:
+    """
+    Return the GraphSnapshot serialized by serialize_snapshot.
+
+    Raises:
+        InvalidGraphSnapshot: if the data isn't a serialized snapshot in a supported format.
+    """
+    try:
+        magic, version, *counts = _HEADER.unpack_from(data)
+    except struct.error as e:
+        raise InvalidGraphSnapshot("The data is too short to be a graph snapshot.") from e
+    if magic != _MAGIC:
+        raise InvalidGraphSnapshot("The data is not a graph snapshot.")
+    if version != _FORMAT_VERSION:
+        raise InvalidGraphSnapshot(f"Unsupported graph snapshot format version {version}.")
+    module_count, squashed_count, line_contents_count, import_count = counts
+
+    try:
+        body = memoryview(zlib.decompress(data[_HEADER.size :]))
+        modules, offset = _decode_strings(body, 0, module_count)
+        line_contents, offset = _decode_strings(body, offset, line_contents_count)
+        squashed, offset = _read_integers(body, offset, "I", squashed_count)
+        importers, offset = _read_integers(body, offset, "I", import_count)
+        importeds, offset = _read_integers(body, offset, "I", import_count)
+        line_numbers, offset = _read_integers(body, offset, "i", import_count)
+        line_contents_refs, offset = _read_integers(body, offset, "i", import_count)
+        imports = tuple(
+            (
+                modules[importer],
+                modules[imported],
+                None if line_number == _MISSING else line_number,
+                None if line_contents_ref == _MISSING else line_contents[line_contents_ref],
+            )
+            for importer, imported, line_number, line_contents_ref in zip(
+                importers, importeds, line_numbers, line_contents_refs
+            )
+        )
+        squashed_modules = tuple(modules[index] for index in squashed)
+    except (zlib.error, ValueError, IndexError) as e:
+        raise InvalidGraphSnapshot(f"The graph snapshot is corrupt: {e}") from e
+    if offset != len(body):
+        raise InvalidGraphSnapshot("The graph snapshot is corrupt: unexpected trailing data.")
+
+    return GraphSnapshot(
+        modules=tuple(modules), squashed_modules=squashed_modules, imports=imports
+    )
+
+
+# Private functions
+# -----------------
+
+
+def _encode_strings(strings: Sequence[str]) -> bytes:
+    encoded = b"\0".join(string.encode() for string in strings)
+    return struct.pack("<I", len(encoded)) + encoded
+
+
+def _decode_strings(body: memoryview, offset: int, count: int) -> Tuple[List[str], int]:
+    (length,) = struct.unpack_from("<I", body, offset)
+    offset += 4
+    encoded = bytes(body[offset : offset + length])
+    if len(encoded) != length:
+        raise ValueError("strings are truncated.")
+    strings = encoded.decode().split("\0") if count else []
+    if len(strings) != count:
+        raise ValueError(f"expected {count} strings, found {len(strings)}.")
+    return strings, offset + length
+
+
+def _to_little_endian(integers: array) -> bytes:
+    if sys.byteorder == "big":
+        integers = array(integers.typecode, integers)
+        integers.byteswap()
+    return integers.tobytes()
+
+
+def _read_integers(body: memoryview, offset: int, typecode: str, count: int) -> Tuple[array, int]:
+    integers = array(typecode)
+    end = offset + integers.itemsize * count
+    if end > len(body):
+        raise ValueError("integers are truncated.")
+    integers.frombytes(body[offset:end])
+    if sys.byteorder == "big":
+        integers.byteswap()
+    return integers, end
@@ -0,0 +1,111 @@
+"""
+An index of where each module in a graph sits in the package hierarchy, built once per run so
+that contracts can tell whether one module is inside another without comparing their names.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Set
+
+from grimp import ImportGraph
+from grimp.exceptions import ModuleNotPresent
+
+
+class HierarchyIndex:
+    """
+    The modules in a graph, numbered in the order of a preorder walk of the package hierarchy.
+
+    A package is numbered before its descendants, which are numbered consecutively after it.
+    So the descendants of each package are those numbered in an interval, stored for each
+    package as the number of its last descendant, and checking whether one module is a
+    descendant of another takes two integer comparisons. Finding all the descendants of a
+    package is a slice of the modules in order.
+
+    Packages that are only implied by their descendants are numbered too, so they can be
+    queried in the same way, but are never returned as modules.
+
+    Names that aren't in the index are compared by name instead, so they give the same answers
+    as the equivalent methods on Module.
+
+    The numbers are only worked out when first needed. The index describes the modules in the
+    graph it was built from, so it can't be used once any modules have been added or removed.
+    """
+
+    def __init__(self, modules: Iterable[str]) -> None:
+        self._modules = frozenset(modules)
+        self._is_built = False
+        # The names of the modules and implied packages, in preorder.
+        self._names: List[str] = []
+        self._numbers: Dict[str, int] = {}
+        # For each name, the number of its last descendant (or its own number, if it has none).
+        self._last_descendant_numbers: List[int] = []
+
+    @property
+    def module_count(self) -> int:
+        return len(self._modules)
+
+    def is_descendant_of(self, module: str, package: str) -> bool:
+        """
+        Return whether the module is a descendant (at any depth) of the package.
+        """
+        if not self._is_built:
+            self._build()
+        try:
+            number = self._numbers[module]
+            package_number = self._numbers[package]
+        except KeyError:
+            return module.startswith(f"{package}.")
+        return package_number < number <= self._last_descendant_numbers[package_number]
+
+    def is_in_package(self, module: str, package: str) -> bool:
+        """
+        Return whether the module is the package, or one of its descendants.
+        """
+        return module == package or self.is_descendant_of(module, package)
+
+    def find_descendants(self, package: str) -> Set[str]:
+        """
+        Return the names of the modules that are descendants of the package.
+
+        Raises ModuleNotPresent if the package isn't a module in the index.
+        """
+        if package not in self._modules:
+            raise ModuleNotPresent(f'"{package}" not present in the graph.')
+        if not self._is_built:
+            self._build()
+        number = self._numbers[package]
+        return {
+            name
+            for name in self._names[number + 1 : self._last_descendant_numbers[number] + 1]
+            if name in self._modules
+        }
+
+    def _build(self) -> None:
+        names = set(self._modules)
+        for module in self._modules:
+            parent, _, _ = module.rpartition(".")
+            while parent and parent not in names:
+                names.add(parent)
+                parent, _, _ = parent.rpartition(".")
+        # Sorting by segments puts each package directly before its descendants.
+        self._names = sorted(names, key=lambda name: name.split("."))
+        self._numbers = {name: number for number, name in enumerate(self._names)}
+
+        self._last_descendant_numbers = [0] * len(self._names)
+        # The numbers of the packages containing the current name, outermost first. Each one
+        # is finished when a name is reached that it doesn't contain.
+        open_numbers: List[int] = []
+        for number, name in enumerate(self._names):
+            while open_numbers and not name.startswith(f"{self._names[open_numbers[-1]]}."):
+                self._last_descendant_numbers[open_numbers.pop()] = number - 1
+            open_numbers.append(number)
+        for open_number in open_numbers:
+            self._last_descendant_numbers[open_number] = len(self._names) - 1
+        self._is_built = True
+
+
+def build_hierarchy_index(graph: ImportGraph) -> HierarchyIndex:
+    """
+    Build a HierarchyIndex of the modules in the supplied graph.
+    """
+    return HierarchyIndex(graph.modules)
@@ -0,0 +1,183 @@
+"""
+An index of the names of the modules in a graph, built once per run so that wildcard
+expressions can be resolved without scanning every module in the graph.
+"""
+
+from __future__ import annotations
+
+import functools
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Set
+
+from grimp import Import, ImportGraph
+
+from importlinter.domain.fields import ModuleExpressionField, ValidationError
+from importlinter.domain.imports import ImportExpression, ModuleExpression
+
+
+class _Node:
+    __slots__ = ("name", "children", "descendant_modules")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.children: Dict[str, _Node] = {}
+        # The names of the modules below the node, worked out when first needed.
+        self.descendant_modules: Optional[FrozenSet[str]] = None
+
+
+class ModuleNameIndex:
+    """
+    The names of the modules in a graph, arranged as a tree with a node for each segment.
+
+    Module expressions are resolved by walking the tree: a literal segment follows a single
+    branch, * follows every branch, and ** follows every branch at every depth. So the cost of
+    resolving an expression depends on the part of the tree it covers, rather than the size of
+    the graph. Expressions with a ** followed by a literal last segment (e.g. mypackage.**.models)
+    would cover most of the tree, so the modules are also indexed by their last segment, and
+    those with the right one are matched against the expression instead.
+
+    The tree also has nodes for packages that are only implied by their descendants, but these
+    are never matched, in line with ImportGraph.find_matching_modules.
+
+    The tree is only built when it is first needed, as runs with no wildcard expressions don't
+    need it.
+
+    The index describes the modules in the graph it was built from, so it can't be used once
+    any modules have been added or removed.
+    """
+
+    def __init__(self, modules: Iterable[str]) -> None:
+        self._modules = set(modules)
+        self._root: Optional[_Node] = None
+        self._modules_by_last_segment: Dict[str, List[str]] = {}
+
+    @property
+    def module_count(self) -> int:
+        return len(self._modules)
+
+    def find_matching_modules(self, expression: ModuleExpression) -> Set[str]:
+        """
+        Return the names of the modules that match the expression.
+        """
+        if not expression.has_wildcard_expression():
+            return {expression.expression} & self._modules
+
+        if self._root is None:
+            self._build_tree()
+        assert self._root is not None  # For type checker.
+
+        parts = expression.parts
+        if "**" in parts and "*" not in parts[-1]:
+            return {
+                module
+                for module in self._modules_by_last_segment.get(parts[-1], [])
+                if expression.matches(module)
+            }
+
+        nodes: List[_Node] = [self._root]
+        for index, part in enumerate(parts):
+            if part == "*":
+                nodes = [child for node in nodes for child in node.children.values()]
+            elif part == "**":
+                if index == len(parts) - 1:
+                    return set().union(*(self._get_descendant_modules(node) for node in nodes))
+                nodes = [descendant for node in nodes for descendant in _iter_descendants(node)]
+            else:
+                nodes = [node.children[part] for node in nodes if part in node.children]
+            if not nodes:
+                return set()
+        return {node.name for node in nodes if node.name in self._modules}
+
+    def find_matching_direct_imports(
+        self, graph: ImportGraph, expression: ImportExpression
+    ) -> List[Import]:
+        """
+        Return the direct imports in the graph that match the expression, in the same form
+        (and order) as ImportGraph.find_matching_direct_imports.
+
+        The graph must have the modules the index was built from, but may have different
+        imports between them.
+        """
+        if not expression.imported.has_wildcard_expression():
+            # Quicker to work back from the single imported module.
+            imported = expression.imported.expression
+            if imported not in self._modules:
+                return []
+            return [
+                {"importer": importer, "imported": imported}
+                for importer in sorted(graph.find_modules_that_directly_import(imported))
+                if expression.importer.matches(importer)
+            ]
+        return [
+            {"importer": importer, "imported": imported}
+            for importer in sorted(self.find_matching_modules(expression.importer))
+            for imported in sorted(graph.find_modules_directly_imported_by(importer))
+            if expression.imported.matches(imported)
+        ]
+
+    def _build_tree(self) -> None:
+        self._root = _Node("")
+        for module in self._modules:
+            self._modules_by_last_segment.setdefault(module.rpartition(".")[2], []).append(module)
+            node = self._root
+            for segment in module.split("."):
+                try:
+                    node = node.children[segment]
+                except KeyError:
+                    child_name = f"{node.name}.{segment}" if node.name else segment
+                    node.children[segment] = node = _Node(child_name)
+
+    def _get_descendant_modules(self, node: _Node) -> FrozenSet[str]:
+        if node.descendant_modules is None:
+            node.descendant_modules = frozenset(
+                descendant.name
+                for descendant in _iter_descendants(node)
+                if descendant.name in self._modules
+            )
+        return node.descendant_modules
+
+
+def build_module_name_index(graph: ImportGraph) -> ModuleNameIndex:
+    """
+    Build a ModuleNameIndex of the modules in the supplied graph.
+    """
+    return ModuleNameIndex(graph.modules)
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_module_expression(expression: str) -> Optional[ModuleExpression]:
+    """
+    Return the ModuleExpression for the supplied string, or None if it isn't valid.
+
+    Expressions are usually parsed (and so compiled) by contract fields. This is for ones that
+    are only supplied as strings, as with the ImportGraph methods; the same strings tend to be
+    supplied again and again, so the results are cached.
+    """
+    if not all(expression.split(".")):
+        return None
+    try:
+        return ModuleExpressionField().parse(expression)
+    except ValidationError:
+        return None
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_import_expression(expression: str) -> Optional[ImportExpression]:
+    """
+    Return the ImportExpression for the supplied string, or None if it isn't valid.
+    """
+    importer, separator, imported = expression.partition(" -> ")
+    if not separator:
+        return None
+    importer_expression = parse_module_expression(importer)
+    imported_expression = parse_module_expression(imported)
+    if importer_expression is None or imported_expression is None:
+        return None
+    return ImportExpression(importer=importer_expression, imported=imported_expression)
+
+
+def _iter_descendants(node: _Node) -> Iterator[_Node]:
+    stack = list(node.children.values())
+    while stack:
+        descendant = stack.pop()
+        yield descendant
+        stack.extend(descendant.children.values())
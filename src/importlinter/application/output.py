@@ -1,7 +1,8 @@
-from typing import Optional
+import contextlib
+from typing import Iterable, Iterator, List, Optional
 
 from .app_config import settings
-from .ports.printing import Printer
+from .ports.printing import PrintedLine, Printer
 
 ERROR = "error"
 SUCCESS = "success"
@@ -132,3 +133,59 @@ def verbose_print(
     if verbose:
         printer: Printer = settings.PRINTER
         printer.print(text, bold, color, newline)
+
+
+def format_duration(duration_in_s: float) -> str:
+    """
+    Return the duration, given in seconds, as a number of milliseconds, e.g. '1,234ms'.
+    """
+    return f"{round(duration_in_s * 1000):,}ms"
+
+
+def format_memory(size_in_bytes: int) -> str:
+    """
+    Return the size, given in bytes, as a number of kilobytes or megabytes, e.g. '123kB' or
+    '1,234.5MB'.
+    """
+    if size_in_bytes < 1_000_000:
+        return f"{round(size_in_bytes / 1_000)}kB"
+    return f"{size_in_bytes / 1_000_000:,.1f}MB"
+
+
+@contextlib.contextmanager
+def capture() -> Iterator[List[PrintedLine]]:
+    """
+    Record anything printed within the block, rather than printing it.
+
+    Usage:
+
+        with output.capture() as printed_lines:
+            output.print("Hello.")
+        output.replay(printed_lines)
+    """
+    previous_printer = settings.PRINTER
+    recording_printer = _RecordingPrinter()
+    settings.configure(PRINTER=recording_printer)
+    try:
+        yield recording_printer.lines
+    finally:
+        settings.configure(PRINTER=previous_printer)
+
+
+def replay(lines: Iterable[PrintedLine]) -> None:
+    """
+    Print lines that were recorded using capture.
+    """
+    printer: Printer = settings.PRINTER
+    for text, bold, color, newline in lines:
+        printer.print(text, bold, color, newline)
+
+
+class _RecordingPrinter(Printer):
+    def __init__(self) -> None:
+        self.lines: List[PrintedLine] = []
+
+    def print(
+        self, text: str = "", bold: bool = False, color: Optional[str] = None, newline: bool = True
+    ) -> None:
+        self.lines.append((text, bold, color, newline))
@@ -0,0 +1,197 @@
+"""
+Checking of contracts across a pool of worker processes.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from multiprocessing.context import BaseContext
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+
+from grimp import Import, ImportGraph
+
+from ..domain.contract import Contract, ContractCheck
+from . import profiling, tracing
+from .app_config import settings
+from .graph_overlay import GraphOverlay
+from .graph_snapshots import GraphSnapshot, restore_graph, snapshot_graph
+from .hierarchy_index import HierarchyIndex, build_hierarchy_index
+from .module_name_index import ModuleNameIndex, build_module_name_index
+from .ports.printing import Printer
+from .ports.profiling import Profiler
+from .ports.timing import Timer
+from .reachability import ReachabilityIndex
+
+# A contract to check, in the form (contract class, contract options).
+ContractTask = Tuple[Type[Contract], Dict[str, Any]]
+# The result of checking a contract, in the form (check, duration in seconds, peak memory in
+# bytes if profiled, otherwise None).
+ContractResult = Tuple[ContractCheck, float, Optional[int]]
+# The result of checking a contract in a worker, along with any spans recorded by the worker
+# since its previous result.
+WorkerResult = Tuple[ContractResult, List[tracing.Span]]
+
+# State set up once in each worker process, by _initialize_worker.
+_worker_graph: Optional[ImportGraph] = None
+_worker_session_options: Dict[str, Any] = {}
+_worker_profile_directory: Optional[str] = None
+_worker_reachability_index: Optional[ReachabilityIndex] = None
+# The imports matching each import expression in the worker's graph, shared by the contracts
+# the worker checks (see GraphOverlay).
+_worker_matching_imports_cache: Dict[str, List[Import]] = {}
+_worker_module_name_index: Optional[ModuleNameIndex] = None
+_worker_hierarchy_index: Optional[HierarchyIndex] = None
+
+
+def check_contracts_in_parallel(
+    graph: ImportGraph,
+    tasks: Sequence[ContractTask],
+    session_options: Dict[str, Any],
+    workers: int,
+    fail_fast: bool = False,
+    profile_directory: Optional[str] = None,
+    reachability_index: Optional[ReachabilityIndex] = None,
+) -> List[Optional[ContractResult]]:
+    """
+    Check each contract in a separate process, using a pool of worker processes.
+
+    The graph is sent to each worker once, when it starts, rather than once per contract.
+
+    Contracts are checked with verbose mode turned off, as noisy output from several processes
+    at once would be interleaved.
+
+    The workers aren't forked from the current process. Grimp's Rust extension uses a thread
+    pool, which is left unusable (so checks hang) in processes forked from one that has used it.
+
+    In fail fast mode, checking stops as soon as a contract is found to be broken: contracts
+    that haven't started are cancelled, and the results of any still being checked are
+    discarded once the workers finish them.
+
+    If spans are being recorded (see tracing), the workers record spans too, and they are added
+    to the record as each contract check completes.
+
+    If profile_directory is supplied, each contract is checked under settings.PROFILER, which
+    saves the profile to that directory (see profiling).
+
+    If reachability_index is supplied, it is sent to each worker along with the graph, for the
+    contracts to use (see contract_utils.get_reachability_index).
+
+    Returns:
+        A list of (ContractCheck, duration in seconds, peak memory in bytes or None if not
+        profiled), in the same order as the tasks. In fail fast mode, the items for any
+        contracts that weren't checked are None.
+    """
+    with tracing.span("Snapshot graph"):
+        snapshot = snapshot_graph(graph)
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=get_multiprocessing_context(),
+        initializer=_initialize_worker,
+        initargs=(
+            snapshot,
+            session_options,
+            settings.TIMER,
+            settings.PRINTER,
+            tracing.is_recording(),
+            settings.PROFILER if profile_directory else None,
+            profile_directory,
+            reachability_index,
+        ),
+    ) as executor:
+        futures = [
+            executor.submit(_check_contract_in_worker, contract_class, contract_options)
+            for contract_class, contract_options in tasks
+        ]
+        if not fail_fast:
+            return [_get_result(future) for future in futures]
+
+        for future in as_completed(futures):
+            (check, _, _), _ = future.result()
+            if not check.kept:
+                break
+        results = [_get_result(future) if future.done() else None for future in futures]
+        # Contracts that are being checked can't be cancelled, so the workers finish them
+        # before the pool shuts down.
+        executor.shutdown(wait=False, cancel_futures=True)
+        return results
+
+
+def get_multiprocessing_context() -> BaseContext:
+    """
+    Return the context to start worker processes with.
+
+    Workers must not be forked from the current process (see check_contracts_in_parallel).
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        # Cheaper than spawn, as each worker is forked from a fresh server process.
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+# Private functions
+# -----------------
+
+
+def _get_result(future: Future[WorkerResult]) -> ContractResult:
+    result, spans = future.result()
+    tracing.add_spans(spans)
+    return result
+
+
+def _initialize_worker(
+    snapshot: GraphSnapshot,
+    session_options: Dict[str, Any],
+    timer: Timer,
+    printer: Printer,
+    record_spans: bool,
+    profiler: Optional[Profiler],
+    profile_directory: Optional[str],
+    reachability_index: Optional[ReachabilityIndex],
+) -> None:
+    global _worker_graph, _worker_session_options, _worker_profile_directory
+    global _worker_reachability_index, _worker_matching_imports_cache, _worker_module_name_index
+    global _worker_hierarchy_index
+    settings.configure(TIMER=timer, PRINTER=printer)
+    if profiler is not None:
+        settings.configure(PROFILER=profiler)
+    if record_spans:
+        # The spans are passed back with the result of each contract check.
+        tracing.start_recording()
+    with tracing.span("Restore graph"):
+        _worker_graph = restore_graph(snapshot)
+    _worker_session_options = session_options
+    _worker_profile_directory = profile_directory
+    _worker_reachability_index = reachability_index
+    _worker_matching_imports_cache = {}
+    _worker_module_name_index = build_module_name_index(_worker_graph)
+    _worker_hierarchy_index = build_hierarchy_index(_worker_graph)
+
+
+def _check_contract_in_worker(
+    contract_class: Type[Contract], contract_options: Dict[str, Any]
+) -> WorkerResult:
+    assert _worker_graph is not None  # For type checker.
+    contract = contract_class(
+        name=contract_options["name"],
+        session_options=_worker_session_options,
+        contract_options=contract_options,
+    )
+    peak_memory: Optional[int] = None
+    with tracing.span("Check contract", contract=contract.name), settings.TIMER as timer:
+        # Check against an overlay so that contracts can mutate the graph without affecting
+        # other contract checks.
+        with GraphOverlay(
+            _worker_graph,
+            _worker_reachability_index,
+            _worker_matching_imports_cache,
+            _worker_module_name_index,
+            _worker_hierarchy_index,
+        ) as overlay:
+            if _worker_profile_directory:
+                check, peak_memory = profiling.check_contract_with_profiling(
+                    contract, overlay, verbose=False, profile_directory=_worker_profile_directory
+                )
+            else:
+                check = contract.check(overlay, verbose=False)
+    return (check, timer.duration_in_s, peak_memory), tracing.take_recorded_spans()
@@ -14,3 +14,21 @@ class GraphBuilder(abc.ABC):
         exclude_type_checking_imports: bool = False,
     ) -> ImportGraph:
         raise NotImplementedError
+
+    @abc.abstractmethod
+    def dump(self, graph: ImportGraph, filename: str) -> None:
+        """
+        Save a snapshot of the graph to the supplied file, so it can be loaded again later.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def load(self, filename: str) -> ImportGraph:
+        """
+        Return the graph saved to the supplied file by dump.
+
+        Raises:
+            FileNotFoundError:    if the file doesn't exist.
+            InvalidGraphSnapshot: if the file isn't a graph snapshot that can be read.
+        """
+        raise NotImplementedError
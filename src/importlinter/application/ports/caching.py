@@ -0,0 +1,85 @@
+import abc
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from importlinter.domain.contract import ContractCheck
+
+
+@dataclass(frozen=True)
+class GraphFingerprint:
+    """
+    Hashes identifying the state of a graph.
+
+    Arguments:
+        - value:               A hash of the whole graph.
+        - module_fingerprints: A hash for each module, of whether it is squashed and the
+                               details of the imports it makes.
+    """
+
+    value: str
+    module_fingerprints: Dict[str, str]
+
+
+@dataclass(frozen=True)
+class CachedContractCheck:
+    """
+    The result of checking a contract, together with a fingerprint of the graph it was checked
+    against.
+    """
+
+    graph_fingerprint: str
+    check: ContractCheck
+
+
+class ContractCheckCache(abc.ABC):
+    """
+    Persistent storage for the results of checking contracts.
+
+    Each contract has a single entry, so storing a new result for a contract replaces
+    the old one.
+    """
+
+    @abc.abstractmethod
+    def read(self, cache_dir: str, contract_key: str) -> Optional[CachedContractCheck]:
+        """
+        Return the stored result for the contract, or None if there isn't one.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def write(self, cache_dir: str, contract_key: str, cached_check: CachedContractCheck) -> None:
+        """
+        Store the result for the contract, replacing any existing one.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def read_graph_fingerprint(self, cache_dir: str) -> Optional[GraphFingerprint]:
+        """
+        Return the fingerprint of the graph from the most recent run, or None if there isn't one.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def write_graph_fingerprint(self, cache_dir: str, fingerprint: GraphFingerprint) -> None:
+        """
+        Store the fingerprint of the graph for the current run, replacing any existing one.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def read_durations(self, cache_dir: str) -> Dict[str, List[float]]:
+        """
+        Return the recorded durations of previous contract checks, in seconds.
+
+        The durations are keyed by contract key, oldest first. If none have been recorded,
+        return an empty dictionary.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def write_durations(self, cache_dir: str, durations: Dict[str, List[float]]) -> None:
+        """
+        Store the durations of contract checks, replacing any existing ones.
+        """
+        raise NotImplementedError
@@ -18,6 +18,13 @@ class FileSystem(abc.ABC):
         """
         raise NotImplementedError
 
+    @abc.abstractmethod
+    def write(self, file_name: str, contents: str, encoding: Optional[str] = None) -> None:
+        """
+        Write the contents to the file, replacing any existing file.
+        """
+        raise NotImplementedError
+
     @abc.abstractmethod
     def exists(self, file_name: str) -> bool:
         """
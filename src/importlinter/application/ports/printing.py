@@ -1,5 +1,8 @@
 import abc
-from typing import Optional
+from typing import Optional, Tuple
+
+# A call to Printer.print, in the form (text, bold, color, newline).
+PrintedLine = Tuple[str, bool, Optional[str], bool]
 
 
 class Printer(abc.ABC):
@@ -0,0 +1,23 @@
+import abc
+from typing import Callable, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class Profiler(abc.ABC):
+    """
+    Profiles where the time and memory go when calling a function.
+    """
+
+    @abc.abstractmethod
+    def profile(self, function: Callable[[], T], stats_filename: str) -> Tuple[T, int]:
+        """
+        Call the function, saving a profile of where its time went to the supplied file.
+
+        Any directories needed for the file are created.
+
+        Returns:
+            Tuple of the function's return value, and the peak memory allocated while it ran,
+            in bytes.
+        """
+        raise NotImplementedError
@@ -1,4 +1,4 @@
-from typing import Dict, Iterator, List, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 
 from importlinter.domain.contract import Contract, ContractCheck, InvalidContractOptions
 from grimp import ImportGraph
@@ -13,8 +13,15 @@ class ExceptionReporter:
 
 
 class Report:
+    """
+    The results of checking the contracts.
+
+    Durations (of building the graph, and of checking each contract) are in seconds, measured
+    with sub-second precision.
+    """
+
     def __init__(
-        self, graph: ImportGraph, show_timings: bool, graph_building_duration: int
+        self, graph: ImportGraph, show_timings: bool, graph_building_duration: float
     ) -> None:
         self.graph = graph
         self.show_timings = show_timings
@@ -24,7 +31,10 @@ class Report:
         self.contains_failures = False
         self.contracts: List[Contract] = []
         self._check_map: Dict[Contract, ContractCheck] = {}
-        self._durations: Dict[Contract, int] = {}
+        self._durations: Dict[Contract, float] = {}
+        self._median_durations: Dict[Contract, float] = {}
+        # Contracts that weren't checked, because fail fast mode stopped the checks early.
+        self.skipped_contracts: List[Contract] = []
         self.warnings_count = 0
         self.broken_count = 0
         self.kept_count = 0
@@ -32,11 +42,23 @@ class Report:
         self.import_count = graph.count_imports()
 
     def add_contract_check(
-        self, contract: Contract, contract_check: ContractCheck, duration: int
+        self,
+        contract: Contract,
+        contract_check: ContractCheck,
+        duration: float,
+        median_duration: Optional[float] = None,
     ) -> None:
+        """
+        Args:
+            ...
+            median_duration: The median time taken to check the contract on previous runs,
+                             if known.
+        """
         self.contracts.append(contract)
         self._check_map[contract] = contract_check
         self._durations[contract] = duration
+        if median_duration is not None:
+            self._median_durations[contract] = median_duration
         self.warnings_count += len(contract_check.warnings)
         if contract_check.kept:
             self.kept_count += 1
@@ -44,13 +66,19 @@ class Report:
             self.broken_count += 1
             self.contains_failures = True
 
+    def add_skipped_contract(self, contract: Contract) -> None:
+        self.skipped_contracts.append(contract)
+
     def get_contracts_and_checks(self) -> Iterator[Tuple[Contract, ContractCheck]]:
         for contract in self.contracts:
             yield contract, self._check_map[contract]
 
-    def get_duration(self, contract) -> int:
+    def get_duration(self, contract) -> float:
         return self._durations[contract]
 
+    def get_median_duration(self, contract) -> Optional[float]:
+        return self._median_durations.get(contract)
+
     def add_invalid_contract_options(
         self, contract_name: str, exception: InvalidContractOptions
     ) -> None:
@@ -0,0 +1,77 @@
+import abc
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple
+
+from .printing import PrintedLine
+
+
+@dataclass(frozen=True)
+class CheckRequest:
+    """
+    A request, sent to a running daemon, to check the contracts.
+
+    The config_fingerprint identifies the configuration the client would have used, so the
+    daemon can refuse to check contracts using a different one.
+    """
+
+    limit_to_contracts: Tuple[str, ...] = ()
+    show_timings: bool = False
+    verbose: bool = False
+    fail_fast: bool = False
+    summary_only: bool = False
+    workers: Optional[int] = None
+    config_fingerprint: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class CheckResponse:
+    """
+    The result of a CheckRequest, including the output that the check printed.
+
+    If the daemon refused to do the check, rejection_reason says why, and the contracts
+    weren't checked.
+    """
+
+    passed: bool
+    output: Tuple[PrintedLine, ...]
+    rejection_reason: Optional[str] = None
+
+
+class DaemonNotRunning(Exception):
+    """
+    Raised when there is no daemon listening at an address.
+    """
+
+
+class DaemonTransport(abc.ABC):
+    """
+    Communication between a lint daemon and its clients.
+    """
+
+    @abc.abstractmethod
+    def serve(
+        self,
+        address: str,
+        handle_request: Callable[[CheckRequest], CheckResponse],
+        handle_idle: Callable[[], None],
+    ) -> None:
+        """
+        Listen for requests at the supplied address, until interrupted.
+
+        Args:
+            address:        Where to listen.
+            handle_request: Called with each request received; the response is sent back
+                            to the client.
+            handle_idle:    Called periodically while no requests are being handled.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def send_request(self, address: str, request: CheckRequest) -> CheckResponse:
+        """
+        Send a request to the daemon listening at the address, returning its response.
+
+        Raises:
+            DaemonNotRunning: if there is no daemon listening at the address.
+        """
+        raise NotImplementedError
@@ -3,13 +3,15 @@ from __future__ import annotations
 import abc
 from types import TracebackType
 
+NANOSECONDS_PER_SECOND = 1_000_000_000
+
 
 class Timer(abc.ABC):
     """
     Context manager to allow easy timing of events.
 
     This is an abstraction that needs to be implemented using a subclass
-    that implements the get_current_time method.
+    that implements the get_current_time method (and, optionally, get_current_time_ns).
 
     Usage:
 
@@ -20,10 +22,11 @@ class Timer(abc.ABC):
 
     def __init__(self) -> None:
         # We use a stack so context managers can be nested.
-        self._start_stack: list[float] = []
+        self._start_stack: list[int] = []
+        self.duration_in_ns = 0
 
     def __enter__(self) -> Timer:
-        self._start_stack.append(self.get_current_time())
+        self._start_stack.append(self.get_current_time_ns())
         return self
 
     def __exit__(
@@ -32,15 +35,37 @@ class Timer(abc.ABC):
         exc_val: BaseException | None,
         exc_tb: TracebackType | None,
     ) -> None:
-        end = self.get_current_time()
+        end = self.get_current_time_ns()
         start = self._start_stack.pop()
-        self.duration_in_s = int(end - start)
+        self.duration_in_ns = end - start
+
+    @property
+    def duration_in_s(self) -> float:
+        """
+        The duration of the most recently exited event, in seconds.
+        """
+        return self.duration_in_ns / NANOSECONDS_PER_SECOND
 
     @abc.abstractmethod
     def get_current_time(self) -> float:
         """
-        Return the time in seconds since the epoch as a floating point number.
+        Return the current time in seconds, as a floating point number.
+
+        Only the difference between two times is used, so the clock may have any starting
+        point, but it should be monotonic.
 
-        See https://docs.python.org/3/library/time.html#time.time
+        See https://docs.python.org/3/library/time.html#time.perf_counter
         """
         raise NotImplementedError
+
+    def get_current_time_ns(self) -> int:
+        """
+        Return the current time in nanoseconds, as an integer.
+
+        This is what's used to time events. By default it is worked out from get_current_time,
+        but subclasses with access to a clock that counts in nanoseconds should override it,
+        to avoid losing precision in the conversion.
+
+        See https://docs.python.org/3/library/time.html#time.perf_counter_ns
+        """
+        return round(self.get_current_time() * NANOSECONDS_PER_SECOND)
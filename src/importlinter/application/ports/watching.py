@@ -0,0 +1,28 @@
+import abc
+from typing import Iterable, Set
+
+
+class FileWatcher(abc.ABC):
+    """
+    Watches directories for changes to the Python files inside them.
+    """
+
+    @abc.abstractmethod
+    def watch(self, directories: Iterable[str]) -> None:
+        """
+        Start watching the supplied directories, including their subdirectories.
+
+        Any directories that were previously being watched will no longer be watched.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get_changed_files(self) -> Set[str]:
+        """
+        Return the files that have been changed, added or removed since the last call
+        (or since watching started).
+
+        The set may also include directories, if a whole directory changed. This method
+        doesn't block.
+        """
+        raise NotImplementedError
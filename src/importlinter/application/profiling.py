@@ -0,0 +1,52 @@
+"""
+Profiling of contract checks, to find out where their time and memory go.
+"""
+
+import os
+import re
+from typing import Tuple
+
+from grimp import ImportGraph
+
+from ..domain.contract import Contract, ContractCheck
+from .app_config import settings
+
+STATS_FILE_EXTENSION = ".pstats"
+
+
+def check_contract_with_profiling(
+    contract: Contract, graph: ImportGraph, verbose: bool, profile_directory: str
+) -> Tuple[ContractCheck, int]:
+    """
+    Check the contract, saving a profile of the check to a file in the profile directory.
+
+    The file is named after the contract's id or, if it has none, its name.
+
+    Returns:
+        Tuple of the contract check, and the peak memory allocated during the check, in bytes.
+    """
+    stats_filename = os.path.join(profile_directory, get_stats_filename(contract))
+    return settings.PROFILER.profile(
+        lambda: _check_contract(contract, graph, verbose), stats_filename
+    )
+
+
+def get_stats_filename(contract: Contract) -> str:
+    """
+    Return the name of the file to save the profile of the contract's check to.
+    """
+    name = contract.contract_options.get("id") or contract.name
+    # Replace anything that isn't safe to use in a filename.
+    return re.sub(r"[^\w.-]+", "_", name) + STATS_FILE_EXTENSION
+
+
+# Private functions
+# -----------------
+
+
+def _check_contract(contract: Contract, graph: ImportGraph, verbose: bool) -> ContractCheck:
+    check = contract.check(graph, verbose=verbose)
+    # Contracts may only build their metadata (e.g. the chains that broke them) when it is first
+    # needed. Build it now, so that the profile covers it, as running lint-imports would.
+    check.metadata
+    return check
@@ -0,0 +1,162 @@
+"""
+An index of which modules import which, directly or indirectly, built once per run so that
+contracts can rule out chains between modules without searching the graph.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, Iterator, List, Mapping, Set, Tuple
+
+from grimp import ImportGraph
+
+# A bitset with every bit set, used for modules the index knows nothing about.
+_ALL_BITS = -1
+
+
+class ReachabilityIndex:
+    """
+    Which modules in a graph import which other modules, directly or indirectly.
+
+    Modules that import each other (directly or indirectly) are collapsed into a single
+    strongly connected component, so the index is built over a graph with no cycles. For each
+    component, the components it can reach (including itself) are stored as a bitset: a Python
+    int with bit n set if component n is reachable.
+
+    The index describes the graph it was built from. It can still be used to rule out chains
+    once imports have been removed from the graph, as that can only make fewer modules
+    reachable, but not once any have been added.
+    """
+
+    def __init__(self, components: Dict[str, int], reachable_components: List[int]) -> None:
+        """
+        Args:
+            components:           the number of the component each module belongs to.
+            reachable_components: for each component, the bitset of the components reachable
+                                  from it.
+        """
+        self._components = components
+        self._reachable_components = reachable_components
+
+    @property
+    def component_count(self) -> int:
+        return len(self._reachable_components)
+
+    def find_reachable_pairs(
+        self, importers: Mapping[str, Iterable[str]], importeds: Mapping[str, Iterable[str]]
+    ) -> Set[Tuple[str, str]]:
+        """
+        Return the (importer, imported) pairs where the importer might import the imported,
+        directly or indirectly.
+
+        There are no chains between pairs that aren't returned. Pairs that overlap, or that
+        contain modules that aren't in the index, are always returned.
+
+        Args:
+            importers: the modules in each importer, keyed by the importer's name. For a
+                       package, these are the package and its descendants.
+            importeds: the modules in each imported, in the same form.
+        """
+        reachable_masks = {
+            name: self._get_reachable_mask(modules) for name, modules in importers.items()
+        }
+        masks = {name: self._get_mask(modules) for name, modules in importeds.items()}
+        return {
+            (importer, imported)
+            for importer, reachable_mask in reachable_masks.items()
+            for imported, mask in masks.items()
+            if reachable_mask & mask
+        }
+
+    def _get_reachable_mask(self, modules: Iterable[str]) -> int:
+        reachable_mask = 0
+        for module in modules:
+            try:
+                reachable_mask |= self._reachable_components[self._components[module]]
+            except KeyError:
+                return _ALL_BITS
+        return reachable_mask
+
+    def _get_mask(self, modules: Iterable[str]) -> int:
+        mask = 0
+        for module in modules:
+            try:
+                mask |= 1 << self._components[module]
+            except KeyError:
+                return _ALL_BITS
+        return mask
+
+
+def build_reachability_index(graph: ImportGraph) -> ReachabilityIndex:
+    """
+    Build a ReachabilityIndex of the supplied graph.
+
+    The strongly connected components are found using Tarjan's algorithm, which finishes each
+    component only after every component it can reach. So the bitset for each component can be
+    built from those of the components it directly imports, in a single pass.
+
+    Memory use grows with the square of the number of components, so for very large graphs
+    the index may be expensive to build.
+    """
+    successors = {
+        module: graph.find_modules_directly_imported_by(module) for module in graph.modules
+    }
+    components: Dict[str, int] = {}
+    reachable_components: List[int] = []
+
+    for members in _find_strongly_connected_components(successors):
+        component = len(reachable_components)
+        for member in members:
+            components[member] = component
+        reachable = 1 << component
+        for member in members:
+            for imported in successors[member]:
+                imported_component = components[imported]
+                if imported_component != component:
+                    reachable |= reachable_components[imported_component]
+        reachable_components.append(reachable)
+
+    return ReachabilityIndex(components, reachable_components)
+
+
+def _find_strongly_connected_components(
+    successors: Mapping[str, Iterable[str]],
+) -> Iterator[List[str]]:
+    # Tarjan's algorithm, made iterative so deep chains of imports don't hit the recursion
+    # limit. Components are yielded in reverse topological order.
+    indexes: Dict[str, int] = {}
+    lowlinks: Dict[str, int] = {}
+    stack: List[str] = []
+    on_stack: Set[str] = set()
+
+    for root in sorted(successors):
+        if root in indexes:
+            continue
+        indexes[root] = lowlinks[root] = len(indexes)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(successors[root]))]
+        while work:
+            module, remaining_successors = work[-1]
+            for successor in remaining_successors:
+                if successor not in indexes:
+                    indexes[successor] = lowlinks[successor] = len(indexes)
+                    stack.append(successor)
+                    on_stack.add(successor)
+                    work.append((successor, iter(successors[successor])))
+                    break
+                if successor in on_stack:
+                    lowlinks[module] = min(lowlinks[module], indexes[successor])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlinks[parent] = min(lowlinks[parent], lowlinks[module])
+                if lowlinks[module] == indexes[module]:
+                    members = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        members.append(member)
+                        if member == module:
+                            break
+                    yield members
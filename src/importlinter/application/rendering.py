@@ -1,8 +1,9 @@
-from typing import Optional
+from typing import List, Optional
 
 from importlinter.domain.contract import Contract, ContractCheck
 
 from . import output
+from .benchmarking import BenchmarkResults, ScenarioComparison, ScenarioResult
 from .ports.reporting import Report
 
 # Public functions
@@ -18,7 +19,9 @@ def render_report(report: Report) -> None:
         return
 
     if report.show_timings:
-        output.print(f"Building graph took {report.graph_building_duration}s.")
+        output.print(
+            f"Building graph took {output.format_duration(report.graph_building_duration)}."
+        )
         output.new_line()
 
     output.print_heading("Contracts", output.HEADING_LEVEL_TWO)
@@ -30,12 +33,25 @@ def render_report(report: Report) -> None:
     )
 
     for contract, contract_check in report.get_contracts_and_checks():
-        duration = report.get_duration(contract) if report.show_timings else None
-        render_contract_result_line(contract, contract_check, duration=duration)
+        if report.show_timings:
+            render_contract_result_line(
+                contract,
+                contract_check,
+                duration=report.get_duration(contract),
+                median_duration=report.get_median_duration(contract),
+            )
+        else:
+            render_contract_result_line(contract, contract_check, duration=None)
+    for contract in report.skipped_contracts:
+        output.print(f"{contract.name} ", newline=False)
+        output.print("SKIPPED", color=output.COLORS[output.WARNING])
 
     output.new_line()
 
-    output.print(f"Contracts: {report.kept_count} kept, {report.broken_count} broken.")
+    skipped_text = f", {len(report.skipped_contracts)} skipped" if report.skipped_contracts else ""
+    output.print(
+        f"Contracts: {report.kept_count} kept, {report.broken_count} broken{skipped_text}."
+    )
 
     if report.warnings_count:
         output.new_line()
@@ -48,15 +64,23 @@ def render_report(report: Report) -> None:
 
 
 def render_contract_result_line(
-    contract: Contract, contract_check: ContractCheck, duration: Optional[int]
+    contract: Contract,
+    contract_check: ContractCheck,
+    duration: Optional[float],
+    median_duration: Optional[float] = None,
+    peak_memory: Optional[int] = None,
 ) -> None:
     """
     Render the one-line contract check result.
 
     Args:
         ...
-        duration: The number of seconds the contract took to check (optional).
-                  The duration will only be displayed if it is provided.
+        duration:        The number of seconds the contract took to check (optional).
+                         The duration will only be displayed if it is provided.
+        median_duration: The median number of seconds the contract took to check on previous
+                         runs (optional). Only displayed alongside the duration.
+        peak_memory:     The peak memory allocated while checking the contract, in bytes
+                         (optional). Only measured when profiling.
     """
     result_text = "KEPT" if contract_check.kept else "BROKEN"
     warning_text = _build_warning_text(warnings_count=len(contract_check.warnings))
@@ -65,11 +89,85 @@ def render_contract_result_line(
     output.print(f"{contract.name} ", newline=False)
     output.print(result_text, color=color, newline=False)
     output.print(warning_text, color=output.COLORS[output.WARNING], newline=False)
+    details = []
     if duration is not None:
-        output.print(f" [{duration}s]", newline=False)
+        details.append(output.format_duration(duration))
+        if median_duration is not None:
+            details.append(f"median {output.format_duration(median_duration)}")
+    if peak_memory is not None:
+        details.append(f"peak memory {output.format_memory(peak_memory)}")
+    if details:
+        output.print(f" [{', '.join(details)}]", newline=False)
     output.new_line()
 
 
+def render_benchmark_results(results: BenchmarkResults) -> None:
+    """
+    Render the median duration and peak RSS of each benchmarked scenario.
+    """
+    for result in results.scenarios.values():
+        output.print(f"{result.name} [{_format_scenario_result(result)}]")
+    output.new_line()
+
+
+def render_benchmark_comparisons(
+    comparisons: List[ScenarioComparison],
+    baseline: BenchmarkResults,
+    current: BenchmarkResults,
+    threshold: float,
+) -> None:
+    """
+    Render a comparison of each benchmarked scenario with its baseline.
+
+    Args:
+        comparisons: the comparisons to render.
+        baseline:    the results that were compared against.
+        current:     the results that were compared.
+        threshold:   the proportion by which a scenario may slow down before it counts as a
+                     regression.
+    """
+    output.print(f"Baseline: {_format_benchmark_environment(baseline)}.")
+    output.print(f"Current: {_format_benchmark_environment(current)}.")
+    output.new_line()
+
+    for comparison in comparisons:
+        output.print(f"{comparison.name} ", newline=False)
+        if comparison.baseline is None:
+            assert comparison.current is not None  # For type checker.
+            output.print("NEW", color=output.COLORS[output.WARNING], newline=False)
+            output.print(f" [{_format_scenario_result(comparison.current)}]")
+            continue
+        if comparison.current is None:
+            output.print("MISSING", color=output.COLORS[output.WARNING])
+            continue
+        output.print(
+            f"{output.format_duration(comparison.baseline.median_duration)} -> "
+            f"{output.format_duration(comparison.current.median_duration)}",
+            newline=False,
+        )
+        if comparison.change is not None:
+            output.print(f" ({comparison.change:+.1%})", newline=False)
+        if comparison.is_regression:
+            output.print(" SLOWER", color=output.COLORS[output.ERROR], newline=False)
+        if comparison.baseline.peak_rss is not None and comparison.current.peak_rss is not None:
+            output.print(
+                f" [peak RSS {output.format_memory(comparison.baseline.peak_rss)} -> "
+                f"{output.format_memory(comparison.current.peak_rss)}]",
+                newline=False,
+            )
+        output.new_line()
+    output.new_line()
+
+    regressions_count = sum(1 for comparison in comparisons if comparison.is_regression)
+    if regressions_count:
+        noun = "scenario" if regressions_count == 1 else "scenarios"
+        output.print_error(
+            f"{regressions_count} {noun} slowed down by more than {threshold * 100:g}%."
+        )
+    else:
+        output.print_success(f"No scenarios slowed down by more than {threshold * 100:g}%.")
+
+
 def render_exception(exception: Exception) -> None:
     """
     Render any exception to the console.
@@ -121,3 +219,14 @@ def _render_broken_contracts_details(report: Report) -> None:
         output.print_heading(contract.name, output.HEADING_LEVEL_THREE, style=output.ERROR)
 
         contract.render_broken_contract(check)
+
+
+def _format_scenario_result(result: ScenarioResult) -> str:
+    details = [f"median {output.format_duration(result.median_duration)}"]
+    if result.peak_rss is not None:
+        details.append(f"peak RSS {output.format_memory(result.peak_rss)}")
+    return ", ".join(details)
+
+
+def _format_benchmark_environment(results: BenchmarkResults) -> str:
+    return f"Import Linter {results.importlinter_version}, Python {results.python_version}"
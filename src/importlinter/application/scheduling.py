@@ -0,0 +1,81 @@
+"""
+Deciding the order in which to check contracts, using how long they took on previous runs.
+"""
+
+from __future__ import annotations
+
+import statistics
+from typing import Dict, Hashable, List, Mapping, Sequence, Set, TypeVar
+
+# How many of the most recent durations to keep for each contract.
+DURATION_HISTORY_LENGTH = 10
+
+T = TypeVar("T", bound=Hashable)
+
+
+def record_durations(
+    duration_history: Mapping[str, Sequence[float]], new_durations: Mapping[str, float]
+) -> Dict[str, List[float]]:
+    """
+    Return the duration history with the new durations appended.
+
+    Args:
+        duration_history: the recorded durations, in seconds, keyed by contract key,
+                          oldest first.
+        new_durations:    the duration of each contract checked in this run, keyed by contract
+                          key.
+
+    Only the most recent DURATION_HISTORY_LENGTH durations are kept for each contract.
+    """
+    updated_history = {key: list(durations) for key, durations in duration_history.items()}
+    for key, duration in new_durations.items():
+        durations = updated_history.setdefault(key, [])
+        durations.append(duration)
+        del durations[:-DURATION_HISTORY_LENGTH]
+    return updated_history
+
+
+def get_median_durations(duration_history: Mapping[str, Sequence[float]]) -> Dict[str, float]:
+    """
+    Return the median recorded duration for each contract with any recorded durations.
+    """
+    return {
+        key: statistics.median(durations)
+        for key, durations in duration_history.items()
+        if durations
+    }
+
+
+def order_longest_first(items: Sequence[T], expected_durations: Mapping[T, float]) -> List[T]:
+    """
+    Return the items in the order to start them in, so that a pool of workers finishes them
+    as early as possible.
+
+    The longest items start first, so they don't hold up the end of the run. Items with no
+    expected duration start before all the others, as they could take any amount of time.
+    """
+    return sorted(
+        items,
+        key=lambda item: (item in expected_durations, -expected_durations.get(item, 0)),
+    )
+
+
+def order_for_fail_fast(
+    items: Sequence[T], expected_durations: Mapping[T, float], previously_failed: Set[T]
+) -> List[T]:
+    """
+    Return the items in the order to check them in, so that any failure is found as early
+    as possible.
+
+    Items that failed previously come first, as they are the most likely to fail again. Then
+    the cheapest items come first, so that as many as possible are checked before any slow ones.
+    Items with no expected duration come last. Otherwise the order is kept.
+    """
+    return sorted(
+        items,
+        key=lambda item: (
+            item not in previously_failed,
+            item not in expected_durations,
+            expected_durations.get(item, 0),
+        ),
+    )
@@ -0,0 +1,153 @@
+"""
+Recording of nested spans of time, to show where the time goes during a run.
+
+Spans are only recorded between calls to start_recording and stop_recording, so the span
+context manager costs next to nothing the rest of the time.
+
+Usage:
+
+    tracing.start_recording()
+    with tracing.span("Build graph"):
+        with tracing.span("Scan package", package="mypackage"):
+            ...
+    spans = tracing.stop_recording()
+    json_string = tracing.render_chrome_trace(spans)
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .app_config import settings
+
+NANOSECONDS_PER_MICROSECOND = 1_000
+
+# The spans recorded so far, or None if spans aren't being recorded.
+_recorded_spans: Optional[List[Span]] = None
+
+
+@dataclass(frozen=True)
+class Span:
+    """
+    A named period of time.
+
+    Times are in nanoseconds, from the clock of settings.TIMER. Spans recorded in different
+    processes can be compared, as the system clock's monotonic time is shared between processes.
+    """
+
+    name: str
+    start_ns: int
+    duration_ns: int
+    process_id: int
+    thread_id: int
+    args: Dict[str, Any] = field(default_factory=dict)
+
+
+def start_recording() -> None:
+    """
+    Start recording spans, discarding any recorded previously.
+    """
+    global _recorded_spans
+    _recorded_spans = []
+
+
+def stop_recording() -> List[Span]:
+    """
+    Stop recording spans, returning the spans recorded since recording started.
+    """
+    global _recorded_spans
+    spans = take_recorded_spans()
+    _recorded_spans = None
+    return spans
+
+
+def is_recording() -> bool:
+    return _recorded_spans is not None
+
+
+def take_recorded_spans() -> List[Span]:
+    """
+    Return the spans recorded so far, removing them from the record (recording continues).
+    """
+    if _recorded_spans is None:
+        return []
+    spans = list(_recorded_spans)
+    _recorded_spans.clear()
+    return spans
+
+
+def add_spans(spans: Iterable[Span]) -> None:
+    """
+    Add spans recorded elsewhere (e.g. in another process) to the record, if recording.
+    """
+    if _recorded_spans is not None:
+        _recorded_spans.extend(spans)
+
+
+@contextlib.contextmanager
+def span(name: str, **args: Any) -> Iterator[None]:
+    """
+    Context manager that records a span for the duration of the block, if recording.
+
+    Spans may be nested. Any keyword arguments are stored with the span, and shown alongside
+    it by trace viewers.
+    """
+    if _recorded_spans is None:
+        yield
+        return
+    start_ns = settings.TIMER.get_current_time_ns()
+    try:
+        yield
+    finally:
+        end_ns = settings.TIMER.get_current_time_ns()
+        # Check again, in case recording was stopped during the block.
+        if _recorded_spans is not None:
+            _recorded_spans.append(
+                Span(
+                    name=name,
+                    start_ns=start_ns,
+                    duration_ns=end_ns - start_ns,
+                    process_id=os.getpid(),
+                    thread_id=threading.get_ident(),
+                    args=args,
+                )
+            )
+
+
+def render_chrome_trace(spans: Iterable[Span]) -> str:
+    """
+    Return the spans as a JSON string in the Chrome trace event format.
+
+    The file can be opened in https://ui.perfetto.dev or chrome://tracing. Times are shown
+    relative to the start of the earliest span.
+
+    See https://docs.google.com/document/d/1CvAClvFfyA5R-PhYUmn5OOQtYMH4h6I0nSsKchNAySU
+    """
+    sorted_spans = sorted(spans, key=lambda span_: (span_.start_ns, -span_.duration_ns))
+    origin_ns = sorted_spans[0].start_ns if sorted_spans else 0
+    # Trace viewers expect small thread ids.
+    thread_numbers: Dict[Tuple[int, int], int] = {}
+    events = []
+    for span_ in sorted_spans:
+        thread_number = thread_numbers.setdefault(
+            (span_.process_id, span_.thread_id), len(thread_numbers) + 1
+        )
+        events.append(
+            {
+                "name": span_.name,
+                "cat": "importlinter",
+                # A complete event, with both a start time and a duration.
+                "ph": "X",
+                "ts": (span_.start_ns - origin_ns) / NANOSECONDS_PER_MICROSECOND,
+                "dur": span_.duration_ns / NANOSECONDS_PER_MICROSECOND,
+                "pid": span_.process_id,
+                "tid": thread_number,
+                "args": span_.args,
+            }
+        )
+    return json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}, default=str)
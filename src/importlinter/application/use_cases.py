@@ -1,14 +1,36 @@
+import contextlib
+import hashlib
 import importlib
-from copy import copy, deepcopy
-from typing import Any, Dict, List, Optional, Tuple, Type, Union
+import importlib.util
+import json
+import os
+from copy import copy
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Type, Union, cast
 
-from grimp import ImportGraph
+from grimp import Import, ImportGraph
 
 from ..application import rendering
-from ..domain.contract import Contract, InvalidContractOptions, registry
-from . import output
+from ..domain import fields
+from ..domain.contract import Contract, ContractCheck, InvalidContractOptions, registry
+from ..domain.imports import ImportExpression
+from . import (
+    benchmarking,
+    check_caching,
+    contract_utils,
+    output,
+    parallel,
+    profiling,
+    scheduling,
+    tracing,
+)
 from .app_config import settings
+from .graph_overlay import GraphOverlay
+from .hierarchy_index import build_hierarchy_index
+from .module_name_index import build_module_name_index
+from .ports.caching import CachedContractCheck, GraphFingerprint
 from .ports.reporting import Report
+from .ports.serving import CheckRequest, CheckResponse, DaemonNotRunning
+from .reachability import ReachabilityIndex, build_reachability_index
 from .rendering import render_exception, render_report
 from .sentinels import NotSupplied
 from .user_options import UserOptions
@@ -19,6 +41,11 @@ from .user_options import UserOptions
 SUCCESS = True
 FAILURE = False
 
+DAEMON_SOCKET_FILENAME = "daemon.sock"
+
+DEFAULT_BENCHMARK_ROUNDS = 5
+DEFAULT_BENCHMARK_THRESHOLD = 0.1
+
 
 def lint_imports(
     config_filename: Optional[str] = None,
@@ -27,6 +54,13 @@ def lint_imports(
     is_debug_mode: bool = False,
     show_timings: bool = False,
     verbose: bool = False,
+    workers: Optional[int] = None,
+    dump_graph: Optional[str] = None,
+    load_graph: Optional[str] = None,
+    fail_fast: bool = False,
+    trace_file: Optional[str] = None,
+    profile_directory: Optional[str] = None,
+    summary_only: bool = False,
 ) -> bool:
     """
     Analyse whether a Python package follows a set of contracts, and report on the results.
@@ -42,23 +76,55 @@ def lint_imports(
         show_timings:       whether to show the times taken to build the graph and to check
                             each contract.
         verbose:            if True, noisily output progress as it goes along.
+        workers:            the number of processes to use to check contracts. If not supplied,
+                            the workers session option is used, or failing that, 1.
+        dump_graph:         if supplied, a file to save a snapshot of the graph to.
+        load_graph:         if supplied, a file to load the graph from (as saved by dump_graph),
+                            instead of building it.
+        fail_fast:          if True, stop checking contracts once one is found to be broken.
+        trace_file:         if supplied, a file to write a trace of where the time went to, in
+                            the Chrome trace event format.
+        profile_directory:  if supplied, a directory to save a profile of each contract check to.
+        summary_only:       if True, only report whether each contract is kept, and how many
+                            chains broke it, rather than the chains themselves.
 
     Returns:
         True if the linting passed, False if it didn't.
     """
     output.print_heading("Import Linter", output.HEADING_LEVEL_ONE)
     output.verbose_print(verbose, "Verbose mode.")
+    if trace_file:
+        tracing.start_recording()
     try:
-        user_options = read_user_options(config_filename=config_filename)
-        _register_contract_types(user_options)
-        report = create_report(user_options, limit_to_contracts, cache_dir, show_timings, verbose)
-    except Exception as e:
-        if is_debug_mode:
-            raise e
-        render_exception(e)
-        return FAILURE
+        try:
+            with tracing.span("Read configuration"):
+                user_options = read_user_options(config_filename=config_filename)
+            with tracing.span("Register contract types"):
+                _register_contract_types(user_options)
+            report = create_report(
+                user_options,
+                limit_to_contracts,
+                cache_dir,
+                show_timings,
+                verbose,
+                workers,
+                dump_graph=dump_graph,
+                load_graph=load_graph,
+                fail_fast=fail_fast,
+                profile_directory=profile_directory,
+                summary_only=summary_only,
+            )
+        except Exception as e:
+            if is_debug_mode:
+                raise e
+            render_exception(e)
+            return FAILURE
 
-    render_report(report)
+        with tracing.span("Render report"):
+            render_report(report)
+    finally:
+        if trace_file:
+            _write_trace(trace_file, verbose)
 
     if report.contains_failures:
         return FAILURE
@@ -97,27 +163,91 @@ def create_report(
     cache_dir: Union[str, None, Type[NotSupplied]] = NotSupplied,
     show_timings: bool = False,
     verbose: bool = False,
+    workers: Optional[int] = None,
+    changed_modules: Optional[Set[str]] = None,
+    dump_graph: Optional[str] = None,
+    load_graph: Optional[str] = None,
+    fail_fast: bool = False,
+    profile_directory: Optional[str] = None,
+    summary_only: bool = False,
 ) -> Report:
     """
     Analyse whether a Python package follows a set of contracts, returning a report on the results.
 
+    If more than one worker is requested, contracts are checked in parallel using a pool of
+    processes. The contract checks are still reported in the order they were configured.
+
+    Unless caching is disabled, the result of each contract check is stored in the cache
+    directory, and reused by later runs if neither the contract nor the graph has changed.
+    If the graph has changed, results from the previous run are still reused for any contracts
+    that are not concerned with modules upstream or downstream of the changed modules.
+
+    The changed modules are detected by comparing the graph with the one from the previous run.
+    Alternatively, they may be passed in as changed_modules: the names of the modules that
+    have been added, removed or had their imports changed since the previous run.
+
+    If limit_to_contracts is supplied, the graph is only built for the root packages that the
+    selected contracts refer to. Chains that pass through other root packages won't be found
+    by the check.
+
+    If load_graph is supplied, the graph is loaded from that file (as saved by a previous run
+    with dump_graph) rather than built, so the code isn't scanned at all. If dump_graph is
+    supplied, a snapshot of the graph is saved to that file for later runs or other tools.
+
+    In fail fast mode, checking stops as soon as a contract is found to be broken, and the
+    remaining contracts are reported as skipped. Contracts that were broken when last checked
+    are checked first, followed by the contracts that usually take the least time.
+
+    Unless caching is disabled, the time taken to check each contract is recorded in the cache
+    directory. When checking contracts in parallel, the contracts that usually take the longest
+    are started first, so they don't hold up the end of the run.
+
+    If profile_directory is supplied, each contract is checked under a profiler, and the profile
+    is saved to a .pstats file in that directory, named after the contract's id. The peak memory
+    allocated during each check is shown in verbose mode.
+
+    In summary only mode (which can also be turned on using the summary_only session option),
+    contracts don't build the details of the chains that break them, reporting only how many
+    there are. This is much quicker when there are a lot of chains. The results are cached
+    separately from full results, so the details are built on the next run that asks for them.
+
     Raises:
         InvalidUserOptions: if the report could not be run due to invalid user configuration,
                             such as a module that could not be imported.
+        InvalidGraphSnapshot: if load_graph isn't a graph snapshot that can be read.
     """
     include_external_packages = _get_include_external_packages(user_options)
     exclude_type_checking_imports = _get_exclude_type_checking_imports(user_options)
+    if workers is None:
+        workers = _get_workers(user_options)
+    resolved_cache_dir = _resolve_cache_dir(cache_dir)
 
-    with settings.TIMER as timer:
-        graph = _build_graph(
-            root_package_names=user_options.session_options["root_packages"],
-            cache_dir=cache_dir,
-            include_external_packages=include_external_packages,
-            exclude_type_checking_imports=exclude_type_checking_imports,
-            verbose=verbose,
-        )
+    with tracing.span("Build graph"), settings.TIMER as timer:
+        if load_graph:
+            graph = _load_graph(
+                filename=load_graph,
+                root_package_names=user_options.session_options["root_packages"],
+                verbose=verbose,
+            )
+        else:
+            graph = _build_graph(
+                root_package_names=_get_root_packages_to_build(
+                    user_options, limit_to_contracts, verbose
+                ),
+                cache_dir=resolved_cache_dir,
+                include_external_packages=include_external_packages,
+                exclude_type_checking_imports=exclude_type_checking_imports,
+                verbose=verbose,
+            )
     graph_building_duration = timer.duration_in_s
-    output.verbose_print(verbose, f"Built graph in {graph_building_duration}s.")
+    output.verbose_print(
+        verbose, f"Built graph in {output.format_duration(graph_building_duration)}."
+    )
+
+    if dump_graph:
+        output.verbose_print(verbose, f"Dumping import graph to {dump_graph}...")
+        with tracing.span("Dump graph"):
+            settings.GRAPH_BUILDER.dump(graph, dump_graph)
 
     return _build_report(
         graph=graph,
@@ -126,9 +256,297 @@ def create_report(
         limit_to_contracts=limit_to_contracts,
         show_timings=show_timings,
         verbose=verbose,
+        cache_dir=resolved_cache_dir,
+        workers=workers,
+        changed_modules=changed_modules,
+        fail_fast=fail_fast,
+        profile_directory=profile_directory,
+        summary_only=summary_only,
     )
 
 
+def serve(
+    config_filename: Optional[str] = None,
+    address: Optional[str] = None,
+    cache_dir: Union[str, None, Type[NotSupplied]] = NotSupplied,
+    workers: Optional[int] = None,
+    verbose: bool = False,
+) -> None:
+    """
+    Run a daemon that keeps the import graph in memory, and checks the contracts on request.
+
+    The source files of the root packages are watched for changes. When they change, the graph
+    is updated: unless caching is disabled, only the changed modules are scanned again, and only
+    the contracts affected by the changes are checked again (see create_report).
+
+    Each request identifies the configuration the client would have used. If it doesn't match
+    the daemon's, the daemon reads its configuration again, in case it has changed since it was
+    last read. If it still doesn't match, the request is rejected, so the client can check the
+    contracts itself.
+
+    Requests can be sent using lint_imports_using_daemon. Runs until interrupted.
+
+    Args:
+        config_filename: the filename to use to parse user options.
+        address:         where to listen for requests. Defaults to a socket in the cache
+                         directory.
+        cache_dir:       the directory to use for caching. Pass None to disable caching.
+        workers:         the number of processes to use to check contracts (see lint_imports).
+                         Requests may ask for a different number.
+        verbose:         if True, noisily output what the daemon is doing.
+    """
+    resolved_cache_dir = _resolve_cache_dir(cache_dir)
+
+    user_options = read_user_options(config_filename=config_filename)
+    config_fingerprint = _fingerprint_user_options(user_options)
+
+    graph: Optional[ImportGraph] = None
+    graph_building_duration = 0.0
+    # If the graph couldn't be built (e.g. due to a syntax error), the error is reported in
+    # response to each request until the graph is next built.
+    graph_building_error: Optional[Exception] = None
+
+    def build_graph() -> None:
+        nonlocal graph, graph_building_duration, graph_building_error
+        try:
+            with settings.TIMER as timer:
+                graph = _build_graph(
+                    root_package_names=user_options.session_options["root_packages"],
+                    cache_dir=resolved_cache_dir,
+                    include_external_packages=_get_include_external_packages(user_options),
+                    exclude_type_checking_imports=_get_exclude_type_checking_imports(user_options),
+                    verbose=verbose,
+                )
+        except Exception as e:
+            graph, graph_building_error = None, e
+            output.verbose_print(verbose, f"Could not build graph: {e}")
+            return
+        graph_building_duration, graph_building_error = timer.duration_in_s, None
+        output.verbose_print(
+            verbose, f"Built graph in {output.format_duration(graph_building_duration)}."
+        )
+
+    def start_using_user_options() -> None:
+        _register_contract_types(user_options)
+        settings.FILE_WATCHER.watch(
+            _find_package_directories(user_options.session_options["root_packages"])
+        )
+        build_graph()
+
+    def reload_user_options() -> None:
+        nonlocal user_options, config_fingerprint
+        try:
+            reloaded_user_options = read_user_options(config_filename=config_filename)
+        except Exception as e:
+            output.verbose_print(verbose, f"Could not read the configuration again: {e}")
+            return
+        reloaded_config_fingerprint = _fingerprint_user_options(reloaded_user_options)
+        if reloaded_config_fingerprint == config_fingerprint:
+            return
+        output.verbose_print(verbose, "The configuration has changed.")
+        user_options, config_fingerprint = reloaded_user_options, reloaded_config_fingerprint
+        start_using_user_options()
+
+    def handle_idle() -> None:
+        changed_files = settings.FILE_WATCHER.get_changed_files()
+        if changed_files:
+            output.verbose_print(verbose, f"Detected changes to {len(changed_files)} files.")
+            build_graph()
+
+    def handle_request(request: CheckRequest) -> CheckResponse:
+        if request.config_fingerprint not in (None, config_fingerprint):
+            reload_user_options()
+            if request.config_fingerprint != config_fingerprint:
+                return CheckResponse(
+                    passed=FAILURE,
+                    output=(),
+                    rejection_reason="The daemon is using a different configuration.",
+                )
+        handle_idle()
+        if request.workers is not None:
+            request_workers = request.workers
+        elif workers is not None:
+            request_workers = workers
+        else:
+            request_workers = _get_workers(user_options)
+        with output.capture() as printed_lines:
+            output.print_heading("Import Linter", output.HEADING_LEVEL_ONE)
+            output.verbose_print(request.verbose, "Verbose mode.")
+            try:
+                if graph is None:
+                    raise graph_building_error or RuntimeError("The graph has not been built.")
+                report = _build_report(
+                    graph=graph,
+                    graph_building_duration=graph_building_duration,
+                    user_options=user_options,
+                    limit_to_contracts=request.limit_to_contracts,
+                    show_timings=request.show_timings,
+                    verbose=request.verbose,
+                    cache_dir=resolved_cache_dir,
+                    workers=request_workers,
+                    fail_fast=request.fail_fast,
+                    summary_only=request.summary_only,
+                )
+            except Exception as e:
+                render_exception(e)
+                passed = FAILURE
+            else:
+                render_report(report)
+                passed = FAILURE if report.contains_failures else SUCCESS
+        return CheckResponse(passed=passed, output=tuple(printed_lines))
+
+    start_using_user_options()
+    daemon_address = _get_daemon_address(address, resolved_cache_dir)
+    output.print(f"Listening for requests at {daemon_address}.")
+    settings.DAEMON_TRANSPORT.serve(daemon_address, handle_request, handle_idle)
+
+
+def lint_imports_using_daemon(
+    config_filename: Optional[str] = None,
+    address: Optional[str] = None,
+    cache_dir: Union[str, None, Type[NotSupplied]] = NotSupplied,
+    limit_to_contracts: Tuple[str, ...] = (),
+    show_timings: bool = False,
+    verbose: bool = False,
+    workers: Optional[int] = None,
+    fail_fast: bool = False,
+    summary_only: bool = False,
+) -> Optional[bool]:
+    """
+    Ask a running daemon (see serve) to check the contracts, and report on the results.
+
+    The daemon only does the check if it is using the same configuration as this process
+    would; otherwise nothing is reported, so the contracts can be checked locally instead.
+
+    Args:
+        config_filename:    the filename to use to parse user options.
+        address:            where the daemon is listening. Defaults to a socket in the cache
+                            directory.
+        cache_dir:          the cache directory the daemon is using, if address isn't supplied.
+        limit_to_contracts: if supplied, only lint the contracts with the supplied ids.
+        show_timings:       whether to show the times taken to build the graph and to check
+                            each contract.
+        verbose:            if True, noisily output progress as it goes along.
+        workers:            the number of processes for the daemon to use to check contracts.
+                            If not supplied, the daemon's number is used.
+        fail_fast:          if True, stop checking contracts once one is found to be broken.
+        summary_only:       if True, only report how many chains broke each contract.
+
+    Returns:
+        True if the linting passed, False if it didn't, or None if no daemon is running, or
+        it is using a different configuration (or the configuration can't be read).
+    """
+    daemon_address = _get_daemon_address(address, _resolve_cache_dir(cache_dir))
+    try:
+        # Any problems with the configuration are reported by the local check instead.
+        config_fingerprint = _fingerprint_user_options(
+            read_user_options(config_filename=config_filename)
+        )
+    except Exception:
+        return None
+    try:
+        response = settings.DAEMON_TRANSPORT.send_request(
+            daemon_address,
+            CheckRequest(
+                limit_to_contracts=limit_to_contracts,
+                show_timings=show_timings,
+                verbose=verbose,
+                fail_fast=fail_fast,
+                summary_only=summary_only,
+                workers=workers,
+                config_fingerprint=config_fingerprint,
+            ),
+        )
+    except DaemonNotRunning:
+        return None
+    if response.rejection_reason is not None:
+        output.verbose_print(verbose, f"{response.rejection_reason} Checking locally instead.")
+        return None
+    output.replay(response.output)
+    return response.passed
+
+
+def run_benchmarks(
+    output_file: str,
+    config_filename: Optional[str] = None,
+    limit_to_contracts: Tuple[str, ...] = (),
+    cache_dir: Union[str, None, Type[NotSupplied]] = NotSupplied,
+    rounds: int = DEFAULT_BENCHMARK_ROUNDS,
+    verbose: bool = False,
+) -> None:
+    """
+    Time how long it takes to check each contract, and save the results as JSON.
+
+    The graph is built once, then each contract is checked the supplied number of rounds in a
+    fresh worker process (see benchmarking.benchmark_contracts). Building the graph isn't timed.
+
+    Args:
+        output_file:        the file to save the results to.
+        config_filename:    the filename to use to parse user options.
+        limit_to_contracts: if supplied, only benchmark the contracts with the supplied ids.
+        cache_dir:          the directory to use for caching. Pass None to disable caching.
+        rounds:             the number of times to check each contract.
+        verbose:            if True, noisily output progress as it goes along.
+    """
+    output.print_heading("Import Linter benchmarks", output.HEADING_LEVEL_ONE)
+    results = _run_benchmarks(config_filename, limit_to_contracts, cache_dir, rounds, verbose)
+    rendering.render_benchmark_results(results)
+    settings.FILE_SYSTEM.write(output_file, benchmarking.serialize_results(results))
+
+
+def compare_benchmarks(
+    baseline_file: str,
+    results_file: Optional[str] = None,
+    output_file: Optional[str] = None,
+    threshold: float = DEFAULT_BENCHMARK_THRESHOLD,
+    min_difference: float = 0.0,
+    config_filename: Optional[str] = None,
+    limit_to_contracts: Tuple[str, ...] = (),
+    cache_dir: Union[str, None, Type[NotSupplied]] = NotSupplied,
+    rounds: int = DEFAULT_BENCHMARK_ROUNDS,
+    verbose: bool = False,
+) -> bool:
+    """
+    Compare benchmark results with a baseline saved earlier by run_benchmarks, and report on
+    the scenarios that have slowed down.
+
+    Args:
+        baseline_file:      the file the baseline results were saved to.
+        results_file:       if supplied, a file to read the results to compare from, instead
+                            of running the benchmarks.
+        output_file:        if supplied, a file to save the results of running the benchmarks
+                            to.
+        threshold:          the proportion by which a scenario's median duration may exceed the
+                            baseline's before it counts as a regression, e.g. 0.1 for 10%.
+        min_difference:     the number of seconds by which a scenario's median duration must
+                            also exceed the baseline's to count as a regression.
+        config_filename, limit_to_contracts, cache_dir, rounds, verbose:
+                            as for run_benchmarks.
+
+    Returns:
+        True if no scenarios have regressed, False if any have.
+
+    Raises:
+        InvalidBenchmarkResults: if the baseline or results file can't be read.
+    """
+    output.print_heading("Import Linter benchmarks", output.HEADING_LEVEL_ONE)
+    baseline = benchmarking.deserialize_results(settings.FILE_SYSTEM.read(baseline_file))
+    if results_file:
+        results = benchmarking.deserialize_results(settings.FILE_SYSTEM.read(results_file))
+    else:
+        results = _run_benchmarks(config_filename, limit_to_contracts, cache_dir, rounds, verbose)
+        if output_file:
+            settings.FILE_SYSTEM.write(output_file, benchmarking.serialize_results(results))
+
+    comparisons = benchmarking.compare_results(
+        baseline, results, threshold=threshold, min_difference=min_difference
+    )
+    rendering.render_benchmark_comparisons(comparisons, baseline, results, threshold)
+    if any(comparison.is_regression for comparison in comparisons):
+        return FAILURE
+    return SUCCESS
+
+
 # Private functions
 # -----------------
 
@@ -144,6 +562,43 @@ def _normalize_user_options(user_options: UserOptions) -> UserOptions:
     return normalized_options
 
 
+def _resolve_cache_dir(cache_dir: Union[str, None, Type[NotSupplied]]) -> Optional[str]:
+    if cache_dir is NotSupplied:
+        return settings.DEFAULT_CACHE_DIR
+    return cast(Optional[str], cache_dir)
+
+
+def _get_daemon_address(address: Optional[str], cache_dir: Optional[str]) -> str:
+    if address:
+        return address
+    return os.path.join(cache_dir or settings.DEFAULT_CACHE_DIR, DAEMON_SOCKET_FILENAME)
+
+
+def _fingerprint_user_options(user_options: UserOptions) -> str:
+    # The working directory is included, as it determines where the root packages are found.
+    return hashlib.blake2b(
+        json.dumps(
+            {
+                "working_directory": os.getcwd(),
+                "session_options": user_options.session_options,
+                "contracts_options": user_options.contracts_options,
+            },
+            sort_keys=True,
+            default=str,
+        ).encode(),
+        digest_size=20,
+    ).hexdigest()
+
+
+def _find_package_directories(package_names: Iterable[str]) -> List[str]:
+    directories = []
+    for package_name in package_names:
+        spec = importlib.util.find_spec(package_name)
+        if spec is not None and spec.submodule_search_locations:
+            directories.extend(spec.submodule_search_locations)
+    return directories
+
+
 def _build_graph(
     root_package_names: List[str],
     include_external_packages: Optional[bool],
@@ -167,20 +622,98 @@ def _build_graph(
     )
 
 
+def _get_root_packages_to_build(
+    user_options: UserOptions, limit_to_contracts: Tuple[str, ...], verbose: bool
+) -> List[str]:
+    """
+    Return the root packages to build the graph for.
+
+    If the only_build_referenced_root_packages option is set and the check is limited to
+    certain contracts, root packages that none of them refer to are left out, so the code in
+    them isn't scanned. This is opt-in, as chains that pass through the packages left out
+    (e.g. a.x -> b.y -> a.z, for a contract that only refers to a) won't be found.
+    """
+    root_package_names: List[str] = user_options.session_options["root_packages"]
+    if (
+        not limit_to_contracts
+        or len(root_package_names) == 1
+        or not _get_only_build_referenced_root_packages(user_options)
+    ):
+        return root_package_names
+
+    needed_root_packages: Set[str] = set()
+    for contract_options in _filter_contract_options(
+        user_options.contracts_options, limit_to_contracts
+    ):
+        contract_class = registry.get_contract_class(contract_options["type"])
+        try:
+            contract = contract_class(
+                name=contract_options["name"],
+                session_options=user_options.session_options,
+                contract_options=contract_options,
+            )
+        except InvalidContractOptions:
+            # This will be reported once the graph is built.
+            return root_package_names
+        referenced_root_packages = contract_utils.find_referenced_root_packages(
+            contract, root_package_names
+        )
+        if referenced_root_packages is None:
+            return root_package_names
+        needed_root_packages |= referenced_root_packages
+
+    if not needed_root_packages:
+        return root_package_names
+    names_to_build = [name for name in root_package_names if name in needed_root_packages]
+    if len(names_to_build) < len(root_package_names):
+        output.verbose_print(
+            verbose,
+            "Only building the graph for the root packages used by the selected contracts: "
+            f"{', '.join(names_to_build)}.",
+        )
+    return names_to_build
+
+
+def _load_graph(filename: str, root_package_names: List[str], verbose: bool) -> ImportGraph:
+    output.verbose_print(verbose, f"Loading import graph from {filename}...")
+    graph = settings.GRAPH_BUILDER.load(filename)
+    missing_packages = [name for name in root_package_names if name not in graph.modules]
+    if missing_packages:
+        raise ValueError(
+            f"The graph loaded from {filename} does not contain the root packages "
+            f"{', '.join(missing_packages)}. Was it dumped using a different configuration?"
+        )
+    return graph
+
+
 def _build_report(
     graph: ImportGraph,
-    graph_building_duration: int,
+    graph_building_duration: float,
     user_options: UserOptions,
     limit_to_contracts: Tuple[str, ...],
     show_timings: bool,
     verbose: bool,
+    cache_dir: Optional[str] = None,
+    workers: int = 1,
+    changed_modules: Optional[Set[str]] = None,
+    fail_fast: bool = False,
+    profile_directory: Optional[str] = None,
+    summary_only: bool = False,
 ) -> Report:
+    if summary_only:
+        # Contracts find out about summary only mode from their session options. This also
+        # keeps summary only results separate from full ones in the cache.
+        user_options = UserOptions(
+            session_options={**user_options.session_options, "summary_only": True},
+            contracts_options=user_options.contracts_options,
+        )
     report = Report(
         graph=graph, show_timings=show_timings, graph_building_duration=graph_building_duration
     )
     contracts_options = _filter_contract_options(
         user_options.contracts_options, limit_to_contracts
     )
+    contracts: List[Contract] = []
     for contract_options in contracts_options:
         contract_class = registry.get_contract_class(contract_options["type"])
         try:
@@ -192,19 +725,376 @@ def _build_report(
         except InvalidContractOptions as e:
             report.add_invalid_contract_options(contract_options["name"], e)
             return report
+        contracts.append(contract)
+
+    checks_and_durations: Dict[Contract, Tuple[ContractCheck, float]] = {}
+    duration_history: Dict[str, List[float]] = {}
+    median_durations: Dict[Contract, float] = {}
+    if cache_dir:
+        graph_fingerprint = check_caching.fingerprint_graph(graph)
+        contract_keys = {
+            contract: check_caching.build_contract_key(contract) for contract in contracts
+        }
+        checks_and_durations.update(
+            _read_cached_checks(
+                graph, contract_keys, graph_fingerprint, changed_modules, cache_dir, verbose
+            )
+        )
+        duration_history = settings.CONTRACT_CHECK_CACHE.read_durations(cache_dir)
+        median_durations_by_key = scheduling.get_median_durations(duration_history)
+        median_durations = {
+            contract: median_durations_by_key[contract_key]
+            for contract, contract_key in contract_keys.items()
+            if contract_key in median_durations_by_key
+        }
+
+    contracts_to_check = [c for c in contracts if c not in checks_and_durations]
+    if fail_fast:
+        if any(not check.kept for check, _ in checks_and_durations.values()):
+            # We already know a contract is broken.
+            contracts_to_check = []
+        previously_broken_contracts = (
+            _find_previously_broken_contracts(contracts_to_check, contract_keys, cache_dir)
+            if cache_dir
+            else set()
+        )
+        contracts_to_check = scheduling.order_for_fail_fast(
+            contracts_to_check, median_durations, previously_broken_contracts
+        )
+    elif workers > 1:
+        contracts_to_check = scheduling.order_longest_first(contracts_to_check, median_durations)
+
+    new_checks_and_durations: List[Optional[Tuple[ContractCheck, float]]] = []
+    if contracts_to_check:
+        with _remove_shared_ignored_imports(
+            graph, _get_shared_ignore_imports(user_options), verbose
+        ) as graph_to_check:
+            reachability_index: Optional[ReachabilityIndex] = None
+            if _get_use_reachability_index(user_options):
+                reachability_index = _build_reachability_index(graph_to_check, verbose)
+
+            if workers > 1 and len(contracts_to_check) > 1:
+                new_checks_and_durations = _check_contracts_in_parallel(
+                    graph_to_check,
+                    contracts_to_check,
+                    user_options,
+                    workers=min(workers, len(contracts_to_check)),
+                    verbose=verbose,
+                    fail_fast=fail_fast,
+                    profile_directory=profile_directory,
+                    reachability_index=reachability_index,
+                )
+            else:
+                # Consumed here, so that every contract is checked before the shared ignored
+                # imports are restored.
+                new_checks_and_durations = list(
+                    _check_contracts_serially(
+                        graph_to_check,
+                        contracts_to_check,
+                        verbose,
+                        fail_fast=fail_fast,
+                        profile_directory=profile_directory,
+                        reachability_index=reachability_index,
+                    )
+                )
+
+    for contract, check_and_duration in zip(contracts_to_check, new_checks_and_durations):
+        if check_and_duration is None:
+            # Not checked, as another contract was found to be broken first.
+            continue
+        checks_and_durations[contract] = check_and_duration
+        if cache_dir:
+            check, _ = check_and_duration
+            settings.CONTRACT_CHECK_CACHE.write(
+                cache_dir,
+                contract_keys[contract],
+                CachedContractCheck(
+                    graph_fingerprint=graph_fingerprint.value, check=_get_check_to_cache(check)
+                ),
+            )
+    if cache_dir:
+        settings.CONTRACT_CHECK_CACHE.write_graph_fingerprint(cache_dir, graph_fingerprint)
+        new_durations = {
+            contract_keys[contract]: checks_and_durations[contract][1]
+            for contract in contracts_to_check
+            if contract in checks_and_durations
+        }
+        if new_durations:
+            settings.CONTRACT_CHECK_CACHE.write_durations(
+                cache_dir, scheduling.record_durations(duration_history, new_durations)
+            )
+
+    for contract in contracts:
+        if contract in checks_and_durations:
+            check, duration = checks_and_durations[contract]
+            report.add_contract_check(
+                contract,
+                check,
+                duration=duration,
+                median_duration=median_durations.get(contract),
+            )
+        else:
+            report.add_skipped_contract(contract)
+
+    output.verbose_print(verbose, newline=True)
+    return report
 
+
+def _read_cached_checks(
+    graph: ImportGraph,
+    contract_keys: Dict[Contract, str],
+    graph_fingerprint: GraphFingerprint,
+    changed_modules: Optional[Set[str]],
+    cache_dir: str,
+    verbose: bool,
+) -> Dict[Contract, Tuple[ContractCheck, float]]:
+    """
+    Return the results of any contracts that don't need checking again.
+
+    These are contracts that were previously checked against the same graph, and contracts
+    checked against the graph from the previous run that aren't affected by the changed modules.
+    """
+    previous_graph_fingerprint = settings.CONTRACT_CHECK_CACHE.read_graph_fingerprint(cache_dir)
+    affected_packages: Optional[Set[str]] = None
+    if previous_graph_fingerprint is not None:
+        if changed_modules is None:
+            changed_modules = check_caching.find_changed_modules(
+                previous_graph_fingerprint, graph_fingerprint
+            )
+        affected_packages = check_caching.find_packages_affected_by_changes(graph, changed_modules)
+
+    cached_checks_and_durations = {}
+    for contract, contract_key in contract_keys.items():
+        cached_check = settings.CONTRACT_CHECK_CACHE.read(cache_dir, contract_key)
+        if cached_check is None:
+            continue
+        if not cached_check.check.kept:
+            # The graph fingerprint doesn't cover the details of each import, so the details of
+            # a broken contract (such as line numbers) may be out of date.
+            continue
+        if cached_check.graph_fingerprint == graph_fingerprint.value:
+            output.verbose_print(verbose, f"Using cached result for {contract.name}.")
+        elif (
+            previous_graph_fingerprint is not None
+            and affected_packages is not None
+            and cached_check.graph_fingerprint == previous_graph_fingerprint.value
+            and not check_caching.contract_is_affected_by_changes(contract, affected_packages)
+        ):
+            output.verbose_print(
+                verbose,
+                f"Reusing result for {contract.name}, as it is not affected by the changes.",
+            )
+            settings.CONTRACT_CHECK_CACHE.write(
+                cache_dir,
+                contract_key,
+                CachedContractCheck(
+                    graph_fingerprint=graph_fingerprint.value, check=cached_check.check
+                ),
+            )
+        else:
+            continue
+        if verbose:
+            rendering.render_contract_result_line(contract, cached_check.check, duration=0.0)
+        # No time was spent checking the contract.
+        cached_checks_and_durations[contract] = (cached_check.check, 0.0)
+    return cached_checks_and_durations
+
+
+def _get_check_to_cache(check: ContractCheck) -> ContractCheck:
+    """
+    Return the version of the check to store in the cache.
+
+    Cached broken checks are never reused (see _read_cached_checks), only used to find which
+    contracts were broken last time. So only that they were broken is stored: pickling the
+    whole check would build its metadata, which may be expensive (see ContractCheck).
+    """
+    if check.kept:
+        return check
+    return ContractCheck(kept=False)
+
+
+def _find_previously_broken_contracts(
+    contracts: List[Contract], contract_keys: Dict[Contract, str], cache_dir: str
+) -> Set[Contract]:
+    """
+    Return the contracts that were broken when they were last checked.
+    """
+    previously_broken_contracts = set()
+    for contract in contracts:
+        cached_check = settings.CONTRACT_CHECK_CACHE.read(cache_dir, contract_keys[contract])
+        if cached_check is not None and not cached_check.check.kept:
+            previously_broken_contracts.add(contract)
+    return previously_broken_contracts
+
+
+def _check_contracts_serially(
+    graph: ImportGraph,
+    contracts: List[Contract],
+    verbose: bool,
+    fail_fast: bool = False,
+    profile_directory: Optional[str] = None,
+    reachability_index: Optional[ReachabilityIndex] = None,
+) -> Iterator[Tuple[ContractCheck, float]]:
+    """
+    Check each contract in turn. In fail fast mode, stop after the first broken contract.
+    """
+    # Every overlay starts from the same graph, so they can share the imports matched by
+    # each import expression (typically the ignored imports that contracts have in common),
+    # and indexes of the module names.
+    matching_imports_cache: Dict[str, List[Import]] = {}
+    module_name_index = build_module_name_index(graph)
+    hierarchy_index = build_hierarchy_index(graph)
+    for contract in contracts:
         output.verbose_print(verbose, f"Checking {contract.name}...")
-        with settings.TIMER as timer:
-            # Make a copy so that contracts can mutate the graph without affecting
+        peak_memory: Optional[int] = None
+        with tracing.span("Check contract", contract=contract.name), settings.TIMER as timer:
+            # Check against an overlay so that contracts can mutate the graph without affecting
             # other contract checks.
-            copy_of_graph = deepcopy(graph)
-            check = contract.check(copy_of_graph, verbose=verbose)
-        report.add_contract_check(contract, check, duration=timer.duration_in_s)
+            with GraphOverlay(
+                graph,
+                reachability_index,
+                matching_imports_cache,
+                module_name_index,
+                hierarchy_index,
+            ) as overlay:
+                if profile_directory:
+                    check, peak_memory = profiling.check_contract_with_profiling(
+                        contract, overlay, verbose, profile_directory
+                    )
+                else:
+                    check = contract.check(overlay, verbose=verbose)
         if verbose:
-            rendering.render_contract_result_line(contract, check, duration=timer.duration_in_s)
+            rendering.render_contract_result_line(
+                contract, check, duration=timer.duration_in_s, peak_memory=peak_memory
+            )
+        yield check, timer.duration_in_s
+        if fail_fast and not check.kept:
+            return
 
-    output.verbose_print(verbose, newline=True)
-    return report
+
+def _check_contracts_in_parallel(
+    graph: ImportGraph,
+    contracts: List[Contract],
+    user_options: UserOptions,
+    workers: int,
+    verbose: bool,
+    fail_fast: bool = False,
+    profile_directory: Optional[str] = None,
+    reachability_index: Optional[ReachabilityIndex] = None,
+) -> List[Optional[Tuple[ContractCheck, float]]]:
+    output.verbose_print(
+        verbose, f"Checking {len(contracts)} contracts using {workers} worker processes..."
+    )
+    with tracing.span("Check contracts in parallel", workers=workers):
+        results = parallel.check_contracts_in_parallel(
+            graph,
+            tasks=[(contract.__class__, contract.contract_options) for contract in contracts],
+            session_options=user_options.session_options,
+            workers=workers,
+            fail_fast=fail_fast,
+            profile_directory=profile_directory,
+            reachability_index=reachability_index,
+        )
+    checks_and_durations: List[Optional[Tuple[ContractCheck, float]]] = []
+    for contract, result in zip(contracts, results):
+        if result is None:
+            checks_and_durations.append(None)
+            continue
+        check, duration, peak_memory = result
+        if verbose:
+            rendering.render_contract_result_line(
+                contract, check, duration=duration, peak_memory=peak_memory
+            )
+        checks_and_durations.append((check, duration))
+    return checks_and_durations
+
+
+def _run_benchmarks(
+    config_filename: Optional[str],
+    limit_to_contracts: Tuple[str, ...],
+    cache_dir: Union[str, None, Type[NotSupplied]],
+    rounds: int,
+    verbose: bool,
+) -> benchmarking.BenchmarkResults:
+    user_options = read_user_options(config_filename=config_filename)
+    _register_contract_types(user_options)
+    graph = _build_graph(
+        root_package_names=_get_root_packages_to_build(user_options, limit_to_contracts, verbose),
+        cache_dir=_resolve_cache_dir(cache_dir),
+        include_external_packages=_get_include_external_packages(user_options),
+        exclude_type_checking_imports=_get_exclude_type_checking_imports(user_options),
+        verbose=verbose,
+    )
+    tasks: List[parallel.ContractTask] = []
+    for contract_options in _filter_contract_options(
+        user_options.contracts_options, limit_to_contracts
+    ):
+        contract_class = registry.get_contract_class(contract_options["type"])
+        # Fail early if the options are invalid, rather than in a worker.
+        contract_class(
+            name=contract_options["name"],
+            session_options=user_options.session_options,
+            contract_options=contract_options,
+        )
+        tasks.append((contract_class, contract_options))
+
+    output.verbose_print(
+        verbose, f"Benchmarking {len(tasks)} contracts, checking each {rounds} times..."
+    )
+    with _remove_shared_ignored_imports(
+        graph, _get_shared_ignore_imports(user_options), verbose
+    ) as graph_to_check:
+        return benchmarking.benchmark_contracts(
+            graph_to_check, tasks, session_options=user_options.session_options, rounds=rounds
+        )
+
+
+@contextlib.contextmanager
+def _remove_shared_ignored_imports(
+    graph: ImportGraph, ignore_imports: List[ImportExpression], verbose: bool
+) -> Iterator[ImportGraph]:
+    """
+    Remove the imports ignored by every contract from the graph, restoring them on exit.
+
+    The imports are removed from an overlay of the graph, which is what is yielded. If there
+    are none to remove, the graph itself is yielded.
+    """
+    if not ignore_imports:
+        yield graph
+        return
+    output.verbose_print(verbose, "Removing shared ignored imports...")
+    with GraphOverlay(graph) as overlay:
+        with settings.TIMER as timer:
+            # Expressions that don't match are skipped, as the graph may only have been built
+            # for some of the root packages (see _get_root_packages_to_build).
+            contract_utils.remove_ignored_imports(
+                graph=overlay,
+                ignore_imports=ignore_imports,
+                unmatched_alerting=contract_utils.AlertLevel.NONE,
+            )
+        output.verbose_print(
+            verbose,
+            f"Removed shared ignored imports in {output.format_duration(timer.duration_in_s)}.",
+        )
+        yield overlay
+
+
+def _build_reachability_index(graph: ImportGraph, verbose: bool) -> ReachabilityIndex:
+    output.verbose_print(verbose, "Building reachability index...")
+    with tracing.span("Build reachability index"), settings.TIMER as timer:
+        reachability_index = build_reachability_index(graph)
+    output.verbose_print(
+        verbose,
+        f"Built reachability index of {reachability_index.component_count} components "
+        f"in {output.format_duration(timer.duration_in_s)}.",
+    )
+    return reachability_index
+
+
+def _write_trace(trace_file: str, verbose: bool) -> None:
+    output.verbose_print(verbose, f"Writing trace to {trace_file}...")
+    spans = tracing.stop_recording()
+    settings.FILE_SYSTEM.write(trace_file, tracing.render_chrome_trace(spans))
 
 
 def _filter_contract_options(
@@ -316,6 +1206,66 @@ def _get_exclude_type_checking_imports(user_options: UserOptions) -> bool:
     return exclude_type_checking_imports_str in ("True", "true")
 
 
+def _get_workers(user_options: UserOptions) -> int:
+    """
+    Get the number of worker processes from the workers option in user_options.
+    """
+    try:
+        workers_str = user_options.session_options["workers"]
+    except KeyError:
+        return 1
+    try:
+        workers = int(workers_str)
+    except ValueError:
+        raise ValueError(f"Invalid workers option '{workers_str}': expected an integer.")
+    if workers < 1:
+        raise ValueError(f"Invalid workers option '{workers_str}': must be at least 1.")
+    return workers
+
+
+def _get_shared_ignore_imports(user_options: UserOptions) -> List[ImportExpression]:
+    """
+    Get the imports ignored by every contract from the shared_ignore_imports option in
+    user_options.
+    """
+    try:
+        shared_ignore_imports = user_options.session_options["shared_ignore_imports"]
+    except KeyError:
+        return []
+    try:
+        return fields.ListField(subfield=fields.ImportExpressionField()).parse(
+            shared_ignore_imports
+        )
+    except fields.ValidationError as e:
+        raise ValueError(f"Invalid shared_ignore_imports option: {e.message}")
+
+
+def _get_use_reachability_index(user_options: UserOptions) -> bool:
+    """
+    Get a boolean for the reachability_index option in user_options.
+    """
+    try:
+        reachability_index_str = user_options.session_options["reachability_index"]
+    except KeyError:
+        return False
+    # Cast the string to a boolean.
+    return reachability_index_str in ("True", "true")
+
+
+def _get_only_build_referenced_root_packages(user_options: UserOptions) -> bool:
+    """
+    Get a boolean for the only_build_referenced_root_packages option in user_options.
+    """
+    try:
+        only_build_referenced_root_packages_str = user_options.session_options[
+            "only_build_referenced_root_packages"
+        ]
+    except KeyError:
+        return False
+    # Cast the string to a boolean.
+    return only_build_referenced_root_packages_str in ("True", "true")
+
+
 def _get_show_timings(user_options: UserOptions) -> bool:
     """
     Get a boolean (or None) for the show_timings option in user_options.
@@ -1,14 +1,15 @@
 import os
+import signal
 import sys
 from logging import config as logging_config
-from typing import Optional, Tuple, Type, Union
+from typing import Callable, Optional, Tuple, Type, Union
 
 import click
 
 from importlinter.application.sentinels import NotSupplied
 
 from . import configuration
-from .application import use_cases
+from .application import rendering, use_cases
 
 configuration.configure()
 
@@ -37,6 +38,57 @@ EXIT_STATUS_ERROR = 1
     is_flag=True,
     help="Noisily output progress as we go along.",
 )
+@click.option(
+    "--workers",
+    default=None,
+    type=click.IntRange(min=1),
+    help="The number of processes to use to check contracts in parallel.",
+)
+@click.option(
+    "--fail-fast",
+    is_flag=True,
+    help="Stop checking contracts as soon as one is found to be broken.",
+)
+@click.option(
+    "--summary-only",
+    is_flag=True,
+    help="Only report whether each contract is kept, not the import chains that broke it.",
+)
+@click.option(
+    "--dump-graph",
+    default=None,
+    help="Save a snapshot of the import graph to the supplied file, for reuse by later runs.",
+)
+@click.option(
+    "--load-graph",
+    default=None,
+    help="Load the import graph from a file saved by --dump-graph, instead of building it.",
+)
+@click.option(
+    "--trace",
+    default=None,
+    help="Write a trace of where the time went to the supplied file, in Chrome trace format.",
+)
+@click.option(
+    "--profile-contracts",
+    default=None,
+    help="Profile each contract check, saving the profiles to the supplied directory.",
+)
+@click.option(
+    "--serve",
+    is_flag=True,
+    help="Run a daemon that keeps the graph in memory, checking contracts on request.",
+)
+@click.option(
+    "--use-daemon",
+    is_flag=True,
+    help="Ask a daemon started with --serve to do the check, if one is running.",
+)
+@click.option(
+    "--socket",
+    default=None,
+    help="The socket used to communicate with the daemon. Defaults to one in the cache directory.",
+)
 def lint_imports_command(
     config: Optional[str],
     contract: Tuple[str, ...],
@@ -45,10 +97,32 @@ def lint_imports_command(
     debug: bool,
     show_timings: bool,
     verbose: bool,
+    workers: Optional[int],
+    fail_fast: bool,
+    summary_only: bool,
+    dump_graph: Optional[str],
+    load_graph: Optional[str],
+    trace: Optional[str],
+    profile_contracts: Optional[str],
+    serve: bool,
+    use_daemon: bool,
+    socket: Optional[str],
 ) -> int:
     """
     Check that a project adheres to a set of contracts.
     """
+    if serve:
+        exit_code = serve_daemon(
+            config_filename=config,
+            socket=socket,
+            cache_dir=cache_dir,
+            no_cache=no_cache,
+            is_debug_mode=debug,
+            verbose=verbose,
+            workers=workers,
+        )
+        sys.exit(exit_code)
+
     exit_code = lint_imports(
         config_filename=config,
         limit_to_contracts=contract,
@@ -57,6 +131,15 @@ def lint_imports_command(
         is_debug_mode=debug,
         show_timings=show_timings,
         verbose=verbose,
+        workers=workers,
+        fail_fast=fail_fast,
+        summary_only=summary_only,
+        dump_graph=dump_graph,
+        load_graph=load_graph,
+        trace_file=trace,
+        profile_directory=profile_contracts,
+        use_daemon=use_daemon,
+        socket=socket,
     )
     sys.exit(exit_code)
 
@@ -69,6 +152,15 @@ def lint_imports(
     is_debug_mode: bool = False,
     show_timings: bool = False,
     verbose: bool = False,
+    workers: Optional[int] = None,
+    fail_fast: bool = False,
+    summary_only: bool = False,
+    dump_graph: Optional[str] = None,
+    load_graph: Optional[str] = None,
+    trace_file: Optional[str] = None,
+    profile_directory: Optional[str] = None,
+    use_daemon: bool = False,
+    socket: Optional[str] = None,
 ) -> int:
     """
     Check that a project adheres to a set of contracts.
@@ -85,6 +177,24 @@ def lint_imports(
         show_timings:       whether to show the times taken to build the graph and to check
                             each contract.
         verbose:            if True, noisily output progress as it goes along.
+        workers:            the number of processes to use to check contracts. If not supplied,
+                            the workers option in the config file is used, or failing that, 1.
+        fail_fast:          if True, stop checking contracts once one is found to be broken.
+        summary_only:       if True, only report how many import chains broke each contract,
+                            which is quicker than working out what they are.
+        dump_graph:         if supplied, a file to save a snapshot of the import graph to.
+        load_graph:         if supplied, a file saved by dump_graph to load the import graph
+                            from, instead of building it.
+        trace_file:         if supplied, a file to write a trace of where the time went to, in
+                            the Chrome trace event format.
+        profile_directory:  if supplied, a directory to save a profile of each contract check
+                            to, as a .pstats file named after the contract's id.
+        use_daemon:         if True, ask a running daemon (see serve_daemon) to do the check.
+                            The check is done in this process instead if no daemon is running,
+                            the daemon is using a different configuration, or any of
+                            dump_graph, load_graph, trace_file, profile_directory or
+                            is_debug_mode are supplied.
+        socket:             the socket the daemon is listening on, if use_daemon is True.
 
     Returns:
         EXIT_STATUS_SUCCESS or EXIT_STATUS_ERROR.
@@ -96,6 +206,26 @@ def lint_imports(
 
     combined_cache_dir = _combine_caching_arguments(cache_dir, no_cache)
 
+    # The daemon can't do anything with the graph other than check the contracts, and it
+    # reports exceptions rather than raising them.
+    can_use_daemon = not (
+        dump_graph or load_graph or trace_file or profile_directory or is_debug_mode
+    )
+    if use_daemon and can_use_daemon:
+        passed_using_daemon = use_cases.lint_imports_using_daemon(
+            config_filename=config_filename,
+            address=socket,
+            cache_dir=combined_cache_dir,
+            limit_to_contracts=limit_to_contracts,
+            show_timings=show_timings,
+            verbose=verbose,
+            workers=workers,
+            fail_fast=fail_fast,
+            summary_only=summary_only,
+        )
+        if passed_using_daemon is not None:
+            return EXIT_STATUS_SUCCESS if passed_using_daemon else EXIT_STATUS_ERROR
+
     passed = use_cases.lint_imports(
         config_filename=config_filename,
         limit_to_contracts=limit_to_contracts,
@@ -103,6 +233,13 @@ def lint_imports(
         is_debug_mode=is_debug_mode,
         show_timings=show_timings,
         verbose=verbose,
+        workers=workers,
+        dump_graph=dump_graph,
+        load_graph=load_graph,
+        fail_fast=fail_fast,
+        trace_file=trace_file,
+        summary_only=summary_only,
+        profile_directory=profile_directory,
     )
 
     if passed:
@@ -111,6 +248,291 @@ def lint_imports(
         return EXIT_STATUS_ERROR
 
 
+def serve_daemon(
+    config_filename: Optional[str] = None,
+    socket: Optional[str] = None,
+    cache_dir: Optional[str] = None,
+    no_cache: bool = False,
+    is_debug_mode: bool = False,
+    verbose: bool = False,
+    workers: Optional[int] = None,
+) -> int:
+    """
+    Run a daemon that keeps the import graph in memory, and checks contracts when asked to
+    by lint_imports(use_daemon=True).
+
+    Args:
+        config_filename: the filename to use to parse user options.
+        socket:          the socket to listen on. Defaults to one in the cache directory.
+        cache_dir:       the directory to use for caching, defaults to '.import_linter_cache'.
+        no_cache:        if True, disable caching.
+        is_debug_mode:   whether debugging should be turned on. In debug mode, exceptions are
+                         not swallowed at the top level, so the stack trace can be seen.
+        verbose:         if True, noisily output what the daemon is doing.
+        workers:         the number of processes to use to check contracts.
+
+    Returns:
+        EXIT_STATUS_SUCCESS once interrupted, or EXIT_STATUS_ERROR if the daemon failed.
+    """
+    # Add current directory to the path, as this doesn't happen automatically.
+    sys.path.insert(0, os.getcwd())
+
+    _configure_logging(verbose)
+    # Shut down cleanly when terminated, as well as when interrupted.
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+
+    try:
+        use_cases.serve(
+            config_filename=config_filename,
+            address=socket,
+            cache_dir=_combine_caching_arguments(cache_dir, no_cache),
+            workers=workers,
+            verbose=verbose,
+        )
+    except KeyboardInterrupt:
+        return EXIT_STATUS_SUCCESS
+    except Exception as e:
+        if is_debug_mode:
+            raise e
+        rendering.render_exception(e)
+        return EXIT_STATUS_ERROR
+    return EXIT_STATUS_SUCCESS
+
+
+@click.group()
+def lint_imports_bench_command() -> None:
+    """
+    Benchmark how long it takes to check each contract, to catch performance regressions.
+    """
+
+
+def _benchmark_options(function: Callable) -> Callable:
+    # Options shared by the benchmarking commands.
+    options = [
+        click.option("--config", default=None, help="The config file to use."),
+        click.option(
+            "--contract",
+            default=list,
+            multiple=True,
+            help=(
+                "Limit the benchmarks to the supplied contract identifier. "
+                "May be passed multiple times."
+            ),
+        ),
+        click.option("--cache-dir", default=None, help="The directory to use for caching."),
+        click.option("--no-cache", is_flag=True, help="Disable caching."),
+        click.option(
+            "--rounds",
+            default=use_cases.DEFAULT_BENCHMARK_ROUNDS,
+            show_default=True,
+            type=click.IntRange(min=1),
+            help="The number of times to check each contract.",
+        ),
+        click.option("--debug", is_flag=True, help="Run in debug mode."),
+        click.option("--verbose", is_flag=True, help="Noisily output progress as we go along."),
+    ]
+    for option in reversed(options):
+        function = option(function)
+    return function
+
+
+@lint_imports_bench_command.command("run")
+@_benchmark_options
+@click.option("--output", required=True, help="The file to save the results to, as JSON.")
+def run_benchmarks_command(
+    config: Optional[str],
+    contract: Tuple[str, ...],
+    cache_dir: Optional[str],
+    no_cache: bool,
+    rounds: int,
+    debug: bool,
+    verbose: bool,
+    output: str,
+) -> None:
+    """
+    Benchmark each contract check, saving the results.
+    """
+    exit_code = run_benchmarks(
+        output_file=output,
+        config_filename=config,
+        limit_to_contracts=contract,
+        cache_dir=cache_dir,
+        no_cache=no_cache,
+        rounds=rounds,
+        is_debug_mode=debug,
+        verbose=verbose,
+    )
+    sys.exit(exit_code)
+
+
+@lint_imports_bench_command.command("compare")
+@click.argument("baseline")
+@_benchmark_options
+@click.option(
+    "--results",
+    default=None,
+    help="Compare the results saved to the supplied file, instead of running the benchmarks.",
+)
+@click.option("--output", default=None, help="Save the results to the supplied file, as JSON.")
+@click.option(
+    "--threshold",
+    default=use_cases.DEFAULT_BENCHMARK_THRESHOLD * 100,
+    show_default=True,
+    type=click.FloatRange(min=0),
+    help="The percentage by which a contract check may slow down before the comparison fails.",
+)
+@click.option(
+    "--min-difference",
+    default=0,
+    show_default=True,
+    type=click.FloatRange(min=0),
+    help=(
+        "The number of milliseconds by which a contract check must also slow down "
+        "for the comparison to fail."
+    ),
+)
+def compare_benchmarks_command(
+    baseline: str,
+    config: Optional[str],
+    contract: Tuple[str, ...],
+    cache_dir: Optional[str],
+    no_cache: bool,
+    rounds: int,
+    debug: bool,
+    verbose: bool,
+    results: Optional[str],
+    output: Optional[str],
+    threshold: float,
+    min_difference: float,
+) -> None:
+    """
+    Benchmark each contract check, comparing the results with a baseline saved by 'run'.
+
+    Fails if any contract check has slowed down by more than the threshold.
+    """
+    exit_code = compare_benchmarks(
+        baseline_file=baseline,
+        results_file=results,
+        output_file=output,
+        threshold=threshold / 100,
+        min_difference=min_difference / 1000,
+        config_filename=config,
+        limit_to_contracts=contract,
+        cache_dir=cache_dir,
+        no_cache=no_cache,
+        rounds=rounds,
+        is_debug_mode=debug,
+        verbose=verbose,
+    )
+    sys.exit(exit_code)
+
+
+def run_benchmarks(
+    output_file: str,
+    config_filename: Optional[str] = None,
+    limit_to_contracts: Tuple[str, ...] = (),
+    cache_dir: Optional[str] = None,
+    no_cache: bool = False,
+    rounds: int = use_cases.DEFAULT_BENCHMARK_ROUNDS,
+    is_debug_mode: bool = False,
+    verbose: bool = False,
+) -> int:
+    """
+    Benchmark each contract check, saving the results to a file.
+
+    Args:
+        output_file:        the file to save the results to, as JSON.
+        config_filename:    the filename to use to parse user options.
+        limit_to_contracts: if supplied, only benchmark the contracts with the supplied ids.
+        cache_dir:          the directory to use for caching, defaults to '.import_linter_cache'.
+        no_cache:           if True, disable caching.
+        rounds:             the number of times to check each contract.
+        is_debug_mode:      whether debugging should be turned on. In debug mode, exceptions are
+                            not swallowed at the top level, so the stack trace can be seen.
+        verbose:            if True, noisily output progress as it goes along.
+
+    Returns:
+        EXIT_STATUS_SUCCESS or EXIT_STATUS_ERROR.
+    """
+    # Add current directory to the path, as this doesn't happen automatically.
+    sys.path.insert(0, os.getcwd())
+
+    _configure_logging(verbose)
+
+    try:
+        use_cases.run_benchmarks(
+            output_file=output_file,
+            config_filename=config_filename,
+            limit_to_contracts=limit_to_contracts,
+            cache_dir=_combine_caching_arguments(cache_dir, no_cache),
+            rounds=rounds,
+            verbose=verbose,
+        )
+    except Exception as e:
+        if is_debug_mode:
+            raise e
+        rendering.render_exception(e)
+        return EXIT_STATUS_ERROR
+    return EXIT_STATUS_SUCCESS
+
+
+def compare_benchmarks(
+    baseline_file: str,
+    results_file: Optional[str] = None,
+    output_file: Optional[str] = None,
+    threshold: float = use_cases.DEFAULT_BENCHMARK_THRESHOLD,
+    min_difference: float = 0.0,
+    config_filename: Optional[str] = None,
+    limit_to_contracts: Tuple[str, ...] = (),
+    cache_dir: Optional[str] = None,
+    no_cache: bool = False,
+    rounds: int = use_cases.DEFAULT_BENCHMARK_ROUNDS,
+    is_debug_mode: bool = False,
+    verbose: bool = False,
+) -> int:
+    """
+    Benchmark each contract check, and compare the results with a baseline.
+
+    Args:
+        baseline_file:  the file the baseline results were saved to by run_benchmarks.
+        results_file:   if supplied, a file to read the results to compare from, instead of
+                        running the benchmarks.
+        output_file:    if supplied, a file to save the results of running the benchmarks to.
+        threshold:      the proportion by which a contract check may slow down before it counts
+                        as a regression, e.g. 0.1 for 10%.
+        min_difference: the number of seconds by which a contract check must also slow down to
+                        count as a regression.
+        Other arguments are as for run_benchmarks.
+
+    Returns:
+        EXIT_STATUS_SUCCESS, or EXIT_STATUS_ERROR if any contract check has regressed.
+    """
+    # Add current directory to the path, as this doesn't happen automatically.
+    sys.path.insert(0, os.getcwd())
+
+    _configure_logging(verbose)
+
+    try:
+        passed = use_cases.compare_benchmarks(
+            baseline_file=baseline_file,
+            results_file=results_file,
+            output_file=output_file,
+            threshold=threshold,
+            min_difference=min_difference,
+            config_filename=config_filename,
+            limit_to_contracts=limit_to_contracts,
+            cache_dir=_combine_caching_arguments(cache_dir, no_cache),
+            rounds=rounds,
+            verbose=verbose,
+        )
+    except Exception as e:
+        if is_debug_mode:
+            raise e
+        rendering.render_exception(e)
+        return EXIT_STATUS_ERROR
+    return EXIT_STATUS_SUCCESS if passed else EXIT_STATUS_ERROR
+
+
 def _combine_caching_arguments(
     cache_dir: Optional[str], no_cache: bool
 ) -> Union[str, None, Type[NotSupplied]]:
@@ -1,8 +1,12 @@
 from .adapters.building import GraphBuilder
+from .adapters.caching import PickleContractCheckCache
 from .adapters.filesystem import FileSystem
 from .adapters.printing import ClickPrinter
+from .adapters.profiling import CProfileProfiler
+from .adapters.serving import UnixSocketDaemonTransport
 from .adapters.timing import SystemClockTimer
 from .adapters.user_options import IniFileUserOptionReader, TomlFileUserOptionReader
+from .adapters.watching import InotifyFileWatcher, PollingFileWatcher
 from .application.app_config import settings
 
 
@@ -13,8 +17,14 @@ def configure():
             "toml": TomlFileUserOptionReader(),
         },
         GRAPH_BUILDER=GraphBuilder(),
+        CONTRACT_CHECK_CACHE=PickleContractCheckCache(),
         PRINTER=ClickPrinter(),
         FILE_SYSTEM=FileSystem(),
         TIMER=SystemClockTimer(),
+        PROFILER=CProfileProfiler(),
+        FILE_WATCHER=(
+            InotifyFileWatcher() if InotifyFileWatcher.is_available() else PollingFileWatcher()
+        ),
+        DAEMON_TRANSPORT=UnixSocketDaemonTransport(),
         DEFAULT_CACHE_DIR=".import_linter_cache",
     )
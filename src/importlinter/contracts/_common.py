@@ -9,14 +9,15 @@ without warning.
 from __future__ import annotations
 
 import itertools
-from typing import List, Optional, Sequence, Tuple, Union
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple, Union
 
 import grimp
 from grimp import ImportGraph
 from typing_extensions import TypedDict
 
-from importlinter.application import output
-from importlinter.domain.imports import Module
+from importlinter.application import contract_utils, output
+from importlinter.domain import fields
+from importlinter.domain.imports import ImportExpression, Module, ModuleExpression
 
 
 class Link(TypedDict):
@@ -35,6 +36,174 @@ class DetailedChain(TypedDict):
     extra_lasts: List[Link]
 
 
+class OmittedChains(TypedDict, total=False):
+    # Only present if there were more chains than the maximum, in which case the rest are
+    # left out.
+    omitted_chain_count: int
+
+
+class DependencySummary(TypedDict):
+    """
+    A broken dependency, as reported in summary only mode: how many chains there are, but not
+    what they are.
+    """
+
+    importer: str
+    imported: str
+    chain_count: int
+
+
+def import_expressions_to_module_expressions(
+    expressions: Optional[Iterable[ImportExpression]],
+) -> set[ModuleExpression]:
+    """
+    Return the importer and imported module expressions of the supplied import expressions.
+    """
+    module_expressions: set[ModuleExpression] = set()
+    for expression in expressions or []:
+        module_expressions.update((expression.importer, expression.imported))
+    return module_expressions
+
+
+def find_reachable_pairs(
+    graph: ImportGraph,
+    importers: Iterable[Module],
+    importeds: Iterable[Module],
+    as_packages: bool = True,
+) -> set[tuple[str, str]]:
+    """
+    Return the names of the (importer, imported) pairs where the importer imports the imported,
+    directly or indirectly.
+
+    This makes one search of the graph for each module on whichever side has fewer modules,
+    rather than one for each pair. It is intended as a cheap way to rule pairs out before
+    searching for the chains between them: there may be no chains between a returned pair,
+    but there are never any between a pair that isn't returned.
+
+    Pairs of modules that overlap are always returned, so that searching for chains between
+    them fails in the usual way.
+
+    If a reachability index is available (see contract_utils.get_reachability_index), it is
+    used instead of searching the graph.
+
+    Args:
+        graph:       the graph to search.
+        importers:   the modules that may do the importing.
+        importeds:   the modules that may be imported.
+        as_packages: whether to treat the modules as packages, including their descendants.
+    """
+    importer_names = {importer.name for importer in importers}
+    imported_names = {imported.name for imported in importeds}
+    modules_in_packages = {
+        name: _get_modules_in_package(graph, name, as_packages)
+        for name in importer_names | imported_names
+    }
+
+    reachability_index = contract_utils.get_reachability_index(graph)
+    if reachability_index is not None:
+        return reachability_index.find_reachable_pairs(
+            importers={name: modules_in_packages[name] for name in importer_names},
+            importeds={name: modules_in_packages[name] for name in imported_names},
+        )
+
+    pairs: set[tuple[str, str]] = set()
+    if len(importer_names) <= len(imported_names):
+        for importer in importer_names:
+            reachable = modules_in_packages[importer] | graph.find_upstream_modules(
+                importer, as_package=as_packages
+            )
+            pairs.update(
+                (importer, imported)
+                for imported in imported_names
+                if not reachable.isdisjoint(modules_in_packages[imported])
+            )
+    else:
+        for imported in imported_names:
+            reachable = modules_in_packages[imported] | graph.find_downstream_modules(
+                imported, as_package=as_packages
+            )
+            pairs.update(
+                (importer, imported)
+                for importer in importer_names
+                if not reachable.isdisjoint(modules_in_packages[importer])
+            )
+    return pairs
+
+
+def get_max_chains_per_dependency(
+    max_chains_per_dependency: Optional[int], session_options: dict
+) -> Optional[int]:
+    """
+    Return the maximum number of chains to build for each broken dependency, or None if there
+    is no maximum.
+
+    Args:
+        max_chains_per_dependency: the contract's max_chains_per_dependency option. If this is
+                                   None, the session option of the same name is used instead.
+        session_options:           the contract's session options.
+    """
+    if max_chains_per_dependency is not None:
+        return max_chains_per_dependency
+    try:
+        raw_value = session_options["max_chains_per_dependency"]
+    except KeyError:
+        return None
+    try:
+        return fields.IntegerField(min_value=1).parse(raw_value)
+    except fields.ValidationError as e:
+        raise ValueError(f"Invalid max_chains_per_dependency option '{raw_value}': {e.message}")
+
+
+def sort_routes(routes: Iterable[grimp.Route]) -> List[grimp.Route]:
+    """
+    Return the routes in a deterministic order, so the same ones are left out each time there
+    are too many of them.
+    """
+    return sorted(
+        routes, key=lambda route: (sorted(route.heads), route.middle, sorted(route.tails))
+    )
+
+
+def render_omitted_chain_count(chains_data: OmittedChains) -> None:
+    omitted_chain_count = chains_data.get("omitted_chain_count")
+    if omitted_chain_count:
+        pluralized = "s" if omitted_chain_count != 1 else ""
+        output.print(f"(and {omitted_chain_count} more chain{pluralized} not shown)")
+        output.new_line()
+
+
+def summarize_dependencies(
+    dependencies: Iterable[grimp.PackageDependency],
+) -> List[DependencySummary]:
+    """
+    Return summaries of the supplied dependencies, without looking up any import details.
+    """
+    return sorted(
+        (
+            {
+                "importer": dependency.importer,
+                "imported": dependency.imported,
+                "chain_count": len(dependency.routes),
+            }
+            for dependency in dependencies
+        ),
+        key=lambda summary: (summary["importer"], summary["imported"]),
+    )
+
+
+def render_dependency_summaries(summaries: Iterable[DependencySummary]) -> None:
+    for summary in summaries:
+        chain_count = summary["chain_count"]
+        pluralized = "s" if chain_count != 1 else ""
+        output.print(
+            f"{summary['importer']} is not allowed to import {summary['imported']} "
+            f"({chain_count} chain{pluralized})."
+        )
+    output.new_line()
+    output.print("(Only a summary was requested, so the chains were not built.)")
+    output.new_line()
+
+
 def render_chain_data(chain_data: DetailedChain) -> None:
     main_chain = chain_data["chain"]
     _render_direct_import(main_chain[0], extra_firsts=chain_data["extra_firsts"], first_line=True)
@@ -81,16 +250,13 @@ def find_segments(
 def segments_to_collapsed_chains(
     graph: ImportGraph, segments: List[Chain], importer: Module, imported: Module
 ) -> List[DetailedChain]:
+    is_in_package = get_is_in_package(graph)
     collapsed_chains: List[DetailedChain] = []
     for segment in segments:
         head_imports: List[Link] = []
         imported_module = segment[0]["imported"]
         candidate_modules = sorted(graph.find_modules_that_directly_import(imported_module))
-        for module in [
-            m
-            for m in candidate_modules
-            if Module(m) == importer or Module(m).is_descendant_of(importer)
-        ]:
+        for module in [m for m in candidate_modules if is_in_package(m, importer.name)]:
             import_details_list = graph.get_import_details(
                 importer=module, imported=imported_module
             )
@@ -102,11 +268,7 @@ def segments_to_collapsed_chains(
         tail_imports: List[Link] = []
         importer_module = segment[-1]["importer"]
         candidate_modules = sorted(graph.find_modules_directly_imported_by(importer_module))
-        for module in [
-            m
-            for m in candidate_modules
-            if Module(m) == imported or Module(m).is_descendant_of(imported)
-        ]:
+        for module in [m for m in candidate_modules if is_in_package(m, imported.name)]:
             import_details_list = graph.get_import_details(
                 importer=importer_module, imported=module
             )
@@ -126,6 +288,30 @@ def segments_to_collapsed_chains(
     return collapsed_chains
 
 
+def get_is_in_package(graph: ImportGraph) -> Callable[[str, str], bool]:
+    """
+    Return a function that tells whether a module is in a package (i.e. is the package, or one
+    of its descendants), given their names.
+
+    The graph's HierarchyIndex is used if there is one, which is quicker when called many times.
+    """
+    hierarchy_index = contract_utils.get_hierarchy_index(graph)
+    if hierarchy_index is not None:
+        return hierarchy_index.is_in_package
+    return _is_in_package
+
+
+def _is_in_package(module: str, package: str) -> bool:
+    return Module(module).is_in_package(Module(package))
+
+
+def _get_modules_in_package(graph: ImportGraph, module: str, as_package: bool) -> set[str]:
+    # Squashed modules have no descendants in the graph.
+    if not as_package or graph.is_module_squashed(module):
+        return {module}
+    return {module} | graph.find_descendants(module)
+
+
 def _pop_shortest_chains(graph: ImportGraph, importer: str, imported: str):
     chain: Union[Optional[Tuple[str, ...]], bool] = True
     while chain:
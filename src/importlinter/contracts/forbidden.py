@@ -1,18 +1,27 @@
 from __future__ import annotations
 
-from typing import Iterable, List, cast
+from typing import Iterable, List, Optional, cast
 
 from grimp import ImportGraph
 
-from importlinter.application import contract_utils, output
+from importlinter.application import contract_utils, output, tracing
 from importlinter.application.contract_utils import AlertLevel
 from importlinter.configuration import settings
 from importlinter.domain import fields
 from importlinter.domain.contract import Contract, ContractCheck
 from importlinter.domain.helpers import module_expressions_to_modules
-from importlinter.domain.imports import Module
+from importlinter.domain.imports import Module, ModuleExpression
 
-from ._common import format_line_numbers
+from ._common import (
+    DependencySummary,
+    find_reachable_pairs,
+    format_line_numbers,
+    get_is_in_package,
+    get_max_chains_per_dependency,
+    import_expressions_to_module_expressions,
+    render_dependency_summaries,
+    render_omitted_chain_count,
+)
 
 
 class ForbiddenContract(Contract):
@@ -34,6 +43,9 @@ class ForbiddenContract(Contract):
                              False, each of the modules passed in will be treated as a module
                              rather than a package. Default behaviour is True (treat modules as
                              packages).
+        - max_chains_per_dependency: The maximum number of chains to report for each pair of
+                             source and forbidden modules. Defaults to the session option of the
+                             same name, or no maximum. (Optional.)
     """
 
     type_name = "forbidden"
@@ -44,10 +56,10 @@ class ForbiddenContract(Contract):
     allow_indirect_imports = fields.BooleanField(required=False, default=False)
     unmatched_ignore_imports_alerting = fields.EnumField(AlertLevel, default=AlertLevel.ERROR)
     as_packages = fields.BooleanField(required=False, default=True)
+    max_chains_per_dependency = fields.IntegerField(required=False, min_value=1)
 
     def check(self, graph: ImportGraph, verbose: bool) -> ContractCheck:
-        is_kept = True
-        invalid_chains = []
+        summary_only = contract_utils.is_summary_only(self.session_options)
 
         warnings = contract_utils.remove_ignored_imports(
             graph=graph,
@@ -69,29 +81,61 @@ class ForbiddenContract(Contract):
         )
 
         self._check_all_modules_exist_in_graph(source_modules, graph)
-        self._check_external_forbidden_modules(forbidden_modules)
+        self._check_external_forbidden_modules(forbidden_modules, graph)
+        max_chains = get_max_chains_per_dependency(
+            self.max_chains_per_dependency, self.session_options  # type: ignore
+        )
 
         # We only need to check for illegal imports for forbidden modules that are in the graph.
         forbidden_modules_in_graph = [m for m in forbidden_modules if m.name in graph.modules]
 
+        allow_indirect_imports = str(self.allow_indirect_imports).lower() == "true"
+
+        reachable_pairs: Optional[set[tuple[str, str]]] = None
+        if not allow_indirect_imports:
+            # Rule out the pairs of modules that have no chains between them in one pass, rather
+            # than searching for chains between every pair. This isn't needed if indirect imports
+            # are allowed, as then only direct imports are looked for, which is cheaper than the
+            # search.
+            output.verbose_print(
+                verbose, "Finding which forbidden modules are imported by the source modules..."
+            )
+            with tracing.span("Find reachable pairs"), settings.TIMER as timer:
+                reachable_pairs = find_reachable_pairs(
+                    graph,
+                    importers=source_modules,
+                    importeds=forbidden_modules_in_graph,
+                    as_packages=self.as_packages,  # type:ignore
+                )
+            if verbose:
+                pair_count = len(reachable_pairs)
+                pluralized = "s" if pair_count != 1 else ""
+                output.print(
+                    f"Found {pair_count} pair{pluralized} of modules to search "
+                    f"in {output.format_duration(timer.duration_in_s)}.",
+                )
+
         def sort_key(module):
             return module.name
 
+        # The chains found between each pair of modules, keyed with (source, forbidden).
+        chains_by_pair: dict[tuple[str, str], set[tuple[str, ...]]] = {}
         for source_module in sorted(source_modules, key=sort_key):
             for forbidden_module in sorted(forbidden_modules_in_graph, key=sort_key):
+                if (
+                    reachable_pairs is not None
+                    and (source_module.name, forbidden_module.name) not in reachable_pairs
+                ):
+                    continue
                 output.verbose_print(
                     verbose,
                     "Searching for import chains from "
                     f"{source_module} to {forbidden_module}...",
                 )
-                with settings.TIMER as timer:
-                    subpackage_chain_data = {
-                        "upstream_module": forbidden_module.name,
-                        "downstream_module": source_module.name,
-                        "chains": [],
-                    }
-
-                    if str(self.allow_indirect_imports).lower() == "true":
+                with tracing.span(
+                    "Find chains", importer=source_module.name, imported=forbidden_module.name
+                ), settings.TIMER as timer:
+                    if allow_indirect_imports:
                         chains = self._get_direct_chains(
                             source_module, forbidden_module, graph, self.as_packages  # type:ignore
                         )
@@ -101,47 +145,70 @@ class ForbiddenContract(Contract):
                             imported=forbidden_module.name,
                             as_packages=self.as_packages,  # type:ignore
                         )
-                    if chains:
-                        is_kept = False
-                        for chain in sorted(chains):
-                            chain_data = []
-                            for importer, imported in [
-                                (chain[i], chain[i + 1]) for i in range(len(chain) - 1)
-                            ]:
-                                import_details = graph.get_import_details(
-                                    importer=importer, imported=imported
-                                )
-                                line_numbers = tuple(j["line_number"] for j in import_details)
-                                chain_data.append(
-                                    {
-                                        "importer": importer,
-                                        "imported": imported,
-                                        "line_numbers": line_numbers,
-                                    }
-                                )
-                            subpackage_chain_data["chains"].append(chain_data)  # type: ignore
-                if subpackage_chain_data["chains"]:
-                    invalid_chains.append(subpackage_chain_data)
+                if chains:
+                    chains_by_pair[(source_module.name, forbidden_module.name)] = chains
                 if verbose:
-                    chain_count = len(subpackage_chain_data["chains"])
+                    chain_count = len(chains)
                     pluralized = "s" if chain_count != 1 else ""
                     output.print(
                         f"Found {chain_count} illegal chain{pluralized} "
-                        f"in {timer.duration_in_s}s.",
+                        f"in {output.format_duration(timer.duration_in_s)}.",
                     )
 
+        if summary_only:
+            dependency_summaries: List[DependencySummary] = [
+                {"importer": source, "imported": forbidden, "chain_count": len(chains)}
+                for (source, forbidden), chains in chains_by_pair.items()
+            ]
+            return ContractCheck(
+                kept=not chains_by_pair,
+                warnings=warnings,
+                metadata={"dependency_summaries": dependency_summaries},
+            )
+
         # Sorting by upstream and downstream module ensures that the output is deterministic
         # and that the same upstream and downstream modules are always adjacent in the output.
         def chain_sort_key(chain_data):
             return (chain_data["upstream_module"], chain_data["downstream_module"])
 
+        def build_metadata() -> dict:
+            # Looking up the line numbers of every import in every chain can be slow, so it's
+            # left until the contract is rendered.
+            with tracing.span("Build chains"):
+                invalid_chains = []
+                for (source, forbidden), chains in chains_by_pair.items():
+                    sorted_chains = sorted(chains)
+                    chains_data: dict = {
+                        "upstream_module": forbidden,
+                        "downstream_module": source,
+                        "chains": [
+                            self._build_chain_data(chain, graph)
+                            for chain in sorted_chains[:max_chains]
+                        ],
+                    }
+                    if max_chains is not None and len(sorted_chains) > max_chains:
+                        chains_data["omitted_chain_count"] = len(sorted_chains) - max_chains
+                    invalid_chains.append(chains_data)
+            return {"invalid_chains": sorted(invalid_chains, key=chain_sort_key)}
+
         return ContractCheck(
-            kept=is_kept,
+            kept=not chains_by_pair,
             warnings=warnings,
-            metadata={"invalid_chains": sorted(invalid_chains, key=chain_sort_key)},
+            metadata=build_metadata,
+        )
+
+    def get_referenced_module_expressions(self) -> set[ModuleExpression]:
+        return (
+            set(self.source_modules)  # type: ignore
+            | set(self.forbidden_modules)  # type: ignore
+            | import_expressions_to_module_expressions(self.ignore_imports)  # type: ignore
         )
 
     def render_broken_contract(self, check: "ContractCheck") -> None:
+        if "dependency_summaries" in check.metadata:
+            render_dependency_summaries(check.metadata["dependency_summaries"])
+            return
+
         count = 0
         for chains_data in check.metadata["invalid_chains"]:
             downstream, upstream = chains_data["downstream_module"], chains_data["upstream_module"]
@@ -161,6 +228,7 @@ class ForbiddenContract(Contract):
                         output.indent_cursor()
                         output.print_error(import_string, bold=False)
                 output.new_line()
+            render_omitted_chain_count(chains_data)
 
             output.new_line()
 
@@ -171,8 +239,8 @@ class ForbiddenContract(Contract):
             if module.name not in graph.modules:
                 raise ValueError(f"Module '{module.name}' does not exist.")
 
-    def _check_external_forbidden_modules(self, forbidden_modules) -> None:
-        external_forbidden_modules = self._get_external_forbidden_modules(forbidden_modules)
+    def _check_external_forbidden_modules(self, forbidden_modules, graph: ImportGraph) -> None:
+        external_forbidden_modules = self._get_external_forbidden_modules(forbidden_modules, graph)
         if external_forbidden_modules:
             if self._graph_was_built_with_externals():
                 for module in external_forbidden_modules:
@@ -187,13 +255,17 @@ class ForbiddenContract(Contract):
                     "when there are external forbidden modules."
                 )
 
-    def _get_external_forbidden_modules(self, forbidden_modules) -> set[Module]:
-        root_packages = [Module(name) for name in self.session_options["root_packages"]]
+    def _get_external_forbidden_modules(
+        self, forbidden_modules, graph: ImportGraph
+    ) -> set[Module]:
+        root_packages = self.session_options["root_packages"]
+        is_in_package = get_is_in_package(graph)
         return {
             forbidden_module
             for forbidden_module in cast(List[Module], forbidden_modules)
             if not any(
-                forbidden_module.is_in_package(root_package) for root_package in root_packages
+                is_in_package(forbidden_module.name, root_package)
+                for root_package in root_packages
             )
         }
 
@@ -226,6 +298,20 @@ class ForbiddenContract(Contract):
                     chains.add((source_module.name, imported_module.name))
         return chains
 
+    def _build_chain_data(self, chain: tuple[str, ...], graph: ImportGraph) -> list[dict]:
+        chain_data = []
+        for importer, imported in [(chain[i], chain[i + 1]) for i in range(len(chain) - 1)]:
+            import_details = graph.get_import_details(importer=importer, imported=imported)
+            line_numbers = tuple(j["line_number"] for j in import_details)
+            chain_data.append(
+                {
+                    "importer": importer,
+                    "imported": imported,
+                    "line_numbers": line_numbers,
+                }
+            )
+        return chain_data
+
     def _get_all_modules_in_package(self, module: Module, graph: ImportGraph) -> set[Module]:
         """
         Return all the modules in the supplied module, including itself.
@@ -4,24 +4,32 @@ from typing import List, cast
 
 import grimp
 from grimp import ImportGraph
-from typing_extensions import TypedDict
 
-from importlinter.application import contract_utils, output
+from importlinter.application import contract_utils, output, tracing
 from importlinter.application.contract_utils import AlertLevel
 from importlinter.domain import fields
 from importlinter.domain.contract import Contract, ContractCheck
 from importlinter.domain.helpers import module_expressions_to_modules
-from importlinter.domain.imports import Module
+from importlinter.domain.imports import ImportExpression, Module, ModuleExpression
 
 from ._common import (
     DetailedChain,
+    DependencySummary,
     Link,
+    OmittedChains,
     build_detailed_chain_from_route,
+    find_reachable_pairs,
+    get_max_chains_per_dependency,
+    import_expressions_to_module_expressions,
     render_chain_data,
+    render_dependency_summaries,
+    render_omitted_chain_count,
+    sort_routes,
+    summarize_dependencies,
 )
 
 
-class _SubpackageChainData(TypedDict):
+class _SubpackageChainData(OmittedChains):
     upstream_module: str
     downstream_module: str
     chains: List[DetailedChain]
@@ -43,6 +51,9 @@ class IndependenceContract(Contract):
         - unmatched_ignore_imports_alerting: Decides how to report when the expression in the
                           `ignore_imports` set is not found in the graph. Valid values are
                           "none", "warn", "error". Default value is "error".
+        - max_chains_per_dependency: The maximum number of chains to report for each illegal
+                          dependency. Defaults to the session option of the same name, or no
+                          maximum. (Optional.)
     """
 
     type_name = "independence"
@@ -50,6 +61,7 @@ class IndependenceContract(Contract):
     modules = fields.SetField(subfield=fields.ModuleExpressionField())
     ignore_imports = fields.SetField(subfield=fields.ImportExpressionField(), required=False)
     unmatched_ignore_imports_alerting = fields.EnumField(AlertLevel, default=AlertLevel.ERROR)
+    max_chains_per_dependency = fields.IntegerField(required=False, min_value=1)
 
     def check(self, graph: ImportGraph, verbose: bool) -> ContractCheck:
         warnings = contract_utils.remove_ignored_imports(
@@ -60,20 +72,52 @@ class IndependenceContract(Contract):
 
         modules = list(module_expressions_to_modules(graph, self.modules))  # type: ignore
         self._check_all_modules_exist_in_graph(graph, modules)
-
-        dependencies = graph.find_illegal_dependencies_for_layers(
-            # A single layer consisting of siblings.
-            layers=({module.name for module in modules},),
+        max_chains = get_max_chains_per_dependency(
+            self.max_chains_per_dependency, self.session_options  # type: ignore
         )
-        invalid_chains = self._build_invalid_chains(dependencies, graph)
+
+        with tracing.span("Find illegal dependencies"):
+            if self._dependencies_are_ruled_out(graph, modules):
+                dependencies = set()
+            else:
+                dependencies = graph.find_illegal_dependencies_for_layers(
+                    # A single layer consisting of siblings.
+                    layers=({module.name for module in modules},),
+                )
+
+        if contract_utils.is_summary_only(self.session_options):
+            return ContractCheck(
+                kept=not dependencies,
+                warnings=warnings,
+                metadata={"dependency_summaries": summarize_dependencies(dependencies)},
+            )
+
+        def build_metadata() -> dict:
+            # Looking up the line numbers of every import in every chain can be slow, so it's
+            # left until the contract is rendered.
+            with tracing.span("Build chains"):
+                return {
+                    "invalid_chains": self._build_invalid_chains(dependencies, graph, max_chains)
+                }
 
         return ContractCheck(
             kept=not dependencies,
             warnings=warnings,
-            metadata={"invalid_chains": invalid_chains},
+            metadata=build_metadata,
         )
 
+    def get_referenced_module_expressions(self) -> set[ModuleExpression]:
+        modules: set[ModuleExpression] = set(self.modules)  # type: ignore
+        ignore_imports: set[ImportExpression] | None = self.ignore_imports  # type: ignore
+        return modules | import_expressions_to_module_expressions(ignore_imports)
+
     def render_broken_contract(self, check: "ContractCheck") -> None:
+        if "dependency_summaries" in check.metadata:
+            render_dependency_summaries(
+                cast(List[DependencySummary], check.metadata["dependency_summaries"])
+            )
+            return
+
         for chains_data in cast(List[_SubpackageChainData], check.metadata["invalid_chains"]):
             downstream, upstream = (
                 chains_data["downstream_module"],
@@ -85,6 +129,7 @@ class IndependenceContract(Contract):
             for chain_data in chains_data["chains"]:
                 render_chain_data(chain_data)
                 output.new_line()
+            render_omitted_chain_count(chains_data)
 
             output.new_line()
 
@@ -93,17 +138,33 @@ class IndependenceContract(Contract):
             if module.name not in graph.modules:
                 raise ValueError(f"Module '{module.name}' does not exist.")
 
+    def _dependencies_are_ruled_out(self, graph: ImportGraph, modules: List[Module]) -> bool:
+        """
+        Return whether the reachability index rules out any dependencies between the modules.
+        """
+        if contract_utils.get_reachability_index(graph) is None:
+            return False
+        pairs = find_reachable_pairs(graph, importers=modules, importeds=modules)
+        return all(importer == imported for importer, imported in pairs)
+
     def _build_invalid_chains(
-        self, dependencies: set[grimp.PackageDependency], graph: grimp.ImportGraph
+        self,
+        dependencies: set[grimp.PackageDependency],
+        graph: grimp.ImportGraph,
+        max_chains: int | None = None,
     ) -> list[_SubpackageChainData]:
-        return [
-            {
+        invalid_chains: list[_SubpackageChainData] = []
+        for dependency in dependencies:
+            routes = sort_routes(dependency.routes)
+            chains_data: _SubpackageChainData = {
                 "upstream_module": dependency.imported,
                 "downstream_module": dependency.importer,
-                "chains": [build_detailed_chain_from_route(c, graph) for c in dependency.routes],
+                "chains": [build_detailed_chain_from_route(r, graph) for r in routes[:max_chains]],
             }
-            for dependency in dependencies
-        ]
+            if max_chains is not None and len(routes) > max_chains:
+                chains_data["omitted_chain_count"] = len(routes) - max_chains
+            invalid_chains.append(chains_data)
+        return invalid_chains
 
     def _build_subpackage_chain_data(
         self, upstream_module: Module, downstream_module: Module, graph: ImportGraph
@@ -1,19 +1,32 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List, Sequence, cast
+from typing import Iterable, List, Sequence, cast
 
 import grimp
-from typing_extensions import TypedDict
 
-from importlinter.application import contract_utils, output
+from importlinter.application import contract_utils, output, tracing
 from importlinter.application.contract_utils import AlertLevel
 from importlinter.domain import fields
 from importlinter.domain.contract import Contract, ContractCheck, InvalidContractOptions
 from importlinter.domain.helpers import module_expressions_to_modules
-from importlinter.domain.imports import Module
-
-from ._common import DetailedChain, build_detailed_chain_from_route, render_chain_data
+from importlinter.domain.imports import Module, ModuleExpression
+
+from ._common import (
+    DependencySummary,
+    DetailedChain,
+    OmittedChains,
+    build_detailed_chain_from_route,
+    find_reachable_pairs,
+    get_is_in_package,
+    get_max_chains_per_dependency,
+    import_expressions_to_module_expressions,
+    render_chain_data,
+    render_dependency_summaries,
+    render_omitted_chain_count,
+    sort_routes,
+    summarize_dependencies,
+)
 
 
 _INDEPENDENT_LAYER_DELIMITER = "|"
@@ -81,7 +94,7 @@ class LayerField(fields.Field):
             return True
 
 
-class _LayerChainData(TypedDict):
+class _LayerChainData(OmittedChains):
     importer: str
     imported: str
     routes: list[DetailedChain]
@@ -118,6 +131,10 @@ class LayersContract(Contract):
                               its list of layers to check. (Optional, default False.)
         - exhaustive_ignores: A set of potential layers to ignore in exhaustiveness checks.
                               (Optional.)
+        - max_chains_per_dependency:
+                              The maximum number of chains to report for each illegal dependency.
+                              (Optional, defaults to the session option of the same name, or no
+                              maximum.)
     """
 
     type_name = "layers"
@@ -128,6 +145,7 @@ class LayersContract(Contract):
     unmatched_ignore_imports_alerting = fields.EnumField(AlertLevel, default=AlertLevel.ERROR)
     exhaustive = fields.BooleanField(default=False)
     exhaustive_ignores = fields.SetField(subfield=fields.StringField(), required=False)
+    max_chains_per_dependency = fields.IntegerField(required=False, min_value=1)
 
     def validate(self) -> None:
         if self.exhaustive and not self.containers:
@@ -158,20 +176,54 @@ class LayersContract(Contract):
             self._check_all_containerless_layers_exist(graph)
 
         undeclared_modules = self._get_undeclared_modules(graph, containers)
-
-        dependencies = graph.find_illegal_dependencies_for_layers(
-            layers=self._grimpify_layers(self.layers),  # type: ignore
-            containers=containers,
+        max_chains = get_max_chains_per_dependency(
+            self.max_chains_per_dependency, self.session_options  # type: ignore
         )
-        invalid_chains = self._build_invalid_chains(dependencies, graph)
+
+        with tracing.span("Find illegal dependencies"):
+            if self._dependencies_are_ruled_out(graph, containers):
+                dependencies = set()
+            else:
+                dependencies = graph.find_illegal_dependencies_for_layers(
+                    layers=self._grimpify_layers(self.layers),  # type: ignore
+                    containers=containers,
+                )
+
+        if contract_utils.is_summary_only(self.session_options):
+            return ContractCheck(
+                kept=not (dependencies or undeclared_modules),
+                warnings=warnings,
+                metadata={
+                    "dependency_summaries": summarize_dependencies(dependencies),
+                    "undeclared_modules": undeclared_modules,
+                },
+            )
+
+        def build_metadata() -> dict:
+            # Looking up the line numbers of every import in every chain can be slow, so it's
+            # left until the contract is rendered.
+            with tracing.span("Build chains"):
+                invalid_chains = self._build_invalid_chains(dependencies, graph, max_chains)
+            return {
+                "invalid_dependencies": invalid_chains,
+                "undeclared_modules": undeclared_modules,
+            }
 
         return ContractCheck(
             kept=not (dependencies or undeclared_modules),
             warnings=warnings,
-            metadata={
-                "invalid_dependencies": invalid_chains,
-                "undeclared_modules": undeclared_modules,
-            },
+            metadata=build_metadata,
+        )
+
+    def get_referenced_module_expressions(self) -> set[ModuleExpression]:
+        if self.containers:
+            # The layers are all within the containers.
+            expressions = set(self.containers)  # type: ignore
+        else:
+            module_tails = self._get_all_module_tails_from_layers(self.layers)  # type: ignore
+            expressions = {ModuleExpression(module_tail.name) for module_tail in module_tails}
+        return expressions | import_expressions_to_module_expressions(
+            self.ignore_imports  # type: ignore
         )
 
     def _get_all_module_tails_from_layers(self, layers: Sequence[Layer]) -> set[ModuleTail]:
@@ -181,16 +233,23 @@ class LayersContract(Contract):
         return flattened
 
     def render_broken_contract(self, check: ContractCheck) -> None:
-        for chains_data in cast(List[_LayerChainData], check.metadata["invalid_dependencies"]):
-            higher_layer, lower_layer = (chains_data["imported"], chains_data["importer"])
-            output.print(f"{lower_layer} is not allowed to import {higher_layer}:")
-            output.new_line()
-
-            for chain_data in chains_data["routes"]:
-                render_chain_data(chain_data)
+        if "dependency_summaries" in check.metadata:
+            if check.metadata["dependency_summaries"]:
+                render_dependency_summaries(
+                    cast(List[DependencySummary], check.metadata["dependency_summaries"])
+                )
+        else:
+            for chains_data in cast(List[_LayerChainData], check.metadata["invalid_dependencies"]):
+                higher_layer, lower_layer = (chains_data["imported"], chains_data["importer"])
+                output.print(f"{lower_layer} is not allowed to import {higher_layer}:")
                 output.new_line()
 
-            output.new_line()
+                for chain_data in chains_data["routes"]:
+                    render_chain_data(chain_data)
+                    output.new_line()
+                render_omitted_chain_count(chains_data)
+
+                output.new_line()
 
         if check.metadata["undeclared_modules"]:
             output.print("The following modules are not listed as layers:")
@@ -206,11 +265,12 @@ class LayersContract(Contract):
 
     def _validate_containers(self, graph: grimp.ImportGraph, containers: set[str]) -> None:
         root_package_names = self.session_options["root_packages"]
-        root_packages = tuple(Module(name) for name in root_package_names)
+        is_in_package = get_is_in_package(graph)
 
         for container in containers:
             if not any(
-                Module(container).is_in_package(root_package) for root_package in root_packages
+                is_in_package(container, root_package_name)
+                for root_package_name in root_package_names
             ):
                 if len(root_package_names) == 1:
                     root_package_name = root_package_names[0]
@@ -279,17 +339,62 @@ class LayersContract(Contract):
             name = module_tail.name
         return Module(name)
 
+    def _dependencies_are_ruled_out(self, graph: grimp.ImportGraph, containers: set[str]) -> bool:
+        """
+        Return whether the reachability index rules out any illegal dependencies between the
+        layers: lower layers importing higher ones, or independent siblings importing each other.
+        """
+        if contract_utils.get_reachability_index(graph) is None:
+            return False
+        module_names = graph.modules
+        if not containers <= module_names:
+            # Leave Grimp to report the missing containers.
+            return False
+        containers_or_none: Iterable[str | None] = containers or [None]
+        for container in containers_or_none:
+            higher_layer_modules: list[Module] = []
+            for layer in self.layers:  # type: ignore
+                layer_modules = [
+                    module
+                    for module in (
+                        self._module_from_module_tail(module_tail, container)
+                        for module_tail in layer.module_tails
+                    )
+                    # Missing layers are optional, so have no dependencies.
+                    if module.name in module_names
+                ]
+                if higher_layer_modules and find_reachable_pairs(
+                    graph, importers=layer_modules, importeds=higher_layer_modules
+                ):
+                    return False
+                if layer.is_independent and any(
+                    importer != imported
+                    for importer, imported in find_reachable_pairs(
+                        graph, importers=layer_modules, importeds=layer_modules
+                    )
+                ):
+                    return False
+                higher_layer_modules.extend(layer_modules)
+        return True
+
     def _build_invalid_chains(
-        self, dependencies: set[grimp.PackageDependency], graph: grimp.ImportGraph
+        self,
+        dependencies: set[grimp.PackageDependency],
+        graph: grimp.ImportGraph,
+        max_chains: int | None = None,
     ) -> list[_LayerChainData]:
-        return [
-            {
+        invalid_chains: list[_LayerChainData] = []
+        for dependency in dependencies:
+            routes = sort_routes(dependency.routes)
+            chains_data: _LayerChainData = {
                 "imported": dependency.imported,
                 "importer": dependency.importer,
-                "routes": [build_detailed_chain_from_route(c, graph) for c in dependency.routes],
+                "routes": [build_detailed_chain_from_route(r, graph) for r in routes[:max_chains]],
             }
-            for dependency in dependencies
-        ]
+            if max_chains is not None and len(routes) > max_chains:
+                chains_data["omitted_chain_count"] = len(routes) - max_chains
+            invalid_chains.append(chains_data)
+        return invalid_chains
 
     @staticmethod
     def _grimpify_layers(layers: list[Layer]) -> list[grimp.Layer]:
@@ -1,9 +1,10 @@
 import abc
-from typing import Any, Dict, List, Optional, Type
+from typing import Any, Callable, Dict, List, Optional, Set, Type, Union
 
 from grimp import ImportGraph
 
 from . import fields
+from .imports import ModuleExpression
 
 
 class Contract(abc.ABC):
@@ -58,6 +59,19 @@ class Contract(abc.ABC):
         """
         pass
 
+    def get_referenced_module_expressions(self) -> Optional[Set[ModuleExpression]]:
+        """
+        Hook method for declaring which modules the contract is concerned with.
+
+        Return expressions that, treated as packages, cover every module whose imports could
+        affect the outcome of the check. This allows the contract to be skipped when none of
+        those modules have changed.
+
+        Return None (the default) if this cannot be determined; the contract will then always
+        be checked.
+        """
+        return None
+
     @classmethod
     def _get_field_names(cls) -> List[str]:
         """
@@ -74,7 +88,8 @@ class Contract(abc.ABC):
     def check(self, graph: ImportGraph, verbose: bool) -> "ContractCheck":
         """
         Args:
-            graph:   Copy of the ImportGraph. May be mutated without affecting other contracts.
+            graph:   The ImportGraph (or a view onto it). May be mutated without affecting
+                     other contracts.
             verbose: Whether to output progress noisily. Can be used as a flag to pass
                      to output.verbose_print.
         """
@@ -100,18 +115,54 @@ class InvalidContractOptions(Exception):
 class ContractCheck:
     """
     Data class to store the result of checking a contract.
+
+    The metadata may be supplied lazily, as a function that returns it. This is useful if the
+    metadata is expensive to build, and only needed to render a broken contract: the function
+    is only called the first time the metadata is accessed (or the check is pickled, for
+    caching or sending between processes). By then, the graph may have been restored to how
+    it was before the check mutated it.
     """
 
     def __init__(
         self,
         kept: bool,
-        metadata: Optional[Dict[str, Any]] = None,
+        metadata: Union[Dict[str, Any], Callable[[], Dict[str, Any]], None] = None,
         warnings: Optional[List[str]] = None,
     ) -> None:
         self.kept = kept
-        self.metadata = metadata or {}
+        self._metadata: Optional[Dict[str, Any]] = None
+        self._build_metadata: Optional[Callable[[], Dict[str, Any]]] = None
+        if callable(metadata):
+            self._build_metadata = metadata
+        else:
+            self._metadata = metadata or {}
         self.warnings = warnings or []
 
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        if self._build_metadata is not None:
+            self._metadata = self._build_metadata() or {}
+            self._build_metadata = None
+        assert self._metadata is not None  # For type checker.
+        return self._metadata
+
+    @metadata.setter
+    def metadata(self, metadata: Dict[str, Any]) -> None:
+        self._metadata = metadata
+        self._build_metadata = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The function that builds the metadata usually can't be pickled, so build it first.
+        return {**self.__dict__, "_metadata": self.metadata, "_build_metadata": None}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        state = dict(state)
+        if "metadata" in state:
+            # Pickled by a version that didn't support lazy metadata.
+            state["_metadata"] = state.pop("metadata")
+            state["_build_metadata"] = None
+        self.__dict__.update(state)
+
 
 class NoSuchContractType(Exception):
     pass
@@ -1,6 +1,6 @@
 import abc
 from enum import Enum
-from typing import Generic, Iterable, List, Set, Type, TypeVar, Union, cast
+from typing import Generic, Iterable, List, Optional, Set, Type, TypeVar, Union, cast
 
 from importlinter.domain.imports import ImportExpression, Module, ModuleExpression
 
@@ -89,6 +89,30 @@ class BooleanField(Field):
             raise ValidationError(f"Could not parse a boolean from '{raw_data}'.")
 
 
+class IntegerField(Field):
+    """
+    A field for single values of integers.
+
+    Arguments:
+        - min_value: the smallest value allowed (optional).
+    """
+
+    def __init__(self, *args, min_value: Optional[int] = None, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.min_value = min_value
+
+    def parse(self, raw_data: Union[str, List]) -> int:
+        if isinstance(raw_data, list):
+            raise ValidationError("Expected a single value, got multiple values.")
+        try:
+            value = int(raw_data)
+        except (TypeError, ValueError):
+            raise ValidationError(f"Could not parse an integer from '{raw_data}'.")
+        if self.min_value is not None and value < self.min_value:
+            raise ValidationError(f"Must be at least {self.min_value}.")
+        return value
+
+
 class BaseMultipleValueField(Field):
     """
     An abstract field for multiple values of any type.
@@ -1,18 +1,47 @@
-from typing import Any, Optional
+import re
+import sys
+from typing import Any, Callable, Optional, Pattern, Sequence, Tuple, Type, TypeVar
+
+_ValueObject = TypeVar("_ValueObject", bound="ValueObject")
+
+# Value objects can't be changed once created, so their attributes are set with this instead.
+_set = object.__setattr__
 
 
 class ValueObject:
+    """
+    Base class for immutable objects that are equal if their values are equal.
+
+    Subclasses list the names of their values in _fields, which must match the keyword
+    arguments of their __init__ method, and compare them in __eq__. Their __init__ method
+    works out the hash, which is stored in _hash.
+
+    These objects are created and compared in large numbers, so each subclass spells this out
+    itself rather than going through generic code.
+    """
+
+    __slots__ = ("_hash",)
+    _fields: Tuple[str, ...] = ()
+
+    _hash: int
+
     def __repr__(self) -> str:
         return "<{}: {}>".format(self.__class__.__name__, self)
 
-    def __eq__(self, other: Any) -> bool:
-        if isinstance(other, self.__class__):
-            return hash(self) == hash(other)
-        else:
-            return False
-
     def __hash__(self) -> int:
-        return hash(str(self))
+        return self._hash
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{self.__class__.__name__} objects are immutable.")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{self.__class__.__name__} objects are immutable.")
+
+    def __reduce__(self) -> Tuple[Callable, Tuple[Type["ValueObject"], Tuple[Any, ...]]]:
+        # Rebuilt from the values rather than the slots, as hashes of strings differ between
+        # processes.
+        values = tuple(getattr(self, field) for field in self._fields)
+        return _rebuild_value_object, (self.__class__, values)
 
 
 class Module(ValueObject):
@@ -20,26 +49,42 @@ class Module(ValueObject):
     A Python module.
     """
 
+    __slots__ = ("name",)
+    _fields = ("name",)
+
+    name: str
+
     def __init__(self, name: str) -> None:
         """
         Args:
             name: The fully qualified name of a Python module, e.g. 'package.foo.bar'.
+                  The name is interned, as the same names are used over and over again.
         """
-        self.name = name
+        name = sys.intern(name)
+        _set(self, "name", name)
+        _set(self, "_hash", hash(name))
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, Module):
+            return self.name == other.name
+        return False
+
+    # Defining __eq__ would otherwise make instances unhashable.
+    __hash__ = ValueObject.__hash__
 
     def __str__(self) -> str:
         return self.name
 
     @property
     def root_package_name(self) -> str:
-        return self.name.split(".")[0]
+        return self.name.partition(".")[0]
 
     @property
     def parent(self) -> "Module":
-        components = self.name.split(".")
-        if len(components) == 1:
+        parent_name, separator, _ = self.name.rpartition(".")
+        if not separator:
             raise ValueError("Module has no parent.")
-        return Module(".".join(components[:-1]))
+        return Module(parent_name)
 
     def is_child_of(self, module: "Module") -> bool:
         try:
@@ -60,6 +105,14 @@ class DirectImport(ValueObject):
     An import between one module and another.
     """
 
+    __slots__ = ("importer", "imported", "line_number", "line_contents")
+    _fields = ("importer", "imported", "line_number", "line_contents")
+
+    importer: Module
+    imported: Module
+    line_number: Optional[int]
+    line_contents: Optional[str]
+
     def __init__(
         self,
         *,
@@ -68,10 +121,25 @@ class DirectImport(ValueObject):
         line_number: Optional[int] = None,
         line_contents: Optional[str] = None,
     ) -> None:
-        self.importer = importer
-        self.imported = imported
-        self.line_number = line_number
-        self.line_contents = line_contents
+        _set(self, "importer", importer)
+        _set(self, "imported", imported)
+        _set(self, "line_number", line_number)
+        _set(self, "line_contents", line_contents)
+        _set(self, "_hash", hash((importer.name, imported.name, line_number, line_contents)))
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, DirectImport):
+            return (
+                self._hash == other._hash
+                and self.importer == other.importer
+                and self.imported == other.imported
+                and self.line_number == other.line_number
+                and self.line_contents == other.line_contents
+            )
+        return False
+
+    # Defining __eq__ would otherwise make instances unhashable.
+    __hash__ = ValueObject.__hash__
 
     def __str__(self) -> str:
         if self.line_number:
@@ -79,9 +147,6 @@ class DirectImport(ValueObject):
         else:
             return "{} -> {}".format(self.importer, self.imported)
 
-    def __hash__(self) -> int:
-        return hash((str(self), self.line_contents))
-
 
 class ModuleExpression(ValueObject):
     """
@@ -97,12 +162,38 @@ class ModuleExpression(ValueObject):
     Note that * and ** cannot be mixed in the same expression.
     """
 
+    __slots__ = ("expression", "parts", "_pattern")
+    _fields = ("expression",)
+
+    expression: str
+    parts: Tuple[str, ...]
+    _pattern: Pattern[str]
+
     def __init__(self, expression: str) -> None:
-        self.expression = expression
+        parts = tuple(expression.split("."))
+        _set(self, "expression", expression)
+        # The expression compiled into its segments, and a pattern for matching module names.
+        _set(self, "parts", parts)
+        _set(self, "_pattern", _compile_module_expression(parts))
+        _set(self, "_hash", hash(expression))
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, ModuleExpression):
+            return self.expression == other.expression
+        return False
+
+    # Defining __eq__ would otherwise make instances unhashable.
+    __hash__ = ValueObject.__hash__
 
     def has_wildcard_expression(self) -> bool:
         return "*" in self.expression
 
+    def matches(self, module_name: str) -> bool:
+        """
+        Return whether the module with the supplied name matches the expression.
+        """
+        return self._pattern.fullmatch(module_name) is not None
+
     def __str__(self) -> str:
         return self.expression
 
@@ -115,12 +206,43 @@ class ImportExpression(ValueObject):
     (see ModuleExpression for details).
     """
 
+    __slots__ = ("importer", "imported")
+    _fields = ("importer", "imported")
+
+    importer: ModuleExpression
+    imported: ModuleExpression
+
     def __init__(self, importer: ModuleExpression, imported: ModuleExpression) -> None:
-        self.importer = importer
-        self.imported = imported
+        _set(self, "importer", importer)
+        _set(self, "imported", imported)
+        _set(self, "_hash", hash((importer.expression, imported.expression)))
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, ImportExpression):
+            return self.importer == other.importer and self.imported == other.imported
+        return False
+
+    # Defining __eq__ would otherwise make instances unhashable.
+    __hash__ = ValueObject.__hash__
 
     def has_wildcard_expression(self) -> bool:
         return self.imported.has_wildcard_expression() or self.importer.has_wildcard_expression()
 
     def __str__(self) -> str:
         return "{} -> {}".format(self.importer.expression, self.imported.expression)
+
+
+def _rebuild_value_object(cls: Type[_ValueObject], values: Tuple[Any, ...]) -> _ValueObject:
+    return cls(**dict(zip(cls._fields, values)))
+
+
+def _compile_module_expression(parts: Sequence[str]) -> Pattern[str]:
+    regex_parts = []
+    for part in parts:
+        if part == "*":
+            regex_parts.append(r"[^.]+")
+        elif part == "**":
+            regex_parts.append(r"[^.]+(?:\.[^.]+)*")
+        else:
+            regex_parts.append(re.escape(part))
+    return re.compile(r"\.".join(regex_parts))
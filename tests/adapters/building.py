@@ -1,7 +1,9 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 
+import grimp
 from grimp.adaptors.graph import ImportGraph
 
+from importlinter.application.graph_snapshots import GraphSnapshot, restore_graph, snapshot_graph
 from importlinter.application.ports.building import GraphBuilder
 
 
@@ -24,8 +26,17 @@ class FakeGraphBuilder(GraphBuilder):
     -------------------------------
 
     The arguments the builder was last called with are stored in self.build_arguments.
+
+    Dumping and loading graphs
+    --------------------------
+
+    Dumped graphs are kept in memory rather than written to files. Snapshots of them are stored
+    in self.dumped_snapshots, keyed by filename.
     """
 
+    def __init__(self) -> None:
+        self.dumped_snapshots: Dict[str, GraphSnapshot] = {}
+
     def build(
         self,
         root_package_names: List[str],
@@ -41,5 +52,15 @@ class FakeGraphBuilder(GraphBuilder):
         }
         return getattr(self, "_graph", ImportGraph())
 
+    def dump(self, graph: grimp.ImportGraph, filename: str) -> None:
+        self.dumped_snapshots[filename] = snapshot_graph(graph)
+
+    def load(self, filename: str) -> grimp.ImportGraph:
+        try:
+            snapshot = self.dumped_snapshots[filename]
+        except KeyError:
+            raise FileNotFoundError(f"No such file: {filename}")
+        return restore_graph(snapshot)
+
     def inject_graph(self, graph: ImportGraph) -> None:
         self._graph = graph
@@ -0,0 +1,40 @@
+from typing import Dict, List, Optional, Tuple
+
+from importlinter.application.ports.caching import (
+    CachedContractCheck,
+    ContractCheckCache,
+    GraphFingerprint,
+)
+
+
+class FakeContractCheckCache(ContractCheckCache):
+    """
+    In-memory contract check cache.
+
+    The entries are stored in self.entries, keyed with (cache_dir, contract_key), and the graph
+    fingerprints and durations in self.graph_fingerprints and self.durations, keyed with
+    cache_dir.
+    """
+
+    def __init__(self) -> None:
+        self.entries: Dict[Tuple[str, str], CachedContractCheck] = {}
+        self.graph_fingerprints: Dict[str, GraphFingerprint] = {}
+        self.durations: Dict[str, Dict[str, List[float]]] = {}
+
+    def read(self, cache_dir: str, contract_key: str) -> Optional[CachedContractCheck]:
+        return self.entries.get((cache_dir, contract_key))
+
+    def write(self, cache_dir: str, contract_key: str, cached_check: CachedContractCheck) -> None:
+        self.entries[(cache_dir, contract_key)] = cached_check
+
+    def read_graph_fingerprint(self, cache_dir: str) -> Optional[GraphFingerprint]:
+        return self.graph_fingerprints.get(cache_dir)
+
+    def write_graph_fingerprint(self, cache_dir: str, fingerprint: GraphFingerprint) -> None:
+        self.graph_fingerprints[cache_dir] = fingerprint
+
+    def read_durations(self, cache_dir: str) -> Dict[str, List[float]]:
+        return self.durations.get(cache_dir, {})
+
+    def write_durations(self, cache_dir: str, durations: Dict[str, List[float]]) -> None:
+        self.durations[cache_dir] = durations
@@ -104,6 +104,9 @@ class FakeFileSystem(ports.FileSystem):
         dedented_lines = self._dedent(raw_lines)
         return "\n".join(dedented_lines)
 
+    def write(self, file_name: str, contents: str, encoding: Optional[str] = None) -> None:
+        self.content_map[file_name] = contents
+
     def exists(self, file_name: str) -> bool:
         # The file should exist if it's either declared in contents or in content_map.
         if file_name in self.content_map.keys():
@@ -0,0 +1,19 @@
+from typing import Callable, List, Tuple, TypeVar
+
+from importlinter.application.ports.profiling import Profiler
+
+T = TypeVar("T")
+
+
+class FakeProfiler(Profiler):
+    def __init__(self, peak_memory: int = 0) -> None:
+        """
+        Args:
+            peak_memory: the peak memory, in bytes, to report for each call.
+        """
+        self.peak_memory = peak_memory
+        self.stats_filenames: List[str] = []
+
+    def profile(self, function: Callable[[], T], stats_filename: str) -> Tuple[T, int]:
+        self.stats_filenames.append(stats_filename)
+        return function(), self.peak_memory
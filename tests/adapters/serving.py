@@ -0,0 +1,42 @@
+from typing import Callable, Optional
+
+from importlinter.application.ports.serving import (
+    CheckRequest,
+    CheckResponse,
+    DaemonNotRunning,
+    DaemonTransport,
+)
+
+
+class FakeDaemonTransport(DaemonTransport):
+    """
+    Daemon transport that keeps everything in the current process.
+
+    Rather than listening, serve stores the address and handlers and returns straight away.
+    Requests sent to the same address are then passed directly to the stored handle_request.
+    Call idle to simulate the daemon being idle.
+    """
+
+    def __init__(self) -> None:
+        self.address: Optional[str] = None
+        self._handle_request: Optional[Callable[[CheckRequest], CheckResponse]] = None
+        self._handle_idle: Optional[Callable[[], None]] = None
+
+    def serve(
+        self,
+        address: str,
+        handle_request: Callable[[CheckRequest], CheckResponse],
+        handle_idle: Callable[[], None],
+    ) -> None:
+        self.address = address
+        self._handle_request = handle_request
+        self._handle_idle = handle_idle
+
+    def send_request(self, address: str, request: CheckRequest) -> CheckResponse:
+        if self._handle_request is None or address != self.address:
+            raise DaemonNotRunning(f"No daemon is listening at {address}.")
+        return self._handle_request(request)
+
+    def idle(self) -> None:
+        assert self._handle_idle is not None
+        self._handle_idle()
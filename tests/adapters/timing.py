@@ -2,17 +2,17 @@ from __future__ import annotations
 
 from types import TracebackType
 
-from importlinter.application.ports.timing import Timer
+from importlinter.application.ports.timing import NANOSECONDS_PER_SECOND, Timer
 
 
 class FakeTimer(Timer):
-    ARBITRARY_SECONDS_SINCE_EPOCH = 1_000_000
+    ARBITRARY_START_TIME_NS = 1_000_000 * NANOSECONDS_PER_SECOND
 
     def __init__(self) -> None:
         super().__init__()
-        self._current_time = float(self.ARBITRARY_SECONDS_SINCE_EPOCH)
-        self._tick_duration = 1
-        self._increment = 0
+        self._current_time_ns = self.ARBITRARY_START_TIME_NS
+        self._tick_duration: float = 1
+        self._increment: float = 0
 
     def __exit__(
         self,
@@ -24,12 +24,20 @@ class FakeTimer(Timer):
         super().__exit__(exc_type, exc_val, exc_tb)
 
     def get_current_time(self) -> float:
-        return self._current_time
+        return self._current_time_ns / NANOSECONDS_PER_SECOND
 
-    def setup(self, tick_duration: int, increment: int) -> None:
+    def get_current_time_ns(self) -> int:
+        return self._current_time_ns
+
+    def setup(self, tick_duration: float, increment: float) -> None:
+        """
+        Args:
+            tick_duration: the duration of the next timed event, in seconds.
+            increment:     how many seconds longer each event takes than the one before.
+        """
         self._tick_duration = tick_duration
         self._increment = increment
 
     def _tick(self) -> None:
-        self._current_time += self._tick_duration
+        self._current_time_ns += round(self._tick_duration * NANOSECONDS_PER_SECOND)
         self._tick_duration += self._increment
@@ -0,0 +1,26 @@
+from typing import Iterable, List, Set
+
+from importlinter.application.ports.watching import FileWatcher
+
+
+class FakeFileWatcher(FileWatcher):
+    """
+    File watcher that doesn't watch anything.
+
+    The directories it was asked to watch are stored in self.directories. Call change_files
+    to simulate changes, which will be returned by the next call to get_changed_files.
+    """
+
+    def __init__(self) -> None:
+        self.directories: List[str] = []
+        self._changed_files: Set[str] = set()
+
+    def watch(self, directories: Iterable[str]) -> None:
+        self.directories = list(directories)
+
+    def get_changed_files(self) -> Set[str]:
+        changed_files, self._changed_files = self._changed_files, set()
+        return changed_files
+
+    def change_files(self, *filenames: str) -> None:
+        self._changed_files.update(filenames)
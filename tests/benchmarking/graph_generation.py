@@ -0,0 +1,151 @@
+"""
+Generation of synthetic import graphs, for benchmarking.
+
+The generated graphs are shaped like a large, layered codebase:
+
+    mypackage
+        component_0
+            high
+                subpackage_0
+                    module_0
+                    module_1
+                    ...
+                subpackage_1
+                ...
+            medium
+            low
+        component_1
+        ...
+
+Most imports go 'downwards': to a later module in the same subpackage, to a lower layer of the
+same component, or to a later component. A small proportion go in any direction, which creates
+cycles and illegal dependencies, as in a real codebase.
+
+The graphs are generated from a seeded random number generator, so the same arguments always
+produce the same graph.
+"""
+
+from __future__ import annotations
+
+import random
+from typing import List
+
+from grimp.adaptors.graph import ImportGraph
+
+ROOT_PACKAGE = "mypackage"
+LAYERS = ("high", "medium", "low")
+MODULES_PER_SUBPACKAGE = 20
+
+# Where imports go, other than the imports that go in any direction.
+SAME_SUBPACKAGE_PROPORTION = 0.5
+SAME_COMPONENT_PROPORTION = 0.3
+
+
+def generate_graph(
+    module_count: int,
+    component_count: int = 10,
+    mean_fan_out: float = 5.0,
+    any_direction_proportion: float = 0.02,
+    seed: int = 0,
+) -> ImportGraph:
+    """
+    Return a synthetic graph of a root package named ROOT_PACKAGE.
+
+    Args:
+        module_count:             the approximate number of modules in the graph (not counting
+                                  packages).
+        component_count:          the number of top level subpackages.
+        mean_fan_out:             the mean number of modules each module imports. The number for
+                                  each module is drawn from a geometric distribution, so most
+                                  import a few modules, and some import many.
+        any_direction_proportion: the proportion of imports that may go in any direction.
+        seed:                     the seed for the random number generator.
+    """
+    rng = random.Random(seed)
+    graph = ImportGraph()
+    graph.add_module(ROOT_PACKAGE)
+
+    # Modules in each component, grouped by layer then subpackage.
+    components: List[List[List[List[str]]]] = []
+    modules_per_layer = max(1, module_count // (component_count * len(LAYERS)))
+    for component_index in range(component_count):
+        component_name = component_package(component_index)
+        graph.add_module(component_name)
+        layers = []
+        for layer in LAYERS:
+            layer_name = f"{component_name}.{layer}"
+            graph.add_module(layer_name)
+            subpackages = []
+            for subpackage_index in range(-(-modules_per_layer // MODULES_PER_SUBPACKAGE)):
+                subpackage_name = f"{layer_name}.subpackage_{subpackage_index}"
+                graph.add_module(subpackage_name)
+                first_module_index = subpackage_index * MODULES_PER_SUBPACKAGE
+                subpackage_modules = [
+                    f"{subpackage_name}.module_{module_index}"
+                    for module_index in range(
+                        first_module_index,
+                        min(first_module_index + MODULES_PER_SUBPACKAGE, modules_per_layer),
+                    )
+                ]
+                for module in subpackage_modules:
+                    graph.add_module(module)
+                subpackages.append(subpackage_modules)
+            layers.append(subpackages)
+        components.append(layers)
+    all_modules = [
+        module
+        for layers in components
+        for subpackages in layers
+        for subpackage_modules in subpackages
+        for module in subpackage_modules
+    ]
+
+    for component_index, layers in enumerate(components):
+        for layer_index, subpackages in enumerate(layers):
+            for subpackage_modules in subpackages:
+                for module_index, importer in enumerate(subpackage_modules):
+                    import_count = _choose_import_count(rng, mean_fan_out)
+                    for line_number in range(1, import_count + 1):
+                        roll = rng.random()
+                        if roll < any_direction_proportion:
+                            imported = rng.choice(all_modules)
+                        elif roll < SAME_SUBPACKAGE_PROPORTION:
+                            later_modules = subpackage_modules[module_index + 1 :]
+                            if not later_modules:
+                                continue
+                            imported = rng.choice(later_modules)
+                        elif roll < SAME_SUBPACKAGE_PROPORTION + SAME_COMPONENT_PROPORTION:
+                            lower_layer = rng.randrange(layer_index, len(layers))
+                            imported = rng.choice(rng.choice(layers[lower_layer]))
+                        else:
+                            if component_index == len(components) - 1:
+                                continue
+                            later_component = rng.randrange(component_index + 1, len(components))
+                            later_layers = components[later_component]
+                            imported = rng.choice(rng.choice(rng.choice(later_layers)))
+                        if imported == importer:
+                            continue
+                        graph.add_import(
+                            importer=importer,
+                            imported=imported,
+                            line_number=line_number,
+                            line_contents=f"import {imported}",
+                        )
+    return graph
+
+
+def component_package(component_index: int) -> str:
+    """
+    Return the name of the top level subpackage with the supplied index.
+    """
+    return f"{ROOT_PACKAGE}.component_{component_index}"
+
+
+def _choose_import_count(rng: random.Random, mean: float) -> int:
+    # Geometric distribution (the number of failures before the first success) with the
+    # supplied mean.
+    success_probability = 1 / (mean + 1)
+    count = 0
+    while rng.random() > success_probability:
+        count += 1
+    return count
@@ -0,0 +1,170 @@
+"""
+Benchmarks, run using pytest-benchmark (see CONTRIBUTING.rst).
+
+The graphs are generated by graph_generation, with the numbers of modules given by the
+IMPORTLINTER_BENCHMARK_MODULE_COUNTS environment variable (comma separated).
+"""
+
+import os
+from typing import Any, Dict, Iterator, List
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from grimp import ImportGraph  # noqa: E402
+
+from importlinter.application import contract_utils  # noqa: E402
+from importlinter.application.app_config import settings  # noqa: E402
+from importlinter.application.contract_utils import AlertLevel  # noqa: E402
+from importlinter.application.graph_overlay import GraphOverlay  # noqa: E402
+from importlinter.application.use_cases import (  # noqa: E402
+    _register_contract_types,
+    create_report,
+)
+from importlinter.application.user_options import UserOptions  # noqa: E402
+from importlinter.contracts.independence import IndependenceContract  # noqa: E402
+from importlinter.contracts.layers import LayersContract  # noqa: E402
+from importlinter.domain.fields import ImportExpressionField  # noqa: E402
+from tests.adapters.building import FakeGraphBuilder  # noqa: E402
+from tests.adapters.printing import FakePrinter  # noqa: E402
+from tests.adapters.timing import FakeTimer  # noqa: E402
+from tests.benchmarking.graph_generation import (  # noqa: E402
+    LAYERS,
+    ROOT_PACKAGE,
+    component_package,
+    generate_graph,
+)
+
+DEFAULT_MODULE_COUNTS = "1000,10000"
+MODULE_COUNTS = [
+    int(count)
+    for count in os.environ.get(
+        "IMPORTLINTER_BENCHMARK_MODULE_COUNTS", DEFAULT_MODULE_COUNTS
+    ).split(",")
+]
+COMPONENT_COUNT = 10
+COMPONENTS = [component_package(i) for i in range(COMPONENT_COUNT)]
+
+# The same number of modules, whatever the size of the graph.
+SOURCE_PACKAGE = f"{COMPONENTS[0]}.high.subpackage_0"
+FORBIDDEN_PACKAGE = f"{COMPONENTS[-1]}.low.subpackage_0"
+
+CONTRACTS_OPTIONS: Dict[str, Dict[str, Any]] = {
+    "forbidden": {
+        "type": "forbidden",
+        "source_modules": [SOURCE_PACKAGE],
+        "forbidden_modules": [FORBIDDEN_PACKAGE],
+    },
+    "layers": {
+        "type": "layers",
+        "layers": COMPONENTS,
+    },
+    "layers_with_containers": {
+        "type": "layers",
+        "layers": list(LAYERS),
+        "containers": COMPONENTS,
+    },
+    "independence": {
+        "type": "independence",
+        "modules": COMPONENTS,
+    },
+}
+# Each expression matches a lot of imports, like the ignore_imports of a large project.
+IGNORE_IMPORTS = [
+    f"{component}.{higher_layer}.** -> {component}.{lower_layer}.**"
+    for component in COMPONENTS
+    for higher_layer, lower_layer in zip(LAYERS, LAYERS[1:])
+] + [f"{ROOT_PACKAGE}.*.low.*.module_0 -> {ROOT_PACKAGE}.*.high.*.*"]
+
+
+@pytest.fixture(scope="module", params=MODULE_COUNTS, ids=lambda count: f"{count}-modules")
+def graph(request) -> ImportGraph:
+    return generate_graph(module_count=request.param, component_count=COMPONENT_COUNT)
+
+
+@pytest.fixture
+def configure_graph_builder(graph) -> Iterator[None]:
+    """
+    Configure the settings to build the graph, restoring the previous settings afterwards.
+    """
+    previous_settings = settings.copy()
+    builder = FakeGraphBuilder()
+    builder.inject_graph(graph)
+    settings.configure(GRAPH_BUILDER=builder, PRINTER=FakePrinter(), TIMER=FakeTimer())
+    yield
+    settings._config = previous_settings._config
+
+
+@pytest.mark.parametrize("contract_name", CONTRACTS_OPTIONS.keys())
+@pytest.mark.usefixtures("configure_graph_builder")
+def test_create_report(benchmark, contract_name):
+    contract_options = {
+        "name": contract_name,
+        "id": contract_name,
+        **CONTRACTS_OPTIONS[contract_name],
+    }
+    user_options = UserOptions(
+        session_options={"root_packages": [ROOT_PACKAGE]},
+        contracts_options=[contract_options],
+    )
+    _register_contract_types(user_options)
+
+    def create_and_build_report():
+        report = create_report(user_options, cache_dir=None)
+        # Build the metadata of the checks, as rendering the report would.
+        for _, check in report.get_contracts_and_checks():
+            check.metadata
+        return report
+
+    report = benchmark(create_and_build_report)
+
+    assert not report.could_not_run
+
+
+def test_remove_ignored_imports(benchmark, graph):
+    ignore_imports = [ImportExpressionField().parse(e) for e in IGNORE_IMPORTS]
+
+    def remove_ignored_imports() -> List[str]:
+        # Revert the removals afterwards, so each round starts with the same graph.
+        with GraphOverlay(graph) as overlay:
+            return contract_utils.remove_ignored_imports(
+                graph=overlay,
+                ignore_imports=ignore_imports,
+                unmatched_alerting=AlertLevel.NONE,
+            )
+
+    benchmark(remove_ignored_imports)
+
+
+@pytest.mark.parametrize("contract_name", ("layers_with_containers", "independence"))
+def test_build_invalid_chains(benchmark, graph, contract_name):
+    contract_options = CONTRACTS_OPTIONS[contract_name]
+    contract: Any
+    if contract_name == "independence":
+        contract = IndependenceContract(
+            name=contract_name, session_options={}, contract_options=contract_options
+        )
+        dependencies = graph.find_illegal_dependencies_for_layers(layers=(set(COMPONENTS),))
+    else:
+        contract = LayersContract(
+            name=contract_name,
+            session_options={"root_packages": [ROOT_PACKAGE]},
+            contract_options=contract_options,
+        )
+        dependencies = graph.find_illegal_dependencies_for_layers(
+            layers=LAYERS, containers=set(COMPONENTS)
+        )
+    assert dependencies
+
+    benchmark(contract._build_invalid_chains, dependencies, graph)
+
+
+def test_find_shortest_chains(benchmark, graph):
+    chains = benchmark(
+        graph.find_shortest_chains,
+        importer=SOURCE_PACKAGE,
+        imported=FORBIDDEN_PACKAGE,
+    )
+
+    assert chains
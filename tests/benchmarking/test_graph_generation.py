@@ -0,0 +1,35 @@
+from tests.benchmarking.graph_generation import generate_graph
+
+
+class TestGenerateGraph:
+    def test_has_approximately_the_requested_number_of_modules(self):
+        graph = generate_graph(module_count=3000, component_count=10)
+
+        modules = {m for m in graph.modules if ".module_" in m}
+        assert len(modules) == 3000
+        assert "mypackage.component_9.low.subpackage_4.module_99" in modules
+
+    def test_has_imports_and_cycles(self):
+        graph = generate_graph(module_count=1000)
+
+        assert graph.count_imports() > 2000
+        assert graph.find_illegal_dependencies_for_layers(
+            layers=("high", "medium", "low"),
+            containers={f"mypackage.component_{i}" for i in range(10)},
+        )
+
+    def test_same_arguments_produce_same_graph(self):
+        graph = generate_graph(module_count=1000, seed=1)
+        same_graph = generate_graph(module_count=1000, seed=1)
+        different_graph = generate_graph(module_count=1000, seed=2)
+
+        assert _get_imports(graph) == _get_imports(same_graph)
+        assert _get_imports(graph) != _get_imports(different_graph)
+
+
+def _get_imports(graph):
+    return {
+        (importer, imported)
+        for importer in graph.modules
+        for imported in graph.find_modules_directly_imported_by(importer)
+    }
@@ -1,5 +1,7 @@
+import multiprocessing
 import os
 import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 from importlinter import cli
@@ -36,3 +38,40 @@ class TestCaching:
 
             assert meta_file.exists()
             assert data_file.exists()
+
+    def test_contract_checks_are_cached(self):
+        os.chdir(testpackage_directory)
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            result = cli.lint_imports(cache_dir=cache_dir, is_debug_mode=True)
+
+            contract_checks_dir = Path(cache_dir) / "contract_checks"
+            assert contract_checks_dir.is_dir()
+            assert list(contract_checks_dir.glob("*.pickle"))
+
+            # A second run should give the same result, using the cached contract checks.
+            assert cli.lint_imports(cache_dir=cache_dir, is_debug_mode=True) == result
+
+    def test_cache_can_be_shared_by_concurrent_processes(self):
+        os.chdir(testpackage_directory)
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            # Use fresh processes rather than forking this one (see parallel.py for why).
+            with ProcessPoolExecutor(
+                max_workers=4, mp_context=multiprocessing.get_context("spawn")
+            ) as executor:
+                results = list(executor.map(_lint_imports_with_cache_dir, [cache_dir] * 8))
+
+            assert results == [cli.EXIT_STATUS_SUCCESS] * 8
+            # No staging or temporary files should be left behind.
+            assert not [
+                path
+                for path in Path(cache_dir).rglob(".*")
+                if path.name not in (".gitignore", ".lock")
+            ]
+            # The cache should still be usable.
+            assert _lint_imports_with_cache_dir(cache_dir) == cli.EXIT_STATUS_SUCCESS
+
+
+def _lint_imports_with_cache_dir(cache_dir: str) -> int:
+    return cli.lint_imports(cache_dir=cache_dir, is_debug_mode=True)
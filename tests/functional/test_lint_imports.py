@@ -1,10 +1,12 @@
+import json
 import os
+import pstats
 import sys
 from pathlib import Path
 
 import pytest
 
-from importlinter import cli
+from importlinter import api, cli
 
 this_directory = Path(__file__).parent
 assets_directory = this_directory / ".." / "assets"
@@ -92,6 +94,143 @@ def test_show_timings_smoke_test():
     assert cli.EXIT_STATUS_SUCCESS == cli.lint_imports(show_timings=True)
 
 
+@pytest.mark.parametrize(
+    "config_filename, expected_result",
+    (
+        (None, cli.EXIT_STATUS_SUCCESS),
+        (".brokencontract.ini", cli.EXIT_STATUS_ERROR),
+    ),
+)
+def test_workers_smoke_test(config_filename, expected_result):
+    os.chdir(testpackage_directory)
+    assert expected_result == cli.lint_imports(config_filename=config_filename, workers=2)
+
+
+def test_dumped_graph_can_be_loaded(tmp_path):
+    os.chdir(testpackage_directory)
+    graph_filename = str(tmp_path / "graph.bin")
+
+    assert cli.EXIT_STATUS_SUCCESS == cli.lint_imports(no_cache=True, dump_graph=graph_filename)
+    assert cli.EXIT_STATUS_SUCCESS == cli.lint_imports(no_cache=True, load_graph=graph_filename)
+
+    graph = api.load_graph(graph_filename)
+    assert "testpackage.high.blue" in graph.modules
+
+
+def test_trace_includes_spans_from_workers(tmp_path):
+    os.chdir(testpackage_directory)
+    config_filename = _write_config_with_two_contracts(tmp_path)
+    trace_filename = str(tmp_path / "trace.json")
+
+    cli.lint_imports(
+        config_filename=config_filename, no_cache=True, workers=2, trace_file=trace_filename
+    )
+
+    with open(trace_filename) as trace_file:
+        events = json.load(trace_file)["traceEvents"]
+    event_names = {event["name"] for event in events}
+    assert {"Build graph", "Snapshot graph", "Restore graph", "Check contract"} <= event_names
+    check_contract_process_ids = {
+        event["pid"] for event in events if event["name"] == "Check contract"
+    }
+    assert os.getpid() not in check_contract_process_ids
+
+
+def test_contract_checks_can_be_profiled(tmp_path):
+    os.chdir(testpackage_directory)
+    profile_directory = tmp_path / "profiles"
+
+    assert cli.EXIT_STATUS_SUCCESS == cli.lint_imports(
+        no_cache=True, profile_directory=str(profile_directory)
+    )
+
+    stats = pstats.Stats(str(profile_directory / "test-independence.pstats"))
+    assert stats.total_calls > 0
+
+
+def test_contract_checks_can_be_profiled_in_workers(tmp_path):
+    os.chdir(testpackage_directory)
+    config_filename = _write_config_with_two_contracts(tmp_path)
+    profile_directory = tmp_path / "profiles"
+
+    cli.lint_imports(
+        config_filename=config_filename,
+        no_cache=True,
+        workers=2,
+        profile_directory=str(profile_directory),
+    )
+
+    assert sorted(os.listdir(profile_directory)) == ["one.pstats", "two.pstats"]
+
+
+def test_benchmarks_can_be_compared_with_baseline(tmp_path):
+    os.chdir(testpackage_directory)
+    config_filename = _write_config_with_two_contracts(tmp_path)
+    baseline_filename = str(tmp_path / "baseline.json")
+    results_filename = str(tmp_path / "results.json")
+
+    assert cli.EXIT_STATUS_SUCCESS == cli.run_benchmarks(
+        output_file=baseline_filename, config_filename=config_filename, no_cache=True, rounds=2
+    )
+    with open(baseline_filename) as baseline_file:
+        baseline = json.load(baseline_file)
+    assert sorted(baseline["scenarios"]) == ["one", "two"]
+
+    # Pretend the checks took no time at all in the baseline.
+    for scenario in baseline["scenarios"].values():
+        scenario["durations"] = [0.0, 0.0]
+    with open(baseline_filename, "w") as baseline_file:
+        json.dump(baseline, baseline_file)
+
+    assert cli.EXIT_STATUS_ERROR == cli.compare_benchmarks(
+        baseline_file=baseline_filename,
+        output_file=results_filename,
+        config_filename=config_filename,
+        no_cache=True,
+        rounds=2,
+    )
+    assert cli.EXIT_STATUS_SUCCESS == cli.compare_benchmarks(
+        baseline_file=results_filename, results_file=results_filename
+    )
+
+
+@pytest.mark.parametrize("workers", (1, 2))
+def test_reachability_index_gives_same_results(tmp_path, capsys, workers):
+    os.chdir(testpackage_directory)
+    config_filename = _write_config_with_two_contracts(tmp_path)
+    expected_result = cli.lint_imports(
+        config_filename=config_filename, no_cache=True, workers=workers
+    )
+    expected_output = capsys.readouterr().out
+    config_filename = _write_config_with_two_contracts(
+        tmp_path, extra_session_options="reachability_index = True"
+    )
+
+    result = cli.lint_imports(config_filename=config_filename, no_cache=True, workers=workers)
+
+    assert result == expected_result
+    assert capsys.readouterr().out == expected_output
+
+
+@pytest.mark.parametrize("workers", (1, 2))
+def test_summary_only_gives_same_results(tmp_path, capsys, workers):
+    os.chdir(testpackage_directory)
+    config_filename = _write_config_with_two_contracts(tmp_path)
+    expected_result = cli.lint_imports(
+        config_filename=config_filename, no_cache=True, workers=workers
+    )
+    capsys.readouterr()
+
+    result = cli.lint_imports(
+        config_filename=config_filename, no_cache=True, workers=workers, summary_only=True
+    )
+
+    assert result == expected_result == cli.EXIT_STATUS_ERROR
+    assert "(Only a summary was requested, so the chains were not built.)" in (
+        capsys.readouterr().out
+    )
+
+
 @pytest.mark.parametrize("verbose", (True, False))
 def test_logging_configuration_respects_verbose_flag(verbose, capsys):
     os.chdir(testpackage_directory)
@@ -102,3 +241,31 @@ def test_logging_configuration_respects_verbose_flag(verbose, capsys):
 
     # N.B. "Wrote data cache file" is logged by Grimp.
     assert ("Wrote data cache file" in captured.out) == verbose
+
+
+def _write_config_with_two_contracts(tmp_path, extra_session_options: str = "") -> str:
+    # Contracts are only checked in parallel if there is more than one of them.
+    config_filename = str(tmp_path / "config.ini")
+    with open(config_filename, "w") as config_file:
+        config_file.write(
+            f"""
+[importlinter]
+root_package = testpackage
+{extra_session_options}
+
+[importlinter:contract:one]
+name=Contract one
+type=forbidden
+source_modules=testpackage.high.blue
+forbidden_modules=testpackage.high.green
+
+[importlinter:contract:two]
+name=Contract two
+type=layers
+layers=
+    testpackage.high
+    testpackage.medium
+    testpackage.low
+"""
+        )
+    return config_filename
@@ -1,3 +1,5 @@
+import time
+
 from importlinter.application import output
 from importlinter.domain import fields
 from importlinter.domain.contract import Contract, ContractCheck
@@ -25,6 +27,47 @@ class AlwaysFailsContract(Contract):
         output.print("This contract will always fail.")
 
 
+class SlowContract(Contract):
+    """
+    Contract that takes a while to check.
+    """
+
+    seconds = fields.StringField()
+
+    def check(self, graph: ImportGraph, verbose: bool) -> ContractCheck:
+        time.sleep(float(self.seconds))  # type: ignore
+        return ContractCheck(kept=True)
+
+    def render_broken_contract(self, check: "ContractCheck") -> None:
+        # No need to implement, will never fail.
+        raise NotImplementedError  # pragma: nocover
+
+
+class SlowMetadataContract(Contract):
+    """
+    Broken contract whose metadata takes a while to build.
+
+    The metadata is only built when first needed, as with the built in contract types.
+    """
+
+    seconds = fields.StringField()
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.built_metadata = False
+
+    def check(self, graph: ImportGraph, verbose: bool) -> ContractCheck:
+        def build_metadata():
+            time.sleep(float(self.seconds))
+            self.built_metadata = True
+            return {"seconds": self.seconds}
+
+        return ContractCheck(kept=False, metadata=build_metadata)
+
+    def render_broken_contract(self, check: "ContractCheck") -> None:
+        output.print(f"This contract took {check.metadata['seconds']} seconds to explain.")
+
+
 class NoisyContract(Contract):
     def check(self, graph: ImportGraph, verbose: bool) -> ContractCheck:
         output.verbose_print(verbose, "Hello from the noisy contract!")
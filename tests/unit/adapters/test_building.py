@@ -0,0 +1,108 @@
+import os
+
+import grimp
+import pytest
+from grimp.adaptors.graph import ImportGraph
+
+from importlinter.adapters.building import GraphBuilder
+from importlinter.adapters.filesystem import fcntl
+from importlinter.application.graph_snapshots import InvalidGraphSnapshot
+
+
+class TestDumpAndLoad:
+    def test_round_trip(self, tmp_path):
+        graph = ImportGraph()
+        graph.add_module("mypackage")
+        graph.add_module("mypackage.squashed", is_squashed=True)
+        graph.add_import(
+            importer="mypackage.blue",
+            imported="mypackage.green",
+            line_number=3,
+            line_contents="from mypackage import green",
+        )
+        graph.add_import(importer="mypackage.green", imported="mypackage.squashed")
+        filename = str(tmp_path / "graph.bin")
+        builder = GraphBuilder()
+
+        builder.dump(graph, filename)
+        loaded = builder.load(filename)
+
+        assert loaded.modules == graph.modules
+        assert loaded.is_module_squashed("mypackage.squashed")
+        assert loaded.get_import_details(
+            importer="mypackage.blue", imported="mypackage.green"
+        ) == [
+            {
+                "importer": "mypackage.blue",
+                "imported": "mypackage.green",
+                "line_number": 3,
+                "line_contents": "from mypackage import green",
+            }
+        ]
+        assert loaded.direct_import_exists(
+            importer="mypackage.green", imported="mypackage.squashed"
+        )
+
+    def test_load_raises_if_file_is_not_a_snapshot(self, tmp_path):
+        filename = tmp_path / "graph.bin"
+        filename.write_text("Not a graph.")
+
+        with pytest.raises(InvalidGraphSnapshot):
+            GraphBuilder().load(str(filename))
+
+    def test_load_raises_if_file_does_not_exist(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            GraphBuilder().load(str(tmp_path / "graph.bin"))
+
+
+class TestBuild:
+    def test_build_writes_cache_that_is_used_by_the_next_build(self, tmp_path, monkeypatch):
+        package_dir = tmp_path / "cachetestpackage"
+        package_dir.mkdir()
+        (package_dir / "__init__.py").write_text("")
+        (package_dir / "blue.py").write_text("from cachetestpackage import green\n")
+        (package_dir / "green.py").write_text("")
+        monkeypatch.syspath_prepend(str(tmp_path))
+        cache_dir = tmp_path / "cache"
+        builder = GraphBuilder()
+
+        builder.build(["cachetestpackage"], cache_dir=str(cache_dir))
+        # Remove the import without changing the modification time, so the next build only
+        # finds it if the cache was used.
+        blue_stat = os.stat(package_dir / "blue.py")
+        (package_dir / "blue.py").write_text("\n")
+        os.utime(package_dir / "blue.py", ns=(blue_stat.st_atime_ns, blue_stat.st_mtime_ns))
+        graph = builder.build(["cachetestpackage"], cache_dir=str(cache_dir))
+
+        assert graph.direct_import_exists(
+            importer="cachetestpackage.blue", imported="cachetestpackage.green"
+        )
+
+    @pytest.mark.skipif(fcntl is None, reason="fcntl is not available.")
+    def test_graph_is_built_holding_exclusive_lock_on_cache_dir(self, tmp_path, monkeypatch):
+        cache_dir = tmp_path / "cache"
+        lock_is_held = []
+
+        def build_graph(*root_package_names, cache_dir, **kwargs):
+            with open(os.path.join(cache_dir, GraphBuilder.LOCK_FILENAME)) as lock_file:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_SH | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    lock_is_held.append(True)
+                else:
+                    lock_is_held.append(False)
+            return ImportGraph()
+
+        monkeypatch.setattr(grimp, "build_graph", build_graph)
+
+        GraphBuilder().build(["mypackage"], cache_dir=str(cache_dir))
+
+        assert lock_is_held == [True]
+
+    def test_no_lock_is_taken_if_caching_is_disabled(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(grimp, "build_graph", lambda *args, **kwargs: ImportGraph())
+
+        GraphBuilder().build(["mypackage"], cache_dir=None)
+
+        assert os.listdir(tmp_path) == []
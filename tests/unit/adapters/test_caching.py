@@ -0,0 +1,84 @@
+from importlinter.adapters.caching import PickleContractCheckCache
+from importlinter.application.ports.caching import CachedContractCheck, GraphFingerprint
+from importlinter.domain.contract import ContractCheck
+
+
+class TestPickleContractCheckCache:
+    def test_round_trip(self, tmp_path):
+        cache = PickleContractCheckCache()
+        cached_check = CachedContractCheck(
+            graph_fingerprint="abc",
+            check=ContractCheck(
+                kept=False,
+                warnings=["A warning."],
+                metadata={"modules": {"mypackage.foo"}, "line_numbers": (1, None)},
+            ),
+        )
+
+        cache.write(str(tmp_path), "some-key", cached_check)
+        result = cache.read(str(tmp_path), "some-key")
+
+        assert result is not None
+        assert result.graph_fingerprint == "abc"
+        assert result.check.kept is False
+        assert result.check.warnings == ["A warning."]
+        assert result.check.metadata == {"modules": {"mypackage.foo"}, "line_numbers": (1, None)}
+
+    def test_write_replaces_existing_entry(self, tmp_path):
+        cache = PickleContractCheckCache()
+        for fingerprint in ("first", "second"):
+            cache.write(
+                str(tmp_path),
+                "some-key",
+                CachedContractCheck(graph_fingerprint=fingerprint, check=ContractCheck(kept=True)),
+            )
+
+        result = cache.read(str(tmp_path), "some-key")
+
+        assert result is not None
+        assert result.graph_fingerprint == "second"
+
+    def test_missing_entry(self, tmp_path):
+        assert PickleContractCheckCache().read(str(tmp_path), "some-key") is None
+
+    def test_corrupt_entry_is_treated_as_missing(self, tmp_path):
+        cache = PickleContractCheckCache()
+        (tmp_path / cache.SUBDIRECTORY).mkdir()
+        (tmp_path / cache.SUBDIRECTORY / "some-key.pickle").write_bytes(b"not a pickle")
+
+        assert cache.read(str(tmp_path), "some-key") is None
+
+    def test_unpicklable_check_is_not_written(self, tmp_path):
+        cache = PickleContractCheckCache()
+        cached_check = CachedContractCheck(
+            graph_fingerprint="abc",
+            check=ContractCheck(kept=True, metadata={"unpicklable": lambda: None}),
+        )
+
+        cache.write(str(tmp_path), "some-key", cached_check)
+
+        assert cache.read(str(tmp_path), "some-key") is None
+
+    def test_graph_fingerprint_round_trip(self, tmp_path):
+        cache = PickleContractCheckCache()
+        fingerprint = GraphFingerprint(
+            value="abc", module_fingerprints={"mypackage": "def", "mypackage.foo": "ghi"}
+        )
+
+        cache.write_graph_fingerprint(str(tmp_path), fingerprint)
+
+        assert cache.read_graph_fingerprint(str(tmp_path)) == fingerprint
+
+    def test_missing_graph_fingerprint(self, tmp_path):
+        assert PickleContractCheckCache().read_graph_fingerprint(str(tmp_path)) is None
+
+    def test_durations_round_trip(self, tmp_path):
+        cache = PickleContractCheckCache()
+        durations = {"abc": [1.0, 2.5], "def": [3.0]}
+
+        cache.write_durations(str(tmp_path), durations)
+
+        assert cache.read_durations(str(tmp_path)) == durations
+
+    def test_missing_durations(self, tmp_path):
+        assert PickleContractCheckCache().read_durations(str(tmp_path)) == {}
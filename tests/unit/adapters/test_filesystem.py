@@ -0,0 +1,73 @@
+import multiprocessing
+
+import pytest
+
+try:
+    import fcntl
+except ImportError:
+    # Not available on Windows.
+    fcntl = None  # type: ignore
+
+from importlinter.adapters.filesystem import locked, write_atomically
+
+
+class TestWriteAtomically:
+    def test_writes_new_file(self, tmp_path):
+        filename = tmp_path / "some" / "directory" / "file.txt"
+
+        write_atomically(str(filename), b"Contents.")
+
+        assert filename.read_bytes() == b"Contents."
+
+    def test_replaces_existing_file(self, tmp_path):
+        filename = tmp_path / "file.txt"
+        filename.write_bytes(b"Old contents.")
+
+        write_atomically(str(filename), b"New contents.")
+
+        assert filename.read_bytes() == b"New contents."
+        assert [path.name for path in tmp_path.iterdir()] == ["file.txt"]
+
+
+def _try_to_lock(lock_filename, exclusive, queue):
+    with open(lock_filename, "a") as lock_file:
+        try:
+            fcntl.flock(lock_file, (fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH) | fcntl.LOCK_NB)
+        except BlockingIOError:
+            queue.put(False)
+        else:
+            queue.put(True)
+
+
+@pytest.mark.skipif(pytest.importorskip("fcntl") is None, reason="File locking is not available.")
+class TestLocked:
+    @pytest.mark.parametrize(
+        "held_exclusive, requested_exclusive, expected_granted",
+        (
+            (False, False, True),
+            (False, True, False),
+            (True, False, False),
+        ),
+    )
+    def test_lock_is_held_for_the_block(
+        self, tmp_path, held_exclusive, requested_exclusive, expected_granted
+    ):
+        lock_filename = str(tmp_path / ".lock")
+
+        with locked(lock_filename, exclusive=held_exclusive):
+            assert (
+                self._try_to_lock_in_other_process(lock_filename, requested_exclusive)
+                is expected_granted
+            )
+
+        # Once the block is exited, the lock is released.
+        assert self._try_to_lock_in_other_process(lock_filename, exclusive=True) is True
+
+    def _try_to_lock_in_other_process(self, lock_filename, exclusive):
+        queue = multiprocessing.Queue()
+        process = multiprocessing.Process(
+            target=_try_to_lock, args=(lock_filename, exclusive, queue)
+        )
+        process.start()
+        process.join(timeout=10)
+        return queue.get(timeout=10)
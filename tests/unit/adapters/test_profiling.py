@@ -0,0 +1,44 @@
+import pstats
+import tracemalloc
+
+from importlinter.adapters.profiling import CProfileProfiler
+
+SOME_SIZE = 10_000_000
+
+
+def allocate_memory() -> str:
+    data = bytearray(SOME_SIZE)
+    del data
+    return "some result"
+
+
+class TestCProfileProfiler:
+    def test_saves_profile_and_returns_result(self, tmp_path):
+        stats_filename = str(tmp_path / "profiles" / "some-contract.pstats")
+
+        result, _ = CProfileProfiler().profile(allocate_memory, stats_filename)
+
+        assert result == "some result"
+        stats = pstats.Stats(stats_filename)
+        profiled_function_names = {function_name for _, _, function_name in stats.stats}
+        assert "allocate_memory" in profiled_function_names
+
+    def test_returns_peak_memory(self, tmp_path):
+        _, peak_memory = CProfileProfiler().profile(
+            allocate_memory, str(tmp_path / "some-contract.pstats")
+        )
+
+        assert SOME_SIZE <= peak_memory < 2 * SOME_SIZE
+        assert not tracemalloc.is_tracing()
+
+    def test_leaves_existing_memory_tracing_running(self, tmp_path):
+        tracemalloc.start()
+        try:
+            _, peak_memory = CProfileProfiler().profile(
+                allocate_memory, str(tmp_path / "some-contract.pstats")
+            )
+
+            assert tracemalloc.is_tracing()
+        finally:
+            tracemalloc.stop()
+        assert SOME_SIZE <= peak_memory < 2 * SOME_SIZE
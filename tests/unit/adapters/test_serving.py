@@ -0,0 +1,117 @@
+import socket
+import threading
+
+import pytest
+
+from importlinter.adapters.serving import UnixSocketDaemonTransport
+from importlinter.application.ports.serving import CheckRequest, CheckResponse, DaemonNotRunning
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(socket, "AF_UNIX"), reason="Unix domain sockets are not available."
+)
+
+
+class _StopServing(Exception):
+    pass
+
+
+class TestUnixSocketDaemonTransport:
+    def test_request_and_response(self, tmp_path):
+        address = str(tmp_path / "daemon.sock")
+        received_requests = []
+
+        def handle_request(request):
+            received_requests.append(request)
+            return CheckResponse(
+                passed=False, output=(("Contract foo BROKEN", True, "red", True),)
+            )
+
+        with _ServingInThread(address, handle_request):
+            response = UnixSocketDaemonTransport().send_request(
+                address,
+                CheckRequest(
+                    limit_to_contracts=("foo",),
+                    show_timings=True,
+                    verbose=False,
+                    fail_fast=True,
+                    summary_only=True,
+                    workers=2,
+                    config_fingerprint="abc123",
+                ),
+            )
+
+        assert received_requests == [
+            CheckRequest(
+                limit_to_contracts=("foo",),
+                show_timings=True,
+                verbose=False,
+                fail_fast=True,
+                summary_only=True,
+                workers=2,
+                config_fingerprint="abc123",
+            )
+        ]
+        assert response == CheckResponse(
+            passed=False, output=(("Contract foo BROKEN", True, "red", True),)
+        )
+
+    def test_rejected_request(self, tmp_path):
+        address = str(tmp_path / "daemon.sock")
+
+        def handle_request(request):
+            return CheckResponse(passed=False, output=(), rejection_reason="Wrong config.")
+
+        with _ServingInThread(address, handle_request):
+            response = UnixSocketDaemonTransport().send_request(address, CheckRequest())
+
+        assert response == CheckResponse(passed=False, output=(), rejection_reason="Wrong config.")
+
+    def test_socket_is_removed_when_serving_stops(self, tmp_path):
+        address = tmp_path / "daemon.sock"
+
+        with _ServingInThread(str(address), lambda request: None):
+            assert address.exists()
+
+        assert not address.exists()
+
+    def test_daemon_not_running(self, tmp_path):
+        with pytest.raises(DaemonNotRunning):
+            UnixSocketDaemonTransport().send_request(str(tmp_path / "daemon.sock"), CheckRequest())
+
+    def test_cannot_serve_at_an_address_already_in_use(self, tmp_path):
+        address = str(tmp_path / "daemon.sock")
+
+        with _ServingInThread(address, lambda request: None):
+            with pytest.raises(RuntimeError, match="A daemon is already listening"):
+                UnixSocketDaemonTransport().serve(address, lambda request: None, lambda: None)
+
+
+class _ServingInThread:
+    def __init__(self, address, handle_request):
+        self._address = address
+        self._handle_request = handle_request
+        self._stop = threading.Event()
+        self._listening = threading.Event()
+
+    def __enter__(self):
+        transport = UnixSocketDaemonTransport()
+        transport.IDLE_INTERVAL = 0.01
+
+        def handle_idle():
+            self._listening.set()
+            if self._stop.is_set():
+                raise _StopServing
+
+        def serve():
+            try:
+                transport.serve(self._address, self._handle_request, handle_idle)
+            except _StopServing:
+                pass
+
+        self._thread = threading.Thread(target=serve)
+        self._thread.start()
+        assert self._listening.wait(timeout=5)
+
+    def __exit__(self, *args):
+        self._stop.set()
+        self._thread.join(timeout=5)
@@ -1,6 +1,7 @@
 import time
 
 from importlinter.adapters.timing import SystemClockTimer
+from importlinter.application.ports.timing import Timer
 from tests.adapters.timing import FakeTimer
 
 
@@ -30,6 +31,16 @@ class TestSystemClockTimer:
         assert middle_duration >= inner_duration + some_seconds
         assert outer_duration >= middle_duration
 
+    def test_sub_second_precision(self):
+        some_seconds = 0.05
+
+        with SystemClockTimer() as timer:
+            time.sleep(some_seconds)
+
+        assert isinstance(timer.duration_in_ns, int)
+        assert some_seconds <= timer.duration_in_s < 1
+        assert timer.duration_in_s == timer.duration_in_ns / 1_000_000_000
+
 
 class TestFakeTimer:
     def test_unnested(self):
@@ -54,3 +65,22 @@ class TestFakeTimer:
                 assert timer.duration_in_s == 10
             assert timer.duration_in_s == 23
         assert timer.duration_in_s == 39
+
+
+class TestTimer:
+    def test_times_using_get_current_time_by_default(self):
+        class SecondsTimer(Timer):
+            def __init__(self) -> None:
+                super().__init__()
+                self.current_time = 100.0
+
+            def get_current_time(self) -> float:
+                return self.current_time
+
+        timer = SecondsTimer()
+
+        with timer:
+            timer.current_time += 2.5
+
+        assert timer.duration_in_ns == 2_500_000_000
+        assert timer.duration_in_s == 2.5
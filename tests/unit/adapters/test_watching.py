@@ -0,0 +1,71 @@
+import os
+
+import pytest
+
+from importlinter.adapters.watching import InotifyFileWatcher, PollingFileWatcher
+
+
+@pytest.fixture
+def package_directory(tmp_path):
+    package = tmp_path / "mypackage"
+    (package / "subpackage").mkdir(parents=True)
+    for filename in ("__init__.py", "one.py", "subpackage/__init__.py", "subpackage/two.py"):
+        (package / filename).write_text("")
+    (package / "README.txt").write_text("")
+    return package
+
+
+@pytest.fixture(
+    params=(
+        PollingFileWatcher,
+        pytest.param(
+            InotifyFileWatcher,
+            marks=pytest.mark.skipif(
+                not InotifyFileWatcher.is_available(), reason="inotify is not available."
+            ),
+        ),
+    )
+)
+def watcher(request, package_directory):
+    watcher = request.param()
+    watcher.watch([str(package_directory)])
+    return watcher
+
+
+class TestFileWatchers:
+    def test_no_changes(self, watcher):
+        assert watcher.get_changed_files() == set()
+
+    def test_modified_added_and_removed_files(self, watcher, package_directory):
+        modified_file = package_directory / "subpackage" / "two.py"
+        modified_file.write_text("import mypackage.one\n")
+        # Make sure the modification time changes, even on file systems with coarse timestamps.
+        os.utime(modified_file, ns=(0, 0))
+        (package_directory / "three.py").write_text("")
+        (package_directory / "one.py").unlink()
+
+        assert watcher.get_changed_files() >= {
+            str(modified_file),
+            str(package_directory / "three.py"),
+            str(package_directory / "one.py"),
+        }
+
+    def test_changes_are_only_returned_once(self, watcher, package_directory):
+        (package_directory / "three.py").write_text("")
+        watcher.get_changed_files()
+
+        assert watcher.get_changed_files() == set()
+
+    def test_non_python_files_are_ignored(self, watcher, package_directory):
+        (package_directory / "README.txt").write_text("Changed.")
+
+        assert watcher.get_changed_files() == set()
+
+    def test_files_in_new_directories_are_watched(self, watcher, package_directory):
+        new_directory = package_directory / "newpackage"
+        new_directory.mkdir()
+        watcher.get_changed_files()
+
+        (new_directory / "__init__.py").write_text("")
+
+        assert str(new_directory / "__init__.py") in watcher.get_changed_files()
@@ -0,0 +1,177 @@
+import pytest
+from grimp.adaptors.graph import ImportGraph
+
+from importlinter.application import benchmarking
+from importlinter.application.app_config import settings
+from importlinter.application.benchmarking import (
+    BenchmarkResults,
+    InvalidBenchmarkResults,
+    ScenarioComparison,
+    ScenarioResult,
+)
+from importlinter.adapters.timing import SystemClockTimer
+from tests.adapters.timing import FakeTimer
+from tests.helpers.contracts import AlwaysPassesContract, SlowMetadataContract
+
+
+def _build_results(**median_durations: float) -> BenchmarkResults:
+    return BenchmarkResults(
+        importlinter_version="1.0",
+        python_version="3.11.0",
+        scenarios={
+            scenario_id: ScenarioResult(
+                name=f"Contract {scenario_id}", durations=(duration,), peak_rss=None
+            )
+            for scenario_id, duration in median_durations.items()
+        },
+    )
+
+
+class TestBenchmarkContracts:
+    def test_times_each_round_of_each_contract(self):
+        timer = FakeTimer()
+        timer.setup(tick_duration=1, increment=1)
+        settings.configure(TIMER=timer)
+        graph = ImportGraph()
+        graph.add_module("mypackage")
+
+        results = benchmarking.benchmark_contracts(
+            graph,
+            tasks=[
+                (AlwaysPassesContract, {"name": "Contract foo", "id": "foo"}),
+                (AlwaysPassesContract, {"name": "Contract bar"}),
+            ],
+            session_options={"root_packages": ["mypackage"]},
+            rounds=3,
+        )
+
+        assert list(results.scenarios) == ["foo", "Contract bar"]
+        # Each contract is checked in a fresh process, so starts with the timer as configured.
+        for scenario_id, name in [("foo", "Contract foo"), ("Contract bar", "Contract bar")]:
+            result = results.scenarios[scenario_id]
+            assert result.name == name
+            assert result.durations == (1.0, 2.0, 3.0)
+            assert result.median_duration == 2.0
+            assert result.peak_rss > 0
+
+    def test_building_the_metadata_is_timed(self):
+        settings.configure(TIMER=SystemClockTimer())
+        graph = ImportGraph()
+        graph.add_module("mypackage")
+
+        results = benchmarking.benchmark_contracts(
+            graph,
+            tasks=[
+                (SlowMetadataContract, {"name": "Contract foo", "id": "foo", "seconds": "0.1"})
+            ],
+            session_options={"root_packages": ["mypackage"]},
+            rounds=1,
+        )
+
+        [duration] = results.scenarios["foo"].durations
+        assert duration >= 0.1
+
+
+class TestCompareResults:
+    @pytest.mark.parametrize(
+        "baseline_duration, current_duration, expected_regression",
+        (
+            (1.0, 1.0, False),
+            (1.0, 0.5, False),
+            (1.0, 1.1, False),
+            (1.0, 1.11, True),
+            (1.0, 3.0, True),
+        ),
+    )
+    def test_regression_is_slowdown_past_threshold(
+        self, baseline_duration, current_duration, expected_regression
+    ):
+        [comparison] = benchmarking.compare_results(
+            baseline=_build_results(foo=baseline_duration),
+            current=_build_results(foo=current_duration),
+            threshold=0.1,
+        )
+
+        assert comparison.is_regression == expected_regression
+
+    @pytest.mark.parametrize(
+        "min_difference, expected_regression",
+        (
+            (0.0, True),
+            (0.005, False),
+            (0.001, True),
+        ),
+    )
+    def test_regression_must_exceed_min_difference(self, min_difference, expected_regression):
+        [comparison] = benchmarking.compare_results(
+            baseline=_build_results(foo=0.001),
+            current=_build_results(foo=0.003),
+            threshold=0.1,
+            min_difference=min_difference,
+        )
+
+        assert comparison.is_regression == expected_regression
+
+    def test_scenarios_on_only_one_side_are_not_regressions(self):
+        comparisons = benchmarking.compare_results(
+            baseline=_build_results(foo=1.0, bar=1.0),
+            current=_build_results(baz=1.0, foo=2.0),
+            threshold=0.1,
+        )
+
+        assert [(c.scenario_id, c.is_regression) for c in comparisons] == [
+            ("baz", False),
+            ("foo", True),
+            ("bar", False),
+        ]
+        baz, foo, bar = comparisons
+        assert baz.baseline is None
+        assert bar.current is None
+        assert (baz.change, foo.change, bar.change) == (None, 1.0, None)
+
+
+class TestScenarioComparison:
+    def test_median_duration_is_used(self):
+        comparison = ScenarioComparison(
+            scenario_id="foo",
+            baseline=ScenarioResult(name="Contract foo", durations=(1.0, 2.0, 9.0), peak_rss=None),
+            current=ScenarioResult(name="Contract foo", durations=(3.0, 3.0, 1.0), peak_rss=None),
+            is_regression=True,
+        )
+
+        assert comparison.name == "Contract foo"
+        assert comparison.change == 0.5
+
+
+class TestSerialization:
+    def test_results_survive_round_trip(self):
+        results = BenchmarkResults(
+            importlinter_version="1.0",
+            python_version="3.11.0",
+            scenarios={
+                "foo": ScenarioResult(
+                    name="Contract foo", durations=(0.5, 0.25), peak_rss=123_456
+                ),
+                "Contract bar": ScenarioResult(
+                    name="Contract bar", durations=(1.5,), peak_rss=None
+                ),
+            },
+        )
+
+        serialized = benchmarking.serialize_results(results)
+
+        assert benchmarking.deserialize_results(serialized) == results
+
+    @pytest.mark.parametrize(
+        "serialized",
+        (
+            "Not JSON",
+            "[]",
+            '{"format_version": 1}',
+            '{"format_version": 9999, "importlinter_version": "1.0", "python_version": "3.11.0", '
+            '"scenarios": {}}',
+        ),
+    )
+    def test_invalid_results_raise(self, serialized):
+        with pytest.raises(InvalidBenchmarkResults):
+            benchmarking.deserialize_results(serialized)
@@ -0,0 +1,215 @@
+from grimp.adaptors.graph import ImportGraph
+
+import pytest
+
+from importlinter.application.check_caching import (
+    build_contract_key,
+    contract_is_affected_by_changes,
+    find_changed_modules,
+    find_packages_affected_by_changes,
+    fingerprint_graph,
+)
+from importlinter.contracts.forbidden import ForbiddenContract
+from tests.helpers.contracts import AlwaysFailsContract, AlwaysPassesContract
+
+
+class TestFingerprintGraph:
+    def test_same_graph_gives_same_fingerprint(self):
+        assert fingerprint_graph(self._build_graph()) == fingerprint_graph(self._build_graph())
+
+    def test_import_details_are_not_fingerprinted(self):
+        graph = self._build_graph()
+        graph.remove_import(importer="mypackage.blue", imported="mypackage.green")
+        graph.add_import(
+            importer="mypackage.blue",
+            imported="mypackage.green",
+            line_number=2,
+            line_contents="from mypackage import green",
+        )
+
+        assert fingerprint_graph(graph) == fingerprint_graph(self._build_graph())
+
+    def test_squashed_module_gives_different_fingerprint(self):
+        graph = self._build_graph()
+        graph.squash_module("mypackage.green")
+
+        assert fingerprint_graph(graph) != fingerprint_graph(self._build_graph())
+
+    def test_added_module_gives_different_fingerprint(self):
+        graph = self._build_graph()
+        graph.add_module("mypackage.yellow")
+
+        assert fingerprint_graph(graph) != fingerprint_graph(self._build_graph())
+
+    def test_only_changed_module_has_different_module_fingerprint(self):
+        graph = self._build_graph()
+        graph.add_import(importer="mypackage.green", imported="mypackage.red")
+
+        fingerprint = fingerprint_graph(graph)
+        original_fingerprint = fingerprint_graph(self._build_graph())
+
+        assert {
+            module
+            for module in original_fingerprint.module_fingerprints
+            if original_fingerprint.module_fingerprints[module]
+            != fingerprint.module_fingerprints[module]
+        } == {"mypackage.green"}
+
+    def _build_graph(self) -> ImportGraph:
+        graph = ImportGraph()
+        graph.add_import(
+            importer="mypackage.blue",
+            imported="mypackage.green",
+            line_number=1,
+            line_contents="from mypackage import green",
+        )
+        return graph
+
+
+class TestFindChangedModules:
+    def test_finds_added_removed_and_changed_modules(self):
+        previous_graph = ImportGraph()
+        previous_graph.add_import(importer="mypackage.blue", imported="mypackage.green")
+        previous_graph.add_module("mypackage.yellow")
+        previous_graph.add_module("mypackage.purple")
+        graph = ImportGraph()
+        graph.add_import(importer="mypackage.blue", imported="mypackage.green")
+        graph.add_import(importer="mypackage.yellow", imported="mypackage.green")
+        graph.add_module("mypackage.orange")
+
+        assert find_changed_modules(
+            fingerprint_graph(previous_graph), fingerprint_graph(graph)
+        ) == {"mypackage.yellow", "mypackage.purple", "mypackage.orange"}
+
+
+class TestFindPackagesAffectedByChanges:
+    def test_includes_upstream_and_downstream_modules_and_their_ancestors(self):
+        graph = ImportGraph()
+        graph.add_import(importer="mypackage.blue.one", imported="mypackage.green")
+        graph.add_import(importer="mypackage.green", imported="mypackage.red.two")
+        graph.add_import(importer="mypackage.yellow", imported="mypackage.purple")
+
+        assert find_packages_affected_by_changes(graph, {"mypackage.green"}) == {
+            "mypackage",
+            "mypackage.blue",
+            "mypackage.blue.one",
+            "mypackage.green",
+            "mypackage.red",
+            "mypackage.red.two",
+        }
+
+    def test_includes_modules_affected_by_any_of_several_changes(self):
+        graph = ImportGraph()
+        graph.add_import(importer="mypackage.blue", imported="mypackage.green")
+        graph.add_import(importer="mypackage.yellow", imported="mypackage.purple")
+        graph.add_import(importer="mypackage.orange", imported="mypackage.brown")
+
+        assert find_packages_affected_by_changes(
+            graph, {"mypackage.blue", "mypackage.purple", "mypackage.removed"}
+        ) == {
+            "mypackage",
+            "mypackage.blue",
+            "mypackage.green",
+            "mypackage.yellow",
+            "mypackage.purple",
+            "mypackage.removed",
+        }
+
+    def test_each_module_is_only_searched_from_once_in_each_direction(self, monkeypatch):
+        graph = ImportGraph()
+        # A chain of modules, each of which changed.
+        modules = [f"mypackage.module_{i}" for i in range(10)]
+        for importer, imported in zip(modules, modules[1:]):
+            graph.add_import(importer=importer, imported=imported)
+        searched_modules = []
+        find_modules_directly_imported_by = graph.find_modules_directly_imported_by
+
+        def spy(module):
+            searched_modules.append(module)
+            return find_modules_directly_imported_by(module)
+
+        monkeypatch.setattr(graph, "find_modules_directly_imported_by", spy)
+
+        affected_packages = find_packages_affected_by_changes(graph, set(modules))
+
+        assert affected_packages == {"mypackage", *modules}
+        assert sorted(searched_modules) == sorted(modules)
+
+    def test_includes_removed_modules(self):
+        graph = ImportGraph()
+        graph.add_module("mypackage.blue")
+
+        assert find_packages_affected_by_changes(graph, {"mypackage.green.one"}) == {
+            "mypackage",
+            "mypackage.green",
+            "mypackage.green.one",
+        }
+
+
+class TestContractIsAffectedByChanges:
+    @pytest.mark.parametrize(
+        "source_module, forbidden_module, expected_result",
+        (
+            ("mypackage.blue", "mypackage.green", False),
+            ("mypackage.red", "mypackage.green", True),
+            ("mypackage.red.one", "mypackage.green", False),
+            ("mypackage.*.one", "mypackage.green", True),
+            ("*.blue", "mypackage.green", True),
+        ),
+    )
+    def test_contract_with_referenced_modules(
+        self, source_module, forbidden_module, expected_result
+    ):
+        contract = ForbiddenContract(
+            name="Contract",
+            session_options={"root_packages": ["mypackage"]},
+            contract_options={
+                "source_modules": [source_module],
+                "forbidden_modules": [forbidden_module],
+            },
+        )
+
+        assert (
+            contract_is_affected_by_changes(contract, {"mypackage", "mypackage.red"})
+            is expected_result
+        )
+
+    def test_contract_without_referenced_modules_is_always_affected(self):
+        contract = AlwaysPassesContract(
+            name="Contract", session_options={"root_packages": ["mypackage"]}, contract_options={}
+        )
+
+        assert contract_is_affected_by_changes(contract, set())
+
+
+class TestBuildContractKey:
+    SESSION_OPTIONS = {"root_packages": ["mypackage"]}
+
+    def test_same_contract_gives_same_key(self):
+        assert build_contract_key(self._build_contract()) == build_contract_key(
+            self._build_contract()
+        )
+
+    def test_different_options_give_different_key(self):
+        assert build_contract_key(self._build_contract()) != build_contract_key(
+            self._build_contract(warnings=["A warning."])
+        )
+
+    def test_different_session_options_give_different_key(self):
+        assert build_contract_key(self._build_contract()) != build_contract_key(
+            self._build_contract(session_options={"root_packages": ["otherpackage"]})
+        )
+
+    def test_different_contract_class_gives_different_key(self):
+        failing_contract = AlwaysFailsContract(
+            name="Contract", session_options=self.SESSION_OPTIONS, contract_options={}
+        )
+
+        assert build_contract_key(self._build_contract()) != build_contract_key(failing_contract)
+
+    def _build_contract(self, session_options=None, **contract_options):
+        return AlwaysPassesContract(
+            name="Contract",
+            session_options=session_options or self.SESSION_OPTIONS,
+            contract_options=contract_options,
+        )
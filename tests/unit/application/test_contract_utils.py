@@ -1,7 +1,13 @@
 import pytest
 from grimp.adaptors.graph import ImportGraph
 
-from importlinter.application.contract_utils import AlertLevel, remove_ignored_imports
+from importlinter.application.contract_utils import (
+    AlertLevel,
+    find_referenced_root_packages,
+    get_package_name,
+    remove_ignored_imports,
+)
+from importlinter.domain.contract import Contract, ContractCheck
 from importlinter.domain.helpers import MissingImport
 from importlinter.domain.imports import DirectImport, ImportExpression, Module, ModuleExpression
 
@@ -122,3 +128,60 @@ class TestRemoveIgnoredImports:
                 line_contents=direct_import.line_contents,
             )
         return graph
+
+
+class TestGetPackageName:
+    @pytest.mark.parametrize(
+        "expression, expected_result",
+        (
+            ("mypackage", "mypackage"),
+            ("mypackage.foo.bar", "mypackage.foo.bar"),
+            ("mypackage.*.bar", "mypackage"),
+            ("mypackage.foo.**", "mypackage.foo"),
+            ("*.foo", None),
+            ("**", None),
+        ),
+    )
+    def test_get_package_name(self, expression, expected_result):
+        assert get_package_name(ModuleExpression(expression)) == expected_result
+
+
+class _ReferencingContract(Contract):
+    def __init__(self, expressions):
+        self.expressions = expressions
+
+    def check(self, graph, verbose):
+        return ContractCheck(kept=True, warnings=None)
+
+    def render_broken_contract(self, check):
+        pass
+
+    def get_referenced_module_expressions(self):
+        if self.expressions is None:
+            return None
+        return {ModuleExpression(expression) for expression in self.expressions}
+
+
+class TestFindReferencedRootPackages:
+    ROOT_PACKAGE_NAMES = ["blue", "green", "namespace.yellow", "namespace.purple"]
+
+    @pytest.mark.parametrize(
+        "expressions, expected_result",
+        (
+            pytest.param(["blue.foo"], {"blue"}, id="module in root package"),
+            pytest.param(["blue.*", "green"], {"blue", "green"}, id="several root packages"),
+            pytest.param(["blue.*", "red.foo"], {"blue"}, id="external module"),
+            pytest.param(
+                ["namespace"],
+                {"namespace.yellow", "namespace.purple"},
+                id="namespace package containing root packages",
+            ),
+            pytest.param(["namespace.yellow.foo"], {"namespace.yellow"}, id="namespace portion"),
+            pytest.param(["blue", "*.foo"], set(ROOT_PACKAGE_NAMES), id="leading wildcard"),
+            pytest.param(None, None, id="unknown"),
+        ),
+    )
+    def test_find_referenced_root_packages(self, expressions, expected_result):
+        contract = _ReferencingContract(expressions)
+
+        assert find_referenced_root_packages(contract, self.ROOT_PACKAGE_NAMES) == expected_result
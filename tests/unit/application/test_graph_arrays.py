@@ -0,0 +1,163 @@
+import pytest
+from grimp.adaptors.graph import ImportGraph
+from grimp.exceptions import ModuleNotPresent
+
+from importlinter.application import graph_arrays
+from importlinter.application.graph_arrays import build_graph_arrays
+
+
+def _build_graph() -> ImportGraph:
+    graph = ImportGraph()
+    for module in (
+        "mypackage",
+        "mypackage.blue",
+        "mypackage.blue.alpha",
+        "mypackage.blue.beta",
+        "mypackage.blue_green",
+        "mypackage.green",
+        "mypackage.green.alpha",
+        "mypackage.yellow",
+        "mypackage.orange",
+        "otherpackage",
+    ):
+        graph.add_module(module)
+    for importer, imported in (
+        ("mypackage.blue", "mypackage.green"),
+        ("mypackage.blue.alpha", "mypackage.green.alpha"),
+        ("mypackage.blue.beta", "mypackage.green.alpha"),
+        ("mypackage.blue.beta", "mypackage.yellow"),
+        ("mypackage.green.alpha", "mypackage.yellow"),
+        ("mypackage.yellow", "mypackage.green"),
+        ("mypackage.green", "otherpackage"),
+        ("mypackage.blue_green", "mypackage.blue.alpha"),
+        ("mypackage.orange", "mypackage.orange"),
+    ):
+        graph.add_import(importer=importer, imported=imported)
+    return graph
+
+
+@pytest.mark.skipif(not graph_arrays.is_available(), reason="NumPy not installed.")
+class TestGraphArrays:
+    def test_stores_imports_in_both_directions(self):
+        graph = _build_graph()
+
+        arrays = build_graph_arrays(graph)
+
+        assert arrays.module_count == len(graph.modules)
+        assert arrays.import_count == graph.count_imports()
+        for module_id, module in enumerate(arrays.modules):
+            assert arrays.get_module_id(module) == module_id
+            start, end = arrays.imported_pointers[module_id : module_id + 2]
+            assert {
+                arrays.modules[i] for i in arrays.imported_ids[start:end]
+            } == graph.find_modules_directly_imported_by(module)
+            start, end = arrays.importer_pointers[module_id : module_id + 2]
+            assert {
+                arrays.modules[i] for i in arrays.importer_ids[start:end]
+            } == graph.find_modules_that_directly_import(module)
+
+    def test_arrays_are_read_only(self):
+        arrays = build_graph_arrays(_build_graph())
+
+        with pytest.raises(ValueError):
+            arrays.imported_ids[0] = 1
+
+    def test_counts_imports_of_each_module(self):
+        graph = _build_graph()
+
+        arrays = build_graph_arrays(graph)
+
+        assert dict(zip(arrays.modules, arrays.count_imported_modules().tolist())) == {
+            module: len(graph.find_modules_directly_imported_by(module))
+            for module in graph.modules
+        }
+        assert dict(zip(arrays.modules, arrays.count_importing_modules().tolist())) == {
+            module: len(graph.find_modules_that_directly_import(module))
+            for module in graph.modules
+        }
+
+    @pytest.mark.parametrize("as_package", (False, True))
+    @pytest.mark.parametrize(
+        "module",
+        ("mypackage", "mypackage.blue", "mypackage.green", "mypackage.orange", "otherpackage"),
+    )
+    def test_finds_same_upstream_and_downstream_modules_as_graph(self, module, as_package):
+        graph = _build_graph()
+
+        arrays = build_graph_arrays(graph)
+
+        assert arrays.find_upstream_modules(
+            module, as_package=as_package
+        ) == graph.find_upstream_modules(module, as_package=as_package)
+        assert arrays.find_downstream_modules(
+            module, as_package=as_package
+        ) == graph.find_downstream_modules(module, as_package=as_package)
+
+    def test_reachable_ids_include_supplied_modules_only_if_reached(self):
+        arrays = build_graph_arrays(_build_graph())
+        module_ids = [arrays.get_module_id(m) for m in ("mypackage.green", "mypackage.orange")]
+
+        reached = arrays.find_reachable_ids(module_ids)
+
+        assert {arrays.modules[i] for i in reached.nonzero()[0]} == {
+            "mypackage.orange",
+            "otherpackage",
+        }
+
+    def test_get_package_ids(self):
+        arrays = build_graph_arrays(_build_graph())
+
+        assert {arrays.modules[i] for i in arrays.get_package_ids("mypackage.blue")} == {
+            "mypackage.blue",
+            "mypackage.blue.alpha",
+            "mypackage.blue.beta",
+        }
+
+    def test_missing_module_raises(self):
+        arrays = build_graph_arrays(_build_graph())
+
+        with pytest.raises(ModuleNotPresent):
+            arrays.find_upstream_modules("mypackage.purple")
+
+    @pytest.mark.parametrize(
+        "depth, expected_counts",
+        (
+            (1, {("mypackage", "otherpackage"): 1}),
+            (
+                2,
+                {
+                    ("mypackage.blue", "mypackage.green"): 3,
+                    ("mypackage.blue", "mypackage.yellow"): 1,
+                    ("mypackage.blue_green", "mypackage.blue"): 1,
+                    ("mypackage.green", "mypackage.yellow"): 1,
+                    ("mypackage.green", "otherpackage"): 1,
+                    ("mypackage.yellow", "mypackage.green"): 1,
+                },
+            ),
+        ),
+    )
+    def test_counts_imports_between_packages(self, depth, expected_counts):
+        arrays = build_graph_arrays(_build_graph())
+
+        assert arrays.count_imports_between_packages(depth) == expected_counts
+
+    def test_invalid_depth_raises(self):
+        arrays = build_graph_arrays(_build_graph())
+
+        with pytest.raises(ValueError, match="Depth must be at least 1."):
+            arrays.count_imports_between_packages(0)
+
+    def test_empty_graph(self):
+        arrays = build_graph_arrays(ImportGraph())
+
+        assert arrays.module_count == 0
+        assert arrays.import_count == 0
+        assert arrays.count_imports_between_packages(1) == {}
+
+
+def test_building_without_numpy_raises(monkeypatch):
+    monkeypatch.setattr(graph_arrays, "_is_numpy_installed", False)
+
+    assert not graph_arrays.is_available()
+    with pytest.raises(ImportError, match="NumPy must be installed"):
+        build_graph_arrays(_build_graph())
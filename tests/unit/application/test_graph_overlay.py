@@ -0,0 +1,309 @@
+from copy import deepcopy
+
+import pytest
+from grimp.adaptors.graph import ImportGraph
+from grimp.exceptions import InvalidModuleExpression
+
+from importlinter.application.graph_overlay import GraphOverlay
+from importlinter.application.hierarchy_index import build_hierarchy_index
+from importlinter.application.module_name_index import ModuleNameIndex, build_module_name_index
+from importlinter.application.reachability import build_reachability_index
+
+
+class TestGraphOverlay:
+    def test_removed_import_is_visible_through_overlay_then_restored(self):
+        graph = self._build_graph()
+
+        with GraphOverlay(graph) as overlay:
+            overlay.remove_import(importer="mypackage.blue", imported="mypackage.green")
+
+            assert not overlay.direct_import_exists(
+                importer="mypackage.blue", imported="mypackage.green"
+            )
+            assert overlay.find_shortest_chains(
+                importer="mypackage.blue", imported="mypackage.yellow"
+            ) == {("mypackage.blue", "mypackage.purple", "mypackage.yellow")}
+
+        self._assert_graph_is_unchanged(graph)
+
+    def test_added_imports_and_modules_are_removed_on_revert(self):
+        graph = self._build_graph()
+
+        with GraphOverlay(graph) as overlay:
+            overlay.add_import(importer="mypackage.new", imported="otherpackage.new")
+            overlay.add_import(
+                importer="mypackage.blue",
+                imported="mypackage.green",
+                line_number=99,
+                line_contents="from . import green as g",
+            )
+            overlay.add_module("mypackage.another")
+
+            assert {"mypackage.new", "otherpackage.new", "mypackage.another"} <= overlay.modules
+            assert (
+                len(
+                    overlay.get_import_details(
+                        importer="mypackage.blue", imported="mypackage.green"
+                    )
+                )
+                == 3
+            )
+
+        self._assert_graph_is_unchanged(graph)
+
+    def test_import_without_details_is_restored(self):
+        graph = self._build_graph()
+
+        with GraphOverlay(graph) as overlay:
+            overlay.remove_import(importer="mypackage.purple", imported="mypackage.yellow")
+
+        assert graph.direct_import_exists(importer="mypackage.purple", imported="mypackage.yellow")
+        assert (
+            graph.get_import_details(importer="mypackage.purple", imported="mypackage.yellow")
+            == []
+        )
+
+    @pytest.mark.parametrize(
+        "mutate",
+        (
+            lambda overlay: overlay.squash_module("mypackage.blue"),
+            lambda overlay: overlay.remove_module("mypackage.green"),
+            # mypackage isn't in the graph, but is implied by its descendants.
+            lambda overlay: overlay.add_module("mypackage"),
+        ),
+    )
+    def test_falls_back_to_private_copy(self, mutate):
+        graph = self._build_graph()
+
+        with GraphOverlay(graph) as overlay:
+            overlay.remove_import(importer="mypackage.blue", imported="mypackage.purple")
+            mutate(overlay)
+
+            # The shared graph has been restored already.
+            self._assert_graph_is_unchanged(graph)
+            # The earlier mutation is still visible through the overlay.
+            assert not overlay.direct_import_exists(
+                importer="mypackage.blue", imported="mypackage.purple"
+            )
+
+        self._assert_graph_is_unchanged(graph)
+
+    def test_reverts_when_exception_is_raised(self):
+        graph = self._build_graph()
+
+        with pytest.raises(RuntimeError):
+            with GraphOverlay(graph) as overlay:
+                overlay.remove_import(importer="mypackage.blue", imported="mypackage.green")
+                raise RuntimeError
+
+        self._assert_graph_is_unchanged(graph)
+
+    def test_deepcopy_returns_graph_with_mutations(self):
+        graph = self._build_graph()
+
+        with GraphOverlay(graph) as overlay:
+            overlay.remove_import(importer="mypackage.blue", imported="mypackage.green")
+            copied = deepcopy(overlay)
+
+        assert isinstance(copied, ImportGraph)
+        assert not copied.direct_import_exists(
+            importer="mypackage.blue", imported="mypackage.green"
+        )
+        self._assert_graph_is_unchanged(graph)
+
+    @pytest.mark.parametrize(
+        "mutate, is_index_available",
+        (
+            (lambda overlay: None, True),
+            (
+                lambda overlay: overlay.remove_import(
+                    importer="mypackage.blue", imported="mypackage.green"
+                ),
+                True,
+            ),
+            (lambda overlay: overlay.remove_module("mypackage.green"), True),
+            (lambda overlay: overlay.add_module("mypackage.new"), True),
+            (
+                lambda overlay: overlay.add_import(
+                    importer="mypackage.yellow", imported="mypackage.blue"
+                ),
+                False,
+            ),
+            (lambda overlay: overlay.squash_module("mypackage.blue"), False),
+        ),
+    )
+    def test_reachability_index_is_only_available_while_safe_to_use(
+        self, mutate, is_index_available
+    ):
+        graph = self._build_graph()
+        reachability_index = build_reachability_index(graph)
+
+        with GraphOverlay(graph, reachability_index) as overlay:
+            mutate(overlay)
+
+            assert (overlay.reachability_index is reachability_index) == is_index_available
+
+    def test_matching_imports_are_shared_between_overlays(self, monkeypatch):
+        graph = self._build_graph()
+        matched_expressions = []
+        find_matching_direct_imports = ImportGraph.find_matching_direct_imports
+
+        def spy(self, *, import_expression):
+            matched_expressions.append(import_expression)
+            return find_matching_direct_imports(self, import_expression=import_expression)
+
+        monkeypatch.setattr(ImportGraph, "find_matching_direct_imports", spy)
+        matching_imports_cache: dict = {}
+        expected = [{"importer": "mypackage.blue", "imported": "mypackage.green"}]
+
+        for _ in range(2):
+            with GraphOverlay(graph, matching_imports_cache=matching_imports_cache) as overlay:
+                matching_imports = overlay.find_matching_direct_imports(
+                    import_expression="mypackage.blue -> mypackage.green"
+                )
+                assert matching_imports == expected
+                # Changing the result mustn't change what's cached.
+                matching_imports.clear()
+
+        assert matched_expressions == ["mypackage.blue -> mypackage.green"]
+
+    def test_matching_imports_cache_is_not_used_once_mutated(self):
+        graph = self._build_graph()
+        matching_imports_cache: dict = {}
+
+        with GraphOverlay(graph, matching_imports_cache=matching_imports_cache) as overlay:
+            overlay.remove_import(importer="mypackage.blue", imported="mypackage.green")
+
+            assert (
+                overlay.find_matching_direct_imports(
+                    import_expression="mypackage.blue -> mypackage.green"
+                )
+                == []
+            )
+
+        assert matching_imports_cache == {}
+
+    @pytest.mark.parametrize(
+        "mutate, is_index_used",
+        (
+            (lambda overlay: None, True),
+            (
+                lambda overlay: overlay.remove_import(
+                    importer="mypackage.blue", imported="mypackage.green"
+                ),
+                True,
+            ),
+            (lambda overlay: overlay.add_module("mypackage.new"), False),
+            (lambda overlay: overlay.remove_module("mypackage.purple"), False),
+        ),
+    )
+    def test_module_name_index_is_used_until_modules_change(
+        self, mutate, is_index_used, monkeypatch
+    ):
+        graph = self._build_graph()
+        module_name_index = build_module_name_index(graph)
+        index_expressions = []
+        find_matching_modules = ModuleNameIndex.find_matching_modules
+
+        def spy(self, expression):
+            index_expressions.append(str(expression))
+            return find_matching_modules(self, expression)
+
+        monkeypatch.setattr(ModuleNameIndex, "find_matching_modules", spy)
+
+        with GraphOverlay(graph, module_name_index=module_name_index) as overlay:
+            mutate(overlay)
+            matching_modules = overlay.find_matching_modules("mypackage.*")
+            matching_imports = overlay.find_matching_direct_imports(
+                import_expression="mypackage.* -> mypackage.yellow"
+            )
+
+            copied_graph = deepcopy(overlay)
+            assert matching_modules == copied_graph.find_matching_modules("mypackage.*")
+            assert matching_imports == copied_graph.find_matching_direct_imports(
+                import_expression="mypackage.* -> mypackage.yellow"
+            )
+        assert bool(index_expressions) == is_index_used
+
+    def test_invalid_expressions_are_left_to_graph(self):
+        graph = self._build_graph()
+
+        with GraphOverlay(graph, module_name_index=build_module_name_index(graph)) as overlay:
+            with pytest.raises(InvalidModuleExpression):
+                overlay.find_matching_modules("mypackage.blue*")
+
+    @pytest.mark.parametrize(
+        "mutate, is_index_available",
+        (
+            (lambda overlay: None, True),
+            (
+                lambda overlay: overlay.remove_import(
+                    importer="mypackage.blue", imported="mypackage.green"
+                ),
+                True,
+            ),
+            (lambda overlay: overlay.add_module("mypackage.blue.new"), False),
+            (lambda overlay: overlay.squash_module("mypackage.green"), False),
+            (lambda overlay: overlay.remove_module("mypackage.purple"), False),
+        ),
+    )
+    def test_hierarchy_index_is_only_available_until_modules_change(
+        self, mutate, is_index_available
+    ):
+        graph = self._build_graph()
+        graph.add_module("mypackage.blue.alpha")
+        hierarchy_index = build_hierarchy_index(graph)
+
+        with GraphOverlay(graph, hierarchy_index=hierarchy_index) as overlay:
+            mutate(overlay)
+
+            assert (overlay.hierarchy_index is hierarchy_index) == is_index_available
+            assert overlay.find_descendants("mypackage.blue") == deepcopy(
+                overlay
+            ).find_descendants("mypackage.blue")
+
+    def test_find_descendants_of_squashed_module_is_left_to_graph(self):
+        graph = self._build_graph()
+        graph.add_module("mypackage.orange", is_squashed=True)
+
+        with GraphOverlay(graph, hierarchy_index=build_hierarchy_index(graph)) as overlay:
+            with pytest.raises(ValueError, match="squashed"):
+                overlay.find_descendants("mypackage.orange")
+
+    def _build_graph(self) -> ImportGraph:
+        graph = ImportGraph()
+        for line_number in (1, 5):
+            graph.add_import(
+                importer="mypackage.blue",
+                imported="mypackage.green",
+                line_number=line_number,
+                line_contents=f"line {line_number}",
+            )
+        graph.add_import(
+            importer="mypackage.green",
+            imported="mypackage.yellow",
+            line_number=2,
+            line_contents="from . import yellow",
+        )
+        graph.add_import(
+            importer="mypackage.blue",
+            imported="mypackage.purple",
+            line_number=3,
+            line_contents="from . import purple",
+        )
+        graph.add_import(importer="mypackage.purple", imported="mypackage.yellow")
+        return graph
+
+    def _assert_graph_is_unchanged(self, graph: ImportGraph) -> None:
+        expected = self._build_graph()
+        assert graph.modules == expected.modules
+        assert graph.count_imports() == expected.count_imports()
+        for importer in expected.modules:
+            assert not graph.is_module_squashed(importer)
+            assert graph.find_modules_directly_imported_by(
+                importer
+            ) == expected.find_modules_directly_imported_by(importer)
+            for imported in expected.find_modules_directly_imported_by(importer):
+                assert graph.get_import_details(
+                    importer=importer, imported=imported
+                ) == expected.get_import_details(importer=importer, imported=imported)
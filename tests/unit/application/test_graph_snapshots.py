@@ -0,0 +1,129 @@
+import pytest
+from grimp.adaptors.graph import ImportGraph
+
+from importlinter.application.graph_snapshots import (
+    GraphSnapshot,
+    InvalidGraphSnapshot,
+    deserialize_snapshot,
+    restore_graph,
+    serialize_snapshot,
+    snapshot_graph,
+)
+
+
+class TestSnapshotGraph:
+    def test_round_trip(self):
+        graph = ImportGraph()
+        graph.add_module("mypackage")
+        graph.add_module("mypackage.squashed", is_squashed=True)
+        graph.add_import(
+            importer="mypackage.blue",
+            imported="mypackage.green",
+            line_number=3,
+            line_contents="from mypackage import green",
+        )
+        graph.add_import(
+            importer="mypackage.blue",
+            imported="mypackage.green",
+            line_number=5,
+            line_contents="from mypackage.green import foo",
+        )
+        # An import with no details.
+        graph.add_import(importer="mypackage.green", imported="mypackage.squashed")
+
+        restored = restore_graph(snapshot_graph(graph))
+
+        assert restored.modules == graph.modules
+        assert restored.count_imports() == graph.count_imports()
+        assert restored.is_module_squashed("mypackage.squashed")
+        assert not restored.is_module_squashed("mypackage.blue")
+        assert sorted(
+            restored.get_import_details(importer="mypackage.blue", imported="mypackage.green"),
+            key=lambda details: details["line_number"],
+        ) == [
+            {
+                "importer": "mypackage.blue",
+                "imported": "mypackage.green",
+                "line_number": 3,
+                "line_contents": "from mypackage import green",
+            },
+            {
+                "importer": "mypackage.blue",
+                "imported": "mypackage.green",
+                "line_number": 5,
+                "line_contents": "from mypackage.green import foo",
+            },
+        ]
+        assert restored.direct_import_exists(
+            importer="mypackage.green", imported="mypackage.squashed"
+        )
+
+    def test_snapshot_of_empty_graph(self):
+        snapshot = snapshot_graph(ImportGraph())
+
+        assert snapshot.modules == ()
+        assert snapshot.imports == ()
+        assert restore_graph(snapshot).modules == set()
+
+
+class TestSerializeSnapshot:
+    def test_round_trip(self):
+        snapshot = GraphSnapshot(
+            modules=("mypackage", "mypackage.blue", "mypackage.green", "mypackage.squashed"),
+            squashed_modules=("mypackage.squashed",),
+            imports=(
+                ("mypackage.blue", "mypackage.green", 3, "from mypackage import green"),
+                ("mypackage.blue", "mypackage.squashed", 4, "from mypackage import squashed"),
+                ("mypackage.green", "mypackage.blue", 1, "from mypackage import green"),
+                ("mypackage.green", "mypackage.squashed", None, None),
+                ("mypackage.squashed", "mypackage", 0, "import müpackage  # Non-ASCII."),
+            ),
+        )
+
+        assert deserialize_snapshot(serialize_snapshot(snapshot)) == snapshot
+
+    def test_round_trip_of_empty_snapshot(self):
+        snapshot = GraphSnapshot(modules=(), squashed_modules=(), imports=())
+
+        assert deserialize_snapshot(serialize_snapshot(snapshot)) == snapshot
+
+    def test_repeated_line_contents_are_stored_once(self):
+        line_contents = "from mypackage import something_with_a_long_name"
+        modules = tuple(f"mypackage.m{i}" for i in range(100))
+        snapshot = GraphSnapshot(
+            modules=modules,
+            squashed_modules=(),
+            imports=tuple((module, modules[0], 1, line_contents) for module in modules[1:]),
+        )
+
+        data = serialize_snapshot(snapshot)
+
+        assert data.count(line_contents.encode()) <= 1
+        assert deserialize_snapshot(data) == snapshot
+
+    @pytest.mark.parametrize(
+        "data, expected_message",
+        (
+            (b"", "The data is too short to be a graph snapshot."),
+            (b"NOTAGRAPH" + bytes(20), "The data is not a graph snapshot."),
+            (
+                b"ILGRAPH" + bytes([99]) + bytes(16),
+                "Unsupported graph snapshot format version 99.",
+            ),
+        ),
+    )
+    def test_invalid_header(self, data, expected_message):
+        with pytest.raises(InvalidGraphSnapshot, match=expected_message):
+            deserialize_snapshot(data)
+
+    def test_corrupt_body(self):
+        data = serialize_snapshot(
+            GraphSnapshot(
+                modules=("mypackage", "mypackage.blue"),
+                squashed_modules=(),
+                imports=(("mypackage.blue", "mypackage", 1, "import mypackage"),),
+            )
+        )
+
+        with pytest.raises(InvalidGraphSnapshot, match="The graph snapshot is corrupt"):
+            deserialize_snapshot(data[:-5])
@@ -0,0 +1,85 @@
+import pytest
+from grimp.adaptors.graph import ImportGraph
+from grimp.exceptions import ModuleNotPresent
+
+from importlinter.application.hierarchy_index import HierarchyIndex, build_hierarchy_index
+from importlinter.domain.imports import Module
+
+
+class TestHierarchyIndex:
+    MODULES = (
+        "mypackage",
+        "mypackage.blue",
+        "mypackage.blue.alpha",
+        "mypackage.blue.alpha.one",
+        "mypackage.blue.beta",
+        "mypackage.blue_green",
+        "mypackage.green",
+        # mypackage.yellow is only implied by its descendants.
+        "mypackage.yellow.one",
+        "mypackage.yellow.two",
+        "mypackage-extra",
+        "otherpackage",
+    )
+
+    def _build_graph(self) -> ImportGraph:
+        graph = ImportGraph()
+        for module in self.MODULES:
+            graph.add_module(module)
+        return graph
+
+    @pytest.mark.parametrize(
+        "package",
+        (
+            "mypackage",
+            "mypackage.blue",
+            "mypackage.blue.alpha",
+            "mypackage.blue.alpha.one",
+            "mypackage.blue_green",
+            "otherpackage",
+        ),
+    )
+    def test_finds_same_descendants_as_graph(self, package):
+        graph = self._build_graph()
+
+        assert build_hierarchy_index(graph).find_descendants(package) == graph.find_descendants(
+            package
+        )
+
+    @pytest.mark.parametrize("package", ("mypackage.yellow", "mypackage.purple"))
+    def test_find_descendants_of_missing_module_raises(self, package):
+        hierarchy_index = build_hierarchy_index(self._build_graph())
+
+        with pytest.raises(ModuleNotPresent):
+            hierarchy_index.find_descendants(package)
+
+    @pytest.mark.parametrize(
+        "package",
+        (
+            "mypackage",
+            "mypackage.blue",
+            "mypackage.blue.alpha",
+            "mypackage.blue_green",
+            "mypackage.yellow",
+            "mypackage.yellow.one",
+            "mypackage.purple",
+            "otherpackage",
+        ),
+    )
+    def test_agrees_with_module(self, package):
+        hierarchy_index = build_hierarchy_index(self._build_graph())
+
+        for module in self.MODULES + ("mypackage.purple.one",):
+            assert hierarchy_index.is_descendant_of(module, package) == Module(
+                module
+            ).is_descendant_of(Module(package))
+            assert hierarchy_index.is_in_package(module, package) == Module(module).is_in_package(
+                Module(package)
+            )
+
+    def test_empty_index(self):
+        hierarchy_index = HierarchyIndex([])
+
+        assert hierarchy_index.module_count == 0
+        assert hierarchy_index.is_descendant_of("mypackage.blue", "mypackage")
+        assert not hierarchy_index.is_in_package("mypackage", "mypackage.blue")
@@ -0,0 +1,132 @@
+import pytest
+from grimp.adaptors.graph import ImportGraph
+
+from importlinter.application.module_name_index import (
+    ModuleNameIndex,
+    build_module_name_index,
+    parse_import_expression,
+    parse_module_expression,
+)
+from importlinter.domain.imports import ImportExpression, ModuleExpression
+
+
+class TestModuleNameIndex:
+    def _build_graph(self) -> ImportGraph:
+        graph = ImportGraph()
+        for module in (
+            "mypackage",
+            "mypackage.blue",
+            "mypackage.blue.models",
+            "mypackage.blue.alpha.models",
+            "mypackage.green",
+            "mypackage.green.models",
+            # mypackage.yellow is only implied by its descendant.
+            "mypackage.yellow.beta",
+            "otherpackage.models",
+        ):
+            graph.add_module(module)
+        for importer, imported in (
+            ("mypackage.blue", "mypackage.green"),
+            ("mypackage.blue.models", "mypackage.green.models"),
+            ("mypackage.blue.alpha.models", "mypackage.green"),
+            ("mypackage.green.models", "otherpackage.models"),
+            ("mypackage.yellow.beta", "mypackage.blue.models"),
+        ):
+            graph.add_import(importer=importer, imported=imported)
+        return graph
+
+    @pytest.mark.parametrize(
+        "expression",
+        (
+            "mypackage.blue",
+            "mypackage.yellow",
+            "mypackage.purple",
+            "*",
+            "mypackage.*",
+            "mypackage.*.models",
+            "mypackage.**",
+            "mypackage.**.models",
+            "**.models",
+            "*.*.models",
+            "mypackage.blue.**",
+            "mypackage.*.alpha.**",
+        ),
+    )
+    def test_matches_same_modules_as_graph(self, expression):
+        graph = self._build_graph()
+        module_name_index = build_module_name_index(graph)
+
+        assert module_name_index.find_matching_modules(
+            ModuleExpression(expression)
+        ) == graph.find_matching_modules(expression)
+
+    @pytest.mark.parametrize(
+        "expression",
+        (
+            "mypackage.blue -> mypackage.green",
+            "mypackage.blue -> mypackage.purple",
+            "mypackage.* -> mypackage.green",
+            "mypackage.** -> mypackage.green",
+            "mypackage.**.models -> *.models",
+            "mypackage.** -> mypackage.**",
+            "** -> **",
+            "mypackage.*.* -> mypackage.*.*",
+        ),
+    )
+    def test_matches_same_direct_imports_as_graph(self, expression):
+        graph = self._build_graph()
+        module_name_index = build_module_name_index(graph)
+
+        assert module_name_index.find_matching_direct_imports(
+            graph, parse_import_expression(expression)
+        ) == graph.find_matching_direct_imports(import_expression=expression)
+
+    def test_direct_imports_are_looked_up_in_supplied_graph(self):
+        graph = self._build_graph()
+        module_name_index = ModuleNameIndex(graph.modules)
+        graph.remove_import(importer="mypackage.blue", imported="mypackage.green")
+
+        assert module_name_index.find_matching_direct_imports(
+            graph,
+            ImportExpression(
+                importer=ModuleExpression("mypackage.**"),
+                imported=ModuleExpression("mypackage.green"),
+            ),
+        ) == [{"importer": "mypackage.blue.alpha.models", "imported": "mypackage.green"}]
+
+
+@pytest.mark.parametrize(
+    "expression, is_valid",
+    (
+        ("mypackage.foo", True),
+        ("mypackage.**.foo", True),
+        ("mypackage..foo", False),
+        ("mypackage.foo*", False),
+        ("mypackage.**.*", False),
+    ),
+)
+def test_parse_module_expression(expression, is_valid):
+    parsed_expression = parse_module_expression(expression)
+
+    if is_valid:
+        assert parsed_expression == ModuleExpression(expression)
+    else:
+        assert parsed_expression is None
+
+
+@pytest.mark.parametrize(
+    "expression, expected",
+    (
+        (
+            "mypackage.* -> mypackage.foo",
+            ImportExpression(
+                importer=ModuleExpression("mypackage.*"),
+                imported=ModuleExpression("mypackage.foo"),
+            ),
+        ),
+        ("mypackage.foo", None),
+        ("mypackage.foo -> mypackage.bar*", None),
+    ),
+)
+def test_parse_import_expression(expression, expected):
+    assert parse_import_expression(expression) == expected
@@ -0,0 +1,33 @@
+import pytest
+
+from importlinter.application.output import format_duration, format_memory
+
+
+@pytest.mark.parametrize(
+    "duration_in_s, expected_result",
+    (
+        (0, "0ms"),
+        (0.0004, "0ms"),
+        (0.0126, "13ms"),
+        (1.5, "1,500ms"),
+        (90, "90,000ms"),
+    ),
+)
+def test_format_duration(duration_in_s, expected_result):
+    assert format_duration(duration_in_s) == expected_result
+
+
+@pytest.mark.parametrize(
+    "size_in_bytes, expected_result",
+    (
+        (0, "0kB"),
+        (400, "0kB"),
+        (40_600, "41kB"),
+        (999_999, "1000kB"),
+        (1_000_000, "1.0MB"),
+        (12_345_678, "12.3MB"),
+        (1_500_000_000, "1,500.0MB"),
+    ),
+)
+def test_format_memory(size_in_bytes, expected_result):
+    assert format_memory(size_in_bytes) == expected_result
@@ -0,0 +1,36 @@
+from typing import Callable, Tuple, TypeVar
+
+from grimp.adaptors.graph import ImportGraph
+
+from importlinter.application import profiling
+from importlinter.application.app_config import settings
+from tests.adapters.profiling import FakeProfiler
+from tests.helpers.contracts import SlowMetadataContract
+
+T = TypeVar("T")
+
+
+class TestCheckContractWithProfiling:
+    def test_metadata_is_built_while_profiling(self):
+        contract = SlowMetadataContract(
+            name="Contract foo", session_options={}, contract_options={"seconds": "0"}
+        )
+
+        class MetadataRecordingProfiler(FakeProfiler):
+            def profile(self, function: Callable[[], T], stats_filename: str) -> Tuple[T, int]:
+                result = super().profile(function, stats_filename)
+                self.built_metadata = contract.built_metadata
+                return result
+
+        profiler = MetadataRecordingProfiler(peak_memory=123)
+        settings.configure(PROFILER=profiler)
+
+        check, peak_memory = profiling.check_contract_with_profiling(
+            contract, ImportGraph(), verbose=False, profile_directory="/path/to/profiles"
+        )
+
+        assert profiler.built_metadata
+        assert not check.kept
+        assert check.metadata == {"seconds": "0"}
+        assert peak_memory == 123
+        assert profiler.stats_filenames == ["/path/to/profiles/Contract_foo.pstats"]
@@ -0,0 +1,88 @@
+import pytest
+from grimp.adaptors.graph import ImportGraph
+
+from importlinter.application.reachability import build_reachability_index
+
+
+class TestReachabilityIndex:
+    def _build_graph(self) -> ImportGraph:
+        graph = ImportGraph()
+        graph.add_module("mypackage.isolated")
+        for importer, imported in (
+            ("mypackage.blue", "mypackage.green"),
+            ("mypackage.green", "mypackage.yellow"),
+            # A cycle.
+            ("mypackage.yellow", "mypackage.orange"),
+            ("mypackage.orange", "mypackage.green"),
+            ("mypackage.orange", "mypackage.purple"),
+            ("mypackage.red", "mypackage.purple"),
+        ):
+            graph.add_import(importer=importer, imported=imported)
+        return graph
+
+    def test_modules_in_a_cycle_share_a_component(self):
+        reachability_index = build_reachability_index(self._build_graph())
+
+        # The cycle of green, yellow and orange is collapsed into one component.
+        assert reachability_index.component_count == 5
+
+    @pytest.mark.parametrize(
+        "importer, imported, is_reachable",
+        (
+            ("mypackage.blue", "mypackage.green", True),
+            ("mypackage.blue", "mypackage.purple", True),
+            ("mypackage.orange", "mypackage.yellow", True),
+            ("mypackage.yellow", "mypackage.green", True),
+            ("mypackage.red", "mypackage.purple", True),
+            ("mypackage.green", "mypackage.blue", False),
+            ("mypackage.purple", "mypackage.orange", False),
+            ("mypackage.red", "mypackage.green", False),
+            ("mypackage.blue", "mypackage.isolated", False),
+            ("mypackage.isolated", "mypackage.blue", False),
+            # Modules always reach themselves.
+            ("mypackage.isolated", "mypackage.isolated", True),
+            # Modules that aren't in the index may reach anything.
+            ("mypackage.new", "mypackage.blue", True),
+            ("mypackage.purple", "mypackage.new", True),
+        ),
+    )
+    def test_reachability_of_modules(self, importer, imported, is_reachable):
+        reachability_index = build_reachability_index(self._build_graph())
+
+        pairs = reachability_index.find_reachable_pairs(
+            importers={importer: [importer]}, importeds={imported: [imported]}
+        )
+
+        assert pairs == ({(importer, imported)} if is_reachable else set())
+
+    def test_reachability_of_groups_of_modules(self):
+        reachability_index = build_reachability_index(self._build_graph())
+
+        pairs = reachability_index.find_reachable_pairs(
+            importers={
+                "blue_and_red": ["mypackage.blue", "mypackage.red"],
+                "isolated": ["mypackage.isolated"],
+            },
+            importeds={
+                "purple": ["mypackage.purple"],
+                "blue_and_isolated": ["mypackage.blue", "mypackage.isolated"],
+            },
+        )
+
+        assert pairs == {
+            ("blue_and_red", "purple"),
+            # Blue is in both.
+            ("blue_and_red", "blue_and_isolated"),
+            ("isolated", "blue_and_isolated"),
+        }
+
+    def test_deep_chains_do_not_hit_recursion_limit(self):
+        graph = ImportGraph()
+        for i in range(5000):
+            graph.add_import(importer=f"mypackage.mod_{i}", imported=f"mypackage.mod_{i + 1}")
+
+        reachability_index = build_reachability_index(graph)
+
+        assert reachability_index.find_reachable_pairs(
+            importers={"first": ["mypackage.mod_0"]}, importeds={"last": ["mypackage.mod_5000"]}
+        ) == {("first", "last")}
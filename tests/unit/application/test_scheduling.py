@@ -0,0 +1,70 @@
+import pytest
+
+from importlinter.application.scheduling import (
+    DURATION_HISTORY_LENGTH,
+    get_median_durations,
+    order_for_fail_fast,
+    order_longest_first,
+    record_durations,
+)
+
+
+class TestRecordDurations:
+    def test_appends_new_durations(self):
+        history = {"a": [1.0, 2.0], "b": [5.0]}
+
+        result = record_durations(history, {"a": 3.0, "c": 4.0})
+
+        assert result == {"a": [1.0, 2.0, 3.0], "b": [5.0], "c": [4.0]}
+        # The supplied history is left alone.
+        assert history == {"a": [1.0, 2.0], "b": [5.0]}
+
+    def test_keeps_only_most_recent_durations(self):
+        history = {"a": [float(i) for i in range(DURATION_HISTORY_LENGTH)]}
+
+        result = record_durations(history, {"a": 100.0})
+
+        assert len(result["a"]) == DURATION_HISTORY_LENGTH
+        assert result["a"][0] == 1.0
+        assert result["a"][-1] == 100.0
+
+
+class TestGetMedianDurations:
+    def test_get_median_durations(self):
+        assert get_median_durations({"a": [3.0, 1.0, 2.0], "b": [1.0, 4.0], "c": []}) == {
+            "a": 2.0,
+            "b": 2.5,
+        }
+
+
+class TestOrderLongestFirst:
+    @pytest.mark.parametrize(
+        "expected_durations, expected_result",
+        (
+            ({}, ["a", "b", "c", "d"]),
+            ({"a": 1.0, "b": 5.0, "c": 3.0, "d": 2.0}, ["b", "c", "d", "a"]),
+            # Items with no expected duration go first.
+            ({"a": 1.0, "b": 5.0}, ["c", "d", "b", "a"]),
+        ),
+    )
+    def test_order_longest_first(self, expected_durations, expected_result):
+        assert order_longest_first(["a", "b", "c", "d"], expected_durations) == expected_result
+
+
+class TestOrderForFailFast:
+    @pytest.mark.parametrize(
+        "expected_durations, previously_failed, expected_result",
+        (
+            ({}, set(), ["a", "b", "c", "d"]),
+            ({}, {"c"}, ["c", "a", "b", "d"]),
+            ({"a": 5.0, "b": 1.0, "c": 3.0, "d": 2.0}, set(), ["b", "d", "c", "a"]),
+            ({"a": 5.0, "b": 1.0, "c": 3.0, "d": 2.0}, {"a", "c"}, ["c", "a", "b", "d"]),
+            # Items with no expected duration go last.
+            ({"a": 5.0, "c": 3.0}, set(), ["c", "a", "b", "d"]),
+        ),
+    )
+    def test_order_for_fail_fast(self, expected_durations, previously_failed, expected_result):
+        assert (
+            order_for_fail_fast(["a", "b", "c", "d"], expected_durations, previously_failed)
+            == expected_result
+        )
@@ -0,0 +1,161 @@
+import json
+import os
+
+import pytest
+
+from importlinter.application import tracing
+from importlinter.application.app_config import settings
+from tests.adapters.timing import FakeTimer
+
+START_NS = FakeTimer.ARBITRARY_START_TIME_NS
+
+
+@pytest.fixture(autouse=True)
+def stop_recording():
+    yield
+    tracing.stop_recording()
+
+
+class TestSpan:
+    def test_nothing_recorded_unless_recording(self):
+        settings.configure(TIMER=FakeTimer())
+
+        with tracing.span("Foo"):
+            pass
+
+        tracing.start_recording()
+        assert tracing.stop_recording() == []
+
+    def test_records_nested_spans(self):
+        timer = FakeTimer()
+        timer.setup(tick_duration=1, increment=1)
+        settings.configure(TIMER=timer)
+        tracing.start_recording()
+
+        with tracing.span("Outer", colour="blue"):
+            with tracing.span("Inner"):
+                # Advance the clock by one second.
+                with timer:
+                    pass
+            # Advance the clock by two seconds.
+            with timer:
+                pass
+
+        spans = tracing.stop_recording()
+        assert [(s.name, s.start_ns, s.duration_ns, s.args) for s in spans] == [
+            ("Inner", START_NS, 1_000_000_000, {}),
+            ("Outer", START_NS, 3_000_000_000, {"colour": "blue"}),
+        ]
+        assert {s.process_id for s in spans} == {os.getpid()}
+
+    def test_records_span_when_exception_raised(self):
+        settings.configure(TIMER=FakeTimer())
+        tracing.start_recording()
+
+        with pytest.raises(ValueError):
+            with tracing.span("Foo"):
+                raise ValueError
+
+        assert [s.name for s in tracing.stop_recording()] == ["Foo"]
+
+
+class TestTakeRecordedSpans:
+    def test_removes_spans_without_stopping_recording(self):
+        settings.configure(TIMER=FakeTimer())
+        tracing.start_recording()
+        with tracing.span("Foo"):
+            pass
+
+        assert [s.name for s in tracing.take_recorded_spans()] == ["Foo"]
+
+        with tracing.span("Bar"):
+            pass
+        assert [s.name for s in tracing.stop_recording()] == ["Bar"]
+
+    def test_returns_nothing_unless_recording(self):
+        assert tracing.take_recorded_spans() == []
+
+
+class TestAddSpans:
+    SPAN = tracing.Span(name="Foo", start_ns=1, duration_ns=2, process_id=3, thread_id=4)
+
+    def test_adds_spans_if_recording(self):
+        tracing.start_recording()
+
+        tracing.add_spans([self.SPAN])
+
+        assert tracing.stop_recording() == [self.SPAN]
+
+    def test_ignores_spans_unless_recording(self):
+        tracing.add_spans([self.SPAN])
+
+        tracing.start_recording()
+        assert tracing.stop_recording() == []
+
+
+class TestRenderChromeTrace:
+    def test_renders_complete_events_in_microseconds(self):
+        spans = [
+            tracing.Span(
+                name="Inner",
+                start_ns=5_500_000,
+                duration_ns=1_000,
+                process_id=100,
+                thread_id=12345,
+                args={"contract": "Foo"},
+            ),
+            tracing.Span(
+                name="Outer",
+                start_ns=5_000_000,
+                duration_ns=2_000_000,
+                process_id=100,
+                thread_id=12345,
+            ),
+            tracing.Span(
+                name="Worker", start_ns=6_000_000, duration_ns=500, process_id=200, thread_id=12345
+            ),
+        ]
+
+        trace = json.loads(tracing.render_chrome_trace(spans))
+
+        assert trace == {
+            "traceEvents": [
+                {
+                    "name": "Outer",
+                    "cat": "importlinter",
+                    "ph": "X",
+                    "ts": 0,
+                    "dur": 2_000,
+                    "pid": 100,
+                    "tid": 1,
+                    "args": {},
+                },
+                {
+                    "name": "Inner",
+                    "cat": "importlinter",
+                    "ph": "X",
+                    "ts": 500,
+                    "dur": 1,
+                    "pid": 100,
+                    "tid": 1,
+                    "args": {"contract": "Foo"},
+                },
+                {
+                    "name": "Worker",
+                    "cat": "importlinter",
+                    "ph": "X",
+                    "ts": 1_000,
+                    "dur": 0.5,
+                    "pid": 200,
+                    "tid": 2,
+                    "args": {},
+                },
+            ],
+            "displayTimeUnit": "ms",
+        }
+
+    def test_renders_no_spans(self):
+        assert json.loads(tracing.render_chrome_trace([])) == {
+            "traceEvents": [],
+            "displayTimeUnit": "ms",
+        }
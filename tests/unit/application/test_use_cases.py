@@ -1,19 +1,43 @@
+import json
+import os
 import re
 import string
-from typing import Any, Dict, List, Optional
+import time
+from typing import Any, Dict, List, Optional, Tuple
 from unittest.mock import sentinel
 
 import pytest
 from grimp.adaptors.graph import ImportGraph
 
+import tests
+
+from importlinter.application import benchmarking, parallel, reachability, tracing
 from importlinter.application.app_config import settings
+from importlinter.application.module_name_index import ModuleNameIndex
 from importlinter.application.ports.building import GraphBuilder
-from importlinter.application.use_cases import FAILURE, SUCCESS, create_report, lint_imports
+from importlinter.application.use_cases import (
+    FAILURE,
+    SUCCESS,
+    compare_benchmarks,
+    create_report,
+    lint_imports,
+    lint_imports_using_daemon,
+    read_user_options,
+    run_benchmarks,
+    serve,
+    _register_contract_types,
+)
 from importlinter.application.user_options import UserOptions
+from importlinter.domain.contract import ContractCheck
 from tests.adapters.building import FakeGraphBuilder
+from tests.adapters.caching import FakeContractCheckCache
+from tests.adapters.filesystem import FakeFileSystem
 from tests.adapters.printing import FakePrinter
+from tests.adapters.profiling import FakeProfiler
+from tests.adapters.serving import FakeDaemonTransport
 from tests.adapters.timing import FakeTimer
 from tests.adapters.user_options import ExceptionRaisingUserOptionReader, FakeUserOptionReader
+from tests.adapters.watching import FakeFileWatcher
 
 SOME_CACHE_DIR = "/path/to/some/cache/dir"
 
@@ -240,7 +264,7 @@ class TestCheckContractsAndPrintReport:
             Import Linter
             =============
 
-            Building graph took 5s.
+            Building graph took 5,000ms.
 
             ---------
             Contracts
@@ -249,8 +273,8 @@ class TestCheckContractsAndPrintReport:
             Analyzed 26 files, 10 dependencies.
             -----------------------------------
 
-            Contract foo KEPT [15s]
-            Contract bar KEPT (1 warning) [25s]
+            Contract foo KEPT [15,000ms]
+            Contract bar KEPT (1 warning) [25,000ms]
 
             Contracts: 2 kept, 0 broken.
 
@@ -265,6 +289,34 @@ class TestCheckContractsAndPrintReport:
             """
         )
 
+    def test_timings_are_compared_with_previous_runs(self):
+        cache = FakeContractCheckCache()
+        contracts_options = [
+            {"type": "always_passes", "name": "Contract foo"},
+            {"type": "always_passes", "name": "Contract bar"},
+        ]
+        timer = FakeTimer()
+        timer.setup(tick_duration=5, increment=10)
+        self._configure(
+            contracts_options=contracts_options, timer=timer, contract_check_cache=cache
+        )
+        lint_imports()
+
+        # Change the graph, so the contracts are checked again.
+        graph = self._build_default_graph()
+        graph.add_import(importer="mypackage.x", imported="mypackage.y")
+        self._configure(
+            contracts_options=contracts_options,
+            timer=timer,
+            contract_check_cache=cache,
+            graph=graph,
+        )
+        lint_imports(show_timings=True)
+
+        assert "Contract foo KEPT [45,000ms, median 15,000ms]" in settings.PRINTER._buffer
+        assert "Contract bar KEPT [55,000ms, median 25,000ms]" in settings.PRINTER._buffer
+        assert list(cache.durations[SOME_CACHE_DIR].values()) == [[15, 45], [25, 55]]
+
     @pytest.mark.parametrize(
         "cache_dir, expected_graph_building_output",
         (
@@ -288,12 +340,12 @@ class TestCheckContractsAndPrintReport:
 
                 Verbose mode.
                 {{ graph building output }}
-                Built graph in 5s.
+                Built graph in 5,000ms.
                 Checking Contract foo...
                 Hello from the noisy contract!
-                Contract foo KEPT [15s]
+                Contract foo KEPT [15,000ms]
                 Checking Contract bar...
-                Contract bar KEPT [25s]
+                Contract bar KEPT [25,000ms]
 
                 ---------
                 Contracts
@@ -451,6 +503,395 @@ class TestCheckContractsAndPrintReport:
             """
         )
 
+    @pytest.mark.parametrize(
+        "workers_kwargs, session_workers", [({"workers": 2}, None), ({}, "3")]
+    )
+    def test_parallel_checks_output_matches_serial_run(self, workers_kwargs, session_workers):
+        graph = self._build_default_graph()
+        graph.add_import(
+            importer="mypackage.foo",
+            imported="mypackage.bar",
+            line_number=8,
+            line_contents="from mypackage import bar",
+        )
+        contracts_options = [
+            {
+                "type": "forbidden",
+                "name": "Forbidden contract one",
+                "importer": "mypackage.foo",
+                "imported": "mypackage.bar",
+            },
+            {"type": "always_passes", "name": "Contract foo", "warnings": ["A warning."]},
+            {
+                "type": "forbidden",
+                "name": "Forbidden contract two",
+                "importer": "mypackage.foo",
+                "imported": "mypackage.baz",
+            },
+            {"type": "always_fails", "name": "Contract bar"},
+        ]
+        self._configure(contracts_options=contracts_options, graph=graph)
+        lint_imports(workers=1)
+        serial_output = settings.PRINTER._buffer
+
+        session_options: Dict[str, Any] = {"root_package": "mypackage"}
+        if session_workers:
+            session_options["workers"] = session_workers
+        self._configure(
+            contracts_options=contracts_options, session_options=session_options, graph=graph
+        )
+        result = lint_imports(is_debug_mode=True, **workers_kwargs)
+
+        assert result == FAILURE
+        assert "Contract bar BROKEN" in serial_output
+        assert settings.PRINTER._buffer == serial_output
+
+    FAIL_FAST_CONTRACTS_OPTIONS = [
+        {"type": "always_passes", "name": "Contract one"},
+        {"type": "always_fails", "name": "Contract two"},
+        {"type": "always_passes", "name": "Contract three"},
+        {"type": "always_fails", "name": "Contract four"},
+    ]
+
+    def test_fail_fast_stops_after_first_broken_contract(self):
+        self._configure(contracts_options=self.FAIL_FAST_CONTRACTS_OPTIONS)
+
+        result = lint_imports(fail_fast=True, cache_dir=None)
+
+        assert result == FAILURE
+        settings.PRINTER.pop_and_assert(
+            """
+            =============
+            Import Linter
+            =============
+
+            ---------
+            Contracts
+            ---------
+
+            Analyzed 26 files, 10 dependencies.
+            -----------------------------------
+
+            Contract one KEPT
+            Contract two BROKEN
+            Contract three SKIPPED
+            Contract four SKIPPED
+
+            Contracts: 1 kept, 1 broken, 2 skipped.
+
+
+            ----------------
+            Broken contracts
+            ----------------
+
+            Contract two
+            ------------
+
+            This contract will always fail.
+            """
+        )
+
+    def test_fail_fast_checks_previously_broken_contracts_first(self):
+        cache = FakeContractCheckCache()
+        self._configure(
+            contracts_options=self.FAIL_FAST_CONTRACTS_OPTIONS, contract_check_cache=cache
+        )
+        lint_imports()
+
+        # Change the graph, so nothing can be reused from the cache.
+        graph = self._build_default_graph()
+        graph.add_import(importer="mypackage.x", imported="mypackage.y")
+        self._configure(
+            contracts_options=self.FAIL_FAST_CONTRACTS_OPTIONS,
+            contract_check_cache=cache,
+            graph=graph,
+        )
+        report = create_report(read_user_options(), fail_fast=True, verbose=True)
+
+        assert [contract.name for contract, _ in report.get_contracts_and_checks()] == [
+            "Contract two"
+        ]
+        assert [contract.name for contract in report.skipped_contracts] == [
+            "Contract one",
+            "Contract three",
+            "Contract four",
+        ]
+
+    def test_fail_fast_checks_quickest_contracts_first(self):
+        cache = FakeContractCheckCache()
+        contracts_options = [
+            {"type": "always_passes", "name": "Contract one"},
+            {"type": "always_passes", "name": "Contract two"},
+            {"type": "always_passes", "name": "Contract three"},
+        ]
+        # Each check takes longer than the one before.
+        timer = FakeTimer()
+        timer.setup(tick_duration=1, increment=1)
+        self._configure(
+            contracts_options=contracts_options, timer=timer, contract_check_cache=cache
+        )
+        lint_imports()
+
+        graph = self._build_default_graph()
+        graph.add_import(importer="mypackage.x", imported="mypackage.y")
+        self._configure(
+            contracts_options=list(reversed(contracts_options)),
+            contract_check_cache=cache,
+            graph=graph,
+        )
+        lint_imports(fail_fast=True, verbose=True)
+
+        checked_contracts = re.findall(r"Checking (.*)\.\.\.", settings.PRINTER._buffer)
+        assert checked_contracts == ["Contract one", "Contract two", "Contract three"]
+
+    def test_parallel_checks_start_with_slowest_contracts(self, monkeypatch):
+        cache = FakeContractCheckCache()
+        contracts_options = [
+            {"type": "always_passes", "name": "Contract one"},
+            {"type": "always_passes", "name": "Contract two"},
+            {"type": "always_passes", "name": "Contract three"},
+        ]
+        timer = FakeTimer()
+        timer.setup(tick_duration=1, increment=1)
+        self._configure(
+            contracts_options=contracts_options, timer=timer, contract_check_cache=cache
+        )
+        lint_imports()
+
+        started_contracts = []
+
+        def check_contracts_in_parallel(graph, tasks, **kwargs):
+            started_contracts.extend(options["name"] for _, options in tasks)
+            return [(ContractCheck(kept=True), 0, None) for _ in tasks]
+
+        monkeypatch.setattr(parallel, "check_contracts_in_parallel", check_contracts_in_parallel)
+        graph = self._build_default_graph()
+        graph.add_import(importer="mypackage.x", imported="mypackage.y")
+        self._configure(
+            contracts_options=contracts_options, contract_check_cache=cache, graph=graph
+        )
+        result = lint_imports(workers=2, is_debug_mode=True)
+
+        assert result == SUCCESS
+        assert started_contracts == ["Contract three", "Contract two", "Contract one"]
+        # The results are still reported in the configured order.
+        assert settings.PRINTER._buffer.index(
+            "Contract one KEPT"
+        ) < settings.PRINTER._buffer.index("Contract three KEPT")
+
+    def test_fail_fast_only_checks_cached_broken_contract_again(self):
+        cache = FakeContractCheckCache()
+        self._configure(
+            contracts_options=self.FAIL_FAST_CONTRACTS_OPTIONS, contract_check_cache=cache
+        )
+        lint_imports()
+
+        self._configure(
+            contracts_options=self.FAIL_FAST_CONTRACTS_OPTIONS, contract_check_cache=cache
+        )
+        report = create_report(read_user_options(), fail_fast=True, verbose=True)
+
+        output = settings.PRINTER._buffer
+        assert "Using cached result for Contract one." in output
+        assert "Using cached result for Contract three." in output
+        assert "Checking Contract two..." in output
+        assert report.broken_count == 1
+        assert [contract.name for contract in report.skipped_contracts] == ["Contract four"]
+
+    def test_metadata_of_broken_contracts_is_not_built_to_cache_them(self):
+        cache = FakeContractCheckCache()
+        self._configure(
+            contracts_options=[
+                {"type": "slow_metadata", "id": "foo", "name": "Contract foo", "seconds": "0"}
+            ],
+            contract_types=["slow_metadata: tests.helpers.contracts.SlowMetadataContract"],
+            contract_check_cache=cache,
+        )
+        user_options = read_user_options()
+        _register_contract_types(user_options)
+
+        report = create_report(user_options)
+
+        [(contract, check)] = report.get_contracts_and_checks()
+        assert not check.kept
+        assert not contract.built_metadata
+        [cached_check] = cache.entries.values()
+        assert not cached_check.check.kept
+        assert cached_check.check.metadata == {}
+
+    def test_fail_fast_cancels_outstanding_parallel_checks(self):
+        contracts_options = [
+            {"type": "slow", "name": "Slow contract one", "seconds": "3"},
+            {"type": "always_fails", "name": "Broken contract"},
+            {"type": "slow", "name": "Slow contract two", "seconds": "3"},
+            {"type": "slow", "name": "Slow contract three", "seconds": "3"},
+        ]
+        self._configure(
+            contracts_options=contracts_options,
+            contract_types=[
+                "always_fails: tests.helpers.contracts.AlwaysFailsContract",
+                "slow: tests.helpers.contracts.SlowContract",
+            ],
+        )
+
+        user_options = read_user_options()
+        _register_contract_types(user_options)
+
+        start = time.monotonic()
+        report = create_report(user_options, workers=2, fail_fast=True, cache_dir=None)
+
+        assert time.monotonic() - start < 3
+        assert [contract.name for contract, _ in report.get_contracts_and_checks()] == [
+            "Broken contract"
+        ]
+        assert len(report.skipped_contracts) == 3
+
+    @pytest.mark.parametrize("workers", ["0", "two"])
+    def test_invalid_workers_option(self, workers):
+        self._configure(
+            contracts_options=[],
+            session_options={"root_package": "mypackage", "workers": workers},
+        )
+
+        with pytest.raises(ValueError, match=f"Invalid workers option '{workers}'"):
+            lint_imports(is_debug_mode=True)
+
+    def test_contract_checks_are_cached(self):
+        cache = FakeContractCheckCache()
+        contracts_options = [
+            {"type": "always_fails", "name": "Contract bar"},
+            {"type": "always_passes", "name": "Contract foo"},
+        ]
+        self._configure(contracts_options=contracts_options, contract_check_cache=cache)
+
+        lint_imports(verbose=True)
+
+        assert {cache_dir for cache_dir, _ in cache.entries} == {SOME_CACHE_DIR}
+        assert [entry.check.kept for entry in cache.entries.values()] == [False, True]
+
+        # Run again, this time the result of the kept contract should come from the cache. The
+        # broken contract is checked again, as the details of how it was broken may have changed.
+        self._configure(contracts_options=contracts_options, contract_check_cache=cache)
+        result = lint_imports(verbose=True)
+
+        assert result == FAILURE
+        output = settings.PRINTER._buffer
+        assert "Using cached result for Contract foo." in output
+        assert "Checking Contract bar..." in output
+        assert "Checking Contract foo..." not in output
+
+    def test_summary_only_results_are_cached_separately(self):
+        cache = FakeContractCheckCache()
+        contracts_options = [{"type": "always_fails", "name": "Contract bar"}]
+        self._configure(contracts_options=contracts_options, contract_check_cache=cache)
+
+        report = create_report(read_user_options(), summary_only=True)
+
+        [(contract, _)] = report.get_contracts_and_checks()
+        assert contract.session_options["summary_only"] is True
+        assert len(cache.entries) == 1
+
+        # Run again without summary only, this time the contract should be checked again.
+        self._configure(contracts_options=contracts_options, contract_check_cache=cache)
+        lint_imports(verbose=True)
+
+        output = settings.PRINTER._buffer
+        assert "Using cached result for Contract bar." not in output
+        assert "Checking Contract bar..." in output
+        assert len(cache.entries) == 2
+
+    def test_cached_contract_checks_are_not_used_if_graph_changes(self):
+        cache = FakeContractCheckCache()
+        contracts_options = [{"type": "always_passes", "name": "Contract foo"}]
+        self._configure(contracts_options=contracts_options, contract_check_cache=cache)
+        lint_imports()
+
+        graph = self._build_default_graph()
+        graph.add_import(importer="mypackage.a", imported="mypackage.b")
+        self._configure(
+            contracts_options=contracts_options, contract_check_cache=cache, graph=graph
+        )
+        lint_imports(verbose=True)
+
+        assert "Checking Contract foo..." in settings.PRINTER._buffer
+        assert len(cache.entries) == 1
+
+    def test_only_contracts_affected_by_changed_modules_are_checked_again(self):
+        cache = FakeContractCheckCache()
+        self._configure(
+            contracts_options=self.INCREMENTAL_CONTRACTS_OPTIONS,
+            contract_types=self.INCREMENTAL_CONTRACT_TYPES,
+            contract_check_cache=cache,
+        )
+        assert lint_imports() == SUCCESS
+
+        graph = self._build_default_graph()
+        graph.add_import(importer="mypackage.b", imported="mypackage.z")
+        self._configure(
+            contracts_options=self.INCREMENTAL_CONTRACTS_OPTIONS,
+            contract_types=self.INCREMENTAL_CONTRACT_TYPES,
+            contract_check_cache=cache,
+            graph=graph,
+        )
+        result = lint_imports(verbose=True)
+
+        assert result == FAILURE
+        output = settings.PRINTER._buffer
+        assert "Checking Contract b-z..." in output
+        assert "Checking Contract unknown-modules..." in output
+        assert "Reusing result for Contract g-h, as it is not affected by the changes." in output
+        assert "Checking Contract g-h..." not in output
+
+        # Run again: every kept result should now come straight from the cache.
+        self._configure(
+            contracts_options=self.INCREMENTAL_CONTRACTS_OPTIONS,
+            contract_types=self.INCREMENTAL_CONTRACT_TYPES,
+            contract_check_cache=cache,
+            graph=graph,
+        )
+        lint_imports(verbose=True)
+
+        output = settings.PRINTER._buffer
+        assert "Checking Contract g-h..." not in output
+        assert "Checking Contract unknown-modules..." not in output
+        assert "Checking Contract b-z..." in output
+
+    def test_changed_modules_can_be_passed_explicitly(self):
+        cache = FakeContractCheckCache()
+        self._configure(
+            contracts_options=self.INCREMENTAL_CONTRACTS_OPTIONS,
+            contract_types=self.INCREMENTAL_CONTRACT_TYPES,
+            contract_check_cache=cache,
+        )
+        lint_imports()
+
+        graph = self._build_default_graph()
+        graph.add_import(importer="mypackage.b", imported="mypackage.z")
+        self._configure(
+            contracts_options=self.INCREMENTAL_CONTRACTS_OPTIONS,
+            contract_types=self.INCREMENTAL_CONTRACT_TYPES,
+            contract_check_cache=cache,
+            graph=graph,
+        )
+        report = create_report(read_user_options(), changed_modules={"mypackage.g"}, verbose=True)
+
+        # The supplied changed modules are used instead of the ones that were detected.
+        assert not report.contains_failures
+        output = settings.PRINTER._buffer
+        assert "Reusing result for Contract b-z" in output
+        assert "Checking Contract g-h..." in output
+
+    def test_contract_checks_are_not_cached_when_caching_disabled(self):
+        cache = FakeContractCheckCache()
+        self._configure(
+            contracts_options=[{"type": "always_passes", "name": "Contract foo"}],
+            contract_check_cache=cache,
+        )
+
+        lint_imports(cache_dir=None)
+
+        assert cache.entries == {}
+
     def test_debug_mode_doesnt_swallow_exception(self):
         some_exception = RuntimeError("There was some sort of exception.")
         reader = ExceptionRaisingUserOptionReader(exception=some_exception)
@@ -484,6 +925,115 @@ class TestCheckContractsAndPrintReport:
             """
         )
 
+    def test_trace_is_written_to_file(self):
+        self._configure(
+            contracts_options=[
+                {"type": "always_passes", "name": "Contract foo"},
+                {"type": "always_fails", "name": "Contract bar"},
+            ]
+        )
+        file_system = FakeFileSystem()
+        settings.configure(FILE_SYSTEM=file_system)
+
+        result = lint_imports(trace_file="/path/to/trace.json")
+
+        assert result == FAILURE
+        trace = json.loads(file_system.content_map["/path/to/trace.json"])
+        events = trace["traceEvents"]
+        assert {event["name"] for event in events} == {
+            "Read configuration",
+            "Register contract types",
+            "Build graph",
+            "Check contract",
+            "Render report",
+        }
+        assert [
+            event["args"]["contract"] for event in events if event["name"] == "Check contract"
+        ] == ["Contract foo", "Contract bar"]
+        build_graph_event = next(event for event in events if event["name"] == "Build graph")
+        # The FakeTimer makes each timed event take a second.
+        assert build_graph_event["dur"] == 1_000_000
+        assert {event["ph"] for event in events} == {"X"}
+
+    def test_trace_is_written_to_file_when_there_is_an_exception(self):
+        self._configure(contracts_options=[{"type": "always_passes", "name": "Contract foo"}])
+        file_system = FakeFileSystem()
+        settings.configure(FILE_SYSTEM=file_system)
+
+        result = lint_imports(
+            load_graph="/path/to/missing/graph", trace_file="/path/to/trace.json"
+        )
+
+        assert result == FAILURE
+        trace = json.loads(file_system.content_map["/path/to/trace.json"])
+        assert {event["name"] for event in trace["traceEvents"]} == {
+            "Read configuration",
+            "Register contract types",
+            "Build graph",
+        }
+
+    def test_nothing_is_traced_without_trace_file(self):
+        self._configure(contracts_options=[{"type": "always_passes", "name": "Contract foo"}])
+        file_system = FakeFileSystem()
+        settings.configure(FILE_SYSTEM=file_system)
+
+        lint_imports()
+
+        assert file_system.content_map == {}
+        assert not tracing.is_recording()
+
+    def test_contract_checks_are_profiled(self):
+        self._configure(
+            contracts_options=[
+                {"type": "always_passes", "id": "foo", "name": "Contract foo"},
+                # Without an id, the profile is named after the contract.
+                {"type": "always_fails", "name": "Contract: bar"},
+            ]
+        )
+        profiler = FakeProfiler(peak_memory=12_345_678)
+        settings.configure(PROFILER=profiler)
+
+        result = lint_imports(profile_directory="/path/to/profiles", verbose=True)
+
+        assert result == FAILURE
+        assert profiler.stats_filenames == [
+            "/path/to/profiles/foo.pstats",
+            "/path/to/profiles/Contract_bar.pstats",
+        ]
+        assert "Contract foo KEPT [1,000ms, peak memory 12.3MB]" in settings.PRINTER._buffer
+        assert "Contract: bar BROKEN [1,000ms, peak memory 12.3MB]" in settings.PRINTER._buffer
+
+    def test_contract_checks_are_not_profiled_by_default(self):
+        self._configure(contracts_options=[{"type": "always_passes", "name": "Contract foo"}])
+        profiler = FakeProfiler()
+        settings.configure(PROFILER=profiler)
+
+        lint_imports(verbose=True)
+
+        assert profiler.stats_filenames == []
+        assert "Contract foo KEPT [1,000ms]" in settings.PRINTER._buffer
+
+    INCREMENTAL_CONTRACT_TYPES = [
+        "always_passes: tests.helpers.contracts.AlwaysPassesContract",
+        "real_forbidden: importlinter.contracts.forbidden.ForbiddenContract",
+    ]
+    INCREMENTAL_CONTRACTS_OPTIONS = [
+        {
+            "type": "real_forbidden",
+            "name": "Contract b-z",
+            "source_modules": ["mypackage.b"],
+            "forbidden_modules": ["mypackage.z"],
+        },
+        {
+            "type": "real_forbidden",
+            "name": "Contract g-h",
+            "source_modules": ["mypackage.g"],
+            "forbidden_modules": ["mypackage.h"],
+        },
+        # Doesn't declare which modules it's concerned with, so is always checked.
+        {"type": "always_passes", "name": "Contract unknown-modules"},
+    ]
+
     def _configure(
         self,
         contracts_options: List[Dict[str, Any]],
@@ -492,6 +1042,7 @@ class TestCheckContractsAndPrintReport:
         graph: Optional[ImportGraph] = None,
         graph_builder: Optional[GraphBuilder] = None,
         timer: Optional[FakeTimer] = None,
+        contract_check_cache: Optional[FakeContractCheckCache] = None,
     ):
         session_options = session_options or {"root_package": "mypackage"}
         if not contract_types:
@@ -513,6 +1064,7 @@ class TestCheckContractsAndPrintReport:
             PRINTER=FakePrinter(),
             TIMER=timer or FakeTimer(),
             DEFAULT_CACHE_DIR=SOME_CACHE_DIR,
+            CONTRACT_CHECK_CACHE=contract_check_cache or FakeContractCheckCache(),
         )
         if graph is None:
             graph = self._build_default_graph()
@@ -550,6 +1102,139 @@ class TestMultipleRootPackages:
 
         assert builder.build_arguments["root_package_names"] == root_package_names
 
+    CONTRACTS_OPTIONS: List[Dict[str, Any]] = [
+        {
+            "type": "forbidden",
+            "name": "Blue contract",
+            "id": "blue",
+            "source_modules": ["mypackageblue.foo"],
+            "forbidden_modules": ["mypackageblue.bar", "django"],
+        },
+        {
+            "type": "forbidden",
+            "name": "Blue green contract",
+            "id": "blue-green",
+            "source_modules": ["mypackageblue.*"],
+            "forbidden_modules": ["mypackagegreen"],
+        },
+        {"type": "always_passes", "name": "Unknown modules contract", "id": "unknown-modules"},
+    ]
+
+    @pytest.mark.parametrize("limit_to_contracts", ((), ("blue",), ("blue-green",)))
+    def test_builder_is_called_with_all_root_packages_by_default(self, limit_to_contracts):
+        # Even a contract that only refers to mypackageblue could be broken by a chain through
+        # another root package, e.g. mypackageblue.foo -> mypackagegreen -> mypackageblue.bar.
+        builder = self._configure()
+        user_options = self._build_user_options()
+
+        create_report(user_options, limit_to_contracts=limit_to_contracts, cache_dir=None)
+
+        assert builder.build_arguments["root_package_names"] == [
+            "mypackageblue",
+            "mypackagegreen",
+            "mypackageyellow",
+        ]
+
+    @pytest.mark.parametrize(
+        "limit_to_contracts, expected_root_package_names",
+        (
+            ((), ["mypackageblue", "mypackagegreen", "mypackageyellow"]),
+            (("blue",), ["mypackageblue"]),
+            (("blue-green",), ["mypackageblue", "mypackagegreen"]),
+            (("blue", "blue-green"), ["mypackageblue", "mypackagegreen"]),
+            (
+                ("blue", "unknown-modules"),
+                ["mypackageblue", "mypackagegreen", "mypackageyellow"],
+            ),
+        ),
+    )
+    def test_builder_is_only_called_with_root_packages_needed_by_selected_contracts_if_set(
+        self, limit_to_contracts, expected_root_package_names
+    ):
+        builder = self._configure()
+        user_options = self._build_user_options(only_build_referenced_root_packages="True")
+
+        create_report(user_options, limit_to_contracts=limit_to_contracts, cache_dir=None)
+
+        assert builder.build_arguments["root_package_names"] == expected_root_package_names
+
+    def _configure(self) -> FakeGraphBuilder:
+        builder = FakeGraphBuilder()
+        graph = ImportGraph()
+        for module in ("mypackageblue.foo", "mypackageblue.bar", "mypackagegreen"):
+            graph.add_module(module)
+        graph.add_module("django", is_squashed=True)
+        builder.inject_graph(graph)
+        settings.configure(GRAPH_BUILDER=builder, PRINTER=FakePrinter())
+        return builder
+
+    def _build_user_options(self, **session_options: Any) -> UserOptions:
+        user_options = UserOptions(
+            session_options={
+                "root_packages": ["mypackageblue", "mypackagegreen", "mypackageyellow"],
+                "include_external_packages": "True",
+                "contract_types": [
+                    "always_passes: tests.helpers.contracts.AlwaysPassesContract",
+                    "forbidden: importlinter.contracts.forbidden.ForbiddenContract",
+                ],
+                **session_options,
+            },
+            contracts_options=self.CONTRACTS_OPTIONS,
+        )
+        _register_contract_types(user_options)
+        return user_options
+
+
+class TestDumpAndLoadGraph:
+    USER_OPTIONS = UserOptions(
+        session_options={"root_packages": ["mypackage"]},
+        contracts_options=[],
+    )
+
+    def test_graph_is_dumped_to_file(self):
+        builder = FakeGraphBuilder()
+        graph = ImportGraph()
+        graph.add_import(importer="mypackage.a", imported="mypackage.b")
+        graph.add_module("mypackage")
+        builder.inject_graph(graph)
+        settings.configure(GRAPH_BUILDER=builder, PRINTER=FakePrinter(), TIMER=FakeTimer())
+
+        create_report(self.USER_OPTIONS, cache_dir=None, dump_graph="/path/to/graph")
+
+        snapshot = builder.dumped_snapshots["/path/to/graph"]
+        assert snapshot.modules == ("mypackage", "mypackage.a", "mypackage.b")
+        assert snapshot.imports == (("mypackage.a", "mypackage.b", None, None),)
+
+    def test_graph_is_loaded_from_file_instead_of_being_built(self):
+        builder = FakeGraphBuilder()
+        dumped_graph = ImportGraph()
+        dumped_graph.add_import(importer="mypackage.a", imported="mypackage.b")
+        dumped_graph.add_module("mypackage")
+        builder.dump(dumped_graph, "/path/to/graph")
+        settings.configure(GRAPH_BUILDER=builder, PRINTER=FakePrinter(), TIMER=FakeTimer())
+
+        report = create_report(self.USER_OPTIONS, cache_dir=None, load_graph="/path/to/graph")
+
+        assert not hasattr(builder, "build_arguments")
+        assert report.graph.modules == {"mypackage", "mypackage.a", "mypackage.b"}
+        assert report.graph.direct_import_exists(importer="mypackage.a", imported="mypackage.b")
+
+    def test_loaded_graph_must_contain_root_packages(self):
+        builder = FakeGraphBuilder()
+        dumped_graph = ImportGraph()
+        dumped_graph.add_module("otherpackage")
+        builder.dump(dumped_graph, "/path/to/graph")
+        settings.configure(GRAPH_BUILDER=builder, PRINTER=FakePrinter(), TIMER=FakeTimer())
+
+        with pytest.raises(
+            ValueError,
+            match=(
+                "The graph loaded from /path/to/graph does not contain the root packages "
+                "mypackage."
+            ),
+        ):
+            create_report(self.USER_OPTIONS, cache_dir=None, load_graph="/path/to/graph")
+
 
 class TestGraphCopying:
     def test_graph_can_be_mutated_without_affecting_other_contracts(self):
@@ -584,6 +1269,7 @@ class TestGraphCopying:
             USER_OPTION_READERS={"foo": reader},
             GRAPH_BUILDER=FakeGraphBuilder(),
             PRINTER=FakePrinter(),
+            CONTRACT_CHECK_CACHE=FakeContractCheckCache(),
         )
 
         graph = ImportGraph()
@@ -646,6 +1332,465 @@ class TestCreateReport:
                 limit_to_contracts=limit_to_contracts,
             )
 
+    @pytest.mark.parametrize(
+        "reachability_index, is_index_built",
+        (("True", True), ("false", False), (None, False)),
+    )
+    def test_reachability_index_is_built_if_enabled(
+        self, reachability_index, is_index_built, monkeypatch
+    ):
+        session_options = {
+            "root_packages": ["mypackage"],
+            "contract_types": ["always_passes: tests.helpers.contracts.AlwaysPassesContract"],
+        }
+        if reachability_index is not None:
+            session_options["reachability_index"] = reachability_index
+        user_options = UserOptions(
+            session_options=session_options,
+            contracts_options=[{"type": "always_passes", "name": "Contract foo"}],
+        )
+        _register_contract_types(user_options)
+        graph = ImportGraph()
+        graph.add_module("mypackage")
+        builder = FakeGraphBuilder()
+        builder.inject_graph(graph)
+        settings.configure(GRAPH_BUILDER=builder, PRINTER=FakePrinter(), TIMER=FakeTimer())
+        built_indexes = []
+
+        def build_reachability_index(graph):
+            reachability_index = reachability.build_reachability_index(graph)
+            built_indexes.append(reachability_index)
+            return reachability_index
+
+        monkeypatch.setattr(
+            "importlinter.application.use_cases.build_reachability_index", build_reachability_index
+        )
+
+        report = create_report(user_options, cache_dir=None, verbose=True)
+
+        assert not report.contains_failures
+        assert len(built_indexes) == (1 if is_index_built else 0)
+        assert (
+            "Built reachability index of 1 components in 1,000ms." in settings.PRINTER._buffer
+        ) == is_index_built
+
+    @pytest.mark.parametrize("workers", (1, 2))
+    def test_shared_ignore_imports_are_removed_for_every_contract(self, workers):
+        user_options = UserOptions(
+            session_options={
+                "root_packages": ["mypackage"],
+                "contract_types": [
+                    "forbidden_import: tests.helpers.contracts.ForbiddenImportContract"
+                ],
+                "shared_ignore_imports": ["mypackage.blue -> mypackage.*", "mypackage.red -> *"],
+            },
+            contracts_options=[
+                {
+                    "type": "forbidden_import",
+                    "name": "Contract one",
+                    "importer": "mypackage.blue",
+                    "imported": "mypackage.green",
+                },
+                {
+                    "type": "forbidden_import",
+                    "name": "Contract two",
+                    "importer": "mypackage.blue",
+                    "imported": "mypackage.yellow",
+                },
+            ],
+        )
+        _register_contract_types(user_options)
+        graph = ImportGraph()
+        for imported in ("mypackage.green", "mypackage.yellow"):
+            graph.add_import(
+                importer="mypackage.blue", imported=imported, line_number=1, line_contents="-"
+            )
+        builder = FakeGraphBuilder()
+        builder.inject_graph(graph)
+        settings.configure(GRAPH_BUILDER=builder, PRINTER=FakePrinter(), TIMER=FakeTimer())
+
+        report = create_report(user_options, cache_dir=None, workers=workers)
+
+        assert not report.contains_failures
+        assert report.kept_count == 2
+        # The imports are restored afterwards.
+        assert graph.find_modules_directly_imported_by("mypackage.blue") == {
+            "mypackage.green",
+            "mypackage.yellow",
+        }
+
+    def test_invalid_shared_ignore_imports_raise_error(self):
+        user_options = UserOptions(
+            session_options={
+                "root_packages": ["mypackage"],
+                "contract_types": ["always_passes: tests.helpers.contracts.AlwaysPassesContract"],
+                "shared_ignore_imports": ["mypackage.blue"],
+            },
+            contracts_options=[{"type": "always_passes", "name": "Contract foo"}],
+        )
+        _register_contract_types(user_options)
+        graph = ImportGraph()
+        graph.add_module("mypackage")
+        builder = FakeGraphBuilder()
+        builder.inject_graph(graph)
+        settings.configure(GRAPH_BUILDER=builder, PRINTER=FakePrinter())
+
+        with pytest.raises(ValueError, match="Invalid shared_ignore_imports option"):
+            create_report(user_options, cache_dir=None)
+
+    def test_ignored_imports_are_only_matched_once_for_all_contracts(self, monkeypatch):
+        user_options = UserOptions(
+            session_options={"root_packages": ["mypackage"]},
+            contracts_options=[
+                {
+                    "type": "forbidden",
+                    "name": f"Contract {forbidden_module}",
+                    "source_modules": ["mypackage.blue"],
+                    "forbidden_modules": [forbidden_module],
+                    "ignore_imports": ["mypackage.blue -> mypackage.*"],
+                }
+                for forbidden_module in ("mypackage.green", "mypackage.yellow")
+            ],
+        )
+        _register_contract_types(user_options)
+        graph = ImportGraph()
+        for imported in ("mypackage.green", "mypackage.yellow"):
+            graph.add_import(
+                importer="mypackage.blue", imported=imported, line_number=1, line_contents="-"
+            )
+        builder = FakeGraphBuilder()
+        builder.inject_graph(graph)
+        settings.configure(GRAPH_BUILDER=builder, PRINTER=FakePrinter(), TIMER=FakeTimer())
+        matched_expressions = []
+        find_matching_direct_imports = ModuleNameIndex.find_matching_direct_imports
+
+        def spy(self, graph, expression):
+            matched_expressions.append(str(expression))
+            return find_matching_direct_imports(self, graph, expression)
+
+        monkeypatch.setattr(ModuleNameIndex, "find_matching_direct_imports", spy)
+
+        report = create_report(user_options, cache_dir=None)
+
+        assert report.kept_count == 2
+        assert matched_expressions == ["mypackage.blue -> mypackage.*"]
+
+
+class TestServe:
+    ADDRESS = "/path/to/daemon.sock"
+
+    def test_checks_contracts_on_request(self):
+        self._configure()
+        serve(address=self.ADDRESS)
+        assert settings.PRINTER._buffer == f"Listening for requests at {self.ADDRESS}.\n"
+        settings.PRINTER._buffer = ""
+
+        result = lint_imports_using_daemon(address=self.ADDRESS, limit_to_contracts=("foo",))
+
+        assert result == SUCCESS
+        settings.PRINTER.pop_and_assert(
+            """
+            =============
+            Import Linter
+            =============
+
+            ---------
+            Contracts
+            ---------
+
+            Analyzed 1 files, 0 dependencies.
+            ---------------------------------
+
+            Contract foo KEPT
+
+            Contracts: 1 kept, 0 broken.
+            """
+        )
+
+    def test_broken_contract(self):
+        self._configure()
+        serve(address=self.ADDRESS)
+
+        assert lint_imports_using_daemon(address=self.ADDRESS) == FAILURE
+
+    def test_graph_is_only_rebuilt_when_files_change(self):
+        self._configure()
+        serve(address=self.ADDRESS)
+        settings.GRAPH_BUILDER.inject_graph(self._build_graph("mypackage", "mypackage.new"))
+
+        lint_imports_using_daemon(address=self.ADDRESS)
+        assert "Analyzed 1 files" in settings.PRINTER._buffer
+
+        settings.FILE_WATCHER.change_files("/path/to/mypackage/new.py")
+        settings.DAEMON_TRANSPORT.idle()
+        settings.PRINTER._buffer = ""
+        lint_imports_using_daemon(address=self.ADDRESS)
+        assert "Analyzed 2 files" in settings.PRINTER._buffer
+
+    def test_watches_root_package_directories(self):
+        self._configure(root_package="tests")
+        serve(address=self.ADDRESS)
+
+        assert settings.FILE_WATCHER.directories == [os.path.dirname(tests.__file__)]
+
+    def test_default_address_is_in_cache_directory(self):
+        self._configure()
+        serve()
+
+        assert settings.DAEMON_TRANSPORT.address == os.path.join(SOME_CACHE_DIR, "daemon.sock")
+        assert lint_imports_using_daemon() == FAILURE
+
+    def test_returns_none_if_daemon_not_running(self):
+        self._configure()
+
+        assert lint_imports_using_daemon(address=self.ADDRESS) is None
+        settings.PRINTER.pop_and_assert("")
+
+    def test_rejects_request_using_different_configuration(self):
+        self._configure()
+        settings.USER_OPTION_READERS["toml"] = FakeUserOptionReader(
+            self._build_user_options(contracts=("foo",))
+        )
+        serve(config_filename="setup.cfg", address=self.ADDRESS)
+        settings.PRINTER._buffer = ""
+
+        assert (
+            lint_imports_using_daemon(
+                config_filename="pyproject.toml", address=self.ADDRESS, verbose=True
+            )
+            is None
+        )
+        settings.PRINTER.pop_and_assert(
+            """
+            The daemon is using a different configuration. Checking locally instead.
+            """
+        )
+        assert lint_imports_using_daemon(config_filename="setup.cfg", address=self.ADDRESS) == (
+            FAILURE
+        )
+
+    def test_reads_configuration_again_if_it_has_changed(self):
+        self._configure()
+        serve(address=self.ADDRESS)
+        assert lint_imports_using_daemon(address=self.ADDRESS) == FAILURE
+
+        settings.USER_OPTION_READERS["ini"] = FakeUserOptionReader(
+            self._build_user_options(contracts=("foo",))
+        )
+        settings.PRINTER._buffer = ""
+
+        assert lint_imports_using_daemon(address=self.ADDRESS) == SUCCESS
+        assert "Contracts: 1 kept, 0 broken." in settings.PRINTER._buffer
+
+    def _configure(self, root_package: str = "mypackage") -> None:
+        settings.configure(
+            USER_OPTION_READERS={
+                "ini": FakeUserOptionReader(self._build_user_options(root_package=root_package))
+            },
+            GRAPH_BUILDER=FakeGraphBuilder(),
+            PRINTER=FakePrinter(),
+            TIMER=FakeTimer(),
+            DEFAULT_CACHE_DIR=SOME_CACHE_DIR,
+            CONTRACT_CHECK_CACHE=FakeContractCheckCache(),
+            FILE_WATCHER=FakeFileWatcher(),
+            DAEMON_TRANSPORT=FakeDaemonTransport(),
+        )
+        settings.GRAPH_BUILDER.inject_graph(self._build_graph("mypackage"))
+
+    def _build_user_options(
+        self, root_package: str = "mypackage", contracts: Tuple[str, ...] = ("foo", "bar")
+    ) -> UserOptions:
+        contracts_options = {
+            "foo": {"type": "always_passes", "id": "foo", "name": "Contract foo"},
+            "bar": {"type": "always_fails", "id": "bar", "name": "Contract bar"},
+        }
+        return UserOptions(
+            session_options={
+                "root_package": root_package,
+                "contract_types": [
+                    "always_passes: tests.helpers.contracts.AlwaysPassesContract",
+                    "always_fails: tests.helpers.contracts.AlwaysFailsContract",
+                ],
+            },
+            contracts_options=[contracts_options[contract] for contract in contracts],
+        )
+
+    def _build_graph(self, *modules: str) -> ImportGraph:
+        graph = ImportGraph()
+        for module in modules:
+            graph.add_module(module)
+        return graph
+
+
+class TestBenchmarks:
+    BASELINE_FILE = "/path/to/baseline.json"
+    RESULTS_FILE = "/path/to/results.json"
+
+    def test_run_benchmarks_saves_results(self):
+        timer = FakeTimer()
+        timer.setup(tick_duration=1, increment=1)
+        self._configure(timer=timer)
+
+        run_benchmarks(output_file=self.RESULTS_FILE, rounds=3, cache_dir=None)
+
+        results = benchmarking.deserialize_results(
+            settings.FILE_SYSTEM.content_map[self.RESULTS_FILE]
+        )
+        assert list(results.scenarios) == ["foo", "bar"]
+        assert results.scenarios["foo"].durations == (1.0, 2.0, 3.0)
+        assert results.scenarios["bar"].durations == (1.0, 2.0, 3.0)
+        assert re.fullmatch(
+            (
+                r"=+\nImport Linter benchmarks\n=+\n\n"
+                r"Contract foo \[median 2,000ms, peak RSS [\d.,]+[kM]B\]\n"
+                r"Contract bar \[median 2,000ms, peak RSS [\d.,]+[kM]B\]\n\n"
+            ),
+            settings.PRINTER._buffer,
+        )
+
+    def test_run_benchmarks_can_be_limited_to_contracts(self):
+        self._configure()
+
+        run_benchmarks(
+            output_file=self.RESULTS_FILE, limit_to_contracts=("foo",), rounds=1, cache_dir=None
+        )
+
+        results = benchmarking.deserialize_results(
+            settings.FILE_SYSTEM.content_map[self.RESULTS_FILE]
+        )
+        assert list(results.scenarios) == ["foo"]
+
+    def test_compare_benchmarks_passes_if_nothing_regressed(self):
+        self._configure(
+            baseline=self._build_results(foo=1.0, bar=1.0),
+            results=self._build_results(foo=1.1, baz=0.5),
+        )
+
+        result = compare_benchmarks(
+            baseline_file=self.BASELINE_FILE, results_file=self.RESULTS_FILE, threshold=0.1
+        )
+
+        assert result == SUCCESS
+        settings.PRINTER.pop_and_assert(
+            """
+            ========================
+            Import Linter benchmarks
+            ========================
+
+            Baseline: Import Linter 1.0, Python 3.11.0.
+            Current: Import Linter 1.0, Python 3.11.0.
+
+            Contract foo 1,000ms -> 1,100ms (+10.0%) [peak RSS 1.0MB -> 1.0MB]
+            Contract baz NEW [median 500ms, peak RSS 1.0MB]
+            Contract bar MISSING
+
+            No scenarios slowed down by more than 10%.
+            """
+        )
+
+    def test_compare_benchmarks_fails_if_a_scenario_regressed(self):
+        self._configure(
+            baseline=self._build_results(foo=1.0, bar=1.0),
+            results=self._build_results(foo=1.5, bar=0.5),
+        )
+
+        result = compare_benchmarks(
+            baseline_file=self.BASELINE_FILE, results_file=self.RESULTS_FILE, threshold=0.25
+        )
+
+        assert result == FAILURE
+        settings.PRINTER.pop_and_assert(
+            """
+            ========================
+            Import Linter benchmarks
+            ========================
+
+            Baseline: Import Linter 1.0, Python 3.11.0.
+            Current: Import Linter 1.0, Python 3.11.0.
+
+            Contract foo 1,000ms -> 1,500ms (+50.0%) SLOWER [peak RSS 1.0MB -> 1.0MB]
+            Contract bar 1,000ms -> 500ms (-50.0%) [peak RSS 1.0MB -> 1.0MB]
+
+            1 scenario slowed down by more than 25%.
+            """
+        )
+
+    def test_compare_benchmarks_runs_benchmarks_if_no_results_file(self):
+        timer = FakeTimer()
+        timer.setup(tick_duration=3, increment=0)
+        self._configure(timer=timer, baseline=self._build_results(foo=1.0))
+
+        result = compare_benchmarks(
+            baseline_file=self.BASELINE_FILE,
+            output_file=self.RESULTS_FILE,
+            limit_to_contracts=("foo",),
+            rounds=1,
+            cache_dir=None,
+        )
+
+        assert result == FAILURE
+        results = benchmarking.deserialize_results(
+            settings.FILE_SYSTEM.content_map[self.RESULTS_FILE]
+        )
+        assert results.scenarios["foo"].durations == (3.0,)
+
+    def test_compare_benchmarks_raises_for_invalid_baseline(self):
+        self._configure()
+        settings.FILE_SYSTEM.content_map[self.BASELINE_FILE] = "Not JSON"
+
+        with pytest.raises(benchmarking.InvalidBenchmarkResults):
+            compare_benchmarks(baseline_file=self.BASELINE_FILE, cache_dir=None)
+
+    def _build_results(self, **median_durations: float) -> benchmarking.BenchmarkResults:
+        return benchmarking.BenchmarkResults(
+            importlinter_version="1.0",
+            python_version="3.11.0",
+            scenarios={
+                scenario_id: benchmarking.ScenarioResult(
+                    name=f"Contract {scenario_id}", durations=(duration,), peak_rss=1_000_000
+                )
+                for scenario_id, duration in median_durations.items()
+            },
+        )
+
+    def _configure(
+        self,
+        timer: Optional[FakeTimer] = None,
+        baseline: Optional[benchmarking.BenchmarkResults] = None,
+        results: Optional[benchmarking.BenchmarkResults] = None,
+    ) -> None:
+        reader = FakeUserOptionReader(
+            UserOptions(
+                session_options={
+                    "root_package": "mypackage",
+                    "contract_types": [
+                        "always_passes: tests.helpers.contracts.AlwaysPassesContract",
+                        "always_fails: tests.helpers.contracts.AlwaysFailsContract",
+                    ],
+                },
+                contracts_options=[
+                    {"type": "always_passes", "id": "foo", "name": "Contract foo"},
+                    {"type": "always_fails", "id": "bar", "name": "Contract bar"},
+                ],
+            )
+        )
+        graph = ImportGraph()
+        graph.add_module("mypackage")
+        builder = FakeGraphBuilder()
+        builder.inject_graph(graph)
+        content_map = {}
+        if baseline:
+            content_map[self.BASELINE_FILE] = benchmarking.serialize_results(baseline)
+        if results:
+            content_map[self.RESULTS_FILE] = benchmarking.serialize_results(results)
+        settings.configure(
+            USER_OPTION_READERS={"foo": reader},
+            GRAPH_BUILDER=builder,
+            PRINTER=FakePrinter(),
+            TIMER=timer or FakeTimer(),
+            FILE_SYSTEM=FakeFileSystem(content_map=content_map),
+        )
+
 
 class TestReadUserOptions:
     @pytest.mark.parametrize("filename", [".importlinter", "setup.cfg", "foo", "foo.bar"])
@@ -0,0 +1,78 @@
+import pytest
+from grimp.adaptors.graph import ImportGraph
+
+from importlinter.contracts._common import find_reachable_pairs
+from importlinter.domain.imports import Module
+
+
+class TestFindReachablePairs:
+    def _build_graph(self) -> ImportGraph:
+        graph = ImportGraph()
+        for module in ("blue", "blue.one", "green", "green.two", "yellow", "purple", "utils"):
+            graph.add_module(f"mypackage.{module}")
+        graph.add_module("sqlalchemy", is_squashed=True)
+        for importer, imported in (
+            ("mypackage.blue.one", "mypackage.utils"),
+            ("mypackage.utils", "mypackage.green.two"),
+            ("mypackage.yellow", "mypackage.green"),
+            ("mypackage.purple", "sqlalchemy"),
+        ):
+            graph.add_import(importer=importer, imported=imported)
+        return graph
+
+    # Vary which side has fewer modules, as the graph is searched from that side.
+    @pytest.mark.parametrize(
+        "importers, importeds, expected_pairs",
+        (
+            (
+                ["mypackage.blue"],
+                ["mypackage.green", "mypackage.yellow", "mypackage.utils"],
+                {("mypackage.blue", "mypackage.green"), ("mypackage.blue", "mypackage.utils")},
+            ),
+            (
+                ["mypackage.blue", "mypackage.yellow", "mypackage.purple"],
+                ["mypackage.green"],
+                {("mypackage.blue", "mypackage.green"), ("mypackage.yellow", "mypackage.green")},
+            ),
+            (
+                ["mypackage.blue", "mypackage.purple"],
+                ["sqlalchemy"],
+                {("mypackage.purple", "sqlalchemy")},
+            ),
+            (["mypackage.green"], ["mypackage.blue", "mypackage.yellow"], set()),
+        ),
+    )
+    def test_finds_pairs_that_import_each_other(self, importers, importeds, expected_pairs):
+        pairs = find_reachable_pairs(
+            self._build_graph(),
+            importers=[Module(name) for name in importers],
+            importeds=[Module(name) for name in importeds],
+        )
+
+        assert pairs == expected_pairs
+
+    @pytest.mark.parametrize(
+        "as_packages, expected_pairs",
+        (
+            (True, {("mypackage.blue", "mypackage.green")}),
+            (False, set()),
+        ),
+    )
+    def test_as_packages(self, as_packages, expected_pairs):
+        pairs = find_reachable_pairs(
+            self._build_graph(),
+            importers=[Module("mypackage.blue")],
+            importeds=[Module("mypackage.green")],
+            as_packages=as_packages,
+        )
+
+        assert pairs == expected_pairs
+
+    def test_overlapping_modules_are_always_paired(self):
+        pairs = find_reachable_pairs(
+            self._build_graph(),
+            importers=[Module("mypackage.green")],
+            importeds=[Module("mypackage.green.two")],
+        )
+
+        assert pairs == {("mypackage.green", "mypackage.green.two")}
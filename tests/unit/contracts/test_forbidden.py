@@ -3,9 +3,11 @@ from typing import Tuple, List, Dict
 import pytest
 from grimp.adaptors.graph import ImportGraph
 
+from importlinter.application.graph_overlay import GraphOverlay
+from importlinter.application.reachability import build_reachability_index
 from importlinter.configuration import settings
 from importlinter.contracts.forbidden import ForbiddenContract
-from importlinter.domain.contract import ContractCheck
+from importlinter.domain.contract import ContractCheck, InvalidContractOptions
 from tests.adapters.printing import FakePrinter
 from tests.adapters.timing import FakeTimer
 
@@ -672,6 +674,203 @@ class TestForbiddenContract:
         ):
             contract.check(graph=graph, verbose=False)
 
+    def test_only_searches_for_chains_between_modules_that_import_each_other(self):
+        graph = self._build_graph()
+        searched_pairs = []
+        find_shortest_chains = graph.find_shortest_chains
+
+        def spy(importer, imported, as_packages=True):
+            searched_pairs.append((importer, imported))
+            return find_shortest_chains(importer, imported, as_packages=as_packages)
+
+        graph.find_shortest_chains = spy
+        contract = self._build_contract(
+            forbidden_modules=(
+                "mypackage.blue",
+                "mypackage.green",
+                "mypackage.yellow",
+                "mypackage.purple",
+            ),
+        )
+
+        contract_check = contract.check(graph=graph, verbose=False)
+
+        assert not contract_check.kept
+        assert sorted(searched_pairs) == [
+            ("mypackage.one", "mypackage.green"),
+            ("mypackage.three", "mypackage.green"),
+            ("mypackage.two", "mypackage.purple"),
+        ]
+
+    def test_does_not_search_for_reachable_pairs_if_indirect_imports_are_allowed(
+        self, monkeypatch
+    ):
+        graph = self._build_graph()
+        for method_name in ("find_upstream_modules", "find_downstream_modules"):
+            monkeypatch.setattr(
+                graph,
+                method_name,
+                lambda *args, **kwargs: pytest.fail("The graph should not be searched."),
+            )
+        contract = self._build_contract(
+            forbidden_modules=("mypackage.green", "mypackage.purple"),
+            allow_indirect_imports=True,
+        )
+
+        contract_check = contract.check(graph=graph, verbose=False)
+
+        assert not contract_check.kept
+        assert [
+            (chains_data["downstream_module"], chains_data["upstream_module"])
+            for chains_data in contract_check.metadata["invalid_chains"]
+        ] == [("mypackage.one", "mypackage.green"), ("mypackage.three", "mypackage.green")]
+
+    @pytest.mark.parametrize("as_packages", (True, False))
+    def test_reachability_index_is_used_if_available(self, as_packages, monkeypatch):
+        graph = self._build_graph()
+        contract = self._build_contract(
+            forbidden_modules=(
+                "mypackage.blue",
+                "mypackage.green",
+                "mypackage.yellow",
+                "mypackage.purple",
+            ),
+            as_packages=as_packages,
+        )
+        expected_check = contract.check(graph=graph, verbose=False)
+        reachability_index = build_reachability_index(graph)
+        for method_name in ("find_upstream_modules", "find_downstream_modules"):
+            monkeypatch.setattr(
+                GraphOverlay, method_name, lambda *args, **kwargs: pytest.fail("Searched graph.")
+            )
+
+        with GraphOverlay(graph, reachability_index) as overlay:
+            contract_check = contract.check(graph=overlay, verbose=False)
+
+        assert contract_check.kept == expected_check.kept
+        assert contract_check.metadata == expected_check.metadata
+
+    def test_line_numbers_are_only_looked_up_when_metadata_is_accessed(self, monkeypatch):
+        graph = self._build_graph()
+        looked_up_imports = []
+        get_import_details = ImportGraph.get_import_details
+
+        def spy(self, *, importer, imported):
+            looked_up_imports.append((importer, imported))
+            return get_import_details(self, importer=importer, imported=imported)
+
+        monkeypatch.setattr(ImportGraph, "get_import_details", spy)
+        contract = self._build_contract(forbidden_modules=("mypackage.purple",))
+
+        contract_check = contract.check(graph=graph, verbose=False)
+
+        assert not contract_check.kept
+        assert looked_up_imports == []
+        assert contract_check.metadata["invalid_chains"][0]["chains"] == [
+            [
+                {"importer": "mypackage.two", "imported": "mypackage.utils", "line_numbers": (9,)},
+                {
+                    "importer": "mypackage.utils",
+                    "imported": "mypackage.purple",
+                    "line_numbers": (1,),
+                },
+            ]
+        ]
+        assert sorted(looked_up_imports) == [
+            ("mypackage.two", "mypackage.utils"),
+            ("mypackage.utils", "mypackage.purple"),
+        ]
+
+    def test_summary_only_counts_chains_without_looking_up_line_numbers(self, monkeypatch):
+        graph = self._build_graph()
+        monkeypatch.setattr(
+            ImportGraph,
+            "get_import_details",
+            lambda *args, **kwargs: pytest.fail("Looked up import details."),
+        )
+        contract = self._build_contract(
+            forbidden_modules=(
+                "mypackage.blue",
+                "mypackage.green",
+                "mypackage.yellow",
+                "mypackage.purple",
+            ),
+            summary_only=True,
+        )
+
+        contract_check = contract.check(graph=graph, verbose=False)
+
+        assert not contract_check.kept
+        assert contract_check.metadata == {
+            "dependency_summaries": [
+                {"importer": "mypackage.one", "imported": "mypackage.green", "chain_count": 2},
+                {"importer": "mypackage.three", "imported": "mypackage.green", "chain_count": 1},
+                {"importer": "mypackage.two", "imported": "mypackage.purple", "chain_count": 1},
+            ]
+        }
+
+    def test_chains_past_maximum_are_omitted(self):
+        contract = self._build_contract(
+            forbidden_modules=("mypackage.green",), max_chains_per_dependency=1
+        )
+
+        contract_check = contract.check(graph=self._build_graph(), verbose=False)
+
+        assert not contract_check.kept
+        assert contract_check.metadata["invalid_chains"] == [
+            {
+                "upstream_module": "mypackage.green",
+                "downstream_module": "mypackage.one",
+                "chains": [
+                    [
+                        {
+                            "importer": "mypackage.one.alpha",
+                            "imported": "mypackage.green.beta",
+                            "line_numbers": (3,),
+                        }
+                    ]
+                ],
+                "omitted_chain_count": 1,
+            },
+            {
+                "upstream_module": "mypackage.green",
+                "downstream_module": "mypackage.three",
+                "chains": [
+                    [
+                        {
+                            "importer": "mypackage.three",
+                            "imported": "mypackage.green",
+                            "line_numbers": (4,),
+                        }
+                    ]
+                ],
+            },
+        ]
+
+    def test_session_option_sets_default_maximum(self):
+        contract = ForbiddenContract(
+            name="Forbid contract",
+            session_options={"root_packages": ["mypackage"], "max_chains_per_dependency": "1"},
+            contract_options={
+                "source_modules": ("mypackage.one",),
+                "forbidden_modules": ("mypackage.green",),
+            },
+        )
+
+        contract_check = contract.check(graph=self._build_graph(), verbose=False)
+
+        [chains_data] = contract_check.metadata["invalid_chains"]
+        assert len(chains_data["chains"]) == 1
+        assert chains_data["omitted_chain_count"] == 1
+
+    def test_invalid_maximum_is_invalid_contract(self):
+        with pytest.raises(InvalidContractOptions) as e:
+            self._build_contract(
+                forbidden_modules=("mypackage.green",), max_chains_per_dependency=0
+            )
+
+        assert e.value.errors == {"max_chains_per_dependency": "Must be at least 1."}
+
     def _build_graph(self):
         graph = ImportGraph()
         for module in (
@@ -737,10 +936,14 @@ class TestForbiddenContract:
         allow_indirect_imports=None,
         source_modules=None,
         as_packages=True,
+        summary_only=False,
+        max_chains_per_dependency=None,
     ):
         session_options = {"root_packages": ["mypackage"]}
         if include_external_packages:
             session_options["include_external_packages"] = "True"
+        if summary_only:
+            session_options["summary_only"] = "True"
 
         contract_options = {
             "source_modules": source_modules
@@ -754,6 +957,8 @@ class TestForbiddenContract:
                 "true" if allow_indirect_imports else "false"
             )
         contract_options["as_packages"] = "true" if as_packages else "false"
+        if max_chains_per_dependency is not None:
+            contract_options["max_chains_per_dependency"] = str(max_chains_per_dependency)
 
         return ForbiddenContract(
             name="Forbid contract",
@@ -893,6 +1098,87 @@ def test_render_broken_contract():
     )
 
 
+def test_render_broken_contract_summary():
+    settings.configure(PRINTER=FakePrinter())
+    contract = ForbiddenContract(
+        name="Forbid contract",
+        session_options={"root_packages": ["mypackage"], "summary_only": "True"},
+        contract_options={
+            "source_modules": ("mypackage.two", "mypackage.three"),
+            "forbidden_modules": ("mypackage.green", "mypackage.purple"),
+        },
+    )
+    check = ContractCheck(
+        kept=False,
+        metadata={
+            "dependency_summaries": [
+                {"importer": "mypackage.three", "imported": "mypackage.green", "chain_count": 1},
+                {"importer": "mypackage.two", "imported": "mypackage.purple", "chain_count": 3},
+            ]
+        },
+    )
+
+    contract.render_broken_contract(check)
+
+    settings.PRINTER.pop_and_assert(
+        """
+        mypackage.three is not allowed to import mypackage.green (1 chain).
+        mypackage.two is not allowed to import mypackage.purple (3 chains).
+
+        (Only a summary was requested, so the chains were not built.)
+
+        """
+    )
+
+
+def test_render_broken_contract_with_omitted_chains():
+    settings.configure(PRINTER=FakePrinter())
+    contract = ForbiddenContract(
+        name="Forbid contract",
+        session_options={"root_packages": ["mypackage"]},
+        contract_options={
+            "source_modules": ("mypackage.one",),
+            "forbidden_modules": ("mypackage.green",),
+            "max_chains_per_dependency": "1",
+        },
+    )
+    check = ContractCheck(
+        kept=False,
+        metadata={
+            "invalid_chains": [
+                {
+                    "upstream_module": "mypackage.green",
+                    "downstream_module": "mypackage.one",
+                    "chains": [
+                        [
+                            {
+                                "importer": "mypackage.one.alpha",
+                                "imported": "mypackage.green.beta",
+                                "line_numbers": (3,),
+                            }
+                        ]
+                    ],
+                    "omitted_chain_count": 2,
+                },
+            ]
+        },
+    )
+
+    contract.render_broken_contract(check)
+
+    settings.PRINTER.pop_and_assert(
+        """
+        mypackage.one is not allowed to import mypackage.green:
+
+        -   mypackage.one.alpha -> mypackage.green.beta (l.3)
+
+        (and 2 more chains not shown)
+
+
+        """
+    )
+
+
 class TestVerbosePrint:
     def test_verbose(self):
         timer = FakeTimer()
@@ -963,29 +1249,13 @@ class TestVerbosePrint:
 
         settings.PRINTER.pop_and_assert(
             """
-            Searching for import chains from mypackage.one to mypackage.blue...
-            Found 0 illegal chains in 10s.
+            Finding which forbidden modules are imported by the source modules...
+            Found 3 pairs of modules to search in 10,000ms.
             Searching for import chains from mypackage.one to mypackage.green...
-            Found 1 illegal chain in 10s.
-            Searching for import chains from mypackage.one to mypackage.purple...
-            Found 0 illegal chains in 10s.
-            Searching for import chains from mypackage.one to mypackage.yellow...
-            Found 0 illegal chains in 10s.
-            Searching for import chains from mypackage.three to mypackage.blue...
-            Found 0 illegal chains in 10s.
+            Found 1 illegal chain in 10,000ms.
             Searching for import chains from mypackage.three to mypackage.green...
-            Found 1 illegal chain in 10s.
-            Searching for import chains from mypackage.three to mypackage.purple...
-            Found 0 illegal chains in 10s.
-            Searching for import chains from mypackage.three to mypackage.yellow...
-            Found 0 illegal chains in 10s.
-            Searching for import chains from mypackage.two to mypackage.blue...
-            Found 0 illegal chains in 10s.
-            Searching for import chains from mypackage.two to mypackage.green...
-            Found 0 illegal chains in 10s.
+            Found 1 illegal chain in 10,000ms.
             Searching for import chains from mypackage.two to mypackage.purple...
-            Found 1 illegal chain in 10s.
-            Searching for import chains from mypackage.two to mypackage.yellow...
-            Found 0 illegal chains in 10s.
+            Found 1 illegal chain in 10,000ms.
             """
         )
@@ -4,6 +4,8 @@ import pytest
 from grimp.adaptors.graph import ImportGraph
 
 from importlinter.application.app_config import settings
+from importlinter.application.graph_overlay import GraphOverlay
+from importlinter.application.reachability import build_reachability_index
 from importlinter.contracts.independence import IndependenceContract, _SubpackageChainData
 from importlinter.domain.contract import ContractCheck
 from tests.adapters.printing import FakePrinter
@@ -757,5 +759,291 @@ def test_namespace_packages(independent_modules, is_kept):
     assert contract_check.kept == is_kept
 
 
+class TestReachabilityIndex:
+    CONTRACT_OPTIONS = {"modules": ("mypackage.blue", "mypackage.green", "mypackage.yellow")}
+
+    def _build_graph(self, imports) -> ImportGraph:
+        graph = ImportGraph()
+        for module in (
+            "mypackage",
+            "mypackage.blue",
+            "mypackage.blue.alpha",
+            "mypackage.green",
+            "mypackage.yellow",
+            "mypackage.yellow.gamma",
+            "mypackage.other",
+        ):
+            graph.add_module(module)
+        for line_number, (importer, imported) in enumerate(imports, start=1):
+            graph.add_import(
+                importer=importer, imported=imported, line_number=line_number, line_contents="-"
+            )
+        return graph
+
+    def _check(self, graph: ImportGraph, reachability_index=None) -> ContractCheck:
+        contract = IndependenceContract(
+            name="Independence contract",
+            session_options={"root_packages": ["mypackage"]},
+            contract_options=self.CONTRACT_OPTIONS,
+        )
+        with GraphOverlay(graph, reachability_index) as overlay:
+            return contract.check(graph=overlay, verbose=False)
+
+    @pytest.mark.parametrize(
+        "imports, is_kept",
+        (
+            ([], True),
+            ([("mypackage.blue", "mypackage.other"), ("mypackage.other", "mypackage.blue")], True),
+            ([("mypackage.blue.alpha", "mypackage.green")], False),
+            (
+                [
+                    ("mypackage.yellow.gamma", "mypackage.other"),
+                    ("mypackage.other", "mypackage.blue.alpha"),
+                ],
+                False,
+            ),
+        ),
+    )
+    def test_same_result_as_without_index(self, imports, is_kept):
+        graph = self._build_graph(imports)
+
+        contract_check = self._check(graph, build_reachability_index(graph))
+
+        assert contract_check.kept == is_kept
+        expected_check = self._check(graph)
+        assert _sort_invalid_chains(
+            contract_check.metadata["invalid_chains"]
+        ) == _sort_invalid_chains(expected_check.metadata["invalid_chains"])
+
+    def test_graph_is_not_searched_if_index_rules_out_dependencies(self, monkeypatch):
+        graph = self._build_graph([("mypackage.blue", "mypackage.other")])
+        reachability_index = build_reachability_index(graph)
+        monkeypatch.setattr(
+            GraphOverlay,
+            "find_illegal_dependencies_for_layers",
+            lambda *args, **kwargs: pytest.fail("Searched the graph."),
+        )
+
+        assert self._check(graph, reachability_index).kept
+
+
+def _build_graph_with_several_chains() -> ImportGraph:
+    graph = ImportGraph()
+    for module in (
+        "mypackage",
+        "mypackage.blue",
+        "mypackage.blue.alpha",
+        "mypackage.green",
+        "mypackage.yellow",
+        "mypackage.other",
+    ):
+        graph.add_module(module)
+    for line_number, (importer, imported) in enumerate(
+        [
+            ("mypackage.blue.alpha", "mypackage.green"),
+            ("mypackage.blue", "mypackage.other"),
+            ("mypackage.other", "mypackage.green"),
+            ("mypackage.yellow", "mypackage.blue.alpha"),
+        ],
+        start=1,
+    ):
+        graph.add_import(
+            importer=importer, imported=imported, line_number=line_number, line_contents="-"
+        )
+    return graph
+
+
+class TestSummaryOnly:
+    def test_chains_are_counted_without_looking_up_line_numbers(self, monkeypatch):
+        graph = _build_graph_with_several_chains()
+        monkeypatch.setattr(
+            ImportGraph,
+            "get_import_details",
+            lambda *args, **kwargs: pytest.fail("Looked up import details."),
+        )
+        contract = IndependenceContract(
+            name="Independence contract",
+            session_options={"root_packages": ["mypackage"], "summary_only": "True"},
+            contract_options={
+                "modules": ("mypackage.blue", "mypackage.green", "mypackage.yellow")
+            },
+        )
+
+        contract_check = contract.check(graph=graph, verbose=False)
+
+        assert not contract_check.kept
+        assert contract_check.metadata == {
+            "dependency_summaries": [
+                {"importer": "mypackage.blue", "imported": "mypackage.green", "chain_count": 2},
+                {"importer": "mypackage.yellow", "imported": "mypackage.blue", "chain_count": 1},
+            ]
+        }
+
+    def test_render_broken_contract(self):
+        settings.configure(PRINTER=FakePrinter())
+        contract = IndependenceContract(
+            name="Independence contract",
+            session_options={"root_packages": ["mypackage"], "summary_only": "True"},
+            contract_options={"modules": ("mypackage.blue", "mypackage.green")},
+        )
+        check = ContractCheck(
+            kept=False,
+            metadata={
+                "dependency_summaries": [
+                    {
+                        "importer": "mypackage.blue",
+                        "imported": "mypackage.green",
+                        "chain_count": 2,
+                    },
+                ]
+            },
+        )
+
+        contract.render_broken_contract(check)
+
+        settings.PRINTER.pop_and_assert(
+            """
+            mypackage.blue is not allowed to import mypackage.green (2 chains).
+
+            (Only a summary was requested, so the chains were not built.)
+
+            """
+        )
+
+
+class TestMaxChainsPerDependency:
+    @pytest.mark.parametrize(
+        "contract_options, session_options",
+        (
+            ({"max_chains_per_dependency": "1"}, {}),
+            ({}, {"max_chains_per_dependency": "1"}),
+            ({"max_chains_per_dependency": "1"}, {"max_chains_per_dependency": "5"}),
+        ),
+    )
+    def test_chains_past_maximum_are_omitted(self, contract_options, session_options):
+        graph = _build_graph_with_several_chains()
+        contract = IndependenceContract(
+            name="Independence contract",
+            session_options={"root_packages": ["mypackage"], **session_options},
+            contract_options={
+                "modules": ("mypackage.blue", "mypackage.green", "mypackage.yellow"),
+                **contract_options,
+            },
+        )
+
+        contract_check = contract.check(graph=graph, verbose=False)
+
+        assert not contract_check.kept
+        assert _sort_invalid_chains(contract_check.metadata["invalid_chains"]) == [
+            {
+                "upstream_module": "mypackage.blue",
+                "downstream_module": "mypackage.yellow",
+                "chains": [
+                    {
+                        "chain": [
+                            {
+                                "importer": "mypackage.yellow",
+                                "imported": "mypackage.blue.alpha",
+                                "line_numbers": (4,),
+                            },
+                        ],
+                        "extra_firsts": [],
+                        "extra_lasts": [],
+                    },
+                ],
+            },
+            {
+                "upstream_module": "mypackage.green",
+                "downstream_module": "mypackage.blue",
+                "chains": [
+                    {
+                        "chain": [
+                            {
+                                "importer": "mypackage.blue",
+                                "imported": "mypackage.other",
+                                "line_numbers": (2,),
+                            },
+                            {
+                                "importer": "mypackage.other",
+                                "imported": "mypackage.green",
+                                "line_numbers": (3,),
+                            },
+                        ],
+                        "extra_firsts": [],
+                        "extra_lasts": [],
+                    },
+                ],
+                "omitted_chain_count": 1,
+            },
+        ]
+
+    @pytest.mark.parametrize("max_chains_per_dependency", ("0", "many"))
+    def test_invalid_session_option_raises_error(self, max_chains_per_dependency):
+        contract = IndependenceContract(
+            name="Independence contract",
+            session_options={
+                "root_packages": ["mypackage"],
+                "max_chains_per_dependency": max_chains_per_dependency,
+            },
+            contract_options={"modules": ("mypackage.blue", "mypackage.green")},
+        )
+
+        with pytest.raises(
+            ValueError,
+            match=f"Invalid max_chains_per_dependency option '{max_chains_per_dependency}'",
+        ):
+            contract.check(graph=_build_graph_with_several_chains(), verbose=False)
+
+    def test_render_broken_contract(self):
+        settings.configure(PRINTER=FakePrinter())
+        contract = IndependenceContract(
+            name="Independence contract",
+            session_options={"root_packages": ["mypackage"]},
+            contract_options={
+                "modules": ("mypackage.blue", "mypackage.green"),
+                "max_chains_per_dependency": "1",
+            },
+        )
+        check = ContractCheck(
+            kept=False,
+            metadata={
+                "invalid_chains": [
+                    {
+                        "upstream_module": "mypackage.green",
+                        "downstream_module": "mypackage.blue",
+                        "chains": [
+                            {
+                                "chain": [
+                                    {
+                                        "importer": "mypackage.blue",
+                                        "imported": "mypackage.green",
+                                        "line_numbers": (2,),
+                                    },
+                                ],
+                                "extra_firsts": [],
+                                "extra_lasts": [],
+                            },
+                        ],
+                        "omitted_chain_count": 3,
+                    },
+                ]
+            },
+        )
+
+        contract.render_broken_contract(check)
+
+        settings.PRINTER.pop_and_assert(
+            """
+            mypackage.blue is not allowed to import mypackage.green:
+
+            - mypackage.blue -> mypackage.green (l.2)
+
+            (and 3 more chains not shown)
+
+
+            """
+        )
+
+
 def _sort_invalid_chains(invalid_chains: list[_SubpackageChainData]) -> list[_SubpackageChainData]:
     return sorted(invalid_chains, key=lambda i: (i["upstream_module"], i["downstream_module"]))
@@ -2,9 +2,12 @@ import pytest
 from grimp.adaptors.graph import ImportGraph
 
 from importlinter.application.app_config import settings
+from importlinter.application.graph_overlay import GraphOverlay
+from importlinter.application.reachability import build_reachability_index
 from importlinter.contracts.layers import Layer, LayerField, LayersContract, ModuleTail
 from importlinter.domain.contract import ContractCheck, InvalidContractOptions
 from importlinter.domain.helpers import MissingImport
+from importlinter.domain.imports import ModuleExpression
 from importlinter.domain import fields
 from tests.adapters.printing import FakePrinter
 from tests.adapters.timing import FakeTimer
@@ -1895,3 +1898,400 @@ def _get_sorted_metadata(contract_check: ContractCheck) -> dict:
         ),
         "undeclared_modules": contract_check.metadata["undeclared_modules"],
     }
+
+
+class TestGetReferencedModuleExpressions:
+    def test_with_containers(self):
+        contract = LayersContract(
+            name="Layer contract",
+            session_options={"root_packages": ["mypackage"]},
+            contract_options={
+                "containers": ["mypackage.foo", "mypackage.bar"],
+                "layers": ["high", "low"],
+                "ignore_imports": ["mypackage.other.blue -> mypackage.other.green"],
+            },
+        )
+
+        assert contract.get_referenced_module_expressions() == {
+            ModuleExpression("mypackage.foo"),
+            ModuleExpression("mypackage.bar"),
+            ModuleExpression("mypackage.other.blue"),
+            ModuleExpression("mypackage.other.green"),
+        }
+
+    def test_without_containers(self):
+        contract = LayersContract(
+            name="Layer contract",
+            session_options={"root_packages": ["mypackage"]},
+            contract_options={"layers": ["mypackage.high", "mypackage.medium | mypackage.low"]},
+        )
+
+        assert contract.get_referenced_module_expressions() == {
+            ModuleExpression("mypackage.high"),
+            ModuleExpression("mypackage.medium"),
+            ModuleExpression("mypackage.low"),
+        }
+
+
+class TestReachabilityIndex:
+    LAYERS = ["high", "medium_a | medium_b", "low_a : low_b", "(missing)"]
+
+    def _build_graph(self, imports) -> ImportGraph:
+        graph = ImportGraph()
+        for container in ("mypackage.one", "mypackage.two"):
+            graph.add_module(container)
+            for layer in ("high", "medium_a", "medium_b", "low_a", "low_b"):
+                graph.add_module(f"{container}.{layer}")
+                graph.add_module(f"{container}.{layer}.module")
+        for line_number, (importer, imported) in enumerate(imports, start=1):
+            graph.add_import(
+                importer=importer, imported=imported, line_number=line_number, line_contents="-"
+            )
+        return graph
+
+    def _check(
+        self, graph: ImportGraph, containers: bool, reachability_index=None
+    ) -> ContractCheck:
+        if containers:
+            contract_options = {
+                "layers": self.LAYERS,
+                "containers": ["mypackage.one", "mypackage.two"],
+            }
+        else:
+            contract_options = {
+                "layers": [
+                    " | ".join(f"mypackage.one.{tail}" for tail in layer.split(" | "))
+                    if "|" in layer
+                    else " : ".join(f"mypackage.one.{tail}" for tail in layer.split(" : "))
+                    for layer in self.LAYERS[:-1]
+                ]
+            }
+        contract = LayersContract(
+            name="Layers contract",
+            session_options={"root_packages": ["mypackage"]},
+            contract_options=contract_options,
+        )
+        with GraphOverlay(graph, reachability_index) as overlay:
+            return contract.check(graph=overlay, verbose=False)
+
+    @pytest.mark.parametrize("containers", (True, False))
+    @pytest.mark.parametrize(
+        "imports, is_kept",
+        (
+            ([], True),
+            (
+                [
+                    ("mypackage.one.high.module", "mypackage.one.medium_a"),
+                    ("mypackage.one.medium_b", "mypackage.one.low_a.module"),
+                    # Between non-independent siblings.
+                    ("mypackage.one.low_a", "mypackage.one.low_b"),
+                    ("mypackage.one.low_b.module", "mypackage.one.low_a"),
+                ],
+                True,
+            ),
+            ([("mypackage.one.low_b.module", "mypackage.one.high")], False),
+            (
+                [
+                    ("mypackage.one.low_a", "mypackage.other"),
+                    ("mypackage.other", "mypackage.one.medium_b.module"),
+                ],
+                False,
+            ),
+            # Between independent siblings.
+            ([("mypackage.one.medium_a", "mypackage.one.medium_b")], False),
+        ),
+    )
+    def test_same_result_as_without_index(self, containers, imports, is_kept):
+        graph = self._build_graph(imports)
+
+        contract_check = self._check(graph, containers, build_reachability_index(graph))
+
+        assert contract_check.kept == is_kept
+        expected_check = self._check(graph, containers)
+        assert _get_sorted_metadata(contract_check) == _get_sorted_metadata(expected_check)
+
+    def test_imports_between_containers_are_allowed(self):
+        graph = self._build_graph([("mypackage.one.low_a", "mypackage.two.high")])
+
+        assert self._check(graph, containers=True, reachability_index=None).kept
+        assert self._check(
+            graph, containers=True, reachability_index=build_reachability_index(graph)
+        ).kept
+
+    @pytest.mark.parametrize("containers", (True, False))
+    def test_graph_is_not_searched_if_index_rules_out_dependencies(self, containers, monkeypatch):
+        graph = self._build_graph([("mypackage.one.high", "mypackage.one.low_b")])
+        reachability_index = build_reachability_index(graph)
+        monkeypatch.setattr(
+            GraphOverlay,
+            "find_illegal_dependencies_for_layers",
+            lambda *args, **kwargs: pytest.fail("Searched the graph."),
+        )
+
+        assert self._check(graph, containers, reachability_index).kept
+
+
+class TestSummaryOnly:
+    def _build_contract(self, exhaustive: bool = False) -> LayersContract:
+        return LayersContract(
+            name="Layers contract",
+            session_options={"root_packages": ["mypackage"], "summary_only": "True"},
+            contract_options={
+                "layers": ["high", "medium", "low"],
+                "containers": ["mypackage"],
+                "exhaustive": "true" if exhaustive else "false",
+            },
+        )
+
+    def test_chains_are_counted_without_looking_up_line_numbers(self, monkeypatch):
+        graph = ImportGraph()
+        for module in ("mypackage", "mypackage.high", "mypackage.medium", "mypackage.low"):
+            graph.add_module(module)
+        for module in ("mypackage.medium.blue", "mypackage.low.green", "mypackage.low.yellow"):
+            graph.add_module(module)
+        for line_number, (importer, imported) in enumerate(
+            [
+                ("mypackage.low.green", "mypackage.high"),
+                ("mypackage.low.yellow", "mypackage.medium.blue"),
+                ("mypackage.medium.blue", "mypackage.high"),
+            ],
+            start=1,
+        ):
+            graph.add_import(
+                importer=importer, imported=imported, line_number=line_number, line_contents="-"
+            )
+        monkeypatch.setattr(
+            ImportGraph,
+            "get_import_details",
+            lambda *args, **kwargs: pytest.fail("Looked up import details."),
+        )
+
+        contract_check = self._build_contract().check(graph=graph, verbose=False)
+
+        assert not contract_check.kept
+        assert contract_check.metadata == {
+            "dependency_summaries": [
+                {"importer": "mypackage.low", "imported": "mypackage.high", "chain_count": 1},
+                {"importer": "mypackage.low", "imported": "mypackage.medium", "chain_count": 1},
+                {"importer": "mypackage.medium", "imported": "mypackage.high", "chain_count": 1},
+            ],
+            "undeclared_modules": set(),
+        }
+
+    def test_render_broken_contract(self):
+        settings.configure(PRINTER=FakePrinter())
+        check = ContractCheck(
+            kept=False,
+            metadata={
+                "dependency_summaries": [
+                    {"importer": "mypackage.low", "imported": "mypackage.high", "chain_count": 3},
+                ],
+                "undeclared_modules": {"mypackage.other"},
+            },
+        )
+
+        self._build_contract(exhaustive=True).render_broken_contract(check)
+
+        settings.PRINTER.pop_and_assert(
+            """
+            mypackage.low is not allowed to import mypackage.high (3 chains).
+
+            (Only a summary was requested, so the chains were not built.)
+
+            The following modules are not listed as layers:
+
+            - mypackage.other
+
+            (Since this contract is marked as 'exhaustive', every child of every container """
+            """must be declared as a layer.)
+
+            """
+        )
+
+
+class TestMaxChainsPerDependency:
+    def _build_graph(self) -> ImportGraph:
+        graph = ImportGraph()
+        for module in (
+            "mypackage",
+            "mypackage.high",
+            "mypackage.low",
+            "mypackage.low.green",
+            "mypackage.low.yellow",
+            "mypackage.utils",
+        ):
+            graph.add_module(module)
+        for line_number, (importer, imported) in enumerate(
+            [
+                ("mypackage.low.green", "mypackage.high"),
+                ("mypackage.low.yellow", "mypackage.utils"),
+                ("mypackage.utils", "mypackage.high"),
+            ],
+            start=1,
+        ):
+            graph.add_import(
+                importer=importer, imported=imported, line_number=line_number, line_contents="-"
+            )
+        return graph
+
+    @pytest.mark.parametrize(
+        "contract_options, session_options",
+        (
+            ({"max_chains_per_dependency": "1"}, {}),
+            ({}, {"max_chains_per_dependency": "1"}),
+            ({"max_chains_per_dependency": "1"}, {"max_chains_per_dependency": "5"}),
+        ),
+    )
+    def test_chains_past_maximum_are_omitted(self, contract_options, session_options):
+        contract = LayersContract(
+            name="Layers contract",
+            session_options={"root_packages": ["mypackage"], **session_options},
+            contract_options={
+                "layers": ["high", "low"],
+                "containers": ["mypackage"],
+                **contract_options,
+            },
+        )
+
+        contract_check = contract.check(graph=self._build_graph(), verbose=False)
+
+        assert not contract_check.kept
+        assert contract_check.metadata["invalid_dependencies"] == [
+            {
+                "importer": "mypackage.low",
+                "imported": "mypackage.high",
+                "routes": [
+                    {
+                        "chain": [
+                            {
+                                "importer": "mypackage.low.green",
+                                "imported": "mypackage.high",
+                                "line_numbers": (1,),
+                            },
+                        ],
+                        "extra_firsts": [],
+                        "extra_lasts": [],
+                    },
+                ],
+                "omitted_chain_count": 1,
+            },
+        ]
+
+    def test_all_chains_are_kept_without_maximum(self):
+        contract = LayersContract(
+            name="Layers contract",
+            session_options={"root_packages": ["mypackage"]},
+            contract_options={"layers": ["high", "low"], "containers": ["mypackage"]},
+        )
+
+        contract_check = contract.check(graph=self._build_graph(), verbose=False)
+
+        [dependency] = contract_check.metadata["invalid_dependencies"]
+        assert len(dependency["routes"]) == 2
+        assert "omitted_chain_count" not in dependency
+
+    def test_render_broken_contract(self):
+        settings.configure(PRINTER=FakePrinter())
+        contract = LayersContract(
+            name="Layers contract",
+            session_options={"root_packages": ["mypackage"]},
+            contract_options={
+                "layers": ["high", "low"],
+                "containers": ["mypackage"],
+                "max_chains_per_dependency": "1",
+            },
+        )
+        check = ContractCheck(
+            kept=False,
+            metadata={
+                "invalid_dependencies": [
+                    {
+                        "importer": "mypackage.low",
+                        "imported": "mypackage.high",
+                        "routes": [
+                            {
+                                "chain": [
+                                    {
+                                        "importer": "mypackage.low.green",
+                                        "imported": "mypackage.high",
+                                        "line_numbers": (1,),
+                                    },
+                                ],
+                                "extra_firsts": [],
+                                "extra_lasts": [],
+                            },
+                        ],
+                        "omitted_chain_count": 1,
+                    },
+                ],
+                "undeclared_modules": set(),
+            },
+        )
+
+        contract.render_broken_contract(check)
+
+        settings.PRINTER.pop_and_assert(
+            """
+            mypackage.low is not allowed to import mypackage.high:
+
+            - mypackage.low.green -> mypackage.high (l.1)
+
+            (and 1 more chain not shown)
+
+
+            """
+        )
+
+
+class TestLazyMetadata:
+    def _build_graph(self) -> ImportGraph:
+        graph = ImportGraph()
+        for module in ("mypackage", "mypackage.high", "mypackage.medium", "mypackage.low"):
+            graph.add_module(module)
+        for line_number, (importer, imported) in enumerate(
+            [
+                ("mypackage.low", "mypackage.high"),
+                ("mypackage.medium", "mypackage.high"),
+                ("mypackage.low", "mypackage.medium"),
+            ],
+            start=1,
+        ):
+            graph.add_import(
+                importer=importer, imported=imported, line_number=line_number, line_contents="-"
+            )
+        return graph
+
+    def _build_contract(self) -> LayersContract:
+        return LayersContract(
+            name="Layers contract",
+            session_options={"root_packages": ["mypackage"]},
+            contract_options={
+                "layers": ["high", "medium", "low"],
+                "containers": ["mypackage"],
+                "ignore_imports": ["mypackage.medium -> mypackage.high"],
+            },
+        )
+
+    def test_line_numbers_are_looked_up_once_graph_is_restored(self, monkeypatch):
+        graph = self._build_graph()
+        expected_metadata = self._build_contract().check(graph=graph, verbose=False).metadata
+        graph = self._build_graph()
+        looked_up_imports = []
+        get_import_details = ImportGraph.get_import_details
+
+        def spy(self, *, importer, imported):
+            looked_up_imports.append((importer, imported))
+            return get_import_details(self, importer=importer, imported=imported)
+
+        monkeypatch.setattr(ImportGraph, "get_import_details", spy)
+
+        with GraphOverlay(graph) as overlay:
+            contract_check = self._build_contract().check(graph=overlay, verbose=False)
+
+        assert not contract_check.kept
+        # The overlay looks up the ignored import, but not the imports in the chains.
+        assert looked_up_imports == [("mypackage.medium", "mypackage.high")]
+        assert _get_sorted_metadata(contract_check) == _get_sorted_metadata(
+            ContractCheck(kept=False, metadata=expected_metadata)
+        )
+        assert ("mypackage.low", "mypackage.high") in looked_up_imports
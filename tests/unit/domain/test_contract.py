@@ -1,8 +1,11 @@
+import pickle
+
 import pytest
 
 from importlinter.domain import fields
 from importlinter.domain.contract import (
     Contract,
+    ContractCheck,
     ContractRegistry,
     InvalidContractOptions,
     NoSuchContractType,
@@ -102,3 +105,33 @@ class TestContractRegistry:
                 registry.get_contract_class(name)
         else:
             assert expected_result == registry.get_contract_class(name)
+
+
+class TestContractCheck:
+    @pytest.mark.parametrize("metadata, expected_metadata", (({"foo": 1}, {"foo": 1}), (None, {})))
+    def test_metadata(self, metadata, expected_metadata):
+        assert ContractCheck(kept=True, metadata=metadata).metadata == expected_metadata
+
+    def test_lazy_metadata_is_built_once_when_first_accessed(self):
+        calls = []
+
+        def build_metadata():
+            calls.append(None)
+            return {"foo": 1}
+
+        check = ContractCheck(kept=False, metadata=build_metadata)
+        assert calls == []
+
+        assert check.metadata == {"foo": 1}
+        assert check.metadata == {"foo": 1}
+        assert len(calls) == 1
+
+    def test_lazy_metadata_is_built_when_pickled(self):
+        # A lambda can't be pickled.
+        check = ContractCheck(kept=False, metadata=lambda: {"foo": 1}, warnings=["Warning"])
+
+        unpickled_check = pickle.loads(pickle.dumps(check))
+
+        assert unpickled_check.kept is False
+        assert unpickled_check.metadata == {"foo": 1}
+        assert unpickled_check.warnings == ["Warning"]
@@ -9,6 +9,7 @@ from importlinter.domain.fields import (
     EnumField,
     Field,
     ImportExpressionField,
+    IntegerField,
     ListField,
     ModuleField,
     SetField,
@@ -71,6 +72,24 @@ class TestBooleanField(BaseFieldTest):
     field_class = BooleanField
 
 
+@pytest.mark.parametrize(
+    "raw_data, expected_value",
+    (
+        ("3", 3),
+        (1, 1),
+        ("0", ValidationError("Must be at least 1.")),
+        ("bananas", ValidationError("Could not parse an integer from 'bananas'.")),
+        (
+            ["one", "two", "three"],
+            ValidationError("Expected a single value, got multiple values."),
+        ),
+    ),
+)
+class TestIntegerField(BaseFieldTest):
+    field_class = IntegerField
+    field_kwargs = dict(min_value=1)
+
+
 @pytest.mark.parametrize(
     "raw_data, expected_value",
     (
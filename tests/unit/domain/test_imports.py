@@ -1,3 +1,4 @@
+import pickle
 from contextlib import contextmanager
 
 import pytest
@@ -66,6 +67,25 @@ class TestModule:
     def test_is_in_package(self, candidate, package, expected_bool):
         assert candidate.is_in_package(package) is expected_bool
 
+    def test_name_is_interned(self):
+        name = "".join(["mypackage", ".foo"])
+
+        assert Module(name).name is Module("mypackage.foo").name
+
+    def test_is_immutable(self):
+        module = Module("mypackage.foo")
+
+        with pytest.raises(AttributeError):
+            module.name = "mypackage.bar"
+
+    def test_survives_pickling(self):
+        module = Module("mypackage.foo")
+
+        unpickled = pickle.loads(pickle.dumps(module))
+
+        assert unpickled == module
+        assert hash(unpickled) == hash(module)
+
 
 class TestDirectImport:
     def test_object_representation(self):
@@ -95,12 +115,124 @@ class TestDirectImport:
     def test_string_object_representation(self, test_object, expected_string):
         assert str(test_object) == expected_string
 
+    @pytest.mark.parametrize(
+        "first_object, second_object, expected_bool",
+        [
+            (
+                DirectImport(importer=Module("mypackage.foo"), imported=Module("mypackage.bar")),
+                DirectImport(importer=Module("mypackage.foo"), imported=Module("mypackage.bar")),
+                True,
+            ),
+            (
+                DirectImport(
+                    importer=Module("mypackage.foo"),
+                    imported=Module("mypackage.bar"),
+                    line_number=10,
+                    line_contents="from mypackage import bar",
+                ),
+                DirectImport(
+                    importer=Module("mypackage.foo"),
+                    imported=Module("mypackage.bar"),
+                    line_number=10,
+                    line_contents="from mypackage import bar",
+                ),
+                True,
+            ),
+            (
+                DirectImport(importer=Module("mypackage.foo"), imported=Module("mypackage.bar")),
+                DirectImport(importer=Module("mypackage.bar"), imported=Module("mypackage.foo")),
+                False,
+            ),
+            (
+                DirectImport(
+                    importer=Module("mypackage.foo"),
+                    imported=Module("mypackage.bar"),
+                    line_number=10,
+                    line_contents="from mypackage import bar",
+                ),
+                DirectImport(
+                    importer=Module("mypackage.foo"),
+                    imported=Module("mypackage.bar"),
+                    line_number=10,
+                    line_contents="import mypackage.bar",
+                ),
+                False,
+            ),
+            (
+                DirectImport(
+                    importer=Module("mypackage.foo"),
+                    imported=Module("mypackage.bar"),
+                    line_number=0,
+                ),
+                DirectImport(importer=Module("mypackage.foo"), imported=Module("mypackage.bar")),
+                False,
+            ),
+            (
+                DirectImport(importer=Module("mypackage.foo"), imported=Module("mypackage.bar")),
+                "mypackage.foo -> mypackage.bar",
+                False,
+            ),
+        ],
+    )
+    def test_equal_magic_method(self, first_object, second_object, expected_bool):
+        assert (first_object == second_object) == expected_bool
+        if expected_bool:
+            assert hash(first_object) == hash(second_object)
+
+    def test_is_immutable(self):
+        direct_import = DirectImport(
+            importer=Module("mypackage.foo"), imported=Module("mypackage.bar")
+        )
+
+        with pytest.raises(AttributeError):
+            direct_import.line_number = 10
+
+    def test_survives_pickling(self):
+        direct_import = DirectImport(
+            importer=Module("mypackage.foo"),
+            imported=Module("mypackage.bar"),
+            line_number=10,
+            line_contents="from mypackage import bar",
+        )
+
+        unpickled = pickle.loads(pickle.dumps(direct_import))
+
+        assert unpickled == direct_import
+        assert hash(unpickled) == hash(direct_import)
+
 
 class TestModuleExpression:
     def test_object_representation(self):
         expression = ModuleExpression("mypackage.foo.**")
         assert repr(expression) == "<ModuleExpression: mypackage.foo.**>"
 
+    @pytest.mark.parametrize(
+        "expression, module_name, expected_bool",
+        [
+            ("mypackage.foo", "mypackage.foo", True),
+            ("mypackage.foo", "mypackage.foo.bar", False),
+            ("mypackage.*", "mypackage.foo", True),
+            ("mypackage.*", "mypackage.foo.bar", False),
+            ("mypackage.*", "mypackage", False),
+            ("mypackage.**", "mypackage.foo.bar", True),
+            ("mypackage.**", "mypackage", False),
+            ("mypackage.**.bar", "mypackage.foo.baz.bar", True),
+            ("mypackage.**.bar", "mypackage.bar", False),
+            ("*.foo", "mypackage.foo", True),
+            ("mypackage.f_o", "mypackage.foo", False),
+        ],
+    )
+    def test_matches(self, expression, module_name, expected_bool):
+        assert ModuleExpression(expression).matches(module_name) == expected_bool
+
+    def test_survives_pickling(self):
+        expression = ModuleExpression("mypackage.*.foo")
+
+        unpickled = pickle.loads(pickle.dumps(expression))
+
+        assert unpickled == expression
+        assert unpickled.matches("mypackage.bar.foo")
+
 
 class TestImportExpression:
     def test_object_representation(self):